@@ -0,0 +1,138 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import numpy as np
+from pandas import DataFrame
+from utils.config_json import JsonConfig
+
+
+class DataGenerator:
+    """
+    Gera dados sintéticos no formato de um ERP brasileiro legado.
+
+    Os dados imitam o cadastro de pessoas (clientes e fornecedores) de uma
+    base de origem: nomes com acentos e espaços sobrando, CPF/CNPJ com dígitos
+    verificadores válidos, CEP, telefones com e sem DDD e cidades reais da
+    base `citys.json`. A geração é vetorizada e determinística para uma
+    mesma semente.
+
+    Args:
+            seed (int): Semente do gerador de números aleatórios. O padrão é 42.
+    """
+
+    __FIRST_NAMES = np.array([
+        'José', 'João', 'Antônio', 'Francisco', 'Luís', 'Sebastião', 'Márcio', 'André',
+        'Maria', 'Ana', 'Conceição', 'Fátima', 'Lúcia', 'Mônica', 'Célia', 'Aparecida',
+    ])
+
+    __LAST_NAMES = np.array([
+        'da Silva', 'dos Santos', 'Gonçalves', 'Araújo', 'Conceição', 'Simões', 'Magalhães',
+        'Brandão', 'Assunção', 'Falcão', 'Pereira', 'Guimarães', 'Lopes', 'Camargo',
+    ])
+
+    __COMPANY_SUFFIX = np.array(['LTDA', 'ME', 'EIRELI', 'S/A', 'Comércio & Cia', 'Distribuição'])
+
+    __STREETS = np.array(['Rua', 'Av.', 'Travessa', 'Rodovia', 'Praça', 'Alameda'])
+
+    def __init__(self, seed: int = 42) -> None:
+        self.__random = np.random.default_rng(seed)
+
+    def people(self, rows: int) -> DataFrame:
+        """
+        Gera um cadastro de pessoas com as colunas da tabela de origem.
+
+        Args:
+            rows (int): Quantidade de linhas a gerar.
+
+        Returns:
+            DataFrame: O cadastro gerado, com colunas no padrão `<campo>_origem`.
+        """
+        random = self.__random
+        supplier = random.random(rows) < 0.3
+        citys = DataFrame(JsonConfig.get_citys())
+        city = citys.iloc[random.integers(0, len(citys), rows)].reset_index(drop=True)
+
+        names = self.__join(
+            '  ',
+            random.choice(self.__FIRST_NAMES, rows),
+            ' ',
+            random.choice(self.__LAST_NAMES, rows),
+            np.where(supplier, ' ' + random.choice(self.__COMPANY_SUFFIX, rows), ''),
+            np.where(random.random(rows) < 0.2, ' ', ''),
+        )
+
+        return DataFrame({
+            'codigo_origem': np.arange(1, rows + 1),
+            'nome_origem': names,
+            'tipo_origem': np.where(supplier, 'FORNECEDOR', 'CLIENTE'),
+            'cnpj_origem': np.where(supplier, self.cnpj(rows), self.cpf(rows)),
+            'endereco_origem': self.__join(
+                random.choice(self.__STREETS, rows), ' ', random.choice(self.__LAST_NAMES, rows)
+            ),
+            'numero_origem': random.integers(1, 5000, rows).astype(str),
+            'cidade_origem': np.where(random.random(rows) < 0.5, city['Cidade'].str.title(), city['Cidade']),
+            'uf_origem': city['Estado'].to_numpy(),
+            'cep_origem': self.__digits(rows, 8),
+            'ativo_origem': random.choice(np.array(['0', '1']), rows),
+            'fone_origem': self.__join(random.choice(self.__ddd(), rows), self.__digits(rows, 8)),
+            'cel_origem': np.where(
+                random.random(rows) < 0.8,
+                self.__join(random.choice(self.__ddd(), rows), '9', self.__digits(rows, 8)),
+                self.__join('9', self.__digits(rows, 8)),
+            ),
+        })
+
+    def cpf(self, rows: int) -> np.ndarray:
+        """Gera CPFs (somente dígitos) com dígitos verificadores válidos."""
+        base = self.__random.integers(0, 10, (rows, 9))
+        first = self.__check_digit(base, np.arange(10, 1, -1))
+        second = self.__check_digit(np.column_stack([base, first]), np.arange(11, 1, -1))
+        return self.__to_str(np.column_stack([base, first, second]))
+
+    def cnpj(self, rows: int) -> np.ndarray:
+        """Gera CNPJs (somente dígitos) com dígitos verificadores válidos."""
+        base = np.column_stack([self.__random.integers(0, 10, (rows, 8)), np.tile([0, 0, 0, 1], (rows, 1))])
+        first = self.__check_digit(base, np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+        second = self.__check_digit(np.column_stack([base, first]), np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+        return self.__to_str(np.column_stack([base, first, second]))
+
+    @staticmethod
+    def __check_digit(digits: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Calcula o dígito verificador módulo 11 de cada linha da matriz."""
+        rest = (digits * weights).sum(axis=1) % 11
+        return np.where(rest < 2, 0, 11 - rest)
+
+    def __digits(self, rows: int, width: int) -> np.ndarray:
+        """Gera textos de dígitos aleatórios com largura fixa."""
+        return self.__to_str(self.__random.integers(0, 10, (rows, width)))
+
+    @staticmethod
+    def __to_str(digits: np.ndarray) -> np.ndarray:
+        """Converte uma matriz de dígitos em um vetor de textos, uma linha por texto."""
+        width = digits.shape[1]
+        return (digits.astype(np.uint8) + ord('0')).view(f'S{width}').ravel().astype(str)
+
+    @staticmethod
+    def __ddd() -> np.ndarray:
+        """Retorna uma amostra de DDDs brasileiros."""
+        return np.array(['11', '19', '21', '31', '35', '41', '48', '51', '61', '62', '71', '81', '85', '91'])
+
+    @staticmethod
+    def __join(*parts) -> np.ndarray:
+        """Concatena vetores de texto (ou textos fixos) elemento a elemento."""
+        result = np.asarray(parts[0], dtype=object)
+        for part in parts[1:]:
+            result = result + np.asarray(part, dtype=object)
+        return result
@@ -0,0 +1,200 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+import subprocess
+from json import dump, load
+from tempfile import TemporaryDirectory
+from typer import run
+from rich import print
+from rich.table import Table
+from sqlalchemy import create_engine, text
+from benchmarks.data_generator import DataGenerator
+from stages.extract.row_counter import RowCounter
+from stages.extract.sql_extractor import Extractor
+from stages.transform.transform_data import Transformer
+from stages.load.load_data import Loader
+from utils.metrics import Metrics
+
+
+class Benchmark:
+    """
+    Executa o pipeline de ponta a ponta sobre dados sintéticos em SQLite.
+
+    Um banco de origem e um de destino são criados em um diretório
+    temporário, onde também ficam as exportações e o cache de contagens; o
+    cadastro gerado pelo `DataGenerator` é gravado na origem e passa por
+    `Extractor`, `Transformer` e `Loader` com as métricas da execução ativas. O relatório é gravado em `benchmarks/results`, com o
+    nome do commit atual, para comparação entre versões.
+    """
+
+    RESULTS_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+    TABLES: dict = {
+        "people": {
+            "table": "pessoas_origem",
+            "destiny": "pessoas_destino",
+            "fields": {
+                "codigo_origem": {"field_destiny": "codigo_destino", "transform": {"rename": True}},
+                "nome_origem": {"field_destiny": "nome_destino", "transform": {"trim": True, "clear": True, "upper": True}},
+                "tipo_origem": {
+                    "field_destiny": "tipo_destino",
+                    "transform": {"switch": {"str_from": ["FORNECEDOR", "CLIENTE"], "str_to": ["J", "F"]}}
+                },
+                "cnpj_origem": {"field_destiny": "cnpj_destino", "transform": {"format": "CNPJ"}},
+                "endereco_origem": {"field_destiny": "endereco_destino", "transform": {"trim": True, "clear": True}},
+                "numero_origem": {"field_destiny": "numero_destino", "transform": {}},
+                "cidade_origem": {
+                    "field_destiny": "Cidade",
+                    "transform": {"clear": True, "upper": True, "search": "CITY", "copy": "Codigo_Cidade"}
+                },
+                "uf_origem": {"field_destiny": "UF", "transform": {}},
+                "cep_origem": {"field_destiny": "cep_destino", "transform": {"format": "CEP"}},
+                "ativo_origem": {
+                    "field_destiny": "ativo_destino",
+                    "transform": {"switch": {"str_from": ["0", "1"], "str_to": ["N", "S"]}}
+                },
+                "fone_origem": {"field_destiny": "Fone_Numero", "transform": {"split": "DDD1"}},
+                "cel_origem": {"field_destiny": "Numero_Celular", "transform": {"split": "DDD_Celular"}}
+            },
+            "remove": {"column_1": "UF", "column_2": "Codigo_Cidade", "column_3": "Codigo_Cidade_IBGE"}
+        }
+    }
+
+    DESTINY_DDL: str = (
+        "CREATE TABLE pessoas_destino ("
+        "Codigo INTEGER PRIMARY KEY AUTOINCREMENT, Codigo_Old INTEGER, nome_destino VARCHAR(100), "
+        "tipo_destino CHAR(1), cnpj_destino VARCHAR(18), endereco_destino VARCHAR(100), "
+        "numero_destino VARCHAR(10), Cidade INTEGER, cep_destino VARCHAR(9), ativo_destino CHAR(1), "
+        "Fone_Numero VARCHAR(9), DDD1 VARCHAR(2), Numero_Celular VARCHAR(9), DDD_Celular VARCHAR(2))"
+    )
+
+    def __init__(self, rows: int, seed: int = 42) -> None:
+        self.__rows = rows
+        self.__seed = seed
+
+    def run(self) -> dict:
+        """
+        Gera os dados, executa o pipeline e retorna o relatório das métricas.
+
+        Returns:
+            dict: O relatório da execução (ver `RunMetrics.report`), acrescido
+                  da escala e do commit avaliados.
+        """
+        with TemporaryDirectory() as directory:
+            origin = create_engine(f"sqlite:///{os.path.join(directory, 'origem.db')}")
+            destiny = create_engine(f"sqlite:///{os.path.join(directory, 'destino.db')}")
+
+            DataGenerator(self.__seed).people(self.__rows).to_sql(
+                "pessoas_origem", origin, index=False, chunksize=50_000
+            )
+            with destiny.begin() as connection:
+                connection.execute(text(self.DESTINY_DDL))
+
+            counter = RowCounter(origin, os.path.join(directory, 'row_counts.json'))
+            run_metrics = Metrics.start_run('benchmark')
+            try:
+                raw_data = Extractor('SQLite', origin, counter=counter).extract(self.TABLES)
+                clean_data = Transformer(raw_data, export_dir=os.path.join(directory, 'exports'),
+                                         changes_dir=None).transform(self.TABLES)
+                Loader(clean_data, destiny).load()
+
+            finally:
+                Metrics.finish_run()
+                origin.dispose()
+                destiny.dispose()
+
+        report = run_metrics.report()
+        report.update({'rows': self.__rows, 'seed': self.__seed, 'commit': self.commit()})
+        return report
+
+    @classmethod
+    def save(cls, report: dict) -> str:
+        """Grava o relatório em `benchmarks/results/<commit>_<linhas>.json`."""
+        os.makedirs(cls.RESULTS_DIR, exist_ok=True)
+        path = os.path.join(cls.RESULTS_DIR, f"{report['commit']}_{report['rows']}.json")
+
+        with open(path, 'w', encoding='utf-8') as file:
+            dump(report, file, ensure_ascii=False, indent=2)
+
+        return path
+
+    @staticmethod
+    def commit() -> str:
+        """Retorna o hash curto do commit atual, ou 'local' fora de um repositório git."""
+        try:
+            result = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True,
+                cwd=os.path.dirname(os.path.abspath(__file__))
+            )
+            return result.stdout.strip()
+
+        except Exception:
+            return 'local'
+
+    @staticmethod
+    def compare(previous: dict, current: dict) -> Table:
+        """
+        Monta uma tabela comparando as linhas por segundo de duas execuções.
+
+        A comparação é feita por etapa e por operação de transformação
+        (somando todas as colunas em que a operação foi aplicada).
+        """
+        def rates(report: dict) -> dict[str, float]:
+            result = {stage: totals['rows_per_second'] for stage, totals in report['stages'].items()}
+            ops: dict[str, list[float]] = {}
+            for item in report['measures']:
+                if item['op']:
+                    ops.setdefault(item['op'], [0, 0])
+                    ops[item['op']][0] += item['rows'] or 0
+                    ops[item['op']][1] += item['seconds']
+            result.update({f"transform:{op}": rows / seconds for op, (rows, seconds) in ops.items() if seconds})
+            return result
+
+        before, after = rates(previous), rates(current)
+        table = Table(title=f"{previous['commit']} -> {current['commit']} (linhas/s)")
+        for column in ("Etapa", "Antes", "Depois", "Variação"):
+            table.add_column(column, justify="left" if column == "Etapa" else "right")
+
+        for key in after:
+            old, new = before.get(key), after[key]
+            change = f"{(new / old - 1) * 100:+.1f}%" if old and new else "-"
+            table.add_row(key, f"{old:,.0f}" if old else "-", f"{new:,.0f}" if new else "-", change)
+
+        return table
+
+
+def main(rows: int = 100_000, seed: int = 42, compare: str = "") -> None:
+    """
+    Executa o benchmark e grava o resultado.
+
+    Args:
+        rows: Quantidade de linhas sintéticas geradas.
+        seed: Semente do gerador de dados.
+        compare: Caminho de um resultado anterior para comparação.
+    """
+    report = Benchmark(rows, seed).run()
+    path = Benchmark.save(report)
+    print(f"[bold green]Resultado gravado em {path}[/bold green]")
+
+    if compare:
+        with open(compare, encoding='utf-8') as file:
+            previous = load(file)
+        print(Benchmark.compare(previous, report))
+
+
+if __name__ == "__main__":
+    run(main)
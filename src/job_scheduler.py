@@ -0,0 +1,308 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+import re
+from collections import namedtuple
+from collections.abc import Mapping
+from contextlib import ExitStack
+from datetime import datetime
+from functools import partial
+from json import dump
+from threading import BoundedSemaphore, Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Annotated, Any
+from typer import Argument, Option, run
+from rich import print
+from utils.config_json import JsonConfig
+from utils.connector import SQLConnector
+from utils.log import Log
+from utils.metrics import Metrics
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
+    from rich.table import Table
+    from utils.frame_store import MemoryBudget
+
+Job = namedtuple('Job', ['name', 'tables', 'origin', 'destiny'])
+JobResult = namedtuple('JobResult', ['name', 'status', 'seconds', 'rows', 'error', 'report'])
+
+
+class JobScheduler:
+    """
+    Executa várias migrações (origem → destino) em paralelo a partir de um manifesto.
+
+    O manifesto é um JSON com a lista de jobs; cada job informa seus arquivos
+    (ou objetos) `origin`, `destiny` e `systems`, no mesmo formato dos arquivos
+    de `utils/`. Valores ausentes no job são lidos de `defaults`, e caminhos
+    relativos partem do diretório do manifesto:
+
+        {
+            "max_workers": 4,
+            "max_per_host": 2,
+            "defaults": {"systems": "systems.json", "destiny": "destiny.json"},
+            "jobs": [
+                {"name": "loja_01", "origin": "lojas/loja_01.json"},
+                {"name": "loja_02", "origin": "lojas/loja_02.json"}
+            ]
+        }
+
+    No máximo `max_workers` jobs rodam ao mesmo tempo, e no máximo
+    `max_per_host` deles usam o mesmo servidor (de origem ou de destino).
+    Os engines e seus pools de conexão, a reflexão das tabelas, o índice de
+    cidades e o orçamento de memória são compartilhados entre os jobs. A falha
+    de um job não interrompe os demais; ao final, um relatório agregado é
+    gravado em `reports/jobs_<data>.json`.
+
+    Args:
+            manifest (str): Caminho do manifesto de jobs.
+            max_workers (int): Jobs simultâneos; 0 usa o valor do manifesto (padrão 4).
+            max_per_host (int): Jobs simultâneos por servidor; 0 usa o valor do
+                                manifesto (padrão `max_workers`).
+            budget (MemoryBudget | None): Orçamento de memória compartilhado. O padrão é None.
+    """
+
+    __REPORTS_DIR: str = "reports"
+    __NAME = re.compile(r'^[\w.-]+$')
+
+    def __init__(self, manifest: str, max_workers: int = 0, max_per_host: int = 0,
+                 budget: "MemoryBudget | None" = None) -> None:
+        data = JsonConfig.read(manifest)
+        self.__jobs = self.__load_jobs(manifest, data)
+        self.__max_workers = max_workers or data.get('max_workers', 4)
+        self.__max_per_host = max_per_host or data.get('max_per_host', self.__max_workers)
+        self.__budget = budget
+        self.__semaphores: dict[str, BoundedSemaphore] = {}
+        self.__lock = Lock()
+
+    @property
+    def jobs(self) -> list[Job]:
+        """Os jobs do manifesto, já validados."""
+        return list(self.__jobs)
+
+    @classmethod
+    def run(
+        cls,
+        manifest: Annotated[str, Argument(help="Manifesto JSON com a lista de jobs.")],
+        max_workers: Annotated[int, Option(help="Jobs simultâneos; 0 usa o valor do manifesto.")] = 0,
+        max_per_host: Annotated[int, Option(help="Jobs simultâneos por servidor; 0 usa o valor do manifesto.")] = 0,
+        memory_budget: Annotated[int, Option(
+            help="Limite de memória (MB) compartilhado por todos os jobs; 0 desativa."
+        )] = 0,
+        spill_dir: Annotated[str, Option(
+            help="Diretório dos arquivos temporários das tabelas despejadas da memória."
+        )] = "",
+    ) -> None:
+        """
+        Executa todos os jobs do manifesto e exibe o resumo.
+
+        Raises:
+            SystemExit: Com código 1 se algum job falhar.
+        """
+        budget = None
+        if memory_budget:
+            from utils.frame_store import MemoryBudget
+            budget = MemoryBudget(memory_budget * 1024 ** 2, spill_dir or None)
+
+        try:
+            scheduler = cls(manifest, max_workers, max_per_host, budget)
+            results = scheduler.execute()
+
+        finally:
+            if budget:
+                budget.close()
+
+        print(cls.render(results))
+        path = cls.save(results)
+        print(f"[bold green]Relatório dos jobs gravado em {path}[/bold green]")
+
+        if any(result.status != 'ok' for result in results):
+            raise SystemExit(1)
+
+    def execute(self) -> list[JobResult]:
+        """
+        Executa os jobs respeitando os limites de concorrência.
+
+        Returns:
+            list[JobResult]: O resultado de cada job, na ordem do manifesto.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from rich.progress import Progress
+        from utils.progress import RichProgressReporter
+
+        with Progress(*RichProgressReporter.columns(), transient=False) as progress:
+            overall = progress.add_task(description="Jobs concluídos", total=len(self.__jobs))
+
+            def work(job: Job) -> JobResult:
+                result = self.__run_job(job, progress)
+                progress.advance(overall)
+                return result
+
+            with ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="job") as executor:
+                return list(executor.map(work, self.__jobs))
+
+    @classmethod
+    def render(cls, results: list[JobResult]) -> "Table":
+        """Monta a tabela do Rich com o resumo dos jobs."""
+        from rich.table import Table
+
+        table = Table(title="Resumo dos jobs")
+        for column in ("Job", "Status", "Tempo (s)", "Linhas carregadas", "Erro"):
+            table.add_column(column, justify="right" if column in ("Tempo (s)", "Linhas carregadas") else "left")
+
+        for result in results:
+            status = "[green]ok[/green]" if result.status == 'ok' else "[red]erro[/red]"
+            table.add_row(result.name, status, f"{result.seconds:,.1f}", f"{result.rows:,}", result.error or "")
+
+        return table
+
+    @classmethod
+    def save(cls, results: list[JobResult]) -> str:
+        """
+        Grava o relatório agregado dos jobs em um arquivo JSON.
+
+        Returns:
+            str: O caminho do arquivo gravado.
+        """
+        os.makedirs(cls.__REPORTS_DIR, exist_ok=True)
+        path = os.path.join(cls.__REPORTS_DIR, f"jobs_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+        with open(path, 'w', encoding='utf-8') as file:
+            dump({
+                'jobs': [result._asdict() for result in results],
+                'ok': sum(result.status == 'ok' for result in results),
+                'failed': sum(result.status != 'ok' for result in results),
+                'rows': sum(result.rows for result in results),
+            }, file, ensure_ascii=False, indent=2)
+
+        return path
+
+    def __run_job(self, job: Job, progress: "Progress") -> JobResult:
+        """Executa as três etapas de um job, sem propagar a sua falha."""
+        from stages.stage_factory import StageFactory
+        from utils.progress import RichProgressReporter
+
+        hosts = sorted({self.__host(job.origin), self.__host(job.destiny)})
+        with ExitStack() as stack:
+            for host in hosts:
+                stack.enter_context(self.__semaphore(host))
+
+            with Log.context(job=job.name):
+                start = perf_counter()
+                run_metrics = Metrics.start_run(job.name)
+                error = None
+
+                try:
+                    Log.info(f"Iniciando o job {job.name}")
+                    factory = StageFactory(job.tables, self.__budget, RichProgressReporter(progress, job.name), job.name)
+                    origin, destiny = SQLConnector(), SQLConnector()
+                    origin.db_connection(job.origin)
+                    destiny.db_connection(job.destiny)
+
+                    extractor = factory.extractor(job.origin['font'], origin.get_engine())
+                    extractor.count_rows(job.tables)
+                    clean_data = factory.transformer(extractor.extract(job.tables)).transform(job.tables)
+                    factory.loader(clean_data, destiny.get_engine(), job.destiny.get('bulk_load', False)).load()
+
+                except (SystemExit, Exception) as failure:
+                    message = str(failure) or str(failure.__cause__ or "")
+                    error = message.split("\n")[0] or "falha na execução, verifique o log"
+                    Log.error(f"O job {job.name} falhou: {error}", trace=isinstance(failure, Exception))
+
+                finally:
+                    Metrics.finish_run()
+                    report = run_metrics.save(self.__REPORTS_DIR)
+
+                return JobResult(
+                    name=job.name,
+                    status='ok' if error is None else 'erro',
+                    seconds=round(perf_counter() - start, 3),
+                    rows=run_metrics.totals('load')['rows'],
+                    error=error,
+                    report=report,
+                )
+
+    def __semaphore(self, host: str) -> BoundedSemaphore:
+        """Retorna o semáforo que limita os jobs simultâneos de um servidor."""
+        with self.__lock:
+            return self.__semaphores.setdefault(host, BoundedSemaphore(self.__max_per_host))
+
+    @staticmethod
+    def __host(info: Mapping[str, Any]) -> str:
+        """Identifica o servidor de uma conexão (o arquivo, no caso do SQLite)."""
+        return f"{info['font']}:{info.get('host') or info.get('database')}".lower()
+
+    @classmethod
+    def __load_jobs(cls, manifest: str, data: Any) -> list[Job]:
+        """
+        Lê e valida todos os jobs do manifesto, reportando os erros de uma vez.
+
+        Raises:
+            SystemExit: Se o manifesto ou a configuração de algum job for inválida.
+        """
+        if not isinstance(data, Mapping) or not isinstance(data.get('jobs'), tuple) or not data['jobs']:
+            JsonConfig.fail([f"{os.path.basename(manifest)}: 'jobs' deve ser uma lista com ao menos um job"])
+
+        from stages.table_checks import TableChecks
+        from stages.transform.registry import TransformRegistry
+
+        base = os.path.dirname(os.path.abspath(manifest))
+        defaults = data.get('defaults', {})
+        checks = {'systems': partial(JsonConfig.tables_errors, transforms=TransformRegistry.check,
+                                      blocks=TableChecks.errors),
+                  'origin': JsonConfig.database_errors, 'destiny': JsonConfig.database_errors}
+
+        errors = []
+        jobs = []
+        names = set()
+        for position, entry in enumerate(data['jobs'], start=1):
+            name = entry.get('name') if isinstance(entry, Mapping) else None
+            if not isinstance(name, str) or not cls.__NAME.match(name):
+                errors.append(f"job {position}: 'name' ausente ou com caracteres inválidos")
+                continue
+            if name in names:
+                errors.append(f"job '{name}': nome repetido")
+                continue
+            names.add(name)
+
+            parts = {}
+            for key, check in checks.items():
+                value = entry.get(key, defaults.get(key))
+                if value is None:
+                    errors.append(f"job '{name}': '{key}' ausente")
+                    continue
+
+                if isinstance(value, str):
+                    path = os.path.join(base, value)
+                    if not os.path.isfile(path):
+                        errors.append(f"job '{name}': arquivo '{value}' de '{key}' não encontrado")
+                        continue
+                    value = JsonConfig.read(path)
+
+                problems = check(value)
+                errors.extend(f"job '{name}', {key}: {problem}" for problem in problems)
+                parts[key] = value
+
+            if len(parts) == len(checks):
+                jobs.append(Job(name=name, tables=parts['systems'], origin=parts['origin'], destiny=parts['destiny']))
+
+        if errors:
+            JsonConfig.fail(errors)
+
+        return jobs
+
+
+if __name__ == "__main__":
+    run(JobScheduler.run)
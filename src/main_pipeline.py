@@ -13,14 +13,23 @@
 # Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
 # com este programa. Se não, veja <https://www.gnu.org/licenses/>.
 
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
 from time import sleep
-from typer import run
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from stages.extract.sql_extractor import Extractor
-from stages.transform.transform_data import Transformer
-from stages.load.load_data import Loader
+from typing import TYPE_CHECKING, Annotated
+from typer import Option, run
+from rich import print
 from utils.connector import SQLConnector
 from utils.config_json import JsonConfig
+from utils.log import Log
+from utils.metrics import Metrics, RunMetrics
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
+    from stages.stage_factory import StageFactory
+    from utils.frame_store import MemoryBudget
+    from utils.progress import RichProgressReporter
 
 
 class MainPipeline:
@@ -36,60 +45,386 @@ class MainPipeline:
     5. Carga (L) dos dados processados no destino final.
 
     É projetada para ser executada de forma estática através do método `run()`.
+    Cada execução é medida (tempo, linhas, bytes e memória por etapa e tabela)
+    e gera um relatório JSON no diretório `reports`.
+
+    É possível executar apenas algumas tabelas (`--tables`) e apenas parte das
+    etapas (`--from-stage`/`--to-stage`). O resultado da extração e da
+    transformação de cada tabela é gravado em disco (veja `ContractStore`),
+    permitindo, por exemplo, retransformar ou recarregar uma única tabela sem
+    extrair todas novamente.
+
+    As bibliotecas pesadas (pandas, NumPy, SQLAlchemy) e as etapas são
+    importadas apenas quando a execução começa, para que `--help` e erros
+    de configuração respondam sem esperar por elas.
     """
 
     __origin_conn: SQLConnector = SQLConnector()
     __destiny_conn: SQLConnector = SQLConnector()
+    __REPORTS_DIR: str = "reports"
+    __STAGES: tuple[str, ...] = ('extract', 'transform', 'load')
 
     @classmethod
-    def run(cls) -> None:
+    def run(
+        cls,
+        profile: Annotated[str, Option(
+            help="Captura o perfil de CPU da execução e grava <caminho>.prof e <caminho>.txt."
+        )] = "",
+        memory_budget: Annotated[int, Option(
+            help="Limite de memória (MB) para as tabelas mantidas entre as etapas; 0 desativa."
+        )] = 0,
+        spill_dir: Annotated[str, Option(
+            help="Diretório dos arquivos temporários das tabelas despejadas da memória."
+        )] = "",
+        dry_run: Annotated[bool, Option(
+            help="Valida a configuração e prevê o tempo de cada tabela, sem mover dados."
+        )] = False,
+        preview: Annotated[int, Option(
+            help="Transforma apenas N linhas por tabela e exibe o antes e o depois de cada coluna; 0 desativa."
+        )] = 0,
+        sample: Annotated[str, Option(
+            help="Amostragem da prévia: first (primeiras linhas), keys (faixas da chave) ou native (do banco)."
+        )] = "first",
+        scratch: Annotated[str, Option(
+            help="Arquivo JSON de conexão (como o destiny.json) de um destino de rascunho para carregar a prévia."
+        )] = "",
+        tables: Annotated[list[str] | None, Option(
+            "--tables", help="Tabela do systems.json a executar; repita a opção para várias. Padrão: todas."
+        )] = None,
+        from_stage: Annotated[str, Option(
+            help="Etapa inicial: extract, transform ou load. As anteriores são lidas de --contracts-dir."
+        )] = "extract",
+        to_stage: Annotated[str, Option(help="Etapa final: extract, transform ou load.")] = "load",
+        contracts_dir: Annotated[str, Option(
+            help="Diretório onde os dados de cada etapa são gravados para retomadas e de onde são lidos."
+        )] = os.path.join(".cache", "contracts"),
+        save_contracts: Annotated[bool, Option(
+            help="Grava os dados de cada etapa em --contracts-dir também numa execução completa."
+        )] = False,
+    ) -> None:
         """
         Executa a sequência completa de operações do pipeline de ETL.
 
         Este método é o ponto de partida que invoca todas as fases do processo,
         desde a leitura das configurações até a carga final dos dados.
+
+        Args:
+            profile (str): Caminho base para o perfil de CPU da execução. Vazio
+                           (padrão) desativa o perfilamento, sem custo adicional.
+            memory_budget (int): Limite, em MB, da memória ocupada pelas tabelas
+                                 brutas e limpas. Acima dele, as tabelas menos
+                                 usadas são despejadas em disco. 0 (padrão) desativa.
+            spill_dir (str): Diretório base dos arquivos despejados. Vazio
+                             (padrão) usa o diretório temporário do sistema.
+            dry_run (bool): Se True, apenas valida o `systems.json` contra os
+                            esquemas de origem e destino e estima linhas,
+                            bytes e tempo por tabela, sem mover dados.
+            preview (int): Se maior que 0, lê no máximo essa quantidade de
+                           linhas de cada tabela, aplica toda a transformação
+                           e exibe o antes e o depois de cada coluna, sem
+                           gravar no destino.
+            sample (str): Amostragem da prévia (veja `Previewer`).
+            scratch (str): Arquivo de conexão de um destino de rascunho onde
+                           a prévia é carregada. Vazio (padrão) não carrega.
+            tables (list[str] | None): Nomes das tabelas do `systems.json` a
+                                       executar. None (padrão) executa todas.
+            from_stage (str): Etapa pela qual a execução começa. Ao começar na
+                              transformação ou na carga, o resultado da etapa
+                              anterior é lido de `contracts_dir`.
+            to_stage (str): Última etapa executada.
+            contracts_dir (str): Diretório onde o resultado da extração e da
+                                 transformação de cada tabela é gravado, para
+                                 que execuções seguintes possam retomar dali.
+                                 Só é usado quando parte das etapas é
+                                 executada ou com `save_contracts`.
+            save_contracts (bool): Se True, grava o resultado das etapas também
+                                   numa execução completa (da extração à carga).
+                                   O padrão é False, sem custo de gravação.
+
+        Raises:
+            SystemExit: Se as etapas ou tabelas informadas forem inválidas.
         """
-        with Progress(
-            SpinnerColumn(spinner_name='boxBounce2'),
-            TextColumn("[progress.description]{task.description}"),
-            transient=False,
-        ) as progress:
-
-            task1 = progress.add_task(description="Verificando configurações...", total=1)
-            tables = JsonConfig.get_tables()
-            origin = JsonConfig.get_origin_db()
-            destiny = JsonConfig.get_destiny_db()
-            progress.update(task1, completed=1)
-
-            task2 = progress.add_task(description="Conectando na origem dos dados...", total=1)
-            cls.__origin_conn.db_connection(origin)
-            origin_engine = cls.__origin_conn.get_engine()
-            progress.update(task2, completed=1)
-
-            task3 = progress.add_task(description="Conectando no destino dos dados...", total=1)
-            cls.__destiny_conn.db_connection(destiny)
-            destiny_engine = cls.__destiny_conn.get_engine()
-            progress.update(task3, completed=1)
-
-            task4 = progress.add_task(description="Extraindo dados...", total=1)
-            extractor = Extractor(origin['font'], origin_engine)
-            raw_data = extractor.extract(tables)
-            progress.update(task4, completed=1)
-
-            task5 = progress.add_task(description="Transformando dados...", total=1)
-            transformer = Transformer(raw_data)
-            clean_data = transformer.transform(tables)
-            progress.update(task5, completed=1)
-
-            task6 = progress.add_task(description="Carregando dados...", total=1)
-            inserter = Loader(clean_data, destiny_engine)
-            inserter.load()
-            progress.update(task6, completed=1)
-
-            task7 = progress.add_task(description="Processamento concluído com êxito...", total=1)
-            progress.update(task7, completed=1)
+        stages = cls.__stage_range(from_stage, to_stage, contracts_dir)
+        if stages == cls.__STAGES and not save_contracts:
+            contracts_dir = ""
+
+        if dry_run:
+            cls.__dry_run(tables)
+            return
+
+        if preview:
+            cls.__preview(tables, preview, sample, scratch)
+            return
+
+        if profile:
+            from utils.profiler import Profiler
+            profiler = Profiler(profile)
+        else:
+            profiler = nullcontext()
+
+        budget = None
+        if memory_budget:
+            from utils.frame_store import MemoryBudget
+            budget = MemoryBudget(memory_budget * 1024 ** 2, spill_dir or None)
+
+        run_metrics = Metrics.start_run()
+        try:
+            with profiler:
+                cls.__execute(run_metrics, budget, tables, stages, contracts_dir)
+
+        finally:
+            if budget:
+                budget.close()
+
+            if profile:
+                raw_path, summary_path = profiler.write(run_metrics)
+                print(f"[bold green]Perfil gravado em {raw_path} e {summary_path}[/bold green]")
+
+    @classmethod
+    def __execute(cls, run_metrics: RunMetrics, budget: "MemoryBudget | None", names: list[str] | None,
+                  stages: tuple[str, ...], contracts_dir: str) -> None:
+        """
+        Executa as etapas selecionadas do pipeline exibindo o progresso, medidas em `run_metrics`.
+
+        O resultado da extração e da transformação é gravado em `contracts_dir`
+        (se informado) e, quando a execução começa depois da extração, o
+        contrato da etapa anterior é lido de lá.
+
+        As tabelas usadas pela transformação `lookup` das selecionadas são
+        extraídas junto, mesmo que não tenham sido selecionadas, mas só as
+        selecionadas são transformadas e carregadas.
+        """
+        from rich.progress import Progress
+        from stages.contracts.contract_store import ContractStore
+        from utils.progress import RichProgressReporter
+
+        store = ContractStore(contracts_dir) if contracts_dir else None
+
+        with Progress(*RichProgressReporter.columns(), transient=False) as progress:
+
+            try:
+                with cls.__task(progress, "Verificando configurações..."):
+                    tables, sources, factory = cls.__configure(names, budget, RichProgressReporter(progress))
+                cls.__connect(progress, stages)
+
+                if 'extract' in stages:
+                    extractor = factory.extractor(JsonConfig.get_origin_db()['font'], cls.__origin_conn.get_engine())
+                    with cls.__task(progress, "Estimando linhas das tabelas..."):
+                        extractor.count_rows(sources)
+                    with cls.__task(progress, "Extraindo dados...", 'extract'):
+                        raw_data = extractor.extract(sources)
+                        if store:
+                            store.save_extract(raw_data, sources)
+
+                elif 'transform' in stages:
+                    with cls.__task(progress, "Lendo dados extraídos..."):
+                        raw_data = store.load_extract(sources, budget)
+
+                if 'transform' in stages:
+                    with cls.__task(progress, "Transformando dados...", 'transform'):
+                        clean_data = factory.transformer(raw_data).transform(tables)
+                        if store:
+                            store.save_transform(clean_data, tables)
+
+                elif 'load' in stages:
+                    with cls.__task(progress, "Lendo dados transformados..."):
+                        clean_data = store.load_transform(tables, budget)
+
+                if 'load' in stages:
+                    with cls.__task(progress, "Carregando dados...", 'load'):
+                        factory.loader(clean_data, cls.__destiny_conn.get_engine(),
+                                       JsonConfig.get_destiny_db().get('bulk_load', False)).load()
+
+            finally:
+                Metrics.finish_run()
+
+            Log.info("Relatório da execução gravado em %s", run_metrics.save(cls.__REPORTS_DIR))
+
+            progress.add_task(description="Processamento concluído com êxito...", total=1, completed=1)
             sleep(1)
 
+    @classmethod
+    def __configure(cls, names: list[str] | None, budget: "MemoryBudget | None",
+                    reporter: "RichProgressReporter") -> tuple[dict[str, dict], dict[str, dict], "StageFactory"]:
+        """
+        Valida as configurações e monta as etapas da execução.
+
+        Returns:
+            tuple: As tabelas selecionadas, as tabelas a extrair (as selecionadas
+                   e as usadas pelos seus `lookup`) e a fábrica das etapas.
+        """
+        from stages.stage_factory import StageFactory
+        from stages.table_checks import TableChecks
+        from stages.transform.lookup import LookupIndex
+        from stages.transform.registry import TransformRegistry
+
+        JsonConfig.validate(TransformRegistry.check, TableChecks.errors)
+        tables = cls.__select(JsonConfig.get_tables(), names)
+        references = LookupIndex.references(JsonConfig.get_tables(), tables)
+        sources = {name: table for name, table in JsonConfig.get_tables().items()
+                   if name in tables or name in references}
+
+        return tables, sources, StageFactory(JsonConfig.get_tables(), budget, reporter)
+
+    @classmethod
+    def __connect(cls, progress: "Progress", stages: tuple[str, ...]) -> None:
+        """Conecta na origem, se houver extração, e no destino, se houver carga."""
+        if 'extract' in stages:
+            with cls.__task(progress, "Conectando na origem dos dados..."):
+                cls.__origin_conn.db_connection(JsonConfig.get_origin_db())
+
+        if 'load' in stages:
+            with cls.__task(progress, "Conectando no destino dos dados..."):
+                cls.__destiny_conn.db_connection(JsonConfig.get_destiny_db())
+
+    @classmethod
+    @contextmanager
+    def __task(cls, progress: "Progress", description: str, stage: str | None = None) -> Iterator[None]:
+        """
+        Exibe um passo da execução na barra de progresso, concluído ao fim do bloco.
+
+        Com `stage`, os totais da etapa na execução corrente são acrescentados
+        à descrição ao concluí-lo.
+        """
+        task = progress.add_task(description=description, total=1)
+        yield
+
+        run_metrics = Metrics.current()
+        if stage is not None and run_metrics is not None:
+            description = f"{description} {cls.__stats(run_metrics, stage)}"
+        progress.update(task, completed=1, description=description)
+
+    @classmethod
+    def __stage_range(cls, from_stage: str, to_stage: str, contracts_dir: str) -> tuple[str, ...]:
+        """
+        Retorna as etapas a executar, de `from_stage` até `to_stage`.
+
+        Raises:
+            SystemExit: Se alguma etapa for desconhecida, se a ordem for inválida
+                        ou se a execução começar depois da extração sem
+                        `contracts_dir` para ler a etapa anterior.
+        """
+        for stage in (from_stage, to_stage):
+            if stage not in cls.__STAGES:
+                print(f"[bold red]Etapa '{stage}' desconhecida; use {', '.join(cls.__STAGES)}.[/bold red]")
+                raise SystemExit(1)
+
+        first, last = cls.__STAGES.index(from_stage), cls.__STAGES.index(to_stage)
+        if first > last:
+            print(f"[bold red]A etapa inicial '{from_stage}' vem depois da etapa final '{to_stage}'.[/bold red]")
+            raise SystemExit(1)
+
+        if first > 0 and not contracts_dir:
+            print("[bold red]Informe --contracts-dir para retomar a partir de uma etapa gravada.[/bold red]")
+            raise SystemExit(1)
+
+        return cls.__STAGES[first:last + 1]
+
+    @staticmethod
+    def __select(tables: dict[str, dict], names: list[str] | None) -> dict[str, dict]:
+        """
+        Filtra as tabelas do `systems.json`, mantendo a ordem do arquivo.
+
+        Raises:
+            SystemExit: Se algum nome não existir no `systems.json`.
+        """
+        if not names:
+            return tables
+
+        unknown = [name for name in names if name not in tables]
+        if unknown:
+            JsonConfig.fail([f"systems.json: tabela '{name}' não encontrada" for name in unknown])
+
+        return {name: table for name, table in tables.items() if name in names}
+
+    @classmethod
+    def __dry_run(cls, names: list[str] | None = None) -> None:
+        """
+        Exibe o plano de execução previsto sem extrair nem carregar dados.
+
+        Args:
+            names (list[str] | None): Tabelas a planejar. None (padrão) planeja todas.
+
+        Raises:
+            SystemExit: Com código 1 se a validação encontrar erros na configuração.
+        """
+        from stages.plan.planner import DryRunPlanner
+        from stages.table_checks import TableChecks
+        from stages.transform.registry import TransformRegistry
+
+        JsonConfig.validate(TransformRegistry.check, TableChecks.errors)
+        tables = cls.__select(JsonConfig.get_tables(), names)
+        cls.__origin_conn.db_connection(JsonConfig.get_origin_db())
+        cls.__destiny_conn.db_connection(JsonConfig.get_destiny_db())
+
+        planner = DryRunPlanner(cls.__origin_conn.get_engine(), cls.__destiny_conn.get_engine(), cls.__REPORTS_DIR)
+        plan = planner.plan(tables)
+        print(DryRunPlanner.render(plan))
+
+        for issue in plan.issues:
+            color = "red" if issue.level == 'erro' else "yellow"
+            print(f"[{color}]{issue.level.capitalize()} em {issue.table}: {issue.message}[/{color}]")
+
+        path = planner.save(plan)
+        Log.info(f"Plano de execução gravado em {path}")
+
+        if any(issue.level == 'erro' for issue in plan.issues):
+            raise SystemExit(1)
+
+    @classmethod
+    def __preview(cls, names: list[str] | None, rows: int, sample: str, scratch: str) -> None:
+        """
+        Exibe o antes e o depois da transformação de uma amostra de cada tabela.
+
+        Args:
+            names (list[str] | None): Tabelas da prévia. None (padrão) inclui todas.
+            rows (int): Linhas lidas por tabela.
+            sample (str): Amostragem: 'first', 'keys' ou 'native'.
+            scratch (str): Arquivo de conexão do destino de rascunho; vazio não carrega.
+
+        Raises:
+            SystemExit: Com código 1 se a amostragem for desconhecida ou se
+                        alguma tabela não puder ser lida ou transformada.
+        """
+        from stages.plan.previewer import Previewer
+        from stages.table_checks import TableChecks
+        from stages.transform.registry import TransformRegistry
+
+        if sample not in Previewer.SAMPLES:
+            print(f"[bold red]Amostragem '{sample}' desconhecida; use {', '.join(Previewer.SAMPLES)}.[/bold red]")
+            raise SystemExit(1)
+
+        JsonConfig.validate(TransformRegistry.check, TableChecks.errors)
+        tables = cls.__select(JsonConfig.get_tables(), names)
+        cls.__origin_conn.db_connection(JsonConfig.get_origin_db())
+
+        previewer = Previewer(cls.__origin_conn.get_engine(), rows, sample)
+        previews = previewer.preview(tables)
+        for item in previews:
+            print(previewer.render(item, tables[item.name]))
+            if item.error:
+                print(f"[red]Erro em {item.name}: {item.error}[/red]")
+
+        if scratch:
+            info = JsonConfig.read(scratch, JsonConfig.database_errors)
+            connector = SQLConnector()
+            connector.db_connection(info)
+            loaded = Previewer.load(previews, connector.get_engine(), info.get('bulk_load', False))
+            print(f"[bold green]{loaded:,} linhas da prévia carregadas no destino de rascunho.[/bold green]")
+
+        if any(item.error for item in previews):
+            raise SystemExit(1)
+
+    @classmethod
+    def __stats(cls, run_metrics: RunMetrics, stage: str) -> str:
+        """Formata os totais de uma etapa para exibição na barra de progresso."""
+        totals = run_metrics.totals(stage)
+        rate = f"{totals['rows_per_second']:,.0f}" if totals['rows_per_second'] else "-"
+        return (
+            f"[dim]{totals['rows']:,} linhas em {totals['seconds']:.1f}s "
+            f"({rate} linhas/s, {totals['bytes'] / 1024 ** 2:,.1f} MB)[/dim]"
+        )
+
 
 if __name__ == "__main__":
     run(MainPipeline.run)
@@ -0,0 +1,218 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+import shutil
+from collections import Counter
+from datetime import date
+from json import dump, load
+from rich import print
+from pandas import DataFrame
+from utils.frame_store import ColumnarFile, FrameStore, MemoryBudget
+from utils.log import Log
+from stages.contracts.extract_contract import ExtractContract
+from stages.contracts.transform_contract import TransformContract
+from stages.transform.change_detector import Delta
+
+
+class ContractStore:
+    """
+    Persiste em disco o conteúdo dos contratos entre as etapas do pipeline.
+
+    Cada tabela é gravada com `ColumnarFile` em `<diretório>/<etapa>/<tabela>`,
+    junto de um `contract.json` com a data da etapa e a origem (ou o destino)
+    da tabela. Assim, uma execução pode começar na transformação ou na carga
+    de apenas algumas tabelas, reaproveitando o que foi gravado pelas
+    execuções anteriores, sem extrair novamente todas as tabelas.
+
+    A gravação de cada tabela é feita em um diretório temporário e trocada
+    ao final, de modo que uma falha no meio da gravação preserva a versão
+    anterior.
+
+    Args:
+            directory (str): Diretório base dos contratos gravados.
+    """
+
+    def __init__(self, directory: str = os.path.join(".cache", "contracts")) -> None:
+        self.__directory = directory
+
+    def save_extract(self, contract: ExtractContract, tables: dict[str, dict]) -> None:
+        """Grava os dados brutos de cada tabela do contrato de extração."""
+        for name, config in tables.items():
+            meta = {'table': config['table'], 'font': contract.font, 'date': contract.extraction_date.isoformat()}
+            self.__write('extract', name, contract.raw_data[name], meta)
+
+    def save_transform(self, contract: TransformContract, tables: dict[str, dict]) -> None:
+        """
+        Grava os dados limpos de cada tabela do contrato de transformação.
+
+        Cada tabela de `tables` é gravada sob o nome da tabela de origem no
+        `systems.json`, com os dados de `clean_data` da sua tabela de destino
+        (as tabelas de mesmo destino, na ordem). A diferença da detecção de
+        alterações, quando houver, é gravada junto.
+
+        Raises:
+            SystemExit: Se alguma tabela não estiver no contrato.
+        """
+        changes = contract.changes or [None] * len(contract.clean_data)
+        frames: dict[str, list[tuple[dict[str, DataFrame], Delta | None]]] = {}
+        for item, delta in zip(contract.clean_data, changes):
+            for destiny in item:
+                frames.setdefault(destiny, []).append((item, delta))
+
+        needed = Counter(config['destiny'] for config in tables.values())
+        missing = [name for name, config in tables.items()
+                   if len(frames.get(config['destiny'], ())) < needed[config['destiny']]]
+        if missing:
+            print("[bold red]Erro ao gravar os dados da etapa, verifique o log.[/bold red]")
+            Log.error(f"Tabelas sem dados transformados no contrato: {', '.join(missing)}")
+            raise SystemExit(1)
+
+        for name, config in tables.items():
+            item, delta = frames[config['destiny']].pop(0)
+            meta = {'destiny': config['destiny'], 'date': contract.transform_date.isoformat()}
+            parts = {}
+            if delta is not None:
+                meta['delta'] = {'path': delta.path, 'keys': list(delta.keys), 'counts': delta.counts}
+                parts = {'deleted': delta.deleted}
+                if delta.index is not None:
+                    parts['index'] = delta.index
+            self.__write('transform', name, item[config['destiny']], meta, parts)
+
+    def load_extract(self, tables: dict[str, dict], budget: MemoryBudget | None = None) -> ExtractContract:
+        """
+        Reconstrói o contrato de extração das tabelas informadas.
+
+        Raises:
+            SystemExit: Se alguma tabela não tiver sido extraída ou tiver sido
+                        extraída de outra tabela de origem.
+        """
+        metas = self.__check('extract', tables, 'table')
+        raw_data = FrameStore(budget) if budget else {}
+
+        for name in tables:
+            raw_data[name] = self.__read('extract', name)
+
+        return ExtractContract(
+            font=metas[next(iter(tables))]['font'] if tables else None,
+            raw_data=raw_data,
+            extraction_date=min((date.fromisoformat(meta['date']) for meta in metas.values()), default=date.today())
+        )
+
+    def load_transform(self, tables: dict[str, dict], budget: MemoryBudget | None = None) -> TransformContract:
+        """
+        Reconstrói o contrato de transformação das tabelas informadas.
+
+        Raises:
+            SystemExit: Se alguma tabela não tiver sido transformada ou tiver
+                        sido transformada para outra tabela de destino.
+        """
+        metas = self.__check('transform', tables, 'destiny')
+        clean_data = []
+        changes = []
+
+        for name, config in tables.items():
+            item = FrameStore(budget) if budget else {}
+            item[config['destiny']] = self.__read('transform', name)
+            clean_data.append(item)
+
+            delta = metas[name].get('delta')
+            changes.append(None if delta is None else Delta(
+                path=delta['path'],
+                keys=tuple(delta['keys']),
+                deleted=self.__read('transform', name, 'deleted'),
+                index=None if delta['path'] is None else self.__read('transform', name, 'index'),
+                counts=delta['counts'],
+            ))
+
+        return TransformContract(
+            clean_data=clean_data,
+            transform_date=min((date.fromisoformat(meta['date']) for meta in metas.values()), default=date.today()),
+            changes=changes if any(changes) else None
+        )
+
+    def __check(self, stage: str, tables: dict[str, dict], key: str) -> dict[str, dict]:
+        """
+        Lê o `contract.json` de cada tabela e confere se ele corresponde à configuração atual.
+
+        Raises:
+            SystemExit: Com todos os problemas encontrados, se houver algum.
+        """
+        metas = {}
+        errors = []
+
+        for name, config in tables.items():
+            try:
+                with open(os.path.join(self.__path(stage, name), "contract.json"), encoding='utf-8') as file:
+                    metas[name] = load(file)
+
+            except (OSError, ValueError):
+                errors.append(f"tabela {name}: etapa '{stage}' não gravada em {self.__directory}")
+                continue
+
+            if metas[name][key] != config[key]:
+                errors.append(f"tabela {name}: etapa '{stage}' gravada para '{metas[name][key]}', "
+                              f"mas a configuração indica '{config[key]}'")
+
+        if errors:
+            print(f"[bold red]Não é possível retomar a partir da etapa seguinte a '{stage}':[/bold red]")
+            for error in errors:
+                print(f"[red]  - {error}[/red]")
+                Log.error(f"Contrato indisponível: {error}")
+            raise SystemExit(1)
+
+        return metas
+
+    def __write(self, stage: str, name: str, df: DataFrame, meta: dict,
+                parts: dict[str, DataFrame] | None = None) -> None:
+        """Grava uma tabela, seus metadados e partes auxiliares, substituindo a versão anterior."""
+        path = self.__path(stage, name)
+        temporary = f"{path}.tmp"
+
+        try:
+            shutil.rmtree(temporary, ignore_errors=True)
+            ColumnarFile.write(df, temporary)
+            for part, frame in (parts or {}).items():
+                ColumnarFile.write(frame, os.path.join(temporary, part))
+            with open(os.path.join(temporary, "contract.json"), 'w', encoding='utf-8') as file:
+                dump(meta, file, ensure_ascii=False)
+
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(temporary, path)
+
+        except Exception as error:
+            print("[bold red]Erro ao gravar os dados da etapa, verifique o log.[/bold red]")
+            Log.error(f"Erro ao gravar a etapa '{stage}' da tabela {name}: {error}", trace=True)
+            raise SystemExit from error
+
+        Log.info("Etapa '%s' da tabela %s gravada em %s", stage, name, path)
+
+    def __read(self, stage: str, name: str, part: str = "") -> DataFrame:
+        """Lê uma tabela gravada (ou uma de suas partes), com memory-map das colunas nativas."""
+        try:
+            df = ColumnarFile.read(os.path.join(self.__path(stage, name), part))
+
+        except Exception as error:
+            print("[bold red]Erro ao ler os dados da etapa, verifique o log.[/bold red]")
+            Log.error(f"Erro ao ler a etapa '{stage}' da tabela {name}: {error}", trace=True)
+            raise SystemExit from error
+
+        if not part:
+            Log.info("Etapa '%s' da tabela %s lida de %s (%d linhas)", stage, name, self.__path(stage, name), len(df))
+        return df
+
+    def __path(self, stage: str, name: str) -> str:
+        """Diretório de uma tabela em uma etapa."""
+        return os.path.join(self.__directory, stage, name)
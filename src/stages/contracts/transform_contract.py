@@ -1,3 +1,3 @@
 from collections import namedtuple
 
-TransformContract = namedtuple('TransformContract', ['clean_data', 'transform_date'])
\ No newline at end of file
+TransformContract = namedtuple('TransformContract', ['clean_data', 'transform_date', 'changes'], defaults=(None,))
\ No newline at end of file
@@ -0,0 +1,240 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import ast
+from collections.abc import Iterable, Mapping
+import numpy as np
+from pandas import CategoricalDtype, DataFrame, Series
+from pandas.api.types import is_object_dtype
+from sqlalchemy import Table
+from sqlalchemy.types import Float, Integer, String
+from utils.log import Log
+
+
+class DtypeOptimizer:
+    """
+    Reduz a memória dos DataFrames extraídos, guiado pelos tipos refletidos da origem.
+
+    O `DataFrame` montado a partir das linhas do banco usa int64/float64 para
+    todos os números e object para todos os textos. Para as colunas que
+    chegam à carga sem transformação, este otimizador:
+
+    - reduz colunas inteiras (`Integer`) ao menor int que comporta os valores;
+    - converte colunas inteiras anuláveis, que o pandas lê como float64 por
+      causa dos nulos, para o menor inteiro anulável (Int8, Int16 ou Int32);
+    - reduz colunas `Float` para float32 quando nenhum valor perde precisão;
+    - converte colunas de texto (`String`) com poucos valores distintos em
+      categorias.
+
+    Cada conversão só é mantida se ocupar menos memória que a original. As
+    colunas lidas pela transformação (veja `candidates`) nunca são reduzidas,
+    então só quem grava ou calcula o hash de linhas inteiras precisa de
+    `restore`. Como a extração só produz int64, float64 e object, `restore`
+    devolve as colunas exatamente aos valores e dtypes originais, de modo que
+    o conteúdo gravado no destino é idêntico ao de uma execução sem otimização.
+
+    Args:
+            max_ratio (float): Proporção máxima de valores distintos por linha para
+                               converter um texto em categoria. O padrão é 0.5.
+    """
+
+    __INTEGERS = (np.int8, np.int16, np.int32)
+    __NULLABLE = {np.int8: 'Int8', np.int16: 'Int16', np.int32: 'Int32'}
+    __RESTORE = {'int8': 'int64', 'int16': 'int64', 'int32': 'int64', 'float32': 'float64',
+                 'Int8': 'float64', 'Int16': 'float64', 'Int32': 'float64'}
+
+    # Colunas usadas por transformações além da própria coluna configurada
+    # (ex: `search` junta as cidades pela coluna UF).
+    __IMPLICIT = {'search': ('uf',)}
+
+    def __init__(self, max_ratio: float = 0.5) -> None:
+        self.__max_ratio = max_ratio
+
+    @classmethod
+    def candidates(cls, config: Mapping, name: str | None = None, tables: Mapping | None = None) -> list[str]:
+        """
+        Lista as colunas de uma tabela do `systems.json` que podem ser otimizadas.
+
+        Ficam de fora as colunas com transformações, as usadas como parâmetro
+        de transformações de outras colunas (ex: a origem de um `copy` ou as
+        colunas de um `expr`), as de `computed`, as chaves de `dedup`,
+        `detect_changes`, `incremental` e `remap`, a coluna incremental e a
+        chave e as colunas buscadas por `lookup` de outras tabelas. Todas elas
+        são lidas pela transformação com os dtypes originais.
+
+        Args:
+            config (Mapping): A configuração da tabela no `systems.json`.
+            name (str | None): O nome da tabela no `systems.json`. O padrão é None.
+            tables (Mapping | None): Todas as tabelas do `systems.json`, cujas
+                                     buscas `lookup` em `name` também ficam de
+                                     fora. O padrão é None.
+
+        Returns:
+            list[str]: Os nomes das colunas de origem, em minúsculas.
+        """
+        fields = config.get('fields', {})
+        referenced = set()
+        transformed = set()
+
+        for field, info in fields.items():
+            for option, value in info.get('transform', {}).items():
+                if not value:
+                    continue
+                transformed.add(field.lower())
+                if isinstance(value, str):
+                    referenced.add(value.lower())
+                if option == 'expr':
+                    referenced.update(cls.__names(value))
+                referenced.update(cls.__IMPLICIT.get(option, ()))
+
+        for text in (config.get('computed') or {}).values():
+            referenced.update(cls.__names(text))
+
+        for block in ('dedup', 'detect_changes', 'incremental'):
+            referenced.update(key.lower() for key in (config.get(block) or {}).get('keys', ()))
+        referenced.update(column.lower() for column in config.get('remap') or ())
+
+        incremental = config.get('incremental')
+        if incremental:
+            referenced.add(incremental['column'].lower())
+
+        for table in (tables or {}).values() if name is not None else ():
+            for info in table.get('fields', {}).values():
+                spec = info.get('transform', {}).get('lookup')
+                if isinstance(spec, Mapping) and spec.get('table') == name:
+                    referenced.add(spec['key'].lower())
+                    referenced.update(column.lower() for column in spec['columns'])
+
+        return [
+            field.lower() for field, info in fields.items()
+            if field.lower() not in transformed
+            and field.lower() not in referenced
+            and str(info.get('field_destiny', '')).lower() not in referenced
+        ]
+
+    def optimize(self, df: DataFrame, table: Table, columns: Iterable[str]) -> DataFrame:
+        """
+        Otimiza os dtypes das colunas informadas, sem alterar os valores.
+
+        Args:
+            df (DataFrame): DataFrame extraído, com as colunas em minúsculas.
+            table (Table): Tabela de origem refletida, cujos tipos guiam as conversões.
+            columns (Iterable[str]): Colunas que podem ser otimizadas.
+
+        Returns:
+            DataFrame: O DataFrame com as colunas convertidas (o mesmo objeto
+                       se nenhuma conversão compensar).
+        """
+        types = {column.name.lower(): column.type for column in table.columns}
+        converted = {}
+        before = after = 0
+
+        for name in columns:
+            if name not in df.columns or name not in types:
+                continue
+
+            series = df[name]
+            result = self.__convert(series, types[name])
+            if result is None:
+                continue
+
+            old_size = int(series.memory_usage(deep=True, index=False))
+            new_size = int(result.memory_usage(deep=True, index=False))
+            if new_size < old_size:
+                converted[name] = result
+                before += old_size
+                after += new_size
+
+        if not converted:
+            return df
+
+        Log.info("Tipos otimizados em %d coluna(s): %.2f MB → %.2f MB (%.2f MB economizados)",
+                 len(converted), before / 1024 ** 2, after / 1024 ** 2, (before - after) / 1024 ** 2)
+        return df.assign(**converted)
+
+    @classmethod
+    def restore(cls, df: DataFrame) -> DataFrame:
+        """
+        Devolve as colunas otimizadas aos dtypes produzidos pela extração.
+
+        Args:
+            df (DataFrame): DataFrame possivelmente otimizado por `optimize`.
+
+        Returns:
+            DataFrame: O DataFrame com int64, float64 e object no lugar dos
+                       dtypes reduzidos (o mesmo objeto se não houver nenhum).
+        """
+        restored = {}
+        for name, dtype in df.dtypes.items():
+            if isinstance(dtype, CategoricalDtype):
+                restored[name] = df[name].astype(object).where(df[name].notna(), None)
+            elif str(dtype) in cls.__RESTORE:
+                restored[name] = df[name].astype(cls.__RESTORE[str(dtype)])
+
+        return df.assign(**restored) if restored else df
+
+    @staticmethod
+    def __names(text: str) -> set[str]:
+        """Retorna as colunas usadas por uma expressão, em minúsculas (sem os nomes de funções)."""
+        try:
+            tree = ast.parse(text, mode='eval')
+        except SyntaxError:
+            return set()
+
+        functions = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+        return {node.id.lower() for node in ast.walk(tree) if isinstance(node, ast.Name) and id(node) not in functions}
+
+    def __convert(self, series: Series, sql_type) -> Series | None:
+        """Retorna a coluna com o dtype reduzido, ou None se não houver conversão segura."""
+        if not len(series):
+            return None
+
+        if isinstance(sql_type, Integer):
+            if series.dtype == np.int64:
+                return self.__downcast(series, series.min(), series.max(), nullable=False)
+
+            if series.dtype == np.float64 and series.hasnans:
+                values = series.dropna()
+                if not len(values) or (values % 1 != 0).any():
+                    return None
+                return self.__downcast(series, values.min(), values.max(), nullable=True)
+
+            return None
+
+        if isinstance(sql_type, Float) and series.dtype == np.float64:
+            values = series.to_numpy()
+            reduced = values.astype(np.float32)
+            if np.array_equal(reduced.astype(np.float64), values, equal_nan=True):
+                return Series(reduced, index=series.index, name=series.name)
+            return None
+
+        if isinstance(sql_type, String) and is_object_dtype(series.dtype):
+            result = series.astype('category')
+            if len(result.cat.categories) > len(series) * self.__max_ratio:
+                return None
+            if not all(isinstance(value, str) for value in result.cat.categories):
+                return None
+            return result
+
+        return None
+
+    def __downcast(self, series: Series, low, high, nullable: bool) -> Series | None:
+        """Converte para o menor inteiro que comporta o intervalo [low, high]."""
+        for kind in self.__INTEGERS:
+            info = np.iinfo(kind)
+            if info.min <= low and high <= info.max:
+                return series.astype(self.__NULLABLE[kind] if nullable else kind)
+
+        return None
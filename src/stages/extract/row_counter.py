@@ -0,0 +1,107 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+from json import dump, load
+from threading import Lock
+from sqlalchemy import Engine, MetaData, Table, func, select, text
+from utils.log import Log
+
+
+class RowCounter:
+    """
+    Estima a quantidade de linhas das tabelas de origem antes da extração.
+
+    A estimativa usa, nesta ordem: as estatísticas do dialeto, quando ele as
+    oferece a baixo custo (SQL Server); a contagem real registrada na última
+    extração da tabela, guardada em um cache local; e, por fim, `COUNT(*)`.
+
+    Args:
+            engine (Engine): Engine do SQLAlchemy do banco de origem.
+            cache_path (str): Arquivo JSON do cache de contagens entre execuções.
+    """
+
+    __STATISTICS = {
+        'mssql': text(
+            "SELECT SUM(p.rows) FROM sys.partitions p "
+            "WHERE p.object_id = OBJECT_ID(:table) AND p.index_id IN (0, 1)"
+        ),
+    }
+
+    __lock: Lock = Lock()
+
+    def __init__(self, engine: Engine, cache_path: str = os.path.join(".cache", "row_counts.json")) -> None:
+        self.__engine = engine
+        self.__cache_path = cache_path
+        self.__prefix = engine.url.render_as_string(hide_password=True)
+
+    def estimate(self, table_name: str) -> int | None:
+        """
+        Retorna a quantidade estimada de linhas de uma tabela.
+
+        Args:
+            table_name (str): O nome exato da tabela no banco de dados.
+
+        Returns:
+            (int | None): A estimativa, ou None se nenhuma fonte responder.
+        """
+        statement = self.__STATISTICS.get(self.__engine.dialect.name)
+        try:
+            if statement is not None:
+                with self.__engine.connect() as connection:
+                    rows = connection.execute(statement, {'table': table_name}).scalar()
+                if rows is not None:
+                    return int(rows)
+
+            cached = self.__read_cache().get(self.__key(table_name))
+            if cached is not None:
+                return int(cached)
+
+            table = Table(table_name, MetaData())
+            with self.__engine.connect() as connection:
+                return int(connection.execute(select(func.count()).select_from(table)).scalar())
+
+        except Exception as error:
+            Log.warning(f"Não foi possível estimar as linhas da tabela {table_name}: {error}")
+            return None
+
+    def record(self, table_name: str, rows: int) -> None:
+        """Guarda no cache a contagem real obtida na extração da tabela."""
+        with self.__lock:
+            cache = self.__read_cache()
+            cache[self.__key(table_name)] = rows
+
+            try:
+                directory = os.path.dirname(self.__cache_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.__cache_path, 'w', encoding='utf-8') as file:
+                    dump(cache, file, ensure_ascii=False, indent=2)
+
+            except OSError as error:
+                Log.warning(f"Não foi possível gravar o cache de contagens: {error}")
+
+    def __key(self, table_name: str) -> str:
+        """Monta a chave do cache a partir da URL do banco (sem senha) e da tabela."""
+        return f"{self.__prefix}|{table_name}"
+
+    def __read_cache(self) -> dict[str, int]:
+        """Lê o cache de contagens; um cache ausente ou inválido é tratado como vazio."""
+        try:
+            with open(self.__cache_path, encoding='utf-8') as file:
+                return load(file)
+
+        except (OSError, ValueError):
+            return {}
@@ -13,12 +13,20 @@
 # Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
 # com este programa. Se não, veja <https://www.gnu.org/licenses/>.
 
+from collections.abc import Mapping
 from datetime import date
+from typing import Any
 from rich import print
 from pandas import DataFrame
-from sqlalchemy import MetaData, Table, Engine
+from sqlalchemy import Engine
+from utils.frame_store import FrameStore, MemoryBudget
 from utils.log import Log
+from utils.metrics import Metrics
+from utils.progress import ProgressReporter
+from utils.reflection_cache import ReflectionCache
 from stages.contracts.extract_contract import ExtractContract
+from stages.extract.dtype_optimizer import DtypeOptimizer
+from stages.extract.row_counter import RowCounter
 from stages.interfaces.sql_extractor import ExtractInterface
 
 
@@ -33,15 +41,59 @@ class Extractor(ExtractInterface):
             font (str): Um identificador para a fonte de dados.
             engine (Engine): Uma instância ativa do engine do SQLAlchemy para a 
                              conexão com o banco de dados.
+            budget (MemoryBudget | None): Orçamento de memória. Se informado, os
+                                          dados brutos são guardados em um
+                                          `FrameStore` que despeja em disco as
+                                          tabelas excedentes. O padrão é None.
+            progress (ProgressReporter | None): Recebe o avanço, em linhas, de
+                                                cada tabela extraída. O padrão
+                                                é None (sem acompanhamento).
+            optimize (bool): Se True (padrão), reduz os dtypes das colunas que
+                             chegam à carga sem transformação (veja `DtypeOptimizer`).
+            tables (Mapping | None): Todas as tabelas da configuração, para não
+                                     otimizar as colunas buscadas por `lookup` de
+                                     tabelas não extraídas junto. O padrão é None
+                                     (apenas as tabelas extraídas).
+            counter (RowCounter | None): Estimativa e cache das contagens de
+                                         linhas. O padrão é None (`RowCounter`
+                                         com o cache em `.cache`).
     """
 
-    def __init__(self,  font: str, engine: Engine) -> None:
-        self.__metadata: MetaData = MetaData()
+    __CHUNK_SIZE: int = 10_000
+
+    def __init__(self,  font: str, engine: Engine, budget: MemoryBudget | None = None,
+                 progress: ProgressReporter | None = None, optimize: bool = True,
+                 tables: Mapping[str, Mapping[str, Any]] | None = None, counter: RowCounter | None = None) -> None:
         self.__engine = engine
         self.__font = font
-        self.__dfs: dict[str, DataFrame] = {}
+        self.__dfs: dict[str, DataFrame] = FrameStore(budget) if budget else {}
+        self.__progress = progress or ProgressReporter()
+        self.__counter = counter or RowCounter(engine)
+        self.__estimates: dict[str, int | None] = {}
+        self.__optimizer = DtypeOptimizer() if optimize else None
+        self.__tables = tables
+
+    def count_rows(self, tables: dict[str, str]) -> dict[str, int | None]:
+        """
+        Estima a quantidade de linhas de cada tabela antes da extração.
+
+        Usa estatísticas do dialeto quando disponíveis, a contagem da última
+        execução (em cache) ou `COUNT(*)`, conforme `RowCounter`. As
+        estimativas são reaproveitadas como total das barras de progresso.
+
+        Args:
+            tables (dict[str, dict]): Dicionário que mapeia um nome lógico 
+                                      para as especificações da tabela.
 
-    def extract(self, tables: dict[str, str]) -> ExtractContract:
+        Returns:
+            dict[str, int | None]: A estimativa de linhas por nome lógico.
+        """
+        for name, table in tables.items():
+            self.__estimates[name] = self.__counter.estimate(table["table"])
+
+        return dict(self.__estimates)
+
+    def extract(self, tables: dict[str, str], since: dict[str, Any] | None = None) -> ExtractContract:
         """
         Orquestra a extração de dados de múltiplas tabelas do banco de dados.
 
@@ -52,14 +104,30 @@ class Extractor(ExtractInterface):
         Args:
             tables (dict[str, dict]): Dicionário que mapeia um nome lógico 
                                       para as especificações da tabela.
+            since (dict[str, Any] | None): Marca d'água por nome lógico. Para as
+                                           tabelas presentes, apenas as linhas com
+                                           a coluna `incremental.column` maior ou
+                                           igual à marca são extraídas. O padrão é None
+                                           (extração completa).
 
         Returns:
             ExtractContract: Um objeto de contrato contendo um dicionário de
                              DataFrames com os dados brutos e a data da extração.
         """
         for name, table in tables.items():
-            data = self.__extract_table(table["table"])
-            self.__dfs.update({name: data})
+            with Log.context(stage='extract', table=name), Metrics.measure('extract', table=name) as measure:
+                self.__progress.start('extract', name, self.__estimates.get(name))
+                incremental = table.get("incremental")
+                watermark = (since or {}).get(name)
+                column = incremental["column"] if incremental and watermark is not None else None
+                data = self.__extract_table(name, table["table"], column, watermark)
+                data = self.__optimize(name, table, data, self.__tables or tables)
+                measure.frame(data)
+                self.__progress.finish('extract', name)
+                if column is None:
+                    self.__counter.record(table["table"], len(data))
+
+            self.__dfs[name] = data
 
         return ExtractContract(
             font=self.__font,
@@ -67,16 +135,35 @@ class Extractor(ExtractInterface):
             extraction_date=date.today()
         )
 
-    def __extract_table(self, table_name: str) -> DataFrame:
+    def __optimize(self, name: str, table: dict, data: DataFrame, tables: Mapping[str, Mapping[str, Any]]) -> DataFrame:
+        """Reduz os dtypes da tabela extraída, medindo a operação à parte."""
+        if self.__optimizer is None or not len(data):
+            return data
+
+        with Metrics.measure('extract', table=name, op='optimize') as measure:
+            source = ReflectionCache.table(self.__engine, table["table"])
+            data = self.__optimizer.optimize(data, source, DtypeOptimizer.candidates(table, name, tables))
+            measure.frame(data)
+
+        return data
+
+    def __extract_table(self, name: str, table_name: str, column: str | None = None,
+                        watermark: Any = None) -> DataFrame:
         """
         Busca todos os registros de uma única tabela do banco de dados.
 
-        Utiliza a funcionalidade de reflexão do SQLAlchemy (`autoload_with`) para
-        carregar a estrutura da tabela e, em seguida, executa uma consulta
-        para selecionar todos os seus dados.
+        Utiliza a reflexão do SQLAlchemy, compartilhada via `ReflectionCache`,
+        para carregar a estrutura da tabela e, em seguida, executa uma consulta
+        para selecionar todos os seus dados, lidos em blocos para informar
+        o avanço da extração.
 
         Args:
+            name (str): O nome lógico da tabela, usado no acompanhamento.
             table_name (str): O nome exato da tabela no banco de dados.
+            column (str | None): Coluna incremental. Se informada, apenas as
+                                 linhas com valor maior ou igual a `watermark`
+                                 são lidas (veja `WatermarkStore.unseen`).
+            watermark (Any): A marca d'água da coluna incremental.
 
         Returns:
             DataFrame: Um DataFrame do pandas com os dados da tabela.
@@ -86,15 +173,22 @@ class Extractor(ExtractInterface):
                         o erro é logado e a aplicação é encerrada.
         """
         try:
-            table = Table(table_name, self.__metadata, autoload_with=self.__engine)
+            table = ReflectionCache.table(self.__engine, table_name)
+            statement = table.select()
+            if column is not None:
+                statement = statement.where(table.c[column.lower()] >= watermark)
 
+            rows = []
             with self.__engine.connect() as connection:
-                result = connection.execute(table.select())
-                rows = result.fetchall()
+                result = connection.execution_options(stream_results=True).execute(statement)
+                for number, chunk in enumerate(iter(lambda: result.fetchmany(self.__CHUNK_SIZE), []), start=1):
+                    with Log.context(chunk=number):
+                        rows.extend(chunk)
+                        self.__progress.advance('extract', name, len(chunk))
 
             return DataFrame(rows, columns=result.keys())
 
         except Exception as error:
             print("[bold red]Erro ao extrair dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao extrair dados da TABELA: {table_name}: ERRO: {error}", True)
+            Log.error(f"Erro ao extrair dados da TABELA: {table_name}: ERRO: {error}", trace=True)
             raise SystemExit from error
@@ -0,0 +1,169 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime
+from decimal import Decimal
+from json import dump, load
+from threading import Lock
+from typing import Any
+import numpy as np
+from pandas import DataFrame
+from pandas.util import hash_pandas_object
+from sqlalchemy import Engine
+from utils.config_json import JsonConfig
+from utils.log import Log
+from stages.extract.dtype_optimizer import DtypeOptimizer
+
+
+class WatermarkStore:
+    """
+    Guarda, entre execuções, a marca d'água da sincronização incremental.
+
+    Para cada tabela de origem com `incremental` configurado, a marca é o
+    maior valor da coluna incremental (ex: data de alteração ou código
+    sequencial) já carregado no destino. A próxima extração busca as linhas
+    com valor maior ou igual à marca, para não perder as confirmadas depois
+    da carga com o mesmo valor; as que já foram carregadas com o valor da
+    marca são reconhecidas pelo hash da linha, guardado junto, e descartadas
+    por `unseen`. As marcas ficam em um arquivo JSON, identificadas pela URL
+    do banco (sem senha) e pelo nome da tabela.
+
+    Args:
+            engine (Engine): Engine do SQLAlchemy do banco de origem.
+            path (str): Arquivo JSON das marcas d'água.
+    """
+
+    __lock: Lock = Lock()
+
+    def __init__(self, engine: Engine, path: str = os.path.join(".cache", "watermarks.json")) -> None:
+        self.__path = path
+        self.__prefix = engine.url.render_as_string(hide_password=True)
+
+    @staticmethod
+    def check(config: Any) -> list[str]:
+        """Confere o bloco `incremental` de uma tabela."""
+        if not (isinstance(config, Mapping) and isinstance(config.get('column'), str) and config['column']):
+            return ["deve informar a coluna em 'column'"]
+        if 'keys' in config and not JsonConfig.columns(config['keys']):
+            return ["deve informar em 'keys' a lista de colunas-chave"]
+        return []
+
+    def get(self, table_name: str) -> Any:
+        """Retorna a marca d'água da tabela, ou None se ela nunca foi sincronizada."""
+        with self.__lock:
+            entry = self.__read().get(self.__key(table_name))
+
+        return None if entry is None else self.__decode(entry)
+
+    def set(self, table_name: str, value: Any, seen: Iterable[int] = ()) -> None:
+        """
+        Grava a nova marca d'água da tabela e os hashes das linhas carregadas com esse valor.
+
+        Se a marca não mudou, os hashes são somados aos já gravados, pois as
+        linhas carregadas antes com o mesmo valor foram descartadas por
+        `unseen` e não estão entre as deste ciclo.
+        """
+        if value is None:
+            return
+
+        encoded = self.__encode(value)
+        with self.__lock:
+            data = self.__read()
+            key = self.__key(table_name)
+            previous = data.get(key)
+            hashes = {int(item) for item in seen}
+            if previous is not None and (previous['type'], previous['value']) == (encoded['type'], encoded['value']):
+                hashes.update(previous.get('seen', ()))
+
+            data[key] = {**encoded, 'seen': sorted(hashes)}
+
+            try:
+                directory = os.path.dirname(self.__path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.__path, 'w', encoding='utf-8') as file:
+                    dump(data, file, ensure_ascii=False, indent=2)
+
+            except OSError as error:
+                Log.warning(f"Não foi possível gravar as marcas d'água: {error}")
+
+    def unseen(self, table_name: str, df: DataFrame, column: str) -> DataFrame:
+        """Descarta as linhas com o valor da marca que já foram carregadas, relidas pelo `>=`."""
+        with self.__lock:
+            entry = self.__read().get(self.__key(table_name))
+
+        if entry is None or not entry.get('seen') or not len(df):
+            return df
+
+        at_mark = (df[column] == self.__decode(entry)).to_numpy()
+        if not at_mark.any():
+            return df
+
+        loaded = np.zeros(len(df), dtype=bool)
+        loaded[at_mark] = np.isin(self.__hashes(df[at_mark]), np.array(entry['seen'], dtype=np.uint64))
+        return df[~loaded].reset_index(drop=True)
+
+    @classmethod
+    def mark(cls, df: DataFrame, column: str) -> tuple[Any, list[int]]:
+        """Retorna a nova marca (o maior valor da coluna) e os hashes das linhas com esse valor."""
+        value = df[column].max()
+        return value, cls.__hashes(df[(df[column] == value).to_numpy()]).tolist()
+
+    @staticmethod
+    def __hashes(df: DataFrame) -> np.ndarray:
+        """Calcula o hash de cada linha com os dtypes da extração (sem as reduções)."""
+        return hash_pandas_object(DtypeOptimizer.restore(df).reset_index(drop=True), index=False).to_numpy()
+
+    def __key(self, table_name: str) -> str:
+        """Monta a chave a partir da URL do banco (sem senha) e da tabela."""
+        return f"{self.__prefix}|{table_name}"
+
+    def __read(self) -> dict[str, dict]:
+        """Lê o arquivo de marcas; um arquivo ausente ou inválido é tratado como vazio."""
+        try:
+            with open(self.__path, encoding='utf-8') as file:
+                return load(file)
+
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def __encode(value: Any) -> dict:
+        """Converte a marca para JSON preservando o tipo."""
+        if hasattr(value, 'to_pydatetime'):
+            value = value.to_pydatetime()
+        if hasattr(value, 'item') and not isinstance(value, (datetime, date)):
+            value = value.item()
+
+        if isinstance(value, datetime):
+            return {'type': 'datetime', 'value': value.isoformat()}
+        if isinstance(value, date):
+            return {'type': 'date', 'value': value.isoformat()}
+        if isinstance(value, Decimal):
+            return {'type': 'decimal', 'value': str(value)}
+        return {'type': 'value', 'value': value}
+
+    @staticmethod
+    def __decode(entry: dict) -> Any:
+        """Reconstrói a marca gravada por `__encode`."""
+        if entry['type'] == 'datetime':
+            return datetime.fromisoformat(entry['value'])
+        if entry['type'] == 'date':
+            return date.fromisoformat(entry['value'])
+        if entry['type'] == 'decimal':
+            return Decimal(entry['value'])
+        return entry['value']
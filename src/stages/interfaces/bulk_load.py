@@ -0,0 +1,45 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from sqlalchemy import Connection
+
+BulkStep = namedtuple('BulkStep', ['description', 'disable', 'restore'])
+
+
+class BulkLoadInterface(ABC):
+    """
+    Define a interface para estratégias de carga em massa por dialeto.
+
+    Uma estratégia inspeciona a tabela de destino e descreve quais índices,
+    restrições e gatilhos não essenciais podem ser desativados (ou removidos)
+    antes da carga, junto com o comando que os restaura depois.
+    """
+
+    @abstractmethod
+    def steps(self, connection: Connection, table: str) -> list[BulkStep]:
+        """
+        Define o contrato para levantar os passos de desativação da tabela.
+
+        Args:
+            connection (Connection): Conexão ativa com o banco de destino.
+            table (str): Nome da tabela de destino.
+
+        Returns:
+            list[BulkStep]: Passos com a descrição do objeto, o comando que o
+                            desativa e o comando que o restaura.
+        """
+        raise NotImplementedError
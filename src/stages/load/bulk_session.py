@@ -0,0 +1,255 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from rich import print
+from sqlalchemy import Connection, Engine, text
+from utils.log import Log
+from stages.interfaces.bulk_load import BulkLoadInterface, BulkStep
+
+
+class SQLServerBulkLoad(BulkLoadInterface):
+    """
+    Estratégia de carga em massa para o SQL Server.
+
+    Desativa os índices não clusterizados que não garantem unicidade, as
+    chaves estrangeiras e restrições CHECK e os gatilhos da tabela. Ao
+    restaurar, os índices são reconstruídos (REBUILD) e as restrições são
+    revalidadas com `WITH CHECK`.
+    """
+
+    __INDEXES = text(
+        "SELECT i.name FROM sys.indexes i "
+        "WHERE i.object_id = OBJECT_ID(:table) AND i.type = 2 "
+        "AND i.is_primary_key = 0 AND i.is_unique_constraint = 0 "
+        "AND i.is_unique = 0 AND i.is_disabled = 0"
+    )
+
+    __CONSTRAINTS = text(
+        "SELECT name FROM sys.foreign_keys "
+        "WHERE parent_object_id = OBJECT_ID(:table) AND is_disabled = 0 "
+        "UNION ALL "
+        "SELECT name FROM sys.check_constraints "
+        "WHERE parent_object_id = OBJECT_ID(:table) AND is_disabled = 0"
+    )
+
+    __TRIGGERS = text(
+        "SELECT name FROM sys.triggers "
+        "WHERE parent_id = OBJECT_ID(:table) AND is_disabled = 0"
+    )
+
+    def steps(self, connection: Connection, table: str) -> list[BulkStep]:
+        steps = []
+
+        for name, in connection.execute(self.__INDEXES, {'table': table}):
+            steps.append(BulkStep(
+                description=f"índice {name}",
+                disable=f"ALTER INDEX [{name}] ON [{table}] DISABLE",
+                restore=f"ALTER INDEX [{name}] ON [{table}] REBUILD"
+            ))
+
+        for name, in connection.execute(self.__CONSTRAINTS, {'table': table}):
+            steps.append(BulkStep(
+                description=f"restrição {name}",
+                disable=f"ALTER TABLE [{table}] NOCHECK CONSTRAINT [{name}]",
+                restore=f"ALTER TABLE [{table}] WITH CHECK CHECK CONSTRAINT [{name}]"
+            ))
+
+        for name, in connection.execute(self.__TRIGGERS, {'table': table}):
+            steps.append(BulkStep(
+                description=f"gatilho {name}",
+                disable=f"DISABLE TRIGGER [{name}] ON [{table}]",
+                restore=f"ENABLE TRIGGER [{name}] ON [{table}]"
+            ))
+
+        return steps
+
+
+class FirebirdBulkLoad(BulkLoadInterface):
+    """
+    Estratégia de carga em massa para o Firebird.
+
+    Inativa os índices de usuário que não sustentam restrições (o Firebird
+    não permite inativar índices de PK, FK ou UNIQUE) e os gatilhos da
+    tabela. Reativar um índice com `ACTIVE` o reconstrói por completo.
+    """
+
+    __INDEXES = text(
+        "SELECT i.RDB$INDEX_NAME FROM RDB$INDICES i "
+        "WHERE i.RDB$RELATION_NAME = :table "
+        "AND COALESCE(i.RDB$SYSTEM_FLAG, 0) = 0 "
+        "AND COALESCE(i.RDB$INDEX_INACTIVE, 0) = 0 "
+        "AND COALESCE(i.RDB$UNIQUE_FLAG, 0) = 0 "
+        "AND NOT EXISTS (SELECT 1 FROM RDB$RELATION_CONSTRAINTS c "
+        "WHERE c.RDB$INDEX_NAME = i.RDB$INDEX_NAME)"
+    )
+
+    __TRIGGERS = text(
+        "SELECT RDB$TRIGGER_NAME FROM RDB$TRIGGERS "
+        "WHERE RDB$RELATION_NAME = :table "
+        "AND COALESCE(RDB$SYSTEM_FLAG, 0) = 0 "
+        "AND COALESCE(RDB$TRIGGER_INACTIVE, 0) = 0"
+    )
+
+    def steps(self, connection: Connection, table: str) -> list[BulkStep]:
+        steps = []
+        relation = table.upper()
+
+        for name, in connection.execute(self.__INDEXES, {'table': relation}):
+            name = name.strip()
+            steps.append(BulkStep(
+                description=f"índice {name}",
+                disable=f'ALTER INDEX "{name}" INACTIVE',
+                restore=f'ALTER INDEX "{name}" ACTIVE'
+            ))
+
+        for name, in connection.execute(self.__TRIGGERS, {'table': relation}):
+            name = name.strip()
+            steps.append(BulkStep(
+                description=f"gatilho {name}",
+                disable=f'ALTER TRIGGER "{name}" INACTIVE',
+                restore=f'ALTER TRIGGER "{name}" ACTIVE'
+            ))
+
+        return steps
+
+
+class SQLiteBulkLoad(BulkLoadInterface):
+    """
+    Estratégia de carga em massa para o SQLite, usada como substituto em testes.
+
+    O SQLite não permite desativar índices ou gatilhos, então os objetos
+    criados pelo usuário são removidos e recriados a partir do SQL original
+    guardado em `sqlite_master`. Índices únicos são mantidos, pois garantem
+    a integridade dos dados.
+    """
+
+    __OBJECTS = text(
+        "SELECT type, name, sql FROM sqlite_master "
+        "WHERE tbl_name = :table AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    )
+
+    def steps(self, connection: Connection, table: str) -> list[BulkStep]:
+        unique = {
+            row[1] for row in connection.exec_driver_sql(f'PRAGMA index_list("{table}")')
+            if row[2]
+        }
+
+        steps = []
+        for kind, name, sql in connection.execute(self.__OBJECTS, {'table': table}):
+            if kind == 'index' and name in unique:
+                continue
+
+            steps.append(BulkStep(
+                description=f"{'índice' if kind == 'index' else 'gatilho'} {name}",
+                disable=f'DROP {kind.upper()} "{name}"',
+                restore=sql
+            ))
+
+        return steps
+
+
+class BulkLoadSession:
+    """
+    Contexto que prepara uma tabela de destino para carga em massa.
+
+    Ao entrar, levanta os passos da estratégia do dialeto do engine e
+    desativa cada objeto. Ao sair, com ou sem erro na carga, restaura na
+    ordem inversa todos os objetos que foram efetivamente desativados.
+    Uma falha na restauração de um objeto não impede a dos demais; ao
+    final, se houver falhas, elas são logadas e a aplicação é encerrada,
+    exceto quando a carga já falhou, caso em que o erro original prevalece.
+
+    Args:
+            engine (Engine): Engine do SQLAlchemy do banco de destino.
+            table (str): Nome da tabela de destino.
+    """
+
+    __STRATEGIES: dict[str, type[BulkLoadInterface]] = {
+        'mssql': SQLServerBulkLoad,
+        'firebird': FirebirdBulkLoad,
+        'sqlite': SQLiteBulkLoad,
+    }
+
+    def __init__(self, engine: Engine, table: str) -> None:
+        self.__engine = engine
+        self.__table = table
+        self.__disabled: list[BulkStep] = []
+
+    @classmethod
+    def supports(cls, engine: Engine) -> bool:
+        """Indica se há uma estratégia de carga em massa para o dialeto do engine."""
+        return engine.dialect.name in cls.__STRATEGIES
+
+    def __enter__(self) -> "BulkLoadSession":
+        strategy = self.__STRATEGIES[self.__engine.dialect.name]()
+
+        try:
+            with self.__engine.connect() as connection:
+                steps = strategy.steps(connection, self.__table)
+
+            for step in steps:
+                with self.__engine.begin() as connection:
+                    connection.exec_driver_sql(step.disable)
+                self.__disabled.append(step)
+
+        except Exception as error:
+            print("[bold red]Erro ao preparar a carga em massa, verifique o log.[/bold red]")
+            Log.error(f"Erro ao desativar objetos da tabela {self.__table}: {error}", trace=True)
+            self.__restore()
+            raise SystemExit from error
+
+        if self.__disabled:
+            Log.info(
+                "Carga em massa na tabela %s: %s desativados.",
+                self.__table, ', '.join(step.description for step in self.__disabled)
+            )
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self.__restore() or exc_type is not None:
+            return
+
+        raise SystemExit
+
+    def __restore(self) -> bool:
+        """
+        Restaura os objetos desativados, em ordem inversa, registrando as falhas.
+
+        Não levanta exceção, para não encobrir um erro já em curso na carga;
+        cabe ao chamador encerrar a aplicação quando não houver outro erro.
+
+        Returns:
+                bool: True se todos os objetos foram restaurados.
+        """
+        failures = []
+
+        while self.__disabled:
+            step = self.__disabled.pop()
+            try:
+                with self.__engine.begin() as connection:
+                    connection.exec_driver_sql(step.restore)
+
+            except Exception as error:
+                failures.append(step)
+                Log.critical(
+                    f"Falha ao restaurar {step.description} da tabela {self.__table}. "
+                    f"Execute manualmente: {step.restore}. ERRO: {error}", trace=True
+                )
+
+        if failures:
+            print("[bold red]Erro ao restaurar objetos da tabela, verifique o log.[/bold red]")
+
+        return not failures
@@ -0,0 +1,220 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+
+import os
+import shutil
+from collections.abc import Mapping
+from typing import Any
+import numpy as np
+from pandas import DataFrame, Index, Series, array
+from pandas.api.extensions import take
+from pandas.api.types import is_float_dtype, is_numeric_dtype
+from sqlalchemy import Engine
+from utils.frame_store import ColumnarFile
+from utils.log import Log
+from utils.metrics import Metrics
+from utils.reflection_cache import ReflectionCache
+
+
+class KeyMapper:
+    """
+    Mapeia os códigos legados para os novos códigos do destino, corrigindo as chaves estrangeiras.
+
+    A tabela pai informa, no `systems.json`, a coluna de destino que guarda o
+    código legado (ex: a gerada por `rename`, o padrão) e a que guarda o novo
+    código, inclusive quando gerado pelo destino (identity/autoincremento):
+
+        "key_map": {"old": "Codigo_Old", "new": "id"}
+
+    e a tabela filha, as colunas de destino que referenciam cada tabela pai:
+
+        "remap": {"cliente_destino": "clientes"}
+
+    Depois da carga da tabela pai, os pares código legado → novo código são
+    lidos do destino (`capture`), mantidos num índice hash em memória e
+    gravados com `ColumnarFile` em `<diretório>/<tabela pai>`, de modo que
+    as execuções seguintes (ou uma carga apenas das filhas) os reaproveitem.
+    Antes da carga da tabela filha, as colunas configuradas são trocadas pelos
+    novos códigos de forma vetorizada (`remap`), dispensando os UPDATEs com
+    junção no destino. Códigos sem correspondência resultam em nulo.
+
+    Args:
+            tables (Mapping[str, Mapping]): A configuração de tabelas do `systems.json`.
+            directory (str): Diretório dos mapas de chaves gravados.
+    """
+
+    __OLD: str = "Codigo_Old"
+    __CHUNK_SIZE: int = 100_000
+
+    def __init__(self, tables: Mapping[str, Mapping[str, Any]],
+                 directory: str = os.path.join(".cache", "keymaps")) -> None:
+        self.__directory = directory
+        self.__parents = {table['destiny']: (name, table['key_map'])
+                          for name, table in tables.items() if table.get('key_map')}
+        self.__remaps = {table['destiny']: table['remap'] for table in tables.values() if table.get('remap')}
+        self.__maps: dict[str, tuple[Index, Any]] = {}
+        self.__texts: dict[str, Index] = {}
+
+    @classmethod
+    def check(cls, config: Any) -> list[str]:
+        """Confere o bloco `key_map` de uma tabela pai."""
+        old = config.get('old', cls.__OLD) if isinstance(config, Mapping) else None
+        if not (isinstance(config, Mapping) and isinstance(config.get('new'), str) and config['new']
+                and isinstance(old, str) and old):
+            return ["deve informar as colunas em 'new' e, opcionalmente, 'old'"]
+        return []
+
+    @staticmethod
+    def check_remap(name: str, remap: Any, tables: Mapping[str, Any]) -> list[str]:
+        """Confere o bloco `remap` de uma tabela filha, que depende das tabelas pais."""
+        if not isinstance(remap, Mapping) or not remap:
+            return ["deve ser um objeto que associa colunas às tabelas pais"]
+
+        errors = []
+        order = list(tables)
+        for column, parent in remap.items():
+            if not isinstance(parent, str) or parent not in tables:
+                errors.append(f"da coluna '{column}' usa a tabela '{parent}', que não existe no systems.json")
+            elif not isinstance(tables[parent], Mapping) or not tables[parent].get('key_map'):
+                errors.append(f"da coluna '{column}' usa a tabela '{parent}', que não tem 'key_map'")
+            elif order.index(parent) >= order.index(name):
+                errors.append(f"da coluna '{column}' usa a tabela '{parent}', que deve vir antes no systems.json")
+
+        return errors
+
+    def remap(self, table: str, df: DataFrame) -> DataFrame:
+        """
+        Troca os códigos legados das colunas de chave estrangeira pelos novos códigos.
+
+        Args:
+            table (str): Nome da tabela de destino.
+            df (DataFrame): Os dados a carregar na tabela.
+
+        Returns:
+            DataFrame: Os dados com as chaves estrangeiras remapeadas.
+
+        Raises:
+            KeyError: Se uma coluna configurada não existir ou se não houver
+                      mapa de chaves da tabela pai.
+        """
+        rules = self.__remaps.get(table)
+        if not rules:
+            return df
+
+        with Metrics.measure('load', table=table, op='remap') as measure:
+            columns = {}
+            for column, parent in rules.items():
+                if column not in df.columns:
+                    raise KeyError(f"coluna '{column}' inexistente para remapear as chaves de '{parent}'")
+
+                index, new = self.__map(parent)
+                values = df[column]
+                keys = values.to_numpy()
+                if not (is_numeric_dtype(values) and is_numeric_dtype(index)):
+                    index, keys = self.__text_index(parent), self.__text(values)
+
+                position = index.get_indexer(keys)
+                missing = int(((position < 0) & values.notna().to_numpy()).sum())
+                if missing:
+                    Log.warning("%d código(s) da coluna '%s' sem correspondência na tabela '%s' ficaram nulos",
+                                missing, column, parent)
+
+                columns[column] = Series(take(new, position, allow_fill=True), index=df.index)
+
+            df = df.assign(**columns)
+            measure.frame(df)
+
+        return df
+
+    def capture(self, table: str, engine: Engine) -> None:
+        """
+        Lê do destino os pares código legado → novo código da tabela pai carregada.
+
+        Args:
+            table (str): Nome da tabela de destino recém-carregada.
+            engine (Engine): O engine do banco de destino.
+
+        Raises:
+            KeyError: Se as colunas do `key_map` não existirem na tabela de destino.
+        """
+        if table not in self.__parents:
+            return
+
+        name, config = self.__parents[table]
+        target = ReflectionCache.table(engine, table)
+        columns = {column.name.lower(): column for column in target.columns}
+        old, new = (columns.get(str(config.get(key, default)).lower())
+                    for key, default in (('old', self.__OLD), ('new', None)))
+        if old is None or new is None:
+            raise KeyError(f"colunas do 'key_map' inexistentes na tabela {table}")
+
+        with Metrics.measure('load', table=table, op='key_map') as measure:
+            rows = []
+            with engine.connect() as connection:
+                result = connection.execution_options(stream_results=True).execute(
+                    target.select().with_only_columns(old, new).where(old.is_not(None)))
+                while chunk := result.fetchmany(self.__CHUNK_SIZE):
+                    rows.extend(chunk)
+
+            pairs = DataFrame(rows, columns=['old', 'new'])
+            repeated = pairs['old'].duplicated(keep='last')
+            if repeated.any():
+                Log.warning("%d código(s) legado(s) repetido(s) na tabela %s; usado o último carregado",
+                            int(repeated.sum()), table)
+                pairs = pairs[~repeated].reset_index(drop=True)
+
+            path = os.path.join(self.__directory, name)
+            temporary = f"{path}.tmp"
+            shutil.rmtree(temporary, ignore_errors=True)
+            ColumnarFile.write(pairs, temporary)
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(temporary, path)
+
+            self.__maps[name] = self.__build(pairs)
+            self.__texts.pop(name, None)
+            measure.rows = len(pairs)
+
+        Log.info("Mapa de chaves da tabela %s: %d código(s)", name, len(pairs))
+
+    def __map(self, parent: str) -> tuple[Index, Any]:
+        """Retorna o índice da tabela pai, capturado nesta execução ou lido do disco."""
+        if parent not in self.__maps:
+            path = os.path.join(self.__directory, parent)
+            if not os.path.isdir(path):
+                raise KeyError(f"mapa de chaves da tabela '{parent}' inexistente; carregue-a antes")
+            self.__maps[parent] = self.__build(ColumnarFile.read(path, mmap=False))
+
+        return self.__maps[parent]
+
+    @staticmethod
+    def __build(pairs: DataFrame) -> tuple[Index, Any]:
+        """Monta o índice hash dos códigos legados e o array dos novos códigos."""
+        return Index(pairs['old'].to_numpy()), array(pairs['new'].to_numpy())
+
+    def __text_index(self, parent: str) -> Index:
+        """Retorna, em cache, o índice da tabela pai com os códigos legados como texto."""
+        if parent not in self.__texts:
+            self.__texts[parent] = Index(self.__text(Series(self.__maps[parent][0])))
+
+        return self.__texts[parent]
+
+    @staticmethod
+    def __text(values: Series) -> np.ndarray:
+        """Converte os códigos para texto, sem o '.0' de inteiros lidos como float e mantendo os nulos."""
+        if is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+            values = values.astype('Int64')
+
+        return values.astype(str).where(values.notna(), None).to_numpy(dtype=object)
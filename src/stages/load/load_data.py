@@ -13,12 +13,23 @@
 # Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
 # com este programa. Se não, veja <https://www.gnu.org/licenses/>.
 
+from contextlib import nullcontext
 from rich import print
 from pandas import DataFrame
-from sqlalchemy import Engine
+from sqlalchemy import Connection, Engine, and_, bindparam
+from utils.frame_store import FrameStore
 from utils.log import Log
+from utils.metrics import Metrics
+from utils.progress import ProgressReporter
+from utils.reflection_cache import ReflectionCache
 from stages.contracts.transform_contract import TransformContract
+from stages.extract.dtype_optimizer import DtypeOptimizer
 from stages.interfaces.load_data import LoadInterface
+from stages.load.bulk_session import BulkLoadSession
+from stages.load.key_mapper import KeyMapper
+from stages.load.reject_router import RejectRouter
+from stages.load.type_mapping import DestinyTypeMap
+from stages.transform.change_detector import ChangeDetector, Delta
 
 
 class Loader(LoadInterface):
@@ -27,18 +38,49 @@ class Loader(LoadInterface):
 
     Esta classe recebe dados limpos de um contrato de transformação e utiliza
     SQLAlchemy e pandas para inserir os registros nas tabelas de destino.
+    Antes de cada inserção, as colunas reduzidas na extração voltam aos dtypes
+    originais (ver `DtypeOptimizer`) e são convertidas para os tipos refletidos
+    da tabela de destino (ver `DestinyTypeMap`).
 
     Args:
             transform_contract (TransformContract): O objeto de contrato que contém
                                                     os DataFrames limpos.
             engine (Engine): Uma instância ativa do engine do SQLAlchemy para a
                              conexão com o banco de dados de destino.
-            
+            bulk_load (bool): Se True, cada tabela é carregada dentro de uma
+                              `BulkLoadSession`, que desativa índices, restrições
+                              e gatilhos não essenciais durante a inserção.
+                              O padrão é False.
+            progress (ProgressReporter | None): Recebe o avanço, em linhas, de
+                                                cada tabela carregada. O padrão
+                                                é None (sem acompanhamento).
+            key_mapper (KeyMapper | None): Remapeia as chaves estrangeiras das
+                                           tabelas filhas e captura os novos
+                                           códigos das tabelas pais (veja
+                                           `KeyMapper`). O padrão é None.
+            rejects (RejectRouter | None): Desvia as linhas inválidas das
+                                           tabelas com `reject` para um arquivo
+                                           de rejeitos (veja `RejectRouter`).
+                                           O padrão é None.
     """
 
-    def __init__(self, transform_contract: TransformContract, engine: Engine):
+    __CHUNK_SIZE: int = 10_000
+
+    def __init__(self, transform_contract: TransformContract, engine: Engine, bulk_load: bool = False,
+                 progress: ProgressReporter | None = None, key_mapper: KeyMapper | None = None,
+                 rejects: RejectRouter | None = None):
         self.__clean_data: list[dict[str, DataFrame]] = transform_contract.clean_data
+        self.__changes: list[Delta | None] = transform_contract.changes or [None] * len(self.__clean_data)
         self.__engine = engine
+        self.__bulk_load = bulk_load
+        self.__progress = progress or ProgressReporter()
+        self.__type_map = DestinyTypeMap(engine)
+        self.__key_mapper = key_mapper
+        self.__rejects = rejects
+
+        if bulk_load and not BulkLoadSession.supports(engine):
+            Log.warning(f"Carga em massa não suportada para o dialeto {engine.dialect.name}, usando carga padrão.")
+            self.__bulk_load = False
 
     def load(self) -> None:
         """Inicia o processo de carga dos dados limpos no banco de dados."""
@@ -49,18 +91,126 @@ class Loader(LoadInterface):
         Itera e insere cada DataFrame na tabela de banco de dados correspondente.
 
         Utiliza o método `pandas.to_sql` com a estratégia 'append' para adicionar
-        os novos registros às tabelas existentes.
+        os novos registros às tabelas existentes, informando explicitamente os
+        tipos de destino em `dtype=`. A inserção é feita em blocos, numa única
+        transação por tabela, para que o avanço de cada tabela seja informado.
+        Com a carga em massa ativa, a
+        inserção ocorre dentro de uma `BulkLoadSession` da tabela.
 
         Raises:
-            SystemExit: Em caso de qualquer erro durante a inserção,
-                        o erro é logado e a aplicação é encerrada.
+            SystemExit: Em caso de colunas incompatíveis com o destino (antes
+                        de qualquer inserção na tabela) ou de qualquer erro
+                        durante a inserção, o erro é logado e a aplicação é encerrada.
         """
-        for item in self.__clean_data:
+        for item, delta in zip(self.__clean_data, self.__changes):
             for table, df in item.items():
-                try:
-                    df.to_sql(name=table, con=self.__engine, if_exists='append', index=False)
+                with Log.context(stage='load', table=table):
+                    self.__insert_dataframe(table, df, delta)
+
+                del df
+                if isinstance(item, FrameStore):
+                    item.release(table)
+
+    def __insert_dataframe(self, table: str, df: DataFrame, delta: Delta | None = None) -> None:
+        """
+        Converte os tipos e insere um DataFrame na tabela de destino.
+
+        Com uma diferença (`delta`) da detecção de alterações, as linhas
+        excluídas ou alteradas na origem são antes removidas do destino pela
+        chave, na mesma transação da inserção, e o índice de alterações só é
+        gravado depois da confirmação. Nesse caso a carga em massa não é usada,
+        pois as exclusões dependem dos índices do destino.
+
+        Com um `KeyMapper`, as chaves estrangeiras são remapeadas antes da
+        conversão de tipos e, depois da carga de uma tabela pai, os novos
+        códigos gerados no destino são capturados.
+
+        Com um `RejectRouter`, as linhas inválidas são desviadas para o arquivo
+        de rejeitos antes da conversão de tipos e não entram no índice de
+        alterações, sendo tentadas de novo na próxima carga.
+        """
+        df = self.__remap(table, DtypeOptimizer.restore(df))
+        df, delta = self.__reject(table, df, delta)
+
+        try:
+            df, dtype = self.__type_map.prepare(table, df)
+
+        except Exception as error:
+            print("[bold red]Erro ao carregar dados, verifique o log.[/bold red]")
+            Log.error(f"Colunas incompatíveis com o destino: {error}", trace=True)
+            raise SystemExit from error
+
+        try:
+            session = BulkLoadSession(self.__engine, table) if self.__bulk_load and delta is None else nullcontext()
+            self.__progress.start('load', table, len(df))
+            with Metrics.measure('load', table=table) as measure, session:
+                with self.__engine.begin() as connection:
+                    if delta is not None and len(delta.deleted):
+                        self.__delete_keys(connection, table, delta)
+
+                    for number, start in enumerate(range(0, max(len(df), 1), self.__CHUNK_SIZE), start=1):
+                        with Log.context(chunk=number):
+                            chunk = df.iloc[start:start + self.__CHUNK_SIZE]
+                            chunk.to_sql(name=table, con=connection, if_exists='append', index=False, dtype=dtype)
+                            self.__progress.advance('load', table, len(chunk))
+                measure.frame(df)
+            self.__progress.finish('load', table)
+
+            if delta is not None:
+                ChangeDetector.commit(delta)
+
+            if self.__key_mapper is not None:
+                self.__key_mapper.capture(table, self.__engine)
+
+        except Exception as error:
+            print("[bold red]Erro ao carregar dados, verifique o log.[/bold red]")
+            Log.error(f"Erro ao inserir dados na tabela {table}: {error}", trace=True)
+            raise SystemExit from error
+
+    def __remap(self, table: str, df: DataFrame) -> DataFrame:
+        """Troca os códigos legados das chaves estrangeiras pelos novos códigos do destino."""
+        if self.__key_mapper is None:
+            return df
+
+        try:
+            return self.__key_mapper.remap(table, df)
+
+        except Exception as error:
+            print("[bold red]Erro ao carregar dados, verifique o log.[/bold red]")
+            Log.error(f"Erro ao remapear as chaves estrangeiras da tabela {table}: {error}", trace=True)
+            raise SystemExit from error
+
+    def __reject(self, table: str, df: DataFrame, delta: Delta | None) -> tuple[DataFrame, Delta | None]:
+        """Desvia as linhas inválidas para o arquivo de rejeitos, interrompendo acima do limite."""
+        if self.__rejects is None:
+            return df, delta
+
+        try:
+            df, rejects = self.__rejects.split(table, df, self.__type_map.columns(table))
+
+        except Exception as error:
+            print("[bold red]Erro ao carregar dados, verifique o log.[/bold red]")
+            Log.error(f"Erro ao validar as linhas da tabela {table}: {error}", trace=True)
+            raise SystemExit from error
+
+        if delta is not None and len(rejects):
+            delta = ChangeDetector.forget(delta, rejects)
+
+        return df, delta
+
+    def __delete_keys(self, connection: Connection, table: str, delta: Delta) -> None:
+        """Remove do destino as linhas cujas chaves foram excluídas ou alteradas na origem."""
+        target = ReflectionCache.table(self.__engine, table)
+        columns = {column.name.lower(): column for column in target.columns}
+        keys = [columns[str(key).lower()] for key in delta.keys]
+
+        statement = target.delete().where(and_(*(column == bindparam(f"key_{position}")
+                                                 for position, column in enumerate(keys))))
+        values = [self.__type_map.cast(delta.deleted[key], column.type).astype(object).tolist()
+                  for key, column in zip(delta.keys, keys)]
+        params = [{f"key_{position}": value for position, value in enumerate(row)} for row in zip(*values)]
 
-                except Exception as error:
-                    print("[bold red]Erro ao carregar dados, verifique o log.[/bold red]")
-                    Log.error(f"Erro ao inserir dados na tabela {table}: {error}", True)
-                    raise SystemExit from error
+        with Metrics.measure('load', table=table, op='delete') as measure:
+            for start in range(0, len(params), self.__CHUNK_SIZE):
+                connection.execute(statement, params[start:start + self.__CHUNK_SIZE])
+            measure.rows = len(params)
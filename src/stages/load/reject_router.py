@@ -0,0 +1,213 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+
+import os
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+import numpy as np
+from pandas import DataFrame, Series
+from sqlalchemy import Column
+from sqlalchemy.types import String
+from utils.log import Log
+from utils.metrics import Metrics
+from stages.load.type_mapping import DestinyTypeMap
+from stages.transform.fixed_width import FixedWidth
+
+
+class RejectRouter:
+    """
+    Desvia as linhas inválidas de uma tabela para um arquivo de rejeitos, carregando as demais.
+
+    Habilitado por tabela no `systems.json`, com o limite de rejeição (fração
+    das linhas, o padrão é 0.01) e, opcionalmente, colunas de documentos a
+    validar além das formatadas com `format` CPF ou CNPJ:
+
+        "reject": {"max_ratio": 0.01, "documents": {"cpf_destino": "CPF"}}
+
+    Antes da carga, cada bloco de linhas recebe máscaras vetorizadas, por
+    coluna, com os motivos de rejeição:
+
+        null:<coluna>      nulo em coluna NOT NULL do destino;
+        length:<coluna>    texto maior que o tamanho da coluna do destino;
+        cast:<coluna>      valor que não pode ser convertido para o tipo do destino;
+        document:<coluna>  CPF ou CNPJ com dígitos verificadores inválidos.
+
+    As linhas rejeitadas são gravadas, com a coluna `reject_reason`, em
+    `<diretório>/<tabela>_<data>.csv`. Se a fração de linhas rejeitadas
+    passar do limite, a carga da tabela é interrompida. Tabelas sem `reject`
+    mantêm o comportamento padrão: qualquer valor incompatível interrompe a carga.
+
+    Só as verificações da carga desviam linhas: uma falha na transformação
+    ainda encerra a execução. As transformações que convertem valores (ex:
+    `date`) não falham por linha, mas deixam nulo o valor inválido, que só é
+    rejeitado aqui se a coluna do destino for NOT NULL.
+
+    Args:
+            tables (Mapping[str, Mapping]): A configuração de tabelas do `systems.json`.
+            directory (str): Diretório dos arquivos de rejeitos.
+            chunk_size (int): Linhas verificadas por vez. O padrão é 100.000.
+    """
+
+    __MAX_RATIO: float = 0.01
+    __CPF_WEIGHTS: tuple[np.ndarray, np.ndarray] = (np.arange(10, 1, -1), np.arange(11, 1, -1))
+    __CNPJ_WEIGHTS: tuple[np.ndarray, np.ndarray] = (np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]),
+                                                     np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+
+    def __init__(self, tables: Mapping[str, Mapping[str, Any]], directory: str = "rejects",
+                 chunk_size: int = 100_000) -> None:
+        self.__directory = directory
+        self.__chunk_size = chunk_size
+        self.__rules = {table['destiny']: (table['reject'], self.__documents(table))
+                        for table in tables.values() if table.get('reject') is not None}
+
+    @staticmethod
+    def check(config: Any) -> list[str]:
+        """Confere o bloco `reject` de uma tabela."""
+        if not isinstance(config, Mapping):
+            return ["deve ser um objeto"]
+
+        errors = []
+        max_ratio = config.get('max_ratio', 0.01)
+        if isinstance(max_ratio, bool) or not isinstance(max_ratio, (int, float)) or not 0 <= max_ratio <= 1:
+            errors.append("'max_ratio' deve ser um número entre 0 e 1")
+
+        documents = config.get('documents', {})
+        if not isinstance(documents, Mapping) or not all(kind in ('CPF', 'CNPJ') for kind in documents.values()):
+            errors.append("'documents' deve associar colunas a 'CPF' ou 'CNPJ'")
+
+        return errors
+
+    def split(self, table: str, df: DataFrame, columns: dict[str, Column] | None) -> tuple[DataFrame, DataFrame]:
+        """
+        Separa as linhas válidas das rejeitadas, gravando as rejeitadas.
+
+        Args:
+            table (str): Nome da tabela de destino.
+            df (DataFrame): Os dados a carregar.
+            columns (dict[str, Column] | None): As colunas refletidas do destino,
+                                                pelo nome em minúsculas.
+
+        Returns:
+            tuple[DataFrame, DataFrame]: As linhas válidas e as rejeitadas.
+
+        Raises:
+            ValueError: Se a fração de linhas rejeitadas passar do limite.
+        """
+        if table not in self.__rules or columns is None or not len(df):
+            return df, df.iloc[0:0]
+
+        config, documents = self.__rules[table]
+        with Metrics.measure('load', table=table, op='reject') as measure:
+            reasons = np.full(len(df), '', dtype=object)
+            for start in range(0, len(df), self.__chunk_size):
+                chunk = df.iloc[start:start + self.__chunk_size]
+                reasons[start:start + len(chunk)] = self.__reasons(chunk, columns, documents)
+
+            rejected = reasons != ''
+            measure.rows = int(rejected.sum())
+
+        if not rejected.any():
+            return df, df.iloc[0:0]
+
+        rejects = df[rejected].assign(reject_reason=Series(reasons[rejected], index=df.index[rejected]).str[:-1])
+        path = self.__write(table, rejects)
+        ratio = rejected.sum() / len(df)
+        Log.warning("%d linha(s) rejeitada(s) (%.2f%%), gravada(s) em %s", int(rejected.sum()), ratio * 100, path)
+
+        max_ratio = config.get('max_ratio', self.__MAX_RATIO)
+        if ratio > max_ratio:
+            raise ValueError(f"{int(rejected.sum()):,} de {len(df):,} linhas rejeitadas ({ratio:.2%}), "
+                             f"acima do limite de {max_ratio:.2%}; veja {path}")
+
+        return df[~rejected], rejects
+
+    def __reasons(self, chunk: DataFrame, columns: dict[str, Column], documents: dict[str, str]) -> np.ndarray:
+        """Monta os motivos de rejeição de cada linha do bloco (vazio para as válidas)."""
+        reasons = np.full(len(chunk), '', dtype=object)
+
+        for name in chunk.columns:
+            column = columns.get(str(name).lower())
+            if column is None:
+                continue
+
+            series = chunk[name]
+            nulls, failed = DestinyTypeMap.failures(series, column.type)
+            masks = {'null': nulls.to_numpy() if not column.nullable else None, 'cast': failed.to_numpy()}
+
+            length = getattr(column.type, 'length', None)
+            if isinstance(column.type, String) and length:
+                masks['length'] = (series.astype(str).str.len() > length).to_numpy() & ~nulls.to_numpy()
+
+            if name in documents:
+                blanks = DestinyTypeMap.blanks(series).to_numpy()
+                masks['document'] = ~blanks & ~self.__valid_document(series, documents[name])
+
+            for code, mask in masks.items():
+                if mask is not None and mask.any():
+                    reasons[mask] = reasons[mask] + f"{code}:{name};"
+
+        return reasons
+
+    @classmethod
+    def __valid_document(cls, series: Series, kind: str) -> np.ndarray:
+        """
+        Confere, de forma vetorizada, os dígitos verificadores de CPFs ou CNPJs.
+
+        Valores só com dígitos ou com a pontuação padrão são lidos por
+        `FixedWidth`; os demais têm a pontuação removida por regex antes.
+        """
+        width, weights = (11, cls.__CPF_WEIGHTS) if kind == 'CPF' else (14, cls.__CNPJ_WEIGHTS)
+        values = series.astype(str).to_numpy(dtype=object)
+        matched = np.zeros(len(values), dtype=bool)
+        digits = np.zeros((len(values), width), dtype=np.int64)
+
+        for pattern in ('9' * width, '999?999?999?99' if kind == 'CPF' else '99?999?999?9999?99'):
+            rows = np.flatnonzero(~matched)
+            mask, found = FixedWidth.match(values[rows], pattern)
+            matched[rows[mask]], digits[rows[mask]] = True, found
+
+        rows = np.flatnonzero(~matched)
+        if len(rows):
+            stripped = Series(values[rows]).str.replace(r'[.\-/ ]', '', regex=True).to_numpy(dtype=object)
+            mask, found = FixedWidth.match(stripped, '9' * width)
+            matched[rows[mask]], digits[rows[mask]] = True, found
+
+        valid = matched & (digits != digits[:, :1]).any(axis=1)
+        for position, weight in zip((width - 2, width - 1), weights):
+            remainder = (digits[:, :position] * weight).sum(axis=1) % 11
+            valid &= digits[:, position] == np.where(remainder < 2, 0, 11 - remainder)
+
+        return valid
+
+    @staticmethod
+    def __documents(table: Mapping[str, Any]) -> dict[str, str]:
+        """Retorna as colunas de documentos da tabela: as formatadas como CPF/CNPJ e as informadas."""
+        documents = {
+            info['field_destiny']: info['transform']['format']
+            for info in table['fields'].values()
+            if info.get('transform', {}).get('format') in ('CPF', 'CNPJ')
+        }
+        documents.update(table['reject'].get('documents', {}))
+        return documents
+
+    def __write(self, table: str, rejects: DataFrame) -> str:
+        """Grava as linhas rejeitadas num CSV, com o motivo na primeira coluna."""
+        os.makedirs(self.__directory, exist_ok=True)
+        path = os.path.join(self.__directory, f"{table}_{datetime.now():%Y%m%d_%H%M%S}.csv")
+        columns = ['reject_reason', *(column for column in rejects.columns if column != 'reject_reason')]
+        rejects[columns].to_csv(path, index=False)
+        return path
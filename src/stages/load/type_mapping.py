@@ -0,0 +1,206 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from pandas import DataFrame, Series, to_datetime, to_numeric
+from pandas.api.types import infer_dtype, is_datetime64_any_dtype, is_object_dtype, is_string_dtype
+from sqlalchemy import Column, Engine
+from sqlalchemy.types import Date, DateTime, Float, Integer, Numeric, String, TypeEngine
+from utils.reflection_cache import ReflectionCache
+
+
+class DestinyTypeMap:
+    """
+    Mapeia as colunas de um DataFrame para os tipos das tabelas de destino.
+
+    Cada tabela de destino é refletida uma única vez no processo (veja
+    `ReflectionCache`) e suas colunas ficam em cache. Antes da inserção, as colunas do DataFrame são convertidas de forma
+    vetorizada para dtypes compatíveis com o tipo de destino, e os tipos
+    refletidos são devolvidos para uso no parâmetro `dtype=` do `to_sql`,
+    evitando a inferência de tipos e a conversão valor a valor no driver.
+
+    Args:
+            engine (Engine): Engine do SQLAlchemy do banco de destino.
+    """
+
+    __NULLS = ['', 'None', 'nan', 'NaN', 'NaT', '<NA>']
+
+    def __init__(self, engine: Engine) -> None:
+        self.__engine = engine
+        self.__cache: dict[str, dict[str, Column] | None] = {}
+
+    def columns(self, table: str) -> dict[str, Column] | None:
+        """
+        Retorna as colunas refletidas da tabela, indexadas pelo nome em minúsculas.
+
+        Args:
+            table (str): Nome da tabela de destino.
+
+        Returns:
+            (dict[str, Column] | None): As colunas da tabela, ou None se a
+                                        tabela ainda não existir no destino.
+        """
+        if table not in self.__cache:
+            reflected = ReflectionCache.columns(self.__engine, table)
+            self.__cache[table] = None if reflected is None else {
+                column['name'].lower(): Column(column['name'], column['type'], nullable=column['nullable'])
+                for column in reflected
+            }
+
+        return self.__cache[table]
+
+    def prepare(self, table: str, df: DataFrame) -> tuple[DataFrame, dict[str, TypeEngine] | None]:
+        """
+        Converte as colunas do DataFrame para os tipos da tabela de destino.
+
+        Args:
+            table (str): Nome da tabela de destino.
+            df (DataFrame): DataFrame com os dados limpos.
+
+        Returns:
+            tuple[DataFrame, dict[str, TypeEngine] | None]: O DataFrame convertido
+                e o mapeamento coluna -> tipo para o `to_sql`. Se a tabela não
+                existir, o DataFrame é devolvido sem alterações e o mapeamento é None.
+
+        Raises:
+            ValueError: Se alguma coluna não existir no destino ou não puder ser
+                        convertida para o tipo de destino. Todas as colunas
+                        incompatíveis são reportadas de uma só vez.
+        """
+        columns = self.columns(table)
+        if columns is None:
+            return df, None
+
+        errors = []
+        dtype = {}
+        converted = {}
+
+        for name in df.columns:
+            column = columns.get(str(name).lower())
+            if column is None:
+                errors.append(f"coluna '{name}' não existe na tabela de destino")
+                continue
+
+            try:
+                converted[name] = self.cast(df[name], column.type)
+                dtype[name] = column.type
+
+            except (TypeError, ValueError) as error:
+                errors.append(f"coluna '{name}' incompatível com {column.type}: {error}")
+
+        if errors:
+            raise ValueError(f"Tabela {table}: " + "; ".join(errors))
+
+        return df.assign(**converted), dtype
+
+    @classmethod
+    def blanks(cls, series: Series) -> Series:
+        """Indica os valores nulos, inclusive os marcadores de nulo gerados por `astype(str)`."""
+        nulls = series.isna()
+        if is_object_dtype(series) or is_string_dtype(series):
+            nulls |= series.isin(cls.__NULLS)
+        return nulls
+
+    @classmethod
+    def failures(cls, series: Series, sql_type: TypeEngine) -> tuple[Series, Series]:
+        """
+        Indica, linha a linha, os valores nulos e os que não podem ser convertidos pelo `cast`.
+
+        Segue as mesmas regras do `cast` (inclusive os marcadores de nulo de
+        `astype(str)` em colunas não textuais), mas convertendo com
+        `errors='coerce'`, de modo que um valor inválido marca apenas a sua linha.
+
+        Args:
+            series (Series): Coluna a ser verificada.
+            sql_type (TypeEngine): Tipo refletido da coluna de destino.
+
+        Returns:
+            tuple[Series, Series]: As máscaras dos valores nulos e dos valores
+                                   que não podem ser convertidos.
+        """
+        nulls = series.isna()
+        failed = Series(False, index=series.index)
+
+        if isinstance(sql_type, String):
+            return nulls, failed
+
+        if is_object_dtype(series):
+            if infer_dtype(series, skipna=True) not in ('string', 'empty'):
+                return nulls, failed
+            nulls = cls.blanks(series)
+            series = series.where(~nulls, None)
+
+        if isinstance(sql_type, (Integer, Numeric)):
+            if is_datetime64_any_dtype(series):
+                return nulls, ~nulls
+            values = to_numeric(series, errors='coerce')
+            failed = values.isna() & ~nulls
+            if isinstance(sql_type, Integer):
+                failed |= values.notna() & (values % 1 != 0)
+
+        elif isinstance(sql_type, (DateTime, Date)):
+            failed = to_datetime(series, errors='coerce').isna() & ~nulls
+
+        return nulls, failed
+
+    @classmethod
+    def cast(cls, series: Series, sql_type: TypeEngine) -> Series:
+        """
+        Converte uma Series para o dtype do pandas correspondente ao tipo SQL.
+
+        Colunas de texto com os marcadores de nulo gerados por `astype(str)`
+        (ex: 'None', 'nan') são tratadas como nulas ao converter para tipos
+        não textuais. Colunas cujo dtype já é compatível não são copiadas.
+
+        Args:
+            series (Series): Coluna a ser convertida.
+            sql_type (TypeEngine): Tipo refletido da coluna de destino.
+
+        Returns:
+            Series: A coluna convertida.
+
+        Raises:
+            ValueError: Se algum valor não puder ser convertido.
+        """
+        if isinstance(sql_type, String):
+            if is_object_dtype(series) or is_string_dtype(series):
+                return series
+            return series.astype(str).where(series.notna(), None)
+
+        if isinstance(sql_type, (Integer, Numeric, DateTime, Date)) and is_object_dtype(series):
+            if infer_dtype(series, skipna=True) not in ('string', 'empty'):
+                return series
+            series = series.replace(cls.__NULLS, None)
+
+        if isinstance(sql_type, (Integer, Numeric)) and is_datetime64_any_dtype(series):
+            raise ValueError("datas não podem ser gravadas em coluna numérica")
+
+        if isinstance(sql_type, Integer):
+            values = to_numeric(series, errors='raise')
+            if (values.dropna() % 1 != 0).any():
+                raise ValueError("valores não inteiros")
+            if values.isna().any():
+                return values.astype('Int64')
+            return values.astype('int64')
+
+        if isinstance(sql_type, Float):
+            return to_numeric(series, errors='raise').astype('float64')
+
+        if isinstance(sql_type, Numeric):
+            return to_numeric(series, errors='raise')
+
+        if isinstance(sql_type, (DateTime, Date)):
+            return to_datetime(series, errors='raise')
+
+        return series
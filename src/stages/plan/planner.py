@@ -0,0 +1,320 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+from collections import namedtuple
+from collections.abc import Mapping
+from datetime import date, datetime
+from glob import glob
+from json import dump, load
+from time import perf_counter
+from pandas import DataFrame
+from rich.table import Table as RichTable
+from sqlalchemy import Engine, Table, inspect
+from utils.log import Log
+from utils.reflection_cache import ReflectionCache
+from stages.contracts.extract_contract import ExtractContract
+from stages.extract.row_counter import RowCounter
+from stages.load.type_mapping import DestinyTypeMap
+from stages.transform.registry import TransformRegistry
+from stages.transform.transform_data import Transformer
+
+Issue = namedtuple('Issue', ['level', 'table', 'message'])
+TablePlan = namedtuple('TablePlan', ['name', 'table', 'destiny', 'rows', 'bytes', 'seconds', 'basis'])
+Plan = namedtuple('Plan', ['tables', 'issues', 'seconds'])
+
+
+class DryRunPlanner:
+    """
+    Planeja uma execução do pipeline sem mover dados.
+
+    Valida o `systems.json` contra os esquemas refletidos da origem e do
+    destino, estima linhas e bytes de cada tabela e prevê o tempo de
+    extração, transformação e carga por tabela e no total.
+
+    A vazão (linhas/s) de cada etapa vem, nesta ordem: dos relatórios das
+    últimas execuções da mesma tabela em `reports_dir`; da média da etapa
+    nesses relatórios; e, para extração e transformação, de uma amostra
+    das primeiras linhas da tabela, lida e transformada em memória. A carga
+    não é calibrada por amostra, pois exigiria gravar no destino.
+
+    Args:
+            origin_engine (Engine): Engine do SQLAlchemy do banco de origem.
+            destiny_engine (Engine): Engine do SQLAlchemy do banco de destino.
+            reports_dir (str): Diretório dos relatórios de execução. O padrão é "reports".
+            sample_rows (int): Linhas lidas da origem por tabela para a amostra. O padrão é 1000.
+            history (int): Quantidade de relatórios recentes considerados. O padrão é 5.
+    """
+
+    __STAGES = ('extract', 'transform', 'load')
+
+    def __init__(self, origin_engine: Engine, destiny_engine: Engine, reports_dir: str = "reports",
+                 sample_rows: int = 1000, history: int = 5) -> None:
+        self.__origin = origin_engine
+        self.__reports_dir = reports_dir
+        self.__sample_rows = sample_rows
+        self.__history = history
+        self.__counter = RowCounter(origin_engine)
+        self.__type_map = DestinyTypeMap(destiny_engine)
+        self.__tables: dict[str, dict] = {}
+        self.__samples: dict[str, tuple[DataFrame, float | None]] = {}
+
+    def plan(self, tables: dict[str, dict]) -> Plan:
+        """
+        Valida a configuração e estima o custo de cada tabela.
+
+        Args:
+            tables (dict[str, dict]): A configuração de tabelas do `systems.json`.
+
+        Returns:
+            Plan: As estimativas por tabela, os problemas encontrados e o
+                  tempo total previsto por etapa (None se alguma tabela não
+                  tiver previsão para a etapa).
+        """
+        rates = self.__report_rates()
+        self.__tables = tables
+        issues: list[Issue] = []
+        plans: list[TablePlan] = []
+
+        for name, config in tables.items():
+            with Log.context(stage='plan', table=name):
+                plans.append(self.__plan_table(name, config, rates, issues))
+
+        seconds = {}
+        for stage in self.__STAGES:
+            values = [item.seconds[stage] for item in plans]
+            seconds[stage] = None if None in values else sum(values)
+
+        return Plan(tables=plans, issues=issues, seconds=seconds)
+
+    def save(self, plan: Plan) -> str:
+        """
+        Grava o plano em um arquivo JSON no diretório dos relatórios.
+
+        Returns:
+            str: O caminho do arquivo gravado.
+        """
+        os.makedirs(self.__reports_dir, exist_ok=True)
+        path = os.path.join(self.__reports_dir, f"plan_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+        with open(path, 'w', encoding='utf-8') as file:
+            dump({
+                'tables': [item._asdict() for item in plan.tables],
+                'issues': [item._asdict() for item in plan.issues],
+                'seconds': plan.seconds,
+            }, file, ensure_ascii=False, indent=2)
+
+        return path
+
+    @classmethod
+    def render(cls, plan: Plan) -> RichTable:
+        """Monta a tabela do Rich com as estimativas do plano."""
+        table = RichTable(title="Plano de execução (dry-run)")
+        for column in ("Tabela", "Destino", "Linhas", "MB", "Extração", "Transformação", "Carga", "Base"):
+            table.add_column(column, justify="left" if column in ("Tabela", "Destino", "Base") else "right")
+
+        for item in plan.tables:
+            table.add_row(
+                item.name,
+                item.destiny,
+                f"{item.rows:,}" if item.rows is not None else "?",
+                f"{item.bytes / 1024 ** 2:,.1f}" if item.bytes is not None else "?",
+                *(cls.__duration(item.seconds[stage]) for stage in cls.__STAGES),
+                item.basis,
+            )
+
+        table.add_section()
+        table.add_row("Total", "", "", "", *(cls.__duration(plan.seconds[stage]) for stage in cls.__STAGES), "")
+        return table
+
+    def __plan_table(self, name: str, config: dict, rates: dict, issues: list[Issue]) -> TablePlan:
+        """Valida uma tabela, lê a amostra e calcula suas estimativas."""
+        destiny = config.get('destiny', '')
+        source = self.__reflect(config.get('table', ''))
+
+        if source is None:
+            issues.append(Issue('erro', name, f"tabela de origem '{config.get('table')}' não encontrada"))
+            return TablePlan(name, config.get('table'), destiny, None, None, dict.fromkeys(self.__STAGES), "-")
+
+        self.__validate(name, config, source, issues)
+
+        rows = self.__counter.estimate(source.name)
+        sample, extract_rate = self.__sample(source)
+        transform_rate = self.__transform_sample(name, config, sample, issues)
+
+        size = None
+        if rows is not None and len(sample):
+            size = int(sample.memory_usage(deep=True).sum() / len(sample) * rows)
+
+        seconds = {}
+        basis = set()
+        sampled = {'extract': extract_rate, 'transform': transform_rate, 'load': None}
+        for stage in self.__STAGES:
+            key = destiny if stage == 'load' else name
+            rate, origin = rates.get((stage, key)), "relatório"
+            if rate is None:
+                rate, origin = rates.get((stage, None)), "média"
+            if rate is None:
+                rate, origin = sampled[stage], "amostra"
+
+            if rate and rows is not None:
+                seconds[stage] = rows / rate
+                basis.add(origin)
+            else:
+                seconds[stage] = None
+
+        return TablePlan(name, source.name, destiny, rows, size, seconds, ", ".join(sorted(basis)) or "-")
+
+    def __reflect(self, table_name: str) -> Table | None:
+        """Reflete a tabela de origem, ou retorna None se ela não existir."""
+        try:
+            if not inspect(self.__origin).has_table(table_name):
+                return None
+            return ReflectionCache.table(self.__origin, table_name)
+
+        except Exception as error:
+            Log.warning(f"Não foi possível refletir a tabela {table_name}: {error}")
+            return None
+
+    def __validate(self, name: str, config: dict, source: Table, issues: list[Issue]) -> None:
+        """
+        Confere os campos e transformações da tabela contra os esquemas refletidos.
+
+        As colunas do destino são conferidas depois, sobre a amostra
+        transformada, pois transformações como `rename` e `split` alteram
+        as colunas que chegam à carga.
+        """
+        fields = config.get('fields', {})
+        source_columns = set(source.columns.keys())
+
+        for field, info in fields.items():
+            if field.lower() not in source_columns:
+                issues.append(Issue('erro', name, f"coluna '{field}' não existe na origem '{source.name}'"))
+
+            for option, value in info.get('transform', {}).items():
+                if value and TransformRegistry.get(option) is None:
+                    issues.append(Issue('aviso', name, f"transformação '{option}' desconhecida será ignorada"))
+
+        incremental = config.get('incremental')
+        if incremental and incremental['column'].lower() not in source_columns:
+            issues.append(Issue('erro', name, f"coluna incremental '{incremental['column']}' não existe na origem"))
+
+        destiny = config.get('destiny', '')
+        if self.__type_map.columns(destiny) is None:
+            issues.append(Issue('aviso', name, f"tabela de destino '{destiny}' não existe e será criada"))
+
+    def __sample(self, source: Table) -> tuple[DataFrame, float | None]:
+        """Lê (uma única vez por tabela) as primeiras linhas da tabela e mede a vazão da leitura."""
+        if source.name not in self.__samples:
+            self.__samples[source.name] = self.__read_sample(source)
+        return self.__samples[source.name]
+
+    def __read_sample(self, source: Table) -> tuple[DataFrame, float | None]:
+        """Lê as primeiras linhas da tabela e mede a vazão da leitura."""
+        try:
+            start = perf_counter()
+            with self.__origin.connect() as connection:
+                result = connection.execute(source.select().limit(self.__sample_rows))
+                sample = DataFrame(result.fetchall(), columns=result.keys())
+            elapsed = perf_counter() - start
+
+        except Exception as error:
+            Log.warning(f"Não foi possível ler a amostra da tabela {source.name}: {error}")
+            return DataFrame(), None
+
+        return sample, (len(sample) / elapsed if len(sample) and elapsed else None)
+
+    def __transform_sample(self, name: str, config: dict, sample: DataFrame, issues: list[Issue]) -> float | None:
+        """
+        Transforma a amostra em memória, mede a vazão e confere os tipos do destino.
+
+        Falhas das transformações e incompatibilidades de tipo com o destino
+        são registradas como problemas do plano em vez de encerrar a execução.
+        As tabelas usadas pela transformação `lookup` entram com suas próprias
+        amostras, de modo que parte das chaves pode ficar sem correspondência.
+        """
+        if not len(sample):
+            issues.append(Issue('aviso', name, "tabela de origem vazia, colunas do destino não conferidas"))
+            return None
+
+        raw_data = {name: sample}
+        for reference in self.__references(config):
+            source = self.__reflect(self.__tables.get(reference, {}).get('table', ''))
+            if source is not None:
+                raw_data[reference] = self.__sample(source)[0]
+
+        contract = ExtractContract(font=None, raw_data=raw_data, extraction_date=date.today())
+        try:
+            start = perf_counter()
+            result = Transformer(contract, export=False, changes_dir=None).transform({name: config})
+            elapsed = perf_counter() - start
+
+        except SystemExit:
+            issues.append(Issue('erro', name, "falha ao transformar a amostra, verifique o log"))
+            return None
+
+        destiny = config.get('destiny', '')
+        try:
+            self.__type_map.prepare(destiny, result.clean_data[0][destiny])
+
+        except ValueError as error:
+            issues.append(Issue('erro', name, str(error)))
+
+        return len(sample) / elapsed if elapsed else None
+
+    @staticmethod
+    def __references(config: dict) -> set[str]:
+        """Tabelas do `systems.json` usadas pela transformação `lookup` da tabela."""
+        return {
+            info['transform']['lookup']['table']
+            for info in config.get('fields', {}).values()
+            if isinstance(info.get('transform', {}).get('lookup'), Mapping) and 'table' in info['transform']['lookup']
+        }
+
+    def __report_rates(self) -> dict[tuple[str, str | None], float]:
+        """
+        Calcula a vazão por etapa e tabela a partir dos relatórios recentes.
+
+        As chaves são `(etapa, tabela)` e `(etapa, None)` para a média da etapa.
+        """
+        paths = sorted(glob(os.path.join(self.__reports_dir, "run_*.json")))[-self.__history:]
+        totals: dict[tuple[str, str | None], list[float]] = {}
+
+        for path in paths:
+            try:
+                with open(path, encoding='utf-8') as file:
+                    report = load(file)
+
+            except (OSError, ValueError):
+                continue
+
+            for measure in report.get('measures', []):
+                if measure.get('op') is not None or not measure.get('rows') or not measure.get('seconds'):
+                    continue
+
+                for key in ((measure['stage'], measure['table']), (measure['stage'], None)):
+                    rows, seconds = totals.get(key, [0.0, 0.0])
+                    totals[key] = [rows + measure['rows'], seconds + measure['seconds']]
+
+        return {key: rows / seconds for key, (rows, seconds) in totals.items()}
+
+    @staticmethod
+    def __duration(seconds: float | None) -> str:
+        """Formata uma duração prevista em horas, minutos e segundos."""
+        if seconds is None:
+            return "?"
+        minutes, secs = divmod(round(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:d}:{minutes:02d}:{secs:02d}"
@@ -0,0 +1,342 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from collections import namedtuple
+from collections.abc import Mapping
+from datetime import date
+from math import ceil
+from time import perf_counter
+from pandas import DataFrame, Series, concat
+from rich.table import Table as RichTable
+from sqlalchemy import Engine, Table, func, inspect, literal_column, select, tablesample
+from utils.log import Log
+from utils.reflection_cache import ReflectionCache
+from stages.contracts.extract_contract import ExtractContract
+from stages.contracts.transform_contract import TransformContract
+from stages.extract.row_counter import RowCounter
+from stages.load.load_data import Loader
+from stages.transform.registry import TransformRegistry
+from stages.transform.transform_data import Transformer
+
+Preview = namedtuple('Preview', ['name', 'destiny', 'before', 'after', 'sample', 'seconds', 'error'])
+
+
+class Previewer:
+    """
+    Executa a transformação de uma amostra de cada tabela, para conferir a configuração em segundos.
+
+    De cada tabela são lidas no máximo `rows` linhas, por uma das amostragens:
+
+    - `first`: as primeiras linhas da tabela;
+    - `keys`: faixas de linhas espalhadas pela chave primária numérica
+      (sempre as mesmas, para comparar prévias entre alterações do `systems.json`);
+    - `native`: a amostragem do próprio banco (`TABLESAMPLE` no SQL Server).
+
+    Quando a amostragem pedida não se aplica à tabela (ex: sem chave numérica),
+    a seguinte da lista acima, até `first`, é usada. As tabelas usadas pela
+    transformação `lookup` são lidas apenas nas linhas cujas chaves aparecem
+    na amostra. A amostra passa por toda a transformação, sem detecção de
+    alterações, e `render` mostra o antes e o depois de cada coluna.
+
+    Args:
+            origin_engine (Engine): Engine do SQLAlchemy do banco de origem.
+            rows (int): Linhas lidas por tabela. O padrão é 1000.
+            sample (str): Amostragem: 'first', 'keys' ou 'native'. O padrão é 'first'.
+            examples (int): Exemplos de valores alterados exibidos por coluna. O padrão é 3.
+
+    Raises:
+            ValueError: Se a amostragem for desconhecida.
+    """
+
+    SAMPLES: tuple[str, ...] = ('first', 'keys', 'native')
+
+    __KEY_RANGES: int = 10
+    __IN_CHUNK: int = 1000
+
+    def __init__(self, origin_engine: Engine, rows: int = 1000, sample: str = 'first', examples: int = 3) -> None:
+        if sample not in self.SAMPLES:
+            raise ValueError(f"amostragem '{sample}' desconhecida; use {', '.join(self.SAMPLES)}")
+
+        self.__origin = origin_engine
+        self.__rows = rows
+        self.__sample = sample
+        self.__examples = examples
+        self.__counter = RowCounter(origin_engine)
+
+    def preview(self, tables: Mapping[str, Mapping]) -> list[Preview]:
+        """
+        Lê e transforma a amostra de cada tabela.
+
+        Falhas de leitura ou de transformação de uma tabela são registradas
+        na sua prévia (`error`) em vez de interromper as demais.
+
+        Args:
+            tables (Mapping[str, Mapping]): A configuração de tabelas do `systems.json`.
+
+        Returns:
+            list[Preview]: Uma prévia por tabela, na ordem do arquivo.
+        """
+        previews = []
+        for name, config in tables.items():
+            with Log.context(stage='preview', table=name):
+                previews.append(self.__preview_table(name, config, tables))
+        return previews
+
+    @staticmethod
+    def load(previews: list[Preview], engine: Engine, bulk_load: bool = False) -> int:
+        """
+        Carrega as amostras transformadas em um destino de rascunho.
+
+        Args:
+            previews (list[Preview]): As prévias de `preview`; as com erro são ignoradas.
+            engine (Engine): Engine do SQLAlchemy do destino de rascunho.
+            bulk_load (bool): Se a carga usa o modo em massa do destino.
+
+        Returns:
+            int: A quantidade de linhas enviadas ao destino.
+
+        Raises:
+            SystemExit: Se a carga falhar.
+        """
+        loaded = [item for item in previews if item.error is None]
+        clean_data = [{item.destiny: item.after} for item in loaded]
+        if clean_data:
+            Loader(TransformContract(clean_data=clean_data, transform_date=date.today()), engine, bulk_load).load()
+        return sum(len(item.after) for item in loaded)
+
+    def render(self, preview: Preview, config: Mapping) -> RichTable:
+        """
+        Monta a tabela do Rich com o antes e o depois de cada coluna da prévia.
+
+        Para cada campo são exibidos o tipo, os nulos e a quantidade de valores
+        alterados antes e depois da transformação, com alguns exemplos. As
+        colunas criadas pelas transformações (ex: `split`, `lookup`) aparecem
+        como novas. Se a transformação mudar a quantidade de linhas (ex:
+        `select`, `dedup`), as linhas não são comparadas uma a uma.
+        """
+        before, after = preview.before, preview.after
+        aligned = after is not None and len(before) == len(after)
+        rows = f"{len(before):,} → {len(after):,}" if after is not None else f"{len(before):,}"
+
+        table = RichTable(title=f"Prévia de {preview.name} → {preview.destiny} "
+                                f"({rows} linhas, amostra {preview.sample}, {preview.seconds:.2f}s)")
+        for column in ("Campo", "Destino", "Tipo", "Nulos", "Alterados", "Exemplos (antes → depois)"):
+            table.add_column(column, justify="right" if column in ("Nulos", "Alterados") else "left")
+
+        if after is None:
+            return table
+
+        matched = set()
+        for field, info in config.get('fields', {}).items():
+            source = field.lower()
+            column = self.__after_column(info, after)
+            old = before[source] if source in before.columns else None
+
+            if column is None:
+                table.add_row(field, f"{info.get('field_destiny')} (removido)", self.__dtype(old), "", "", "")
+                continue
+
+            matched.add(column)
+            new = after[column]
+            changed = self.__changed(old, new) if aligned and old is not None else None
+            table.add_row(
+                field,
+                column,
+                f"{self.__dtype(old)} → {new.dtype}",
+                f"{int(old.isna().sum()) if old is not None else '?'} → {int(new.isna().sum())}",
+                f"{int(changed.sum()):,}" if changed is not None else "?",
+                self.__pairs(old, new, changed) if changed is not None else self.__values(new),
+            )
+
+        for column in after.columns:
+            if column not in matched:
+                new = after[column]
+                table.add_row("", f"{column} (novo)", str(new.dtype), str(int(new.isna().sum())), "",
+                              self.__values(new))
+
+        return table
+
+    def __preview_table(self, name: str, config: Mapping, tables: Mapping[str, Mapping]) -> Preview:
+        """Lê a amostra da tabela e das tabelas de `lookup` e a transforma."""
+        destiny = config.get('destiny', '')
+        start = perf_counter()
+        try:
+            source = self.__reflect(config['table'])
+            before, sample = self.__read(source)
+            raw_data = {name: before}
+            for reference, spec, field in self.__references(config):
+                if reference in tables:
+                    raw_data[reference] = self.__read_keys(tables[reference]['table'], spec['key'],
+                                                           before.get(field.lower()))
+
+        except Exception as error:
+            Log.error(f"Erro ao ler a amostra da tabela {name}: {error}", trace=True)
+            return Preview(name, destiny, DataFrame(), None, self.__sample, perf_counter() - start, str(error))
+
+        contract = ExtractContract(font=None, raw_data=raw_data, extraction_date=date.today())
+        try:
+            result = Transformer(contract, export=False, changes_dir=None).transform({name: dict(config)})
+            after = result.clean_data[0][destiny]
+
+        except SystemExit:
+            return Preview(name, destiny, before, None, sample, perf_counter() - start,
+                           "falha ao transformar a amostra, verifique o log")
+
+        return Preview(name, destiny, before, after, sample, perf_counter() - start, None)
+
+    def __reflect(self, table_name: str) -> Table:
+        """
+        Reflete a tabela de origem.
+
+        Raises:
+            LookupError: Se a tabela não existir na origem.
+        """
+        if not inspect(self.__origin).has_table(table_name):
+            raise LookupError(f"tabela de origem '{table_name}' não encontrada")
+        return ReflectionCache.table(self.__origin, table_name)
+
+    def __read(self, source: Table) -> tuple[DataFrame, str]:
+        """Lê a amostra pela amostragem configurada ou pela seguinte que se aplicar à tabela."""
+        strategies = self.SAMPLES[:self.SAMPLES.index(self.__sample) + 1][::-1]
+        for strategy in strategies:
+            sample = getattr(self, f'_Previewer__sample_{strategy}')(source)
+            if sample is not None:
+                if strategy != self.__sample:
+                    Log.info(f"Amostragem '{self.__sample}' não se aplica à tabela {source.name}; "
+                             f"usada '{strategy}'")
+                return sample, strategy
+
+        raise RuntimeError(f"nenhuma amostragem se aplica à tabela {source.name}")
+
+    def __sample_first(self, source: Table) -> DataFrame:
+        """As primeiras linhas da tabela."""
+        return self.__fetch(source.select().limit(self.__rows))
+
+    def __sample_keys(self, source: Table) -> DataFrame | None:
+        """
+        Faixas consecutivas de linhas em pontos igualmente espaçados da chave primária numérica.
+
+        Returns:
+            DataFrame | None: A amostra, ou None se a tabela não tiver chave numérica.
+        """
+        key = next((column for column in source.primary_key.columns
+                    if getattr(column.type, 'python_type', None) in (int, float)), None)
+        if key is None:
+            return None
+
+        with self.__origin.connect() as connection:
+            low, high = connection.execute(select(func.min(key), func.max(key))).one()
+        if low is None:
+            return self.__sample_first(source)
+
+        ranges = min(self.__KEY_RANGES, self.__rows)
+        size = ceil(self.__rows / ranges)
+        parts = [
+            self.__fetch(source.select().where(key >= low + (high - low) * part / ranges).order_by(key).limit(size))
+            for part in range(ranges)
+        ]
+        sample = concat(parts, ignore_index=True).drop_duplicates(subset=[key.name])
+        return sample.head(self.__rows).reset_index(drop=True)
+
+    def __sample_native(self, source: Table) -> DataFrame | None:
+        """
+        A amostragem por páginas do banco (`TABLESAMPLE SYSTEM`), com folga sobre as linhas pedidas.
+
+        Returns:
+            DataFrame | None: A amostra, ou None se o dialeto não a oferecer ou
+                              se ela vier com menos linhas que o pedido.
+        """
+        total = self.__counter.estimate(source.name)
+        if self.__origin.dialect.name != 'mssql' or not total:
+            return None
+
+        percent = min(100.0, max(0.01, self.__rows * 4 / total * 100))
+        sampled = tablesample(source, func.system(literal_column(f"{percent:.4f} PERCENT")))
+        sample = self.__fetch(select(sampled).limit(self.__rows))
+        return sample if len(sample) >= min(self.__rows, total) else None
+
+    def __read_keys(self, table_name: str, key: str, values: Series | None) -> DataFrame:
+        """Lê as linhas da tabela de `lookup` cujas chaves aparecem na amostra."""
+        source = self.__reflect(table_name)
+        column = next((item for item in source.columns if item.name.lower() == key.lower()), None)
+        if column is None or values is None:
+            return self.__sample_first(source)
+
+        keys = [value.item() if hasattr(value, 'item') else value for value in values.dropna().unique()]
+        parts = [self.__fetch(source.select().where(column.in_(keys[start:start + self.__IN_CHUNK])))
+                 for start in range(0, len(keys), self.__IN_CHUNK)]
+        if not parts:
+            return self.__fetch(source.select().limit(0))
+        return concat(parts, ignore_index=True)
+
+    def __fetch(self, statement) -> DataFrame:
+        """Executa a consulta e retorna o resultado com as colunas em minúsculas, como na extração."""
+        with self.__origin.connect() as connection:
+            result = connection.execute(statement)
+            return DataFrame(result.fetchall(), columns=[name.lower() for name in result.keys()])
+
+    @staticmethod
+    def __references(config: Mapping) -> list[tuple[str, Mapping, str]]:
+        """As tabelas usadas pela transformação `lookup`, com sua configuração e o campo de busca."""
+        return [
+            (info['transform']['lookup']['table'], info['transform']['lookup'], field)
+            for field, info in config.get('fields', {}).items()
+            if isinstance(info.get('transform', {}).get('lookup'), Mapping) and 'table' in info['transform']['lookup']
+        ]
+
+    @staticmethod
+    def __after_column(info: Mapping, after: DataFrame) -> str | None:
+        """A coluna do resultado que corresponde ao campo (o destino ou a criada por `rename`)."""
+        destiny = info.get('field_destiny')
+        if destiny in after.columns:
+            return destiny
+
+        for option, value in info.get('transform', {}).items():
+            transform = TransformRegistry.get(option)
+            if value and transform is not None and transform.outputs is not None:
+                created = [column for column in transform.outputs(destiny, value) if column in after.columns]
+                if created:
+                    return created[0]
+        return None
+
+    @staticmethod
+    def __changed(old: Series, new: Series) -> Series:
+        """Marca as linhas cujo valor mudou na transformação (nulos iguais não contam)."""
+        old, new = old.reset_index(drop=True), new.reset_index(drop=True)
+        both_null = old.isna() & new.isna()
+        return (old.astype(str) != new.astype(str)) & ~both_null
+
+    def __pairs(self, old: Series, new: Series, changed: Series) -> str:
+        """Alguns exemplos distintos de valores alterados, como 'antes → depois'."""
+        positions = changed.to_numpy().nonzero()[0]
+        pairs = dict.fromkeys(
+            f"{self.__short(old.iloc[position])} → {self.__short(new.iloc[position])}" for position in positions
+        )
+        return "\n".join(list(pairs)[:self.__examples])
+
+    def __values(self, new: Series) -> str:
+        """Alguns valores distintos preenchidos da coluna."""
+        return ", ".join(self.__short(value) for value in new.dropna().unique()[:self.__examples])
+
+    @staticmethod
+    def __short(value) -> str:
+        """Representa o valor em no máximo 40 caracteres."""
+        text = repr(value) if isinstance(value, str) else str(value)
+        return text if len(text) <= 40 else text[:37] + "..."
+
+    @staticmethod
+    def __dtype(series: Series | None) -> str:
+        """O dtype da coluna, ou '?' se ela não existir na amostra."""
+        return str(series.dtype) if series is not None else "?"
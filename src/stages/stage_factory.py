@@ -0,0 +1,92 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+from collections.abc import Collection, Mapping
+from typing import Any
+from sqlalchemy import Engine
+from utils.frame_store import MemoryBudget
+from utils.progress import ProgressReporter
+from stages.contracts.extract_contract import ExtractContract
+from stages.contracts.transform_contract import TransformContract
+from stages.extract.sql_extractor import Extractor
+from stages.load.key_mapper import KeyMapper
+from stages.load.load_data import Loader
+from stages.load.reject_router import RejectRouter
+from stages.transform.lookup import LookupIndex
+from stages.transform.transform_data import Transformer
+
+
+class StageFactory:
+    """
+    Monta as etapas de extração, transformação e carga de uma execução com a mesma configuração.
+
+    O pipeline, os jobs e a sincronização contínua montam as etapas por aqui,
+    com o mesmo orçamento de memória, acompanhamento do progresso e diretórios
+    de trabalho. O mapa de chaves (`KeyMapper`) e o roteador de rejeitos
+    (`RejectRouter`) são criados uma única vez e usados por todas as cargas.
+
+    Com `name` (ex: o nome de um job), cada diretório de trabalho ganha um
+    subdiretório com esse nome, para que execuções diferentes não misturem
+    exportações, índices de alterações, mapas de chaves e rejeitos.
+
+    Args:
+            tables (Mapping[str, Mapping[str, Any]]): Todas as tabelas da
+                                                      configuração, inclusive as
+                                                      pais de `remap`.
+            budget (MemoryBudget | None): Orçamento de memória das tabelas. O padrão é None.
+            progress (ProgressReporter | None): Recebe o avanço de cada etapa. O padrão é None.
+            name (str): Subdiretório de trabalho da execução. O padrão ("") não usa subdiretório.
+            lookups (LookupIndex | None): Índices da transformação `lookup` mantidos
+                                          por quem chama (veja `Transformer`).
+    """
+
+    __EXPORTS_DIR: str = "exports"
+    __CHANGES_DIR: str = os.path.join(".cache", "changes")
+    __KEYMAPS_DIR: str = os.path.join(".cache", "keymaps")
+    __REJECTS_DIR: str = "rejects"
+
+    def __init__(self, tables: Mapping[str, Mapping[str, Any]], budget: MemoryBudget | None = None,
+                 progress: ProgressReporter | None = None, name: str = "", lookups: LookupIndex | None = None) -> None:
+        self.__budget = budget
+        self.__progress = progress
+        self.__name = name
+        self.__lookups = lookups
+        self.__tables = tables
+        self.__key_mapper = KeyMapper(tables, self.__directory(self.__KEYMAPS_DIR))
+        self.__rejects = RejectRouter(tables, self.__directory(self.__REJECTS_DIR))
+
+    def extractor(self, font: str, engine: Engine) -> Extractor:
+        """Monta a extração do banco de origem."""
+        return Extractor(font, engine, self.__budget, self.__progress, tables=self.__tables)
+
+    def transformer(self, extract_contract: ExtractContract, export: bool = True,
+                    upsert: Collection[str] = ()) -> Transformer:
+        """
+        Monta a transformação dos dados extraídos.
+
+        Sem `name`, as exportações ficam no diretório corrente, como no `Transformer`.
+        """
+        return Transformer(extract_contract, self.__budget, self.__progress, export=export,
+                           export_dir=self.__directory(self.__EXPORTS_DIR) if self.__name else "",
+                           changes_dir=self.__directory(self.__CHANGES_DIR), upsert=upsert, lookups=self.__lookups)
+
+    def loader(self, transform_contract: TransformContract, engine: Engine, bulk_load: bool = False) -> Loader:
+        """Monta a carga no banco de destino."""
+        return Loader(transform_contract, engine, bulk_load, self.__progress, self.__key_mapper, self.__rejects)
+
+    def __directory(self, base: str) -> str:
+        """Retorna o diretório de trabalho da execução."""
+        return os.path.join(base, self.__name) if self.__name else base
@@ -0,0 +1,69 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from collections.abc import Callable, Mapping
+from typing import Any
+from stages.extract.watermark import WatermarkStore
+from stages.load.key_mapper import KeyMapper
+from stages.load.reject_router import RejectRouter
+from stages.transform.change_detector import ChangeDetector
+from stages.transform.dedup import Deduplicator
+from stages.transform.expression import Expression
+from stages.transform.lookup import LookupIndex
+
+
+class TableChecks:
+    """
+    Confere os blocos opcionais de cada tabela do `systems.json`.
+
+    Cada bloco é conferido pela classe da etapa que o usa (ex: `dedup` por
+    `Deduplicator.check`); esta classe apenas os reúne, para ser repassada a
+    `JsonConfig.validate` e `JsonConfig.tables_errors`, já que as
+    configurações não dependem das etapas.
+    """
+
+    __BLOCKS: dict[str, Callable[[Any], list[str]]] = {
+        'incremental': WatermarkStore.check,
+        'detect_changes': ChangeDetector.check,
+        'dedup': Deduplicator.check,
+        'key_map': KeyMapper.check,
+        'reject': RejectRouter.check,
+        'computed': Expression.check_computed,
+    }
+
+    @classmethod
+    def errors(cls, name: str, config: Mapping[str, Any], tables: Mapping[str, Any]) -> list[str]:
+        """
+        Lista os problemas dos blocos de uma tabela.
+
+        Args:
+            name (str): Nome da tabela no `systems.json`.
+            config (Mapping[str, Any]): A configuração da tabela.
+            tables (Mapping[str, Any]): Todas as tabelas, para os blocos que
+                se referem a outras (ex: `remap` e `lookup`).
+
+        Returns:
+            list[str]: Uma mensagem por problema encontrado (vazia se válida).
+        """
+        errors = [f"'{block}' {problem}" for block, check in cls.__BLOCKS.items()
+                  if config.get(block) is not None for problem in check(config[block])]
+
+        if config.get('incremental') is not None and config.get('detect_changes') is not None:
+            errors.append("use 'incremental' ou 'detect_changes', não os dois")
+        if config.get('remap') is not None:
+            errors.extend(f"'remap' {problem}" for problem in KeyMapper.check_remap(name, config['remap'], tables))
+
+        errors.extend(LookupIndex.check_references(config, tables))
+        return errors
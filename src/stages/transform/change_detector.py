@@ -0,0 +1,199 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+import shutil
+from collections import namedtuple
+from collections.abc import Mapping, Sequence
+from typing import Any
+import numpy as np
+from pandas import DataFrame, Index, MultiIndex
+from pandas.util import hash_pandas_object
+from utils.config_json import JsonConfig
+from utils.frame_store import ColumnarFile
+from utils.log import Log
+from stages.extract.dtype_optimizer import DtypeOptimizer
+
+Delta = namedtuple('Delta', ['path', 'keys', 'deleted', 'index', 'counts'])
+
+
+class ChangeDetector:
+    """
+    Detecta as linhas inseridas, alteradas e excluídas desde a última carga de uma tabela.
+
+    Para tabelas sem coluna de data ou chave crescente confiável, a tabela é
+    extraída e transformada por completo, mas apenas a diferença é carregada.
+    Cada linha transformada recebe dois hashes de 64 bits, calculados de forma
+    vetorizada com `hash_pandas_object`: um das colunas-chave e outro de todas
+    as colunas. Eles são comparados com o índice chave → hash da última carga
+    concluída, gravado com `ColumnarFile` em `<diretório>/<tabela>` (as
+    colunas-chave e os dois hashes, 16 bytes por linha além das chaves).
+
+    Configurado por tabela no `systems.json`, com as chaves pelos nomes de destino:
+
+        "detect_changes": {"keys": ["codigo_destino"], "delete": true}
+
+    Sem índice anterior (primeira carga), todas as linhas são inseridas. Nas
+    seguintes, as chaves de todas as linhas carregadas (e não só das
+    alteradas) são excluídas do destino antes da inserção, de modo que
+    repetir uma carga, ou retomá-la depois de uma falha entre a confirmação
+    no destino e a gravação do índice, não duplica linhas. O novo índice só
+    é gravado por `commit`, depois que a carga é concluída.
+
+    Args:
+            directory (str): Diretório dos índices das tabelas.
+            chunk_size (int): Linhas hasheadas por vez. O padrão é 100.000.
+    """
+
+    def __init__(self, directory: str = os.path.join(".cache", "changes"), chunk_size: int = 100_000) -> None:
+        self.__directory = directory
+        self.__chunk_size = chunk_size
+
+    @staticmethod
+    def check(config: Any) -> list[str]:
+        """Confere o bloco `detect_changes` de uma tabela."""
+        if not isinstance(config, Mapping) or not JsonConfig.columns(config.get('keys')):
+            return ["deve informar a lista de colunas em 'keys'"]
+        if not isinstance(config.get('delete', True), bool):
+            return ["'delete' deve ser true ou false"]
+        return []
+
+    def detect(self, name: str, config: Mapping[str, Any], df: DataFrame) -> tuple[DataFrame, Delta]:
+        """
+        Compara a tabela transformada com o índice da última carga.
+
+        Args:
+            name (str): Nome da tabela no `systems.json`, que identifica o índice.
+            config (Mapping[str, Any]): O bloco `detect_changes` da tabela.
+            df (DataFrame): A tabela transformada por completo.
+
+        Returns:
+            tuple[DataFrame, Delta]: As linhas inseridas ou alteradas, e a
+                diferença com as chaves a excluir no destino e o novo índice.
+
+        Raises:
+            KeyError: Se alguma coluna-chave não existir na tabela.
+            ValueError: Se houver chaves repetidas na tabela.
+        """
+        keys = list(config['keys'])
+        missing = [key for key in keys if key not in df.columns]
+        if missing:
+            raise KeyError(f"colunas-chave inexistentes: {', '.join(missing)}")
+
+        key_values = df[keys].reset_index(drop=True)
+        key_hash = hash_pandas_object(key_values, index=False, categorize=False).to_numpy()
+        if not Index(key_hash).is_unique:
+            raise ValueError(f"chaves repetidas em {', '.join(keys)}; configure 'dedup' para a tabela")
+
+        row_hash = self.__row_hashes(df)
+        path = os.path.join(self.__directory, name)
+        previous = self.__read(path, keys)
+
+        if previous is None:
+            changed = np.ones(len(df), dtype=bool)
+            counts = {'inserted': len(df), 'updated': 0, 'deleted': 0}
+            deleted = key_values.iloc[0:0]
+        else:
+            previous_key = previous['__key'].to_numpy()
+            position = Index(previous_key).get_indexer(key_hash)
+            inserted = position < 0
+            updated = np.zeros(len(df), dtype=bool)
+            updated[~inserted] = previous['__hash'].to_numpy()[position[~inserted]] != row_hash[~inserted]
+            removed = ~np.isin(previous_key, key_hash) if config.get('delete', True) else np.zeros(len(previous), bool)
+
+            changed = inserted | updated
+            counts = {'inserted': int(inserted.sum()), 'updated': int(updated.sum()), 'deleted': int(removed.sum())}
+            deleted = DataFrame({
+                key: np.concatenate([previous[key].to_numpy()[removed], key_values[key].to_numpy()[changed]])
+                for key in keys
+            })
+
+        index = key_values.assign(__key=key_hash, __hash=row_hash)
+        Log.info("Alterações desde a última carga: %d inserida(s), %d alterada(s) e %d excluída(s)",
+                 counts['inserted'], counts['updated'], counts['deleted'])
+
+        return df[changed].reset_index(drop=True), Delta(path, tuple(keys), deleted, index, counts)
+
+    @staticmethod
+    def replace(keys: Sequence[str], df: DataFrame) -> Delta:
+        """
+        Monta a diferença que substitui no destino as linhas de mesma chave, sem índice a gravar.
+
+        Usada na sincronização incremental com `keys`: as linhas extraídas
+        desde a marca d'água são inseridas ou alteradas na origem, então as
+        suas chaves são excluídas do destino antes da inserção.
+
+        Raises:
+            KeyError: Se alguma coluna-chave não existir na tabela.
+        """
+        keys = list(keys)
+        missing = [key for key in keys if key not in df.columns]
+        if missing:
+            raise KeyError(f"colunas-chave inexistentes: {', '.join(missing)}")
+
+        deleted = df[keys].reset_index(drop=True)
+        return Delta(None, tuple(keys), deleted, None, {'inserted': len(df), 'updated': 0, 'deleted': 0})
+
+    @staticmethod
+    def commit(delta: Delta) -> None:
+        """Grava o índice da carga concluída, substituindo o anterior."""
+        if delta.path is None:
+            return
+
+        temporary = f"{delta.path}.tmp"
+        shutil.rmtree(temporary, ignore_errors=True)
+        ColumnarFile.write(delta.index, temporary)
+        shutil.rmtree(delta.path, ignore_errors=True)
+        os.replace(temporary, delta.path)
+
+    @staticmethod
+    def forget(delta: Delta, rows: DataFrame) -> Delta:
+        """
+        Remove do novo índice as linhas não carregadas, para que sejam tentadas de novo na próxima carga.
+
+        As chaves dessas linhas também saem das exclusões, para que a versão
+        anterior de uma linha alterada e rejeitada continue no destino.
+        """
+        keys = list(delta.keys)
+        index = delta.index
+        if index is not None:
+            key_hash = hash_pandas_object(rows[keys].reset_index(drop=True),
+                                          index=False, categorize=False).to_numpy()
+            index = index[~np.isin(index['__key'].to_numpy(), key_hash)].reset_index(drop=True)
+        rejected = MultiIndex.from_frame(rows[keys])
+        deleted = delta.deleted[~MultiIndex.from_frame(delta.deleted[keys]).isin(rejected)].reset_index(drop=True)
+        return delta._replace(deleted=deleted, index=index)
+
+    def __row_hashes(self, df: DataFrame) -> np.ndarray:
+        """Calcula, em blocos, o hash de todas as colunas de cada linha com os dtypes originais."""
+        result = np.empty(len(df), dtype=np.uint64)
+        for start in range(0, len(df), self.__chunk_size):
+            chunk = DtypeOptimizer.restore(df.iloc[start:start + self.__chunk_size])
+            result[start:start + len(chunk)] = hash_pandas_object(chunk, index=False, categorize=False).to_numpy()
+
+        return result
+
+    @staticmethod
+    def __read(path: str, keys: list[str]) -> DataFrame | None:
+        """Lê o índice anterior; um índice ausente ou com outras chaves é tratado como inexistente."""
+        if not os.path.isdir(path):
+            return None
+
+        index = ColumnarFile.read(path, mmap=False)
+        if [column for column in index.columns if column not in ('__key', '__hash')] != keys:
+            Log.warning(f"Índice de alterações em {path} usa outras chaves e será refeito.")
+            return None
+
+        return index
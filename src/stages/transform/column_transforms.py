@@ -0,0 +1,249 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from threading import Lock
+from typing import Any
+from unicodedata import normalize
+from warnings import catch_warnings, simplefilter
+import numpy as np
+from pandas import NaT, Series, factorize, to_datetime
+from pandas.api.types import infer_dtype, is_datetime64_any_dtype, is_float_dtype, is_object_dtype
+from pandas.tseries.api import guess_datetime_format
+from utils.log import Log
+from stages.transform.fixed_width import FixedWidth
+
+
+class ColumnTransforms:
+    """
+    Transformações embutidas que operam sobre uma única coluna (Series).
+
+    Cada método recebe a coluna e o valor configurado no `systems.json` e
+    devolve a coluna transformada, com o mesmo índice. Nenhum deles lê outras
+    colunas ou altera a quantidade de linhas, então podem ser fundidos e
+    aplicados em blocos pelo `TransformRegistry`, que também trata os erros.
+    """
+
+    __date_lock: Lock = Lock()
+    __date_formats: dict[tuple[str, str], str] = {}
+    __date_table: ContextVar[str | None] = ContextVar('date_table', default=None)
+    __SENTINEL_DATES: tuple[str, ...] = ('1899-12-30', '1899-12-31', '1900-01-01')
+    __BLANKS: tuple[str, ...] = ('', 'None', 'nan', 'NaN', 'NaT', '<NA>')
+
+    __CLEAR: str = r'[^a-zA-Z0-9\s\n.-\/àáâãäèéêëìíîïòóôõöùúûüçñÀÁÂÃÄÈÉÊËÌÍÎÏÒÓÔÕÖÙÚÛÜÇÑº*ª]'
+
+    # tipo: (expressão de busca, substituição, padrões de largura fixa, layout)
+    __FORMATS: dict[str, tuple[str, str, tuple[str, ...], str]] = {
+        'CPF': (r'([0-9]{3})([0-9]{3})([0-9]{3})([0-9]{2})', r'\1.\2.\3-\4',
+                ('99999999999',), '###.###.###-##'),
+        'CNPJ': (r'([0-9]{2})([0-9]{3})([0-9]{3})([0-9]{4})([0-9]{2})', r'\1.\2.\3/\4-\5',
+                 ('99999999999999',), '##.###.###/####-##'),
+        'DATETIME': (r'([0-9]{4})[-./ ]?([0-9]{2})[-./ ]?([0-9]{2})', r'\1-\2-\3 00:00:00.000',
+                     ('99999999', '9999?99?99'), '####-##-## 00:00:00.000'),
+        'CEP': (r'([0-9]{5})([0-9]{3})', r'\1-\2',
+                ('99999999',), '#####-###'),
+    }
+
+    @staticmethod
+    def trim(series: Series, value: Any) -> Series:
+        """Remove espaços em branco do início e do fim dos valores."""
+        return series.astype(str).str.strip()
+
+    @staticmethod
+    def upper(series: Series, value: Any) -> Series:
+        """Converte todos os caracteres para maiúsculas."""
+        return series.astype(str).str.upper()
+
+    @staticmethod
+    def lower(series: Series, value: Any) -> Series:
+        """Converte todos os caracteres para minúsculas."""
+        return series.astype(str).str.lower()
+
+    @staticmethod
+    def switch(series: Series, value: Mapping[str, Any]) -> Series:
+        """
+        Substitui múltiplos valores com base nas listas de 'de/para'.
+
+        Args:
+            series (Series): Coluna a ser modificada.
+            value (Mapping[str, Any]): 'str_from' (valores a serem
+                                       substituídos) e 'str_to' (novos valores).
+        """
+        series = series.astype(str)
+        for old, new in zip(value['str_from'], value['str_to']):
+            series = series.str.replace(r'\b{}\b'.format(old), new, regex=True)
+        return series
+
+    @classmethod
+    def clear(cls, series: Series, value: Any) -> Series:
+        """Remove caracteres especiais e troca os acentuados por seus equivalentes normais."""
+        series = series.astype(str).str.replace(cls.__CLEAR, '', regex=True)
+        return series.map(lambda x: normalize('NFKD', x).encode('ASCII', 'ignore').decode('ASCII'))
+
+    @classmethod
+    def format(cls, series: Series, value: str) -> Series:
+        """
+        Formata os valores para padrões específicos (CPF, CNPJ, etc.).
+
+        Os valores que seguem exatamente o padrão de entrada (ex: os 11 dígitos
+        de um CPF) são formatados por `FixedWidth`, com arrays de bytes; os
+        demais, pela expressão regular, com o mesmo resultado.
+
+        Args:
+            series (Series): Coluna a ser modificada.
+            value (str): O tipo de formato, ex: 'CPF', 'CNPJ', 'DATETIME', 'CEP'.
+        """
+        search, replace, patterns, layout = cls.__FORMATS[value]
+        return FixedWidth.format(series.astype(str), patterns, layout, search, replace)
+
+    @classmethod
+    @contextmanager
+    def date_scope(cls, table: str) -> Iterator[None]:
+        """
+        Identifica a tabela em transformação no bloco, para o cache de formatos de `date`.
+
+        O formato inferido fica em cache pela tabela e pela coluna; fora de um
+        bloco, ele é inferido a cada conversão. Vale apenas para a thread (ou
+        tarefa) corrente.
+
+        Exemplo:
+            with ColumnTransforms.date_scope('clientes'):
+                ColumnTransforms.date(series, True)
+        """
+        token = cls.__date_table.set(table)
+        try:
+            yield
+        finally:
+            cls.__date_table.reset(token)
+
+    @classmethod
+    def date(cls, series: Series, value: Any) -> Series:
+        """
+        Converte a coluna para datas tipadas (datetime64), de forma vetorizada.
+
+        Diferente de `format` 'DATETIME', que reescreve o texto e descarta as
+        horas, a coluna chega à carga já tipada. O formato pode ser informado
+        ou inferido pelo primeiro valor preenchido; o formato inferido fica em
+        cache por tabela e coluna (veja `date_scope`) e é reaproveitado
+        enquanto servir (o dia vem antes do mês, exceto quando o valor começa pelo ano). Datas-sentinela de
+        sistemas legados (ex: 1899-12-30) e datas zeradas (ex: 0000-00-00)
+        resultam em nulo, assim como os valores fora do formato, que são
+        contados no log. Formatos ISO usam o caminho rápido do pandas, e os
+        demais de largura fixa (ex: '%d/%m/%Y') são lidos por `FixedWidth`,
+        sem `strptime` linha a linha. Com o formato inferido, os poucos valores que não o
+        seguem (ex: data com hora numa coluna só de datas) são convertidos um a um.
+
+        Args:
+            series (Series): Coluna a ser modificada; o nome, com a tabela de
+                             `date_scope`, identifica o formato em cache.
+            value (Any): True (formato inferido), um formato (ex: '%d/%m/%Y')
+                         ou um objeto com 'format' e 'sentinels' (as datas
+                         tratadas como nulas).
+        """
+        spec = value if isinstance(value, Mapping) else {'format': value}
+        date_format = spec.get('format') if isinstance(spec.get('format'), str) else None
+
+        parsed = cls.__parse_dates(series, str(series.name), date_format)
+        sentinels = to_datetime(list(spec.get('sentinels', cls.__SENTINEL_DATES)))
+        return parsed.mask(parsed.dt.normalize().isin(sentinels))
+
+    @staticmethod
+    def check_date(value: Any) -> str | None:
+        """Confere a configuração da transformação `date`."""
+        spec = value if isinstance(value, Mapping) else {'format': value}
+        date_format = spec.get('format', True)
+        if not (date_format is True or (isinstance(date_format, str) and '%' in date_format)):
+            return "deve ser true, um formato (ex: '%d/%m/%Y') ou um objeto com 'format' e 'sentinels'"
+
+        sentinels = spec.get('sentinels', ())
+        if not isinstance(sentinels, tuple) or not all(isinstance(item, str) and item for item in sentinels):
+            return "deve informar as datas tratadas como nulas em 'sentinels'"
+        return None
+
+    @classmethod
+    def check_format(cls, value: Any) -> str | None:
+        """Confere a configuração da transformação `format`."""
+        return None if value in cls.__FORMATS else "deve ser 'CPF', 'CNPJ', 'DATETIME' ou 'CEP'"
+
+    @classmethod
+    def __parse_dates(cls, series: Series, column: str, date_format: str | None) -> Series:
+        """Converte a coluna para datetime64 pelo formato informado ou inferido, com nulo nos valores inválidos."""
+        if is_datetime64_any_dtype(series):
+            return series
+
+        if is_object_dtype(series) and infer_dtype(series, skipna=True) in ('datetime', 'date', 'datetime64'):
+            return to_datetime(series, errors='coerce')
+
+        if is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+            series = series.astype('Int64')
+
+        codes, uniques = factorize(series)
+        text = Series(uniques, dtype=object).astype(str)
+        blank = text.isin(cls.__BLANKS)
+        parsed = Series(NaT, index=text.index, dtype='datetime64[ns]')
+
+        if not blank.all():
+            inferred = date_format is None
+            date_format = date_format or cls.__date_format(column, text[~blank].iloc[0].strip())
+            pending = ~blank.to_numpy()
+
+            fixed = None
+            if date_format != 'mixed' and not date_format.startswith('%Y'):
+                fixed = FixedWidth.dates(text.to_numpy(dtype=object), date_format)
+            if fixed is not None:
+                mask, values = fixed
+                parsed[mask] = values
+                pending &= ~mask
+
+            if pending.any():
+                options = {'dayfirst': True} if date_format == 'mixed' else {}
+                parsed[pending] = to_datetime(text[pending], format=date_format, errors='coerce', **options)
+
+            failed = parsed.isna() & ~blank
+            if inferred and date_format != 'mixed' and failed.any():
+                parsed[failed] = to_datetime(text[failed].str.strip(), format='mixed', dayfirst=True, errors='coerce')
+                failed = parsed.isna() & ~blank
+
+            invalid = failed & ~text.str.fullmatch(r'[0\W_]+')
+            if invalid.any():
+                count = int(np.bincount(codes[codes >= 0], minlength=len(text))[invalid.to_numpy()].sum())
+                Log.warning("%d valor(es) da coluna '%s' fora do formato %s ficaram nulos", count, column, date_format)
+
+        result = np.full(len(codes), np.datetime64('NaT'), dtype='datetime64[ns]')
+        result[codes >= 0] = parsed.to_numpy()[codes[codes >= 0]]
+        return Series(result, index=series.index, name=series.name)
+
+    @classmethod
+    def __date_format(cls, column: str, sample: str) -> str:
+        """Retorna o formato em cache da tabela e coluna, se servir para a amostra, ou infere um novo."""
+        table = cls.__date_table.get()
+        with cls.__date_lock:
+            cached = cls.__date_formats.get((table, column)) if table is not None else None
+            if cached is not None:
+                try:
+                    datetime.strptime(sample, cached)
+                    return cached
+                except ValueError:
+                    pass
+
+            with catch_warnings():
+                simplefilter('ignore', UserWarning)
+                date_format = guess_datetime_format(sample, dayfirst=not sample[:4].isdigit()) or 'mixed'
+            if table is not None:
+                cls.__date_formats[(table, column)] = date_format
+            return date_format
@@ -0,0 +1,146 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from collections.abc import Mapping
+from typing import Any
+import numpy as np
+from pandas import DataFrame, Series
+from pandas.util import hash_pandas_object
+from utils.config_json import JsonConfig
+from utils.log import Log
+
+
+class Deduplicator:
+    """
+    Remove linhas duplicadas comparando impressões digitais de 64 bits das colunas-chave.
+
+    Em vez de `drop_duplicates` sobre colunas de texto largas, as colunas-chave
+    são normalizadas (ex: sem espaços nas pontas, sem acentos, em maiúsculas)
+    e transformadas, de forma vetorizada, em um hash de 64 bits por linha com
+    `hash_pandas_object`. A duplicidade é decidida sobre esse vetor de inteiros.
+
+    O cálculo é feito em blocos de linhas, de modo que as cópias normalizadas
+    das colunas existam apenas para um bloco por vez; para a tabela inteira
+    fica em memória somente o vetor de hashes (8 bytes por linha). A chance
+    de dois valores distintos terem o mesmo hash é pequena, mas não nula
+    (cerca de 1 em 370 mil para 10 milhões de linhas): por isso só as linhas
+    com hash repetido são normalizadas de novo, juntas, e removidas apenas se
+    os valores das chaves forem de fato iguais.
+
+    Configurado por tabela no `systems.json`:
+
+        "dedup": {"keys": ["cpf_destino"], "normalize": ["trim", "clear"], "keep": "first"}
+
+    Args:
+            config (Mapping[str, Any]): O bloco `dedup` da tabela. `keys` são as
+                                        colunas (já com os nomes de destino),
+                                        `normalize` as normalizações aplicadas
+                                        antes da comparação e `keep` indica qual
+                                        ocorrência manter, 'first' (padrão) ou 'last'.
+            chunk_size (int): Linhas normalizadas e hasheadas por vez. O padrão é 100.000.
+    """
+
+    __SPECIAL = r'[^a-zA-Z0-9\s.\-/]'
+    __NORMALIZE: tuple[str, ...] = ('trim', 'upper', 'lower', 'clear')
+
+    def __init__(self, config: Mapping[str, Any], chunk_size: int = 100_000) -> None:
+        self.__keys = list(config['keys'])
+        self.__normalize = list(config.get('normalize', ()))
+        self.__keep = config.get('keep', 'first')
+        self.__chunk_size = chunk_size
+
+    @classmethod
+    def check(cls, config: Any) -> list[str]:
+        """Confere o bloco `dedup` de uma tabela."""
+        if not isinstance(config, Mapping):
+            return ["deve ser um objeto"]
+
+        errors = []
+        if not JsonConfig.columns(config.get('keys')):
+            errors.append("deve informar a lista de colunas em 'keys'")
+
+        normalize = config.get('normalize', ())
+        if not isinstance(normalize, tuple) or not all(option in cls.__NORMALIZE for option in normalize):
+            errors.append(f"'normalize' deve ser uma lista com {', '.join(cls.__NORMALIZE)}")
+
+        if config.get('keep', 'first') not in ('first', 'last'):
+            errors.append("'keep' deve ser 'first' ou 'last'")
+
+        return errors
+
+    def fingerprints(self, df: DataFrame) -> np.ndarray:
+        """
+        Calcula o hash de 64 bits das colunas-chave normalizadas de cada linha.
+
+        Raises:
+            KeyError: Se alguma coluna-chave não existir no DataFrame.
+        """
+        missing = [key for key in self.__keys if key not in df.columns]
+        if missing:
+            raise KeyError(f"colunas-chave inexistentes: {', '.join(missing)}")
+
+        result = np.empty(len(df), dtype=np.uint64)
+        for start in range(0, len(df), self.__chunk_size):
+            chunk = df.iloc[start:start + self.__chunk_size]
+            keys = DataFrame({key: self.__normalized(chunk[key]) for key in self.__keys})
+            result[start:start + len(chunk)] = hash_pandas_object(keys, index=False, categorize=False).to_numpy()
+
+        return result
+
+    def deduplicate(self, df: DataFrame) -> DataFrame:
+        """
+        Retorna o DataFrame sem as linhas cujas chaves normalizadas se repetem.
+
+        As linhas com hash repetido são confirmadas pelos valores das chaves,
+        de modo que uma colisão de hash nunca remove uma linha distinta.
+
+        Raises:
+            KeyError: Se alguma coluna-chave não existir no DataFrame.
+        """
+        candidates = np.flatnonzero(Series(self.fingerprints(df)).duplicated(keep=False).to_numpy())
+        if not len(candidates):
+            return df
+
+        rows = df.iloc[candidates]
+        keys = DataFrame({position: self.__normalized(rows[key]) for position, key in enumerate(self.__keys)})
+        duplicated = np.zeros(len(df), dtype=bool)
+        duplicated[candidates] = keys.duplicated(keep=self.__keep).to_numpy()
+        removed = int(duplicated.sum())
+        if not removed:
+            return df
+
+        Log.info("%d linha(s) duplicada(s) removida(s) pelas chaves %s", removed, ', '.join(self.__keys))
+        return df[~duplicated].reset_index(drop=True)
+
+    def __normalized(self, series: Series) -> Series:
+        """Aplica as normalizações configuradas a uma coluna-chave, preservando os nulos."""
+        if not self.__normalize:
+            return series
+
+        values = series.astype(object).where(series.notna(), None)
+        text = values.where(values.isna(), values.astype(str))
+
+        for option in self.__normalize:
+            if option == 'trim':
+                text = text.str.strip()
+            elif option == 'upper':
+                text = text.str.upper()
+            elif option == 'lower':
+                text = text.str.lower()
+            elif option == 'clear':
+                text = (text.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+                        .str.replace(self.__SPECIAL, '', regex=True))
+
+        return text
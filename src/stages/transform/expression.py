@@ -0,0 +1,320 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import ast
+import operator
+from collections.abc import Callable, Mapping
+from decimal import Decimal
+from threading import Lock
+from typing import Any
+import numpy as np
+from pandas import DataFrame, Series, to_numeric
+from pandas.api.types import infer_dtype, is_float_dtype, is_object_dtype
+
+
+class Expression:
+    """
+    Expressão de coluna calculada, compilada uma única vez e avaliada de forma vetorizada.
+
+    O texto é uma expressão Python restrita sobre as colunas do DataFrame
+    (pelos nomes de destino), avaliada coluna a coluna, sem laço por linha:
+
+        preco * quantidade
+        trim(endereco) + ', ' + str(numero)
+        'S' if saldo > 0 else 'N'
+        coalesce(celular, telefone)
+
+    São aceitos constantes, os operadores aritméticos (`+ - * / // % **`), as
+    comparações, `and`/`or`/`not`, `x if condição else y` e as funções `abs`,
+    `round`, `int`, `float`, `str`, `upper`, `lower`, `trim` e `coalesce`.
+    Qualquer outra construção (atributos, índices, chamadas arbitrárias) é
+    rejeitada na compilação, então a expressão não executa código além disso.
+
+    Colunas de texto com números entram como números nas operações; em `+`
+    entre textos, os valores são concatenados. Colunas Decimal (ex: NUMERIC do
+    Firebird) mantêm a aritmética exata de Decimal com inteiros, Decimais e
+    números escritos na expressão (`preco * 1.1`); só passam a float quando
+    combinadas com uma coluna de ponto flutuante.
+
+    Args:
+            text (str): A expressão.
+
+    Raises:
+            SyntaxError: Se a expressão for inválida ou usar uma construção não permitida.
+    """
+
+    __lock: Lock = Lock()
+    __compiled: dict[str, 'Expression'] = {}
+
+    __NUMERIC: tuple[str, ...] = ('integer', 'floating', 'decimal', 'mixed-integer-float')
+
+    __OPERATORS: dict[type, Callable[[Any, Any], Any]] = {
+        ast.Add: operator.add,
+        ast.Sub: operator.sub,
+        ast.Mult: operator.mul,
+        ast.Div: operator.truediv,
+        ast.FloorDiv: operator.floordiv,
+        ast.Mod: operator.mod,
+        ast.Pow: operator.pow,
+        ast.Eq: operator.eq,
+        ast.NotEq: operator.ne,
+        ast.Lt: operator.lt,
+        ast.LtE: operator.le,
+        ast.Gt: operator.gt,
+        ast.GtE: operator.ge,
+    }
+
+    def __init__(self, text: str) -> None:
+        self.__text = text
+        self.__columns: list[str] = []
+        self.__evaluate = self.__compile(ast.parse(text.strip(), mode='eval').body)
+
+    @classmethod
+    def compile(cls, text: str) -> 'Expression':
+        """
+        Retorna a expressão compilada, reaproveitando a compilação anterior do mesmo texto.
+
+        Raises:
+            SyntaxError: Se a expressão for inválida ou usar uma construção não permitida.
+        """
+        with cls.__lock:
+            if text not in cls.__compiled:
+                cls.__compiled[text] = cls(text)
+            return cls.__compiled[text]
+
+    @classmethod
+    def check(cls, value: Any) -> str | None:
+        """Confere a configuração da transformação `expr`."""
+        if not isinstance(value, str) or not value.strip():
+            return "deve ser uma expressão, ex: 'preco * quantidade'"
+        try:
+            cls.compile(value)
+        except SyntaxError as error:
+            return f"tem expressão inválida: {error.msg}"
+        return None
+
+    @classmethod
+    def check_computed(cls, computed: Any) -> list[str]:
+        """Confere o bloco `computed` de uma tabela, da coluna de destino para a expressão."""
+        if not isinstance(computed, Mapping):
+            return ["deve ser um objeto da coluna de destino para a expressão"]
+
+        return [f"da coluna '{column}' {problem}" for column, text in computed.items()
+                if (problem := cls.check(text))]
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """As colunas usadas pela expressão, na ordem em que aparecem."""
+        return tuple(dict.fromkeys(self.__columns))
+
+    def evaluate(self, df: DataFrame) -> Series:
+        """
+        Avalia a expressão sobre o DataFrame.
+
+        Returns:
+            Series: O resultado, com o índice do DataFrame (constantes são repetidas).
+
+        Raises:
+            KeyError: Se alguma coluna usada não existir no DataFrame.
+        """
+        result = self.__evaluate(df)
+        if isinstance(result, Series):
+            return result
+        return Series([result] * len(df), index=df.index, dtype=object if result is None else None)
+
+    def __compile(self, node: ast.AST) -> Callable[[DataFrame], Any]:
+        """Converte o nó em uma função do DataFrame, rejeitando as construções não permitidas."""
+        if isinstance(node, ast.Constant) and (node.value is None or isinstance(node.value, (str, int, float, bool))):
+            value = node.value
+            return lambda df: value
+
+        if isinstance(node, ast.Name):
+            self.__columns.append(node.id)
+            return lambda df, name=node.id: self.__column(df, name)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in self.__OPERATORS:
+            function = self.__OPERATORS[type(node.op)]
+            left, right = self.__compile(node.left), self.__compile(node.right)
+            return lambda df: function(*self.__numbers(left(df), right(df)))
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd, ast.Not)):
+            operand = self.__compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda df: self.__logical(operator.invert, operator.not_, operand(df))
+            function = operator.neg if isinstance(node.op, ast.USub) else operator.pos
+            return lambda df: self.__unary(function, operand(df))
+
+        if isinstance(node, ast.BoolOp):
+            operands = [self.__compile(value) for value in node.values]
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            return lambda df: self.__reduce(combine, [operand(df) for operand in operands])
+
+        if isinstance(node, ast.Compare) and all(type(op) in self.__OPERATORS for op in node.ops):
+            operands = [self.__compile(value) for value in (node.left, *node.comparators)]
+            functions = [self.__OPERATORS[type(op)] for op in node.ops]
+            return lambda df: self.__compare(functions, self.__numbers(*[operand(df) for operand in operands]))
+
+        if isinstance(node, ast.IfExp):
+            test, body, orelse = self.__compile(node.test), self.__compile(node.body), self.__compile(node.orelse)
+            return lambda df: self.__choose(df, test(df), body(df), orelse(df))
+
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords
+                and hasattr(self, f'_Expression__call_{node.func.id}')):
+            function = getattr(self, f'_Expression__call_{node.func.id}')
+            arguments = [self.__compile(argument) for argument in node.args]
+            return lambda df: function(*[argument(df) for argument in arguments])
+
+        raise SyntaxError(f"construção não permitida em '{self.__text}': {ast.unparse(node)}")
+
+    @staticmethod
+    def __column(df: DataFrame, name: str) -> Series:
+        """Retorna a coluna usada pela expressão."""
+        if name not in df.columns:
+            raise KeyError(f"coluna '{name}' não existe")
+        return df[name]
+
+    @classmethod
+    def __number(cls, value: Any) -> Any:
+        """Converte colunas de texto que guardam apenas números para numéricas."""
+        if isinstance(value, Series) and is_object_dtype(value) and infer_dtype(value, skipna=True) in cls.__NUMERIC:
+            return to_numeric(value)
+        return value
+
+    @classmethod
+    def __numbers(cls, *values: Any) -> list[Any]:
+        """
+        Prepara os operandos de uma operação ou comparação.
+
+        Com uma coluna Decimal e nenhuma coluna de ponto flutuante, os valores
+        são mantidos e os números escritos na expressão viram Decimal, para que
+        o resultado seja exato; caso contrário, as colunas numéricas de texto
+        são convertidas (veja `__number`).
+        """
+        kinds = [infer_dtype(value, skipna=True) if isinstance(value, Series) else None for value in values]
+        if 'decimal' in kinds and not {'floating', 'mixed-integer-float'} & set(kinds):
+            return [Decimal(repr(value)) if isinstance(value, float) else value for value in values]
+        return [cls.__number(value) for value in values]
+
+    @staticmethod
+    def __decimal(value: Any) -> bool:
+        """Indica se o valor é uma coluna Decimal."""
+        return isinstance(value, Series) and is_object_dtype(value) and infer_dtype(value, skipna=True) == 'decimal'
+
+    @classmethod
+    def __unary(cls, function: Callable[[Any], Any], value: Any) -> Any:
+        """Aplica a função de um operando, valor a valor nas colunas Decimal (preservando os nulos)."""
+        if cls.__decimal(value):
+            return value.map(function, na_action='ignore')
+        return function(cls.__number(value))
+
+    @staticmethod
+    def __logical(vectorized: Callable[[Any], Any], scalar: Callable[[Any], Any], value: Any) -> Any:
+        """Aplica o operador lógico à coluna (como booleana) ou ao valor."""
+        if isinstance(value, Series):
+            return vectorized(value.fillna(False).astype(bool))
+        return scalar(value)
+
+    @classmethod
+    def __reduce(cls, combine: Callable[[Any, Any], Any], values: list[Any]) -> Any:
+        """Combina os operandos de `and`/`or` elemento a elemento."""
+        result = values[0]
+        for value in values[1:]:
+            if isinstance(result, Series) or isinstance(value, Series):
+                result = combine(cls.__boolean(result), cls.__boolean(value))
+            else:
+                result = result and value if combine is operator.and_ else result or value
+        return result
+
+    @classmethod
+    def __compare(cls, functions: list[Callable[[Any, Any], Any]], values: list[Any]) -> Any:
+        """Avalia comparações encadeadas (ex: 0 < x <= 10) como a conjunção de cada par."""
+        results = [function(left, right) for function, left, right in zip(functions, values, values[1:])]
+        return cls.__reduce(operator.and_, results)
+
+    @classmethod
+    def __choose(cls, df: DataFrame, test: Any, body: Any, orelse: Any) -> Any:
+        """Avalia `body if test else orelse` linha a linha, de forma vetorizada."""
+        if not isinstance(test, Series):
+            return body if test else orelse
+
+        other = orelse if isinstance(orelse, Series) else Series([orelse] * len(df), index=df.index)
+        return other.mask(cls.__boolean(test), body)
+
+    @staticmethod
+    def __boolean(value: Any) -> Any:
+        """Trata os nulos como falso nas condições."""
+        return value.fillna(False).astype(bool) if isinstance(value, Series) else bool(value)
+
+    @classmethod
+    def __call_abs(cls, value: Any) -> Any:
+        """`abs(x)`: valor absoluto."""
+        return cls.__unary(abs, value)
+
+    @classmethod
+    def __call_round(cls, value: Any, digits: int = 0) -> Any:
+        """`round(x, casas)`: arredonda para as casas decimais."""
+        if cls.__decimal(value):
+            return value.map(lambda item: round(item, digits), na_action='ignore')
+        value = cls.__number(value)
+        return value.round(digits) if isinstance(value, Series) else round(value, digits)
+
+    @classmethod
+    def __call_float(cls, value: Any) -> Any:
+        """`float(x)`: converte para número, com nulo nos valores inválidos."""
+        if isinstance(value, Series):
+            return to_numeric(value, errors='coerce').astype(float)
+        return float(value)
+
+    @classmethod
+    def __call_int(cls, value: Any) -> Any:
+        """`int(x)`: converte para inteiro (truncado), com nulo nos valores inválidos."""
+        if isinstance(value, Series):
+            return np.trunc(to_numeric(value, errors='coerce').astype(float)).astype('Int64')
+        return int(value)
+
+    @staticmethod
+    def __call_str(value: Any) -> Any:
+        """`str(x)`: converte para texto, com vazio nos nulos e sem '.0' nos inteiros."""
+        if not isinstance(value, Series):
+            return '' if value is None else str(value)
+        if is_float_dtype(value) and (value.dropna() % 1 == 0).all():
+            value = value.astype('Int64')
+        return value.astype(object).where(value.notna(), '').astype(str)
+
+    @classmethod
+    def __call_upper(cls, value: Any) -> Any:
+        """`upper(x)`: texto em maiúsculas."""
+        return cls.__call_str(value).upper() if not isinstance(value, Series) else cls.__call_str(value).str.upper()
+
+    @classmethod
+    def __call_lower(cls, value: Any) -> Any:
+        """`lower(x)`: texto em minúsculas."""
+        return cls.__call_str(value).lower() if not isinstance(value, Series) else cls.__call_str(value).str.lower()
+
+    @classmethod
+    def __call_trim(cls, value: Any) -> Any:
+        """`trim(x)`: texto sem espaços nas laterais."""
+        return cls.__call_str(value).strip() if not isinstance(value, Series) else cls.__call_str(value).str.strip()
+
+    @staticmethod
+    def __call_coalesce(*values: Any) -> Any:
+        """`coalesce(a, b, ...)`: o primeiro valor preenchido (não nulo nem vazio) de cada linha."""
+        result = values[0]
+        for value in values[1:]:
+            if not isinstance(result, Series):
+                return result if result is not None and result != '' else value
+            blank = result.isna() | (result.astype(str).str.strip() == '') if is_object_dtype(result) else result.isna()
+            result = result.mask(blank, value)
+        return result
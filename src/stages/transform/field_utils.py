@@ -13,118 +13,70 @@
 # Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
 # com este programa. Se não, veja <https://www.gnu.org/licenses/>.
 
-from unicodedata import normalize
-from rich import print
+
+from collections.abc import Mapping
+from threading import Lock
+from typing import Any
 from pandas import DataFrame
-from utils.log import Log
 from utils.config_json import JsonConfig
+from stages.transform.column_transforms import ColumnTransforms
+from stages.transform.expression import Expression
+from stages.transform.fixed_width import FixedWidth
+from stages.transform.lookup import LookupIndex
+from stages.transform.registry import TransformRegistry
 
 
 class FieldHandler:
     """
-    Fornece uma coleção de métodos estáticos para transformar colunas de DataFrames.
+    Fornece as transformações de campo embutidas sobre DataFrames.
 
-    Esta classe atua como uma biblioteca de funções de transformação de dados,
-    projetada para ser usada dinamicamente por um pipeline de ETL.
+    As transformações de tabela (`rename`, `select`, `copy`, `expr`, `split`,
+    `search` e `lookup`) ficam aqui; as de coluna (`trim`, `upper`, `lower`,
+    `clear`, `switch`, `format` e `date`) ficam em `ColumnTransforms`, e os
+    métodos de mesmo nome desta classe as aplicam a uma coluna do DataFrame.
+    Todas são registradas no `TransformRegistry` por `register`.
 
-    Atenção: Todos os métodos de transformação nesta classe irão encerrar a
-    aplicação (via `SystemExit`) caso qualquer erro inesperado ocorra durante
-    a sua execução.
+    Atenção: executadas pelo `TransformRegistry`, as transformações encerram
+    a aplicação (via `SystemExit`) caso qualquer erro inesperado ocorra.
     """
 
+    __city_lock: Lock = Lock()
+    __city_index: tuple[object, DataFrame] | None = None
+
     @classmethod
     def trim(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
-        """
-        Remove espaços em branco do início e do fim dos valores da coluna.
-        
-        Args:
-            df (DataFrame): DataFrame a ser modificado.
-            column (str): Coluna selecionada para modificação.
-
-        Raises:
-            SystemExit: Se ocorrer um erro durante a conversão ou manipulação da string.
-        """
-        try:
-            df[column] = df[column].astype(str).str.strip()
-            return df
-
-        except Exception as error:
-            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao aplicar 'trim' na coluna '{column}': {error}", True)
-            raise SystemExit from error
+        """Remove espaços em branco do início e do fim dos valores da coluna."""
+        return cls.__column(df, column, 'trim', kwargs)
 
     @classmethod
     def upper(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
-        """
-        Converte todos os caracteres da coluna para maiúsculas.
-        
-        Args:
-            df (DataFrame): DataFrame a ser modificado.
-            column (str): Coluna selecionada para modificação.
-
-        Raises:
-            SystemExit: Se ocorrer um erro durante a conversão ou manipulação da string.
-        """
-        try:
-            df[column] = df[column].astype(str).str.upper()
-            return df
-
-        except Exception as error:
-            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao aplicar 'upper' na coluna '{column}': {error}", True)
-            raise SystemExit from error
+        """Converte todos os caracteres da coluna para maiúsculas."""
+        return cls.__column(df, column, 'upper', kwargs)
 
     @classmethod
     def lower(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
-        """
-        Converte todos os caracteres da coluna para minúsculas.
-        
-        Args:
-            df (DataFrame): DataFrame a ser modificado.
-            column (str): Coluna selecionada para modificação.
-
-        Raises:
-            SystemExit: Se ocorrer um erro durante a conversão ou manipulação da string.
-        """
-        try:
-            df[column] = df[column].astype(str).str.lower()
-            return df
-
-        except Exception as error:
-            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao aplicar 'lower' na coluna '{column}': {error}", True)
-            raise SystemExit from error
+        """Converte todos os caracteres da coluna para minúsculas."""
+        return cls.__column(df, column, 'lower', kwargs)
 
     @classmethod
     def switch(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
-        """
-        Substitui múltiplos valores na coluna com base em listas de 'de/para'.
+        """Substitui múltiplos valores na coluna com base nas listas 'str_from'/'str_to' de 'option_data'."""
+        return cls.__column(df, column, 'switch', kwargs)
 
-        Args:
-            df (DataFrame): DataFrame a ser modificado.
-            column (str): Coluna selecionada para modificação.
-            **kwargs: Espera 'option_data' com 'str_from' (valor a
-                      ser substituído) e 'str_to' (novo valor).
-
-        Raises:
-            SystemExit: Se ocorrer um erro durante a substituição dos valores.
-        """
-        str_from = kwargs['option_data']['str_from']
-        str_to = kwargs['option_data']['str_to']
-        df[column] = df[column].astype(str)
-
-        index = 0
-        for value in str_from:
-            try:
-                df[column] = df[column].str.replace(r'\b{}\b'.format(value), str_to[index], regex=True).copy()
-                index += 1
+    @classmethod
+    def clear(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
+        """Limpa a coluna, trocando caracteres especiais ou com acentos por seus equivalentes normais."""
+        return cls.__column(df, column, 'clear', kwargs)
 
-            except Exception as error:
-                print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao aplicar 'switch' na coluna '{column}': {error}", True)
-                raise SystemExit from error
+    @classmethod
+    def format(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
+        """Formata os valores da coluna para o padrão de 'option_data' (ex: 'CPF', 'CNPJ', 'DATETIME', 'CEP')."""
+        return cls.__column(df, column, 'format', kwargs)
 
-        return df
+    @classmethod
+    def date(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
+        """Converte a coluna para datas tipadas (veja `ColumnTransforms.date`)."""
+        return cls.__column(df, column, 'date', kwargs)
 
     @classmethod
     def rename(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
@@ -134,44 +86,8 @@ class FieldHandler:
         Args:
             df (DataFrame): DataFrame a ser modificado.
             column (str): Coluna selecionada para modificação.
-
-        Raises:
-            SystemExit: Se a coluna alvo não existir no DataFrame.
-        """
-        try:
-            df = df.rename(columns={column:"Codigo_Old"}).copy()
-            return df
-
-        except Exception as error:
-            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao aplicar 'rename' na coluna '{column}': {error}", True)
-            raise SystemExit from error
-
-    @classmethod
-    def clear(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
-        """
-        Limpa a coluna, trocando caracteres especiais ou com 
-        acentos por seus equivalentes normais.
-        
-        Args:
-            df (DataFrame): DataFrame a ser modificado.
-            column (str): Coluna selecionada para modificação.
-
-        Raises:
-            SystemExit: Se ocorrer um erro durante a limpeza ou normalização.
         """
-        default = r'[^a-zA-Z0-9\s\n.-\/àáâãäèéêëìíîïòóôõöùúûüçñÀÁÂÃÄÈÉÊËÌÍÎÏÒÓÔÕÖÙÚÛÜÇÑº*ª]'
-
-        try:
-            df[column] = df[column].astype(str)
-            df[column] = df[column].str.replace(default, '', regex=True).copy()
-            df[column] = df[column].map(lambda x: normalize('NFKD', x).encode('ASCII', 'ignore').decode('ASCII')).copy()
-            return df
-
-        except Exception as error:
-            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao aplicar 'clear' na coluna '{column}': {error}", True)
-            raise SystemExit from error
+        return df.rename(columns={column:"Codigo_Old"}).copy()
 
     @classmethod
     def select(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
@@ -182,19 +98,8 @@ class FieldHandler:
             df (DataFrame): DataFrame a ser modificado.
             column (str): Coluna selecionada para modificação.
             **kwargs: Espera 'option_data' contendo o valor a ser usado no filtro.
-
-        Raises:
-            SystemExit: Se a coluna de filtro não existir ou ocorrer outro erro.
         """
-        filter = kwargs['option_data']
-        try:
-            df = df[df[column] == filter].reset_index(drop=True).copy()
-            return df
-
-        except Exception as error:
-            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao aplicar 'select' na coluna '{column}': {error}", True)
-            raise SystemExit from error
+        return df[df[column] == kwargs['option_data']].reset_index(drop=True).copy()
 
     @classmethod
     def copy(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
@@ -205,124 +110,51 @@ class FieldHandler:
             df (DataFrame): DataFrame a ser modificado.
             column (str): Coluna selecionada para modificação.
             **kwargs: Espera 'option_data' com o nome da coluna de origem.
-
-        Raises:
-            SystemExit: Se a coluna de origem não existir no DataFrame.
         """
-        option_data = kwargs['option_data']
-        try:
-            df[column] = df[option_data]
-            return df
-
-        except Exception as error:
-            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao aplicar 'copy' na coluna '{column}': {error}", True)
-            raise SystemExit from error
+        df[column] = df[kwargs['option_data']]
+        return df
 
     @classmethod
-    def format(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
+    def expr(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
         """
-        Formata os valores da coluna para padrões específicos (CPF, CNPJ, etc.).
+        Preenche a coluna com o resultado de uma expressão sobre as colunas da tabela.
+
+        A expressão é compilada uma única vez e avaliada de forma vetorizada
+        (veja `Expression`), ex: 'preco * quantidade'.
 
         Args:
             df (DataFrame): DataFrame a ser modificado.
-            column (str): Coluna selecionada para modificação.
-            **kwargs: Espera 'option_data' com o tipo de formato desejado,
-                      ex: 'CPF', 'CNPJ', 'DATETIME', 'CEP'.
-        
-        Raises:
-            SystemExit: Se ocorrer um erro durante a aplicação do formato.
+            column (str): Coluna que recebe o resultado.
+            **kwargs: Espera 'option_data' com a expressão.
         """
-        str_type = kwargs['option_data']
-        df[column] = df[column].astype(str)
-
-        if str_type == 'CPF':
-            search = r'([0-9]{3})([0-9]{3})([0-9]{3})([0-9]{2})'
-            format = r'\1.\2.\3-\4'
-            try:
-                df[column] = df[column].str.replace(search, format, regex=True).copy()
-                return df
-
-            except Exception as error:
-                print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao aplicar 'format' na coluna '{column}': {error}", True)
-                raise SystemExit from error
-
-        elif str_type == 'CNPJ':
-            search = r'([0-9]{2})([0-9]{3})([0-9]{3})([0-9]{4})([0-9]{2})'
-            format = r'\1.\2.\3/\4-\5'
-            try:
-                df[column] = df[column].str.replace(search, format, regex=True).copy()
-                return df
-
-            except Exception as error:
-                print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao aplicar 'format' na coluna '{column}': {error}", True)
-                raise SystemExit from error
-
-        elif str_type == 'DATETIME':
-            search = r'([0-9]{4})[-./ ]?([0-9]{2})[-./ ]?([0-9]{2})'
-            format = r'\1-\2-\3 00:00:00.000'
-            try:
-                df[column] = df[column].str.replace(search, format, regex=True).copy()
-                return df
-
-            except Exception as error:
-                print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao aplicar 'format' na coluna '{column}': {error}", True)
-                raise SystemExit from error
-
-        elif str_type == 'CEP':
-            search = r'([0-9]{5})([0-9]{3})'
-            format = r'\1-\2'
-
-            try:
-                df[column] = df[column].str.replace(search, format, regex=True).copy()
-                return df
-
-            except Exception as error:
-                print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao aplicar 'format' na coluna '{column}': {error}", True)
-                raise SystemExit from error
+        df[column] = Expression.compile(kwargs['option_data']).evaluate(df)
+        return df
 
     @classmethod
     def split(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
         """
         Divide uma coluna de telefone em novas colunas de DDD e número.
 
+        Telefones só com dígitos são divididos por `FixedWidth`; os demais,
+        pela expressão regular.
+
         Args:
             df (DataFrame): DataFrame a ser modificado.
             column (str): Coluna selecionada para modificação.
             **kwargs: Espera 'option_data' indicando o tipo de campo a ser
                       dividido.
-
-        Raises:
-            SystemExit: Se ocorrer um erro durante a extração com regex.
         """
-        split_field = kwargs['option_data']
+        ddd_column, number_column = cls.split_outputs(column, kwargs['option_data'])
         df[column] = df[column].astype(str)
 
-        if split_field == 'DDD1':
-            try:
-                splited = df[column].str.extract(r'^(?P<DDD1>[0-9]{2})?(?P<Fone_Numero>[0-9]{8,9})').copy()
-                df = df.assign(DDD1=splited[split_field],Fone_Numero=splited[column]).copy()
-                return df
+        pattern = rf'^(?P<{ddd_column}>[0-9]{{2}})?(?P<{number_column}>[0-9]{{8,9}})'
+        ddd, number = FixedWidth.split_phone(df[column], pattern)
+        return df.assign(**{ddd_column: ddd, number_column: number}).copy()
 
-            except Exception as error:
-                print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao aplicar 'split' na coluna '{column}': {error}", True)
-                raise SystemExit from error
-
-        else:
-            try:
-                splited = df[column].str.extract(r'^(?P<DDD_Celular>[0-9]{2})?(?P<Numero_Celular>[0-9]{8,9})').copy()
-                df = df.assign(DDD_Celular=splited[split_field],Numero_Celular=splited[column]).copy()
-                return df
-
-            except Exception as error:
-                print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao aplicar 'split' na coluna '{column}': {error}", True)
-                raise SystemExit from error
+    @staticmethod
+    def split_outputs(column: str, value: Any) -> tuple[str, str]:
+        """Retorna as colunas de DDD e número criadas por `split`."""
+        return ('DDD1', 'Fone_Numero') if value == 'DDD1' else ('DDD_Celular', 'Numero_Celular')
 
     @classmethod
     def search(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
@@ -334,23 +166,79 @@ class FieldHandler:
             column (str): Coluna selecionada para modificação.
             **kwargs: Espera 'option_data' com o tipo de busca, 
                       ex: 'CITY'.
+        """
+        if kwargs['option_data'] == 'CITY':
+            df = df.join(cls.__city_table(), on=[column, 'UF']).copy()
+        return df
 
-        Raises:
-            SystemExit: Se ocorrer um erro durante a busca ou junção dos dados.
+    @classmethod
+    def lookup(cls, df: DataFrame, column: str, **kwargs) -> DataFrame:
         """
-        search_type = kwargs['option_data']
-
-        if search_type == 'CITY':
-            citys = JsonConfig.get_citys()
-            df_city = DataFrame(citys)
-
-            try:
-                df_city = df_city.rename(columns={'Codigo':'Codigo_Cidade'}).copy()
-                df_city = df_city.set_index(['Cidade', 'Estado'])
-                df = df.join(df_city, on=[column, 'UF']).copy()
-                return df
-
-            except Exception as error:
-                print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao aplicar 'search' na coluna '{column}': {error}", True)
-                raise SystemExit from error
+        Acrescenta colunas de outra tabela extraída ou de um arquivo, buscadas pelo valor da coluna.
+
+        Args:
+            df (DataFrame): DataFrame a ser modificado.
+            column (str): Coluna cujos valores são procurados na chave da origem.
+            **kwargs: Espera 'option_data' com a configuração da busca (`table`
+                      ou `file`, `key` e `columns`) e 'lookups' com o
+                      `LookupIndex` da execução.
+        """
+        return kwargs['lookups'].join(df, column, kwargs['option_data'])
+
+    @classmethod
+    def register(cls, registry: type[TransformRegistry]) -> None:
+        """Registra as transformações embutidas no `TransformRegistry`."""
+        registry.register('trim', ColumnTransforms.trim, per_value=True, check=lambda value: (
+            None if isinstance(value, bool) else "deve ser true ou false"))
+        registry.register('upper', ColumnTransforms.upper, per_value=True, check=lambda value: (
+            None if isinstance(value, bool) else "deve ser true ou false"))
+        registry.register('lower', ColumnTransforms.lower, per_value=True, check=lambda value: (
+            None if isinstance(value, bool) else "deve ser true ou false"))
+        registry.register('clear', ColumnTransforms.clear, per_value=True, check=lambda value: (
+            None if isinstance(value, bool) else "deve ser true ou false"))
+        registry.register('format', ColumnTransforms.format, per_value=True, check=ColumnTransforms.check_format)
+        registry.register('date', ColumnTransforms.date, check=ColumnTransforms.check_date)
+        registry.register('switch', ColumnTransforms.switch, per_value=True, check=lambda value: None if (
+            isinstance(value, Mapping)
+            and isinstance(value.get('str_from'), tuple)
+            and isinstance(value.get('str_to'), tuple)
+            and len(value['str_from']) == len(value['str_to'])
+        ) else "deve ter as listas 'str_from' e 'str_to' com o mesmo tamanho")
+
+        registry.register('rename', cls.rename, frame=True,
+                          outputs=lambda column, value: ('Codigo_Old',))
+        registry.register('select', cls.select, frame=True, check=lambda value: (
+            None if not isinstance(value, (Mapping, tuple)) else "deve ser um valor simples"))
+        registry.register('copy', cls.copy, frame=True, check=lambda value: (
+            None if isinstance(value, str) and value else "deve ser o nome de uma coluna"))
+        registry.register('expr', cls.expr, frame=True, check=Expression.check)
+        registry.register('split', cls.split, frame=True, outputs=cls.split_outputs,
+                          check=lambda value: None if isinstance(value, str) and value
+                          else "deve ser o nome do campo a dividir")
+        registry.register('search', cls.search, frame=True,
+                          outputs=lambda column, value: ('Codigo_Cidade', 'Codigo_Cidade_IBGE'),
+                          check=lambda value: None if value == 'CITY' else "deve ser 'CITY'")
+        registry.register('lookup', cls.lookup, frame=True, outputs=LookupIndex.outputs,
+                          check=LookupIndex.check)
+
+    @staticmethod
+    def __column(df: DataFrame, column: str, name: str, kwargs: dict[str, Any]) -> DataFrame:
+        """Aplica a transformação de coluna `name` pelo `TransformRegistry`."""
+        return TransformRegistry.apply(df, column, [(name, kwargs.get('option_data', True))])
+
+    @classmethod
+    def __city_table(cls) -> DataFrame:
+        """
+        Retorna a tabela de cidades indexada por cidade e estado.
+
+        O índice é montado uma única vez e compartilhado entre tabelas,
+        execuções e threads; só é refeito quando o `citys.json` muda.
+        """
+        citys = JsonConfig.get_citys()
+        with cls.__city_lock:
+            if cls.__city_index is None or cls.__city_index[0] is not citys:
+                df_city = DataFrame(citys).rename(columns={'Codigo':'Codigo_Cidade'})
+                cls.__city_index = (citys, df_city.set_index(['Cidade', 'Estado']))
+
+            return cls.__city_index[1]
+
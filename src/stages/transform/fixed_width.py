@@ -0,0 +1,213 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+
+import re
+from itertools import groupby
+import numpy as np
+from pandas import DataFrame, Series, to_datetime
+
+
+class FixedWidth:
+    """
+    Formata códigos de largura fixa (CPF, CNPJ, CEP, datas e telefones) com arrays de bytes do NumPy.
+
+    Os valores são convertidos de uma vez para um array de texto de largura
+    fixa e lidos como uma matriz de códigos (uma linha por valor, uma coluna
+    por caractere). As linhas que seguem exatamente o padrão de entrada
+    (ex: `99999999999` para um CPF só com dígitos) são montadas por fatias
+    de uma matriz de bytes, sem expressões regulares; as demais ficam a
+    cargo da expressão regular correspondente, de modo que o resultado é
+    idêntico ao da versão com regex.
+
+    Nos padrões de entrada, `9` é um dígito, `?` um separador (`-`, `.`,
+    `/` ou espaço) e os demais caracteres devem aparecer como estão; no
+    leiaute de saída, `#` é o próximo dígito e os demais caracteres são copiados.
+    """
+
+    __SEPARATORS: np.ndarray = np.array([ord(char) for char in "-./ "], dtype=np.uint32)
+    __DATE_PARTS: dict[str, tuple[str, int]] = {
+        '%Y': ('year', 4), '%m': ('month', 2), '%d': ('day', 2),
+        '%H': ('hour', 2), '%M': ('minute', 2), '%S': ('second', 2),
+    }
+
+    @classmethod
+    def match(cls, values: np.ndarray, pattern: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Seleciona os valores que seguem exatamente o padrão de entrada.
+
+        Args:
+            values (np.ndarray): Array de objetos com os valores em texto.
+            pattern (str): O padrão de entrada (ex: `9999?99?99`).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: A máscara dos valores que seguem o
+                padrão e a matriz `uint8` com os dígitos desses valores.
+        """
+        width = len(pattern)
+        codes = cls.__codes(values, width + 1)
+        digits = [position for position, char in enumerate(pattern) if char == '9']
+        separators = [position for position, char in enumerate(pattern) if char == '?']
+
+        literals = [(position, ord(char)) for position, char in enumerate(pattern) if char not in '9?']
+
+        mask = (codes[:, width] == 0) & ((codes[:, digits] - ord('0')) <= 9).all(axis=1)
+        if separators:
+            mask &= np.isin(codes[:, separators], cls.__SEPARATORS).all(axis=1)
+        for position, code in literals:
+            mask &= codes[:, position] == code
+
+        return mask, (codes[mask][:, digits] - ord('0')).astype(np.uint8)
+
+    @staticmethod
+    def __codes(values: np.ndarray, width: int) -> np.ndarray:
+        """Converte os valores na matriz de códigos dos seus `width` primeiros caracteres (0 após o fim)."""
+        return values.astype(f'U{width}').view(np.uint32).reshape(len(values), width)
+
+    @staticmethod
+    def assemble(digits: np.ndarray, layout: str) -> np.ndarray:
+        """
+        Monta os valores formatados a partir da matriz de dígitos.
+
+        Args:
+            digits (np.ndarray): A matriz `uint8` de dígitos retornada por `match`.
+            layout (str): O leiaute de saída (ex: `###.###.###-##`).
+
+        Returns:
+            np.ndarray: Array de objetos com os valores formatados.
+        """
+        output = np.empty((len(digits), len(layout)), dtype=np.uint8)
+        start, position = 0, 0
+        for is_digit, run in groupby(layout, key=lambda char: char == '#'):
+            size = len(list(run))
+            if is_digit:
+                output[:, start:start + size] = digits[:, position:position + size] + ord('0')
+                position += size
+            else:
+                output[:, start:start + size] = np.frombuffer(layout[start:start + size].encode(), dtype=np.uint8)
+            start += size
+
+        return output.view(f'S{len(layout)}').ravel().astype(f'U{len(layout)}').astype(object)
+
+    @classmethod
+    def format(cls, series: Series, patterns: tuple[str, ...], layout: str, search: str, replace: str) -> Series:
+        """
+        Formata a coluna pelo leiaute, recorrendo à regex para os valores irregulares.
+
+        Args:
+            series (Series): A coluna, já convertida para texto.
+            patterns (tuple[str, ...]): Os padrões de entrada aceitos pelo caminho rápido.
+            layout (str): O leiaute de saída.
+            search (str): A regex equivalente, aplicada aos demais valores.
+            replace (str): A substituição da regex.
+
+        Returns:
+            Series: A coluna formatada.
+        """
+        values = series.to_numpy(dtype=object)
+        result = values.copy()
+        pending = np.ones(len(values), dtype=bool)
+
+        for pattern in patterns:
+            rows = np.flatnonzero(pending)
+            mask, digits = cls.match(values[rows], pattern)
+            result[rows[mask]] = cls.assemble(digits, layout)
+            pending[rows[mask]] = False
+
+        if pending.any():
+            result[pending] = series[pending].str.replace(search, replace, regex=True).to_numpy(dtype=object)
+
+        return Series(result, index=series.index, name=series.name)
+
+    @classmethod
+    def dates(cls, values: np.ndarray, date_format: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Converte para datas os valores que seguem exatamente um formato de largura fixa.
+
+        Aceita formatos compostos apenas por `%Y`, `%m`, `%d`, `%H`, `%M`, `%S`
+        e caracteres literais (ex: `%d/%m/%Y %H:%M`). Os componentes são lidos
+        da matriz de dígitos e montados de uma vez; datas impossíveis (ex: 31/02)
+        resultam em NaT.
+
+        Args:
+            values (np.ndarray): Array de objetos com os valores em texto.
+            date_format (str): O formato, no padrão do `strptime`.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: A máscara dos valores que seguem
+                o formato e as datas (datetime64) desses valores, ou None se o
+                formato não for de largura fixa.
+        """
+        pattern, parts = '', {}
+        for token in re.findall(r'%.|[^%]', date_format):
+            if token in cls.__DATE_PARTS:
+                name, width = cls.__DATE_PARTS[token]
+                parts[name] = (pattern.count('9'), width)
+                pattern += '9' * width
+            elif token.startswith('%') or token in '9?':
+                return None
+            else:
+                pattern += token
+
+        if not {'year', 'month', 'day'} <= parts.keys():
+            return None
+
+        mask, digits = cls.match(values, pattern)
+        components = DataFrame({
+            name: digits[:, start:start + width].astype(np.int64) @ 10 ** np.arange(width - 1, -1, -1)
+            for name, (start, width) in parts.items()
+        })
+        return mask, to_datetime(components, errors='coerce').to_numpy()
+
+    @classmethod
+    def split_phone(cls, series: Series, pattern: str) -> tuple[Series, Series]:
+        """
+        Divide telefones em DDD e número, recorrendo à regex para os valores irregulares.
+
+        Valores só com dígitos, de 8 ou 9 caracteres, são apenas o número; de
+        10 ou 11, os dois primeiros são o DDD. Valores sem correspondência
+        resultam em nulo, como em `str.extract`.
+
+        Args:
+            series (Series): A coluna, já convertida para texto.
+            pattern (str): A regex equivalente, com dois grupos (DDD e número).
+
+        Returns:
+            tuple[Series, Series]: As colunas de DDD e de número.
+        """
+        values = series.to_numpy(dtype=object)
+        ddd = np.full(len(values), np.nan, dtype=object)
+        number = np.full(len(values), np.nan, dtype=object)
+
+        codes = cls.__codes(values, 12)
+        digits = (codes - ord('0')) <= 9
+        valid = np.zeros(len(values), dtype=bool)
+
+        for width in (8, 9, 10, 11):
+            rows = np.flatnonzero(digits[:, :width].all(axis=1) & (codes[:, width] == 0))
+            valid[rows] = True
+            matrix = (codes[rows, :width] - ord('0')).astype(np.uint8)
+            prefix = 2 if width > 9 else 0
+            if prefix:
+                ddd[rows] = cls.assemble(matrix[:, :prefix], '#' * prefix)
+            number[rows] = cls.assemble(matrix[:, prefix:], '#' * (width - prefix))
+
+        pending = ~valid
+        if pending.any():
+            extracted = series[pending].str.extract(pattern)
+            ddd[pending] = extracted.iloc[:, 0].to_numpy(dtype=object)
+            number[pending] = extracted.iloc[:, 1].to_numpy(dtype=object)
+
+        return Series(ddd, index=series.index), Series(number, index=series.index)
@@ -0,0 +1,200 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+from collections.abc import Iterable, Mapping
+from typing import Any
+import numpy as np
+from pandas import DataFrame, Index, Series, read_csv, read_json
+from utils.log import Log
+
+
+class LookupIndex:
+    """
+    Índices de busca, montados uma única vez por execução, para a transformação `lookup`.
+
+    Uma busca associa a coluna de uma tabela à chave de outra tabela já
+    extraída na mesma execução (`table`, pelo nome no `systems.json`) ou de
+    um arquivo de referência JSON ou CSV (`file`), e copia colunas dela:
+
+        "lookup": {"table": "grupos", "key": "codigo", "columns": {"descricao": "nome_grupo"}}
+
+    Para cada par origem/chave é montado um índice hash (`pandas.Index`) na
+    primeira busca, reaproveitado por todas as colunas e tabelas que usam a
+    mesma origem e chave. Das tabelas extraídas, só o índice e as posições das
+    linhas ficam guardados: a tabela é obtida de novo a cada busca, sem
+    prendê-la em memória fora do `FrameStore`. Os arquivos são lidos uma única
+    vez e guardados junto do índice, até serem modificados. A busca em si é
+    vetorizada (`get_indexer` e `take`)
+    e nunca multiplica linhas: chaves repetidas na origem usam a primeira
+    ocorrência, e chaves nulas ou não encontradas resultam em nulo. A chave e
+    a coluna buscada devem ter o mesmo tipo (ex: ambas numéricas).
+
+    As tabelas de referência devem estar completas em `raw_data`; veja
+    `references` para incluí-las na extração. Quem mantém o índice entre
+    execuções deve chamar `forget` ao trocar os dados de uma delas.
+
+    Args:
+            raw_data (Mapping[str, DataFrame]): Os dados brutos da execução.
+    """
+
+    def __init__(self, raw_data: Mapping[str, DataFrame]) -> None:
+        self.__raw_data = raw_data
+        self.__indexes: dict[tuple[str, str, str], tuple[Index, np.ndarray, DataFrame | None, int | None]] = {}
+
+    def join(self, df: DataFrame, column: str, spec: Mapping[str, Any]) -> DataFrame:
+        """
+        Acrescenta ao DataFrame as colunas buscadas pela chave em `column`.
+
+        Args:
+            df (DataFrame): DataFrame a ser enriquecido.
+            column (str): Coluna cujos valores são procurados na chave da origem.
+            spec (Mapping[str, Any]): A configuração da transformação `lookup`.
+
+        Returns:
+            DataFrame: O DataFrame com as colunas buscadas.
+
+        Raises:
+            KeyError: Se a tabela, a chave ou alguma coluna não existir na origem.
+        """
+        index, positions, source = self.__index(spec)
+        found = index.get_indexer(df[column])
+        matched = found >= 0
+        rows = positions[np.where(matched, found, 0)] if len(positions) else np.zeros(len(df), dtype=np.intp)
+
+        columns = spec['columns']
+        if not isinstance(columns, Mapping):
+            columns = {name: name for name in columns}
+
+        added = {}
+        for name, target in columns.items():
+            name = self.__name(spec, name)
+            if name not in source.columns:
+                raise KeyError(f"coluna '{name}' não existe na origem da busca")
+            values = source[name]
+            taken = values.take(rows) if len(values) else Series([None] * len(df), dtype=object)
+            added[target] = Series(taken.to_numpy(), index=df.index).where(matched)
+
+        missing = int((~matched & df[column].notna().to_numpy()).sum())
+        if missing:
+            Log.warning("%d valor(es) de '%s' sem correspondência na busca em %s", missing, column, self.__label(spec))
+
+        return df.assign(**added)
+
+    def forget(self, table: str) -> None:
+        """Descarta os índices montados sobre uma tabela, cujos dados mudaram."""
+        for cache_key in [item for item in self.__indexes if item[:2] == ('table', table)]:
+            del self.__indexes[cache_key]
+
+    @staticmethod
+    def check(value: Any) -> str | None:
+        """Confere a configuração da transformação `lookup`."""
+        if not isinstance(value, Mapping):
+            return "deve ser um objeto"
+        if ('table' in value) == ('file' in value):
+            return "deve informar 'table' ou 'file'"
+        if not isinstance(value.get('table', value.get('file')), str) or not value.get('table', value.get('file')):
+            return "deve ter 'table' ou 'file' preenchido"
+        if not isinstance(value.get('key'), str) or not value['key']:
+            return "deve informar a coluna 'key' da origem"
+
+        columns = value.get('columns')
+        names = (*columns.keys(), *columns.values()) if isinstance(columns, Mapping) else columns
+        if not isinstance(names, tuple) or not names or not all(isinstance(name, str) and name for name in names):
+            return "deve informar as colunas buscadas em 'columns'"
+        return None
+
+    @staticmethod
+    def check_references(config: Mapping[str, Any], tables: Mapping[str, Any]) -> list[str]:
+        """Confere se as buscas `lookup` de uma tabela usam tabelas existentes no `systems.json`."""
+        fields = config.get('fields')
+        return [
+            f"campo '{field}': transformação 'lookup' usa a tabela '{spec['table']}', que não existe no systems.json"
+            for field, info in (fields.items() if isinstance(fields, Mapping) else ())
+            if isinstance(info, Mapping) and isinstance(info.get('transform'), Mapping)
+            and isinstance(spec := info['transform'].get('lookup'), Mapping)
+            and isinstance(spec.get('table'), str) and spec['table'] not in tables
+        ]
+
+    @staticmethod
+    def outputs(column: str, value: Mapping[str, Any]) -> tuple[str, ...]:
+        """Retorna as colunas acrescentadas pela busca."""
+        columns = value['columns']
+        return tuple(columns.values()) if isinstance(columns, Mapping) else tuple(columns)
+
+    @staticmethod
+    def references(tables: Mapping[str, Mapping[str, Any]], selected: Iterable[str]) -> dict[str, Mapping[str, Any]]:
+        """
+        Retorna as tabelas do `systems.json` usadas pela transformação `lookup` das tabelas selecionadas.
+
+        Returns:
+            dict[str, Mapping[str, Any]]: As tabelas de referência, na ordem do arquivo.
+        """
+        names = {
+            info['transform']['lookup']['table']
+            for name in selected
+            for info in tables[name].get('fields', {}).values()
+            if isinstance(info.get('transform', {}).get('lookup'), Mapping) and 'table' in info['transform']['lookup']
+        }
+        return {name: table for name, table in tables.items() if name in names}
+
+    def __index(self, spec: Mapping[str, Any]) -> tuple[Index, np.ndarray, DataFrame]:
+        """Retorna a origem e (montando na primeira vez) o seu índice pela chave configurada."""
+        key = self.__name(spec, spec['key'])
+        cache_key = ('table', spec['table'], key) if 'table' in spec else ('file', spec['file'], key)
+        mtime = None if 'table' in spec else os.stat(spec['file']).st_mtime_ns
+
+        cached = self.__indexes.get(cache_key)
+        if cached is None or cached[3] != mtime:
+            source = self.__source(spec)
+            if key not in source.columns:
+                raise KeyError(f"chave '{key}' não existe em {self.__label(spec)}")
+
+            keys = source[key]
+            duplicated = keys.duplicated().to_numpy()
+            if duplicated.any():
+                Log.warning("%d chave(s) repetida(s) em %s; a primeira ocorrência será usada",
+                            int(duplicated.sum()), self.__label(spec))
+
+            positions = np.flatnonzero(~duplicated & keys.notna().to_numpy())
+            cached = (Index(keys.to_numpy()[positions]), positions, None if mtime is None else source, mtime)
+            self.__indexes[cache_key] = cached
+            Log.info("Índice de busca montado para %s pela chave '%s' (%d chaves)", self.__label(spec), key, len(positions))
+
+            return cached[0], cached[1], source
+
+        return cached[0], cached[1], self.__source(spec) if cached[2] is None else cached[2]
+
+    def __source(self, spec: Mapping[str, Any]) -> DataFrame:
+        """Obtém a tabela extraída ou lê o arquivo de referência."""
+        if 'table' in spec:
+            if spec['table'] not in self.__raw_data:
+                raise KeyError(f"tabela '{spec['table']}' não foi extraída nesta execução")
+            return self.__raw_data[spec['table']]
+
+        path = spec['file']
+        if os.path.splitext(path)[1].lower() == '.csv':
+            return read_csv(path, dtype=object, keep_default_na=False, na_values=[''])
+        return read_json(path, orient='records', dtype=False)
+
+    @staticmethod
+    def __name(spec: Mapping[str, Any], name: str) -> str:
+        """As colunas das tabelas extraídas estão em minúsculas; as dos arquivos, como no arquivo."""
+        return name.lower() if 'table' in spec else name
+
+    @staticmethod
+    def __label(spec: Mapping[str, Any]) -> str:
+        """Descreve a origem da busca para as mensagens."""
+        return f"tabela '{spec['table']}'" if 'table' in spec else f"arquivo '{spec['file']}'"
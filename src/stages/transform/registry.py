@@ -0,0 +1,323 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+from collections import namedtuple
+from collections.abc import Callable, Iterable, Sequence
+from importlib import import_module
+from importlib.util import module_from_spec, spec_from_file_location
+from threading import RLock
+from typing import Any
+from rich import print
+import numpy as np
+from pandas import CategoricalDtype, DataFrame, Series, factorize
+from pandas.api.types import infer_dtype, is_object_dtype, is_string_dtype
+from utils.config_json import JsonConfig
+from utils.log import Log
+
+
+Transform = namedtuple('Transform', ['name', 'function', 'frame', 'per_value', 'outputs', 'check'])
+
+
+class TransformRegistry:
+    """
+    Registro das transformações de campo disponíveis no `systems.json`.
+
+    Cada transformação declara seu nome e como pode ser executada:
+
+    - de coluna (`frame=False`): `function(series, value)` recebe a coluna e o
+      valor configurado e devolve a coluna transformada, sem ler outras colunas
+      nem alterar a quantidade de linhas;
+    - de tabela (`frame=True`): `function(df, column, option_data=value, **context)`
+      recebe o DataFrame e o contexto da execução (ex: `lookups`) e devolve o
+      DataFrame, podendo criar colunas (`outputs`) ou filtrar linhas.
+
+    `per_value` indica que o resultado depende apenas do valor, de modo que
+    basta calculá-lo uma vez por valor distinto. `check` confere o valor configurado na validação do
+    `systems.json` (veja `check`).
+
+    As transformações de coluna consecutivas de um mesmo campo são fundidas
+    num único passo (veja `plan`), sem devolver a coluna ao DataFrame entre
+    elas; quando todas são `per_value` e a coluna é de texto com poucos
+    valores distintos, o passo é aplicado uma única vez a cada valor distinto.
+
+    As transformações embutidas ficam em `FieldHandler`. Módulos do usuário,
+    listados em `transforms.json` (nome de módulo ou caminho de arquivo .py),
+    registram as suas com o decorador `transform`:
+
+        @TransformRegistry.transform('sigla', per_value=True)
+        def sigla(series, value):
+            return series.astype(str).str[:3].str.upper()
+    """
+
+    __MAX_DISTINCT: float = 0.5
+    __SAMPLE_ROWS: int = 10_000
+
+    __lock: RLock = RLock()
+    __transforms: dict[str, Transform] = {}
+    __builtins: bool = False
+    __plugins: tuple[str, ...] | None = None
+
+    @classmethod
+    def register(
+        cls,
+        name: str,
+        function: Callable[..., Any],
+        *,
+        frame: bool = False,
+        per_value: bool = False,
+        outputs: Callable[[str, Any], tuple[str, ...]] | None = None,
+        check: Callable[[Any], str | None] | None = None,
+    ) -> Transform:
+        """
+        Registra (ou substitui) uma transformação.
+
+        Args:
+            name (str): Nome da transformação no bloco `transform` do `systems.json`.
+            function (Callable): A função de coluna ou de tabela (veja a classe).
+            frame (bool): Se a função recebe o DataFrame em vez da coluna.
+            per_value (bool): Se o resultado depende apenas do valor da linha.
+            outputs (Callable | None): Retorna as colunas criadas, dada a coluna
+                                       e o valor configurado.
+            check (Callable | None): Retorna o problema do valor configurado, ou None.
+
+        Returns:
+            Transform: A transformação registrada.
+        """
+        transform = Transform(name, function, frame, per_value and not frame, outputs, check)
+        with cls.__lock:
+            cls.__transforms[name] = transform
+        return transform
+
+    @classmethod
+    def transform(cls, name: str, **options) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorador que registra a função com `register`, mantendo-a inalterada."""
+        def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+            cls.register(name, function, **options)
+            return function
+        return decorator
+
+    @classmethod
+    def get(cls, name: str) -> Transform | None:
+        """Retorna a transformação registrada com o nome, ou None se não existir."""
+        cls.__ensure()
+        return cls.__transforms.get(name)
+
+    @classmethod
+    def names(cls) -> tuple[str, ...]:
+        """Retorna os nomes das transformações registradas."""
+        cls.__ensure()
+        return tuple(cls.__transforms)
+
+    @classmethod
+    def check(cls, name: str, value: Any) -> str | None:
+        """
+        Confere o nome e o valor configurado para a transformação.
+
+        Usado na validação do `systems.json` (veja `JsonConfig.tables_errors`).
+        Valores vazios desativam a transformação e não são conferidos.
+
+        Returns:
+            str | None: O problema encontrado, ou None se o valor for válido.
+        """
+        transform = cls.get(name)
+        if transform is None:
+            return "desconhecida"
+        if transform.check is None or not value:
+            return None
+        return transform.check(value)
+
+    @classmethod
+    def plan(cls, operations: Iterable[tuple[str, str, Any]]) -> list[tuple[str, list[tuple[str, Any]]]]:
+        """
+        Agrupa as operações em passos, fundindo as de coluna consecutivas sobre a mesma coluna.
+
+        Args:
+            operations (Iterable[tuple[str, str, Any]]): As operações na ordem
+                configurada, como (coluna, transformação, valor).
+
+        Returns:
+            list[tuple[str, list[tuple[str, Any]]]]: Os passos, como (coluna,
+                [(transformação, valor), ...]). Transformações de tabela ficam
+                sozinhas no seu passo.
+        """
+        steps: list[tuple[str, list[tuple[str, Any]]]] = []
+        fusable = False
+
+        for column, name, value in operations:
+            transform = cls.get(name)
+            column_level = transform is not None and not transform.frame
+
+            if fusable and column_level and steps[-1][0] == column:
+                steps[-1][1].append((name, value))
+            else:
+                steps.append((column, [(name, value)]))
+            fusable = column_level
+
+        return steps
+
+    @classmethod
+    def apply(cls, df: DataFrame, column: str, chain: Sequence[tuple[str, Any]], **context) -> DataFrame:
+        """
+        Executa um passo de `plan` sobre o DataFrame.
+
+        Args:
+            df (DataFrame): DataFrame a ser modificado.
+            column (str): Coluna do passo.
+            chain (Sequence[tuple[str, Any]]): As transformações e seus valores,
+                na ordem; mais de uma apenas se forem todas de coluna.
+            **context: Repassado às transformações de tabela (ex: `lookups`).
+
+        Returns:
+            DataFrame: O DataFrame transformado.
+
+        Raises:
+            SystemExit: Se alguma transformação não existir ou falhar.
+        """
+        names = '+'.join(name for name, _ in chain)
+        try:
+            transforms = [cls.__require(name) for name, _ in chain]
+
+            if transforms[0].frame:
+                if len(chain) > 1:
+                    raise ValueError(f"transformação de tabela '{chain[0][0]}' não pode ser fundida")
+                return transforms[0].function(df, column, option_data=chain[0][1], **context)
+
+            values = [value for _, value in chain]
+            df[column] = cls.__run(df[column], transforms, values)
+            return df
+
+        except Exception as error:
+            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
+            Log.error(f"Erro ao aplicar '{names}' na coluna '{column}': {error}", trace=True)
+            raise SystemExit from error
+
+    @classmethod
+    def __run(cls, series: Series, transforms: list[Transform], values: list[Any]) -> Series:
+        """
+        Aplica as transformações de coluna em sequência.
+
+        Se todas forem `per_value`, a coluna for de texto e tiver no máximo
+        metade de valores distintos, elas são aplicadas só a uma linha de
+        cada valor e o resultado é expandido pelos códigos (veja `__distinct`).
+        """
+        distinct = None
+        if len(series) and all(transform.per_value for transform in transforms) and cls.__textual(series):
+            distinct = cls.__distinct(series)
+
+        result = series if distinct is None else distinct[1]
+        for transform, value in zip(transforms, values):
+            result = transform.function(result, value)
+
+        if distinct is None:
+            return result
+        return result.take(distinct[0]).set_axis(series.index)
+
+    @staticmethod
+    def __textual(series: Series) -> bool:
+        """
+        Indica se a coluna (ou as categorias) tem apenas textos e nulos.
+
+        Em colunas object com outros tipos, `factorize` junta valores iguais de
+        tipos diferentes (ex: 1, 1.0 e True), que as transformações de texto
+        convertem em textos diferentes; essas colunas usam o caminho comum.
+        """
+        values = series.cat.categories if isinstance(series.dtype, CategoricalDtype) else series
+        return (is_object_dtype(values) or is_string_dtype(values)) and \
+            infer_dtype(values, skipna=True) in ('string', 'empty')
+
+    @classmethod
+    def __distinct(cls, series: Series) -> tuple[np.ndarray, Series] | None:
+        """
+        Retorna os códigos das linhas e uma linha de cada valor distinto, ou None se forem muitos.
+
+        A proporção de distintos é estimada antes nas primeiras linhas, para
+        não fatorar à toa as colunas quase únicas (ex: CPF). Os nulos são
+        separados pelo tipo (None, NaN, NaT...), já que as transformações de
+        texto os convertem em textos diferentes.
+        """
+        sample = series.iloc[:cls.__SAMPLE_ROWS]
+        if len(series) > len(sample) and len(factorize(sample)[1]) > len(sample) * cls.__MAX_DISTINCT:
+            return None
+
+        codes, uniques = factorize(series)
+        if len(uniques) > len(series) * cls.__MAX_DISTINCT:
+            return None
+
+        missing = codes < 0
+        if missing.any():
+            kinds, _ = factorize(Series(series[missing].to_numpy(dtype=object)).map(type))
+            codes[missing] = len(uniques) + kinds
+
+        first = Series(codes).drop_duplicates()
+        order = np.empty(len(first), dtype=np.intp)
+        order[first.to_numpy()] = np.arange(len(first))
+        return order[codes], series.iloc[first.index.to_numpy()].reset_index(drop=True)
+
+    @classmethod
+    def __require(cls, name: str) -> Transform:
+        """Retorna a transformação registrada com o nome, ou lança KeyError."""
+        transform = cls.get(name)
+        if transform is None:
+            raise KeyError(f"transformação '{name}' desconhecida")
+        return transform
+
+    @classmethod
+    def __ensure(cls) -> None:
+        """
+        Registra as transformações embutidas e carrega os módulos do `transforms.json`.
+
+        O arquivo é relido a cada chamada (pelo cache do `JsonConfig`), mas os
+        módulos só são importados na primeira vez ou quando ele muda.
+
+        Raises:
+            SystemExit: Se algum módulo não puder ser importado.
+        """
+        plugins = JsonConfig.get_plugins()
+        if cls.__builtins and plugins is cls.__plugins:
+            return
+
+        with cls.__lock:
+            if not cls.__builtins:
+                import_module('.field_utils', __package__).FieldHandler.register(cls)
+                cls.__builtins = True
+
+            if plugins is cls.__plugins:
+                return
+
+            for module in plugins:
+                try:
+                    cls.__import(module)
+                    Log.info(f"Transformações do módulo '{module}' carregadas.")
+
+                except Exception as error:
+                    print("[bold red]Erro ao carregar transformações, verifique o log.[/bold red]")
+                    Log.error(f"Erro ao importar o módulo de transformações '{module}': {error}", trace=True)
+                    raise SystemExit from error
+
+            cls.__plugins = plugins
+
+    @staticmethod
+    def __import(module: str) -> None:
+        """Importa o módulo pelo nome ou pelo caminho do arquivo .py."""
+        if not module.endswith('.py'):
+            import_module(module)
+            return
+
+        name = f"transforms_{os.path.splitext(os.path.basename(module))[0]}"
+        spec = spec_from_file_location(name, module)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"arquivo '{module}' não pode ser importado")
+        spec.loader.exec_module(module_from_spec(spec))
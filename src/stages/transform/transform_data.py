@@ -13,14 +13,24 @@
 # Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
 # com este programa. Se não, veja <https://www.gnu.org/licenses/>.
 
+import os
+from collections.abc import Collection
 from datetime import date
+from typing import Any
 from rich import print
 from pandas import DataFrame
+from utils.frame_store import FrameStore, MemoryBudget
 from utils.log import Log
+from utils.metrics import Metrics
+from utils.progress import ProgressReporter
 from stages.contracts.extract_contract import ExtractContract
 from stages.contracts.transform_contract import TransformContract
 from stages.interfaces.transform_data import TransformInterface
-from stages.transform.field_utils import FieldHandler
+from stages.transform.change_detector import ChangeDetector, Delta
+from stages.transform.column_transforms import ColumnTransforms
+from stages.transform.dedup import Deduplicator
+from stages.transform.lookup import LookupIndex
+from stages.transform.registry import TransformRegistry
 
 
 class Transformer(TransformInterface):
@@ -30,17 +40,68 @@ class Transformer(TransformInterface):
     Esta classe recebe dados brutos de um contrato de extração e aplica uma
     série de passos configuráveis — como seleção, renomeação e remoção
     de colunas, além de transformações de valores — para gerar dados limpos.
-    A lógica de transformação de campos é delegada dinamicamente à classe
-    `FieldHandler`.
+    A lógica de transformação de campos é delegada dinamicamente ao
+    `TransformRegistry`.
 
     Args:
             extract_contract (ExtractContract): O objeto de contrato que contém
                                                 os DataFrames brutos da fase de extração.
+            budget (MemoryBudget | None): Orçamento de memória. Se informado, cada
+                                          tabela processada é guardada em um
+                                          `FrameStore` e os dados brutos já
+                                          transformados são liberados para
+                                          despejo em disco. O padrão é None.
+            progress (ProgressReporter | None): Recebe o avanço, em linhas, de
+                                                cada tabela transformada. O padrão
+                                                é None (sem acompanhamento).
+            export (bool): Se True (padrão), grava um arquivo xlsx de cada
+                           tabela transformada.
+            export_dir (str): Diretório dos arquivos xlsx, criado se não
+                              existir. O padrão ("") é o diretório corrente.
+            changes_dir (str | None): Diretório dos índices das tabelas com
+                                      `detect_changes` (veja `ChangeDetector`).
+                                      None desativa a detecção e mantém as
+                                      tabelas completas.
+            upsert (Collection[str]): Tabelas extraídas desde a marca d'água
+                                      cujas linhas substituem no destino as de
+                                      mesma chave (`incremental.keys`). O padrão
+                                      é nenhuma.
+            lookups (LookupIndex | None): Índices da transformação `lookup`,
+                                      quando mantidos por quem chama (ex: entre
+                                      os ciclos da sincronização contínua). O
+                                      padrão é None (índices sobre os dados brutos).
     """
 
-    def __init__(self, extract_contract: ExtractContract) -> None:
+    def __init__(self, extract_contract: ExtractContract, budget: MemoryBudget | None = None,
+                 progress: ProgressReporter | None = None, export: bool = True, export_dir: str = "",
+                 changes_dir: str | None = os.path.join(".cache", "changes"), upsert: Collection[str] = (),
+                 lookups: LookupIndex | None = None) -> None:
+        self.__shared_lookups = lookups
+        self.__budget = budget
+        self.__progress = progress or ProgressReporter()
+        self.__export = export
+        self.__export_dir = export_dir
+        self.__detector = ChangeDetector(changes_dir) if changes_dir else None
+        self.__plans: dict[str, list[tuple[str, list[tuple[str, Any]]]]] = {}
+        self.reload(extract_contract, upsert)
+
+    def reload(self, extract_contract: ExtractContract, upsert: Collection[str] = ()) -> None:
+        """
+        Troca os dados brutos para uma nova transformação com as mesmas tabelas.
+
+        Os passos de transformação de cada tabela, montados na primeira vez
+        em que ela é transformada, e os índices de busca recebidos em
+        `lookups` são mantidos; os resultados anteriores são descartados.
+
+        Args:
+            extract_contract (ExtractContract): Os novos dados brutos.
+            upsert (Collection[str]): Como no construtor.
+        """
         self.__raw_data: dict[str, DataFrame] = extract_contract.raw_data
+        self.__lookups = self.__shared_lookups or LookupIndex(self.__raw_data)
         self.__processed_data: list[dict[str, DataFrame]] = []
+        self.__changes: list[Delta | None] = []
+        self.__upsert = frozenset(upsert)
 
     def transform(self, tables: dict[str, str]) -> TransformContract:
         """
@@ -51,13 +112,17 @@ class Transformer(TransformInterface):
                                      transformação para cada tabela de dados brutos.
 
         Returns:
-            TransformContract: Um contrato contendo os DataFrames processados.
+            TransformContract: Um contrato contendo os DataFrames processados e,
+                               se alguma tabela tiver `detect_changes`, a lista
+                               `changes` com a diferença de cada tabela (na
+                               mesma ordem de `clean_data`, None nas demais).
         """
         self.__transform_tables(tables)
 
         return TransformContract(
             clean_data=self.__processed_data,
-            transform_date=date.today()
+            transform_date=date.today(),
+            changes=self.__changes if any(self.__changes) else None
         )
 
     def __transform_tables(self, tables: dict[str, str]) -> None:
@@ -65,9 +130,12 @@ class Transformer(TransformInterface):
         Aplica o fluxo de transformação para cada DataFrame.
 
         Para cada item no dicionário de configuração, este método executa a
-        sequência de limpeza: extrai colunas, renomeia, aplica transformações
-        e remove colunas indesejadas.
-        Adicionalmente cria arquivos xlsx para cada tabela transformada.
+        sequência de limpeza: extrai colunas, renomeia, aplica transformações,
+        calcula as colunas de `computed`, remove linhas duplicadas (se `dedup` estiver configurado), remove
+        colunas indesejadas e, com `detect_changes`, mantém apenas as linhas
+        inseridas ou alteradas desde a última carga.
+        Adicionalmente cria arquivos xlsx para cada tabela transformada, se
+        a exportação estiver habilitada.
 
         Args:
             tables (dict[str, str]): A configuração detalhada das transformações.
@@ -77,13 +145,29 @@ class Transformer(TransformInterface):
             info = value['fields']
             remove = value['remove']
 
-            result = self.__extract_colunms(df, info)
-            result = self.__rename(result, info)
-            result = self.__transform_columns(result, info)
-            result = self.__remove_columns(result, remove)
-
-            result.to_excel(f'{key}.xlsx', index=False)
+            with Log.context(stage='transform', table=key), ColumnTransforms.date_scope(key), \
+                    Metrics.measure('transform', table=key) as measure:
+                self.__progress.start('transform', key, len(df))
+                result = self.__extract_colunms(df, info)
+                result = self.__rename(result, info)
+                result = self.__transform_columns(key, result, info)
+                result = self.__compute(key, result, value.get('computed'))
+                result = self.__deduplicate(key, result, value.get('dedup'))
+                result = self.__remove_columns(result, remove)
+                result, delta = self.__detect_changes(key, result, value)
+                measure.frame(result)
+                self.__progress.finish('transform', key)
+
+            if self.__export:
+                if self.__export_dir:
+                    os.makedirs(self.__export_dir, exist_ok=True)
+                result.to_excel(os.path.join(self.__export_dir, f'{key}.xlsx'), index=False)
             self.__set_table(value['destiny'], result)
+            self.__changes.append(delta)
+
+            del df
+            if isinstance(self.__raw_data, FrameStore):
+                self.__raw_data.release(key)
 
     def __extract_colunms(self, df: DataFrame, info: dict[str, str]) -> DataFrame:
         """
@@ -106,7 +190,7 @@ class Transformer(TransformInterface):
 
         except Exception as error:
             print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao extrair colunas: {error}", True)
+            Log.error(f"Erro ao extrair colunas: {error}", trace=True)
             raise SystemExit from error
 
         return df_filtered
@@ -135,17 +219,21 @@ class Transformer(TransformInterface):
 
         except Exception as error:
             print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao renomear colunas: {error}", True)
+            Log.error(f"Erro ao renomear colunas: {error}", trace=True)
             raise SystemExit from error
 
         return df
 
-    def __transform_columns(self, df: DataFrame, info: dict[str, str]) -> DataFrame:
+    def __transform_columns(self, key: str, df: DataFrame, info: dict[str, str]) -> DataFrame:
         """
         Aplica transformações de valor dinâmicas nas colunas.
 
-        Itera sobre a configuração e, para cada transformação especificada,
-        chama o método correspondente da classe `FieldHandler`.
+        Itera sobre a configuração e agrupa as transformações especificadas em
+        passos pelo `TransformRegistry`, que funde as de coluna consecutivas
+        de um mesmo campo. Os passos de cada tabela são montados uma única
+        vez e reaproveitados em `reload`. Cada passo é medido individualmente por tabela,
+        operação (as fundidas unidas por '+') e coluna, e o avanço da tabela
+        é informado proporcionalmente aos passos concluídos.
 
         Returns:
             DataFrame: O DataFrame com os valores das colunas transformados.
@@ -153,28 +241,116 @@ class Transformer(TransformInterface):
         Raises:
             SystemExit: Se ocorrer um erro durante a aplicação de uma transformação.
         """
+        if key not in self.__plans:
+            operations = []
+            for field, data in info.items():
+                if 'transform' not in data:
+                    continue
+
+                for option, value in data['transform'].items():
+                    if value:
+                        operations.append((data['field_destiny'], option, value))
+
+            self.__plans[key] = TransformRegistry.plan(operations)
+
+        steps = self.__plans[key]
+        rows = len(df)
+        done = 0
+        for position, (column, chain) in enumerate(steps, start=1):
+            op = '+'.join(option for option, _ in chain)
+            with Metrics.measure('transform', table=key, op=op, column=column) as measure:
+                df = TransformRegistry.apply(df, column, chain, lookups=self.__lookups)
+                measure.rows = len(df)
+
+            target = rows * position // len(steps)
+            self.__progress.advance('transform', key, target - done)
+            done = target
+
+        if not steps:
+            self.__progress.advance('transform', key, rows)
+
+        return df
+
+    def __deduplicate(self, key: str, df: DataFrame, config: dict | None) -> DataFrame:
+        """
+        Remove as linhas duplicadas pelas colunas-chave do bloco `dedup` da tabela.
 
-        for field, data in info.items():
-            column = data['field_destiny']
+        Returns:
+            DataFrame: O DataFrame sem duplicados (o mesmo, se `dedup` não estiver configurado).
 
-            if 'transform' not in data:
-                continue
+        Raises:
+            SystemExit: Se alguma coluna-chave não existir ou ocorrer outro erro.
+        """
+        if not config:
+            return df
 
-            transforms = data['transform']
-            for option, value in transforms.items():
-                if value:
-                    if hasattr(FieldHandler, option):
-                        try:
-                            transform_method = getattr(FieldHandler, option)
-                            df = transform_method(df, column, option_data=value)
+        try:
+            with Metrics.measure('transform', table=key, op='dedup') as measure:
+                df = Deduplicator(config).deduplicate(df)
+                measure.rows = len(df)
 
-                        except Exception as error:
-                            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                            Log.error(f"Erro no processo de transformação: {error}", True)
-                            raise SystemExit from error
+        except Exception as error:
+            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
+            Log.error(f"Erro ao remover linhas duplicadas: {error}", trace=True)
+            raise SystemExit from error
 
         return df
 
+    def __compute(self, key: str, df: DataFrame, computed: dict[str, str] | None) -> DataFrame:
+        """
+        Acrescenta as colunas calculadas da tabela, sem coluna correspondente na origem.
+
+        Configuradas no bloco `computed`, do nome de destino para a expressão
+        (veja `Expression`), são avaliadas na ordem, depois das transformações
+        dos campos, e podem usar as colunas calculadas antes delas:
+
+            "computed": {"total": "preco * quantidade"}
+
+        Raises:
+            SystemExit: Se alguma expressão falhar.
+        """
+        for column, text in (computed or {}).items():
+            with Metrics.measure('transform', table=key, op='expr', column=column) as measure:
+                df = TransformRegistry.apply(df, column, [('expr', text)])
+                measure.rows = len(df)
+
+        return df
+
+    def __detect_changes(self, key: str, df: DataFrame, table: dict) -> tuple[DataFrame, Delta | None]:
+        """
+        Reduz a tabela às linhas inseridas ou alteradas desde a última carga.
+
+        Nas tabelas de `upsert` com `incremental.keys`, as linhas já são só as
+        alteradas, e a diferença apenas exclui do destino as suas chaves.
+
+        Returns:
+            tuple[DataFrame, Delta | None]: As linhas a carregar e a diferença
+                (o DataFrame completo e None, se a detecção não se aplicar).
+
+        Raises:
+            SystemExit: Se alguma coluna-chave não existir, houver chaves
+                        repetidas ou ocorrer outro erro.
+        """
+        config = table.get('detect_changes')
+        keys = (table.get('incremental') or {}).get('keys') if key in self.__upsert else None
+        if not keys and (not config or self.__detector is None):
+            return df, None
+
+        try:
+            if keys:
+                return df, ChangeDetector.replace(keys, df)
+
+            with Metrics.measure('transform', table=key, op='detect_changes') as measure:
+                df, delta = self.__detector.detect(key, config, df)
+                measure.rows = len(df)
+
+        except Exception as error:
+            print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
+            Log.error(f"Erro ao detectar alterações: {error}", trace=True)
+            raise SystemExit from error
+
+        return df, delta
+
     def __remove_columns(self, df: DataFrame, remove: dict[str, str]) -> DataFrame:
         """
         Remove colunas especificadas de um DataFrame.
@@ -195,11 +371,13 @@ class Transformer(TransformInterface):
 
             except Exception as error:
                 print("[bold red]Erro ao transformar dados, verifique o log.[/bold red]")
-                Log.error(f"Erro ao tentar remover coluna: {error}", True)
+                Log.error(f"Erro ao tentar remover coluna: {error}", trace=True)
                 raise SystemExit from error
 
         return df
 
     def __set_table(self, table: str ,df: DataFrame) -> None:
         """Adiciona um DataFrame processado a uma lista de dicionários de resultados."""
-        self.__processed_data.append({table: df})
+        item = FrameStore(self.__budget) if self.__budget else {}
+        item[table] = df
+        self.__processed_data.append(item)
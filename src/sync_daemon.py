@@ -0,0 +1,317 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+import signal
+from threading import Event
+from time import monotonic
+from typing import TYPE_CHECKING, Annotated
+from typer import Option, run
+from rich import print
+from utils.config_json import JsonConfig
+from utils.connector import SQLConnector
+from utils.log import Log
+from utils.metrics import Metrics
+from utils.reflection_cache import ReflectionCache
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from stages.extract.sql_extractor import Extractor
+
+
+class SyncDaemon:
+    """
+    Mantém o pipeline em execução, sincronizando a origem com o destino em ciclos.
+
+    O processo fica ativo entre os ciclos, de modo que a importação das
+    bibliotecas e dos drivers, os engines e seus pools de conexão, a
+    reflexão das tabelas e o índice de cidades são criados uma única vez.
+    A cada ciclo, as configurações são relidas apenas se os arquivos mudaram;
+    os passos de transformação, os índices de busca e os mapas de chaves são
+    mantidos até que a configuração de tabelas mude.
+
+    Somente as tabelas com `incremental` ou `detect_changes` no `systems.json`
+    são sincronizadas:
+
+        "incremental": {"column": "data_alteracao", "keys": ["codigo_destino"]}
+
+    No primeiro ciclo a tabela é extraída por completo; nos seguintes, apenas
+    as linhas com a coluna maior ou igual à marca d'água da última carga,
+    exceto as já carregadas com o valor da marca (veja `WatermarkStore`).
+    Com `keys` (nomes de destino), as chaves das linhas extraídas são antes
+    excluídas do destino, de modo que uma linha alterada substitui a versão
+    anterior; sem elas, as linhas são apenas acrescentadas. A marca só avança
+    depois que a carga é concluída. Com `keys`, ela não avança se alguma linha
+    da tabela for rejeitada (veja `RejectRouter`): as linhas desde a marca são
+    extraídas e substituídas de novo a cada ciclo, até que as rejeitadas sejam
+    corrigidas na origem. Sem `keys`, reextraí-las duplicaria as carregadas,
+    então a marca avança e as rejeitadas só voltam quando alteradas na origem.
+    As tabelas com `detect_changes` são extraídas por completo em todo ciclo,
+    mas apenas as linhas inseridas, alteradas ou excluídas são aplicadas no
+    destino (veja `ChangeDetector`). As tabelas usadas pela transformação
+    `lookup` das sincronizadas são mantidas completas em memória entre os
+    ciclos e extraídas de novo só quando mudam: as sincronizadas, ao trazerem
+    linhas novas; as não sincronizadas, apenas quando a configuração muda.
+
+    Um ciclo é disparado a cada `interval` segundos ou quando o arquivo de
+    gatilho é criado (ele é removido ao iniciar o ciclo). A falha de um ciclo
+    é registrada no log e não encerra o processo; a reflexão das tabelas é
+    descartada, para que uma alteração de esquema seja vista no ciclo seguinte.
+
+    Args:
+            interval (float): Segundos entre os ciclos; 0 sincroniza apenas pelo gatilho.
+            trigger (str): Arquivo cujo surgimento dispara um ciclo. Vazio desativa.
+            cycles (int): Quantidade de ciclos antes de encerrar; 0 executa até ser interrompido.
+    """
+
+    __REPORTS_DIR: str = "reports"
+
+    def __init__(self, interval: float = 60.0, trigger: str = "", cycles: int = 0) -> None:
+        self.__interval = interval
+        self.__trigger = trigger
+        self.__cycles = cycles
+        self.__stop = Event()
+        self.__origin_conn = SQLConnector()
+        self.__destiny_conn = SQLConnector()
+        self.__tables = None
+        self.__references: dict[str, "DataFrame"] = {}
+        self.__lookups = None
+        self.__stages = None
+        self.__transformer = None
+        self.__skipped: set[str] = set()
+        self.__append_only: set[str] = set()
+
+    @classmethod
+    def run(
+        cls,
+        interval: Annotated[float, Option(help="Segundos entre os ciclos; 0 sincroniza apenas pelo gatilho.")] = 60.0,
+        trigger: Annotated[str, Option(help="Arquivo cujo surgimento dispara um ciclo de sincronização.")] = "",
+        cycles: Annotated[int, Option(help="Ciclos a executar antes de encerrar; 0 executa até ser interrompido.")] = 0,
+    ) -> None:
+        """
+        Inicia o modo de sincronização contínua, até SIGINT/SIGTERM.
+
+        Raises:
+            SystemExit: Se não houver intervalo nem gatilho configurados.
+        """
+        if interval <= 0 and not trigger:
+            print("[bold red]Informe um intervalo (--interval) ou um arquivo de gatilho (--trigger).[/bold red]")
+            raise SystemExit(1)
+
+        daemon = cls(interval, trigger, cycles)
+        for number in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(number, lambda *_: daemon.stop())
+
+        print(f"[bold green]Sincronização contínua iniciada (intervalo: {interval}s, "
+              f"gatilho: {trigger or '-'}).[/bold green]")
+        daemon.serve()
+
+    def stop(self) -> None:
+        """Solicita o encerramento ao fim do ciclo corrente."""
+        self.__stop.set()
+
+    def serve(self) -> int:
+        """
+        Executa os ciclos até o encerramento ou até atingir `cycles`.
+
+        Returns:
+            int: A quantidade de ciclos executados.
+        """
+        count = 0
+        while not self.__stop.is_set():
+            count += 1
+            self.sync_once(count)
+
+            if self.__cycles and count >= self.__cycles:
+                break
+            self.__wait()
+
+        Log.info(f"Sincronização contínua encerrada após {count} ciclo(s).")
+        return count
+
+    def sync_once(self, cycle: int = 1) -> dict[str, int]:
+        """
+        Executa um ciclo de sincronização incremental.
+
+        Args:
+            cycle (int): Número do ciclo, registrado no contexto do log.
+
+        Returns:
+            dict[str, int]: As linhas gravadas por tabela (vazio se nada foi
+                            gravado ou se o ciclo falhou).
+        """
+        from stages.extract.watermark import WatermarkStore
+        from stages.stage_factory import StageFactory
+        from stages.table_checks import TableChecks
+        from stages.transform.lookup import LookupIndex
+        from stages.transform.registry import TransformRegistry
+
+        with Log.context(cycle=cycle):
+            run_metrics = Metrics.start_run('sync')
+            loaded: dict[str, int] = {}
+            deleted = 0
+
+            try:
+                JsonConfig.validate(TransformRegistry.check, TableChecks.errors)
+                tables = JsonConfig.get_tables()
+                origin = JsonConfig.get_origin_db()
+                destiny = JsonConfig.get_destiny_db()
+
+                if tables is not self.__tables:
+                    if self.__tables is not None:
+                        Log.info("Configuração de tabelas alterada, recarregada para este ciclo.")
+                    self.__tables = tables
+                    self.__references = {}
+                    self.__lookups = LookupIndex(self.__references)
+                    self.__stages = StageFactory(tables, lookups=self.__lookups)
+                    self.__transformer = None
+
+                synced = {name: table for name, table in tables.items()
+                          if table.get('incremental') or table.get('detect_changes')}
+                for name in tables.keys() - synced.keys() - self.__skipped:
+                    Log.warning(f"Tabela {name} sem 'incremental' ou 'detect_changes' configurado, "
+                                "ignorada na sincronização contínua.")
+                    self.__skipped.add(name)
+
+                self.__origin_conn.db_connection(origin)
+                self.__destiny_conn.db_connection(destiny)
+                origin_engine = self.__origin_conn.get_engine()
+
+                watermarks = WatermarkStore(origin_engine)
+                since = {name: watermarks.get(table['table']) for name, table in synced.items()
+                         if table.get('incremental')}
+
+                raw_data = self.__stages.extractor(origin['font'], origin_engine).extract(synced, since)
+                for name, mark in since.items():
+                    if mark is not None:
+                        raw_data.raw_data[name] = watermarks.unseen(synced[name]['table'], raw_data.raw_data[name],
+                                                                    synced[name]['incremental']['column'].lower())
+
+                changed = {name: table for name, table in synced.items()
+                           if table.get('detect_changes') or len(raw_data.raw_data[name])}
+
+                marks = {
+                    name: WatermarkStore.mark(raw_data.raw_data[name], table['incremental']['column'].lower())
+                    for name, table in changed.items() if table.get('incremental')
+                }
+                self.__warn_append_only(changed)
+
+                if changed:
+                    upsert = [name for name, mark in since.items() if mark is not None]
+                    self.__refresh_references(self.__stages.extractor(origin['font'], origin_engine),
+                                              LookupIndex.references(tables, changed), raw_data.raw_data, upsert)
+                    if self.__transformer is None:
+                        self.__transformer = self.__stages.transformer(raw_data, export=False, upsert=upsert)
+                    else:
+                        self.__transformer.reload(raw_data, upsert)
+                    clean_data = self.__transformer.transform(changed)
+                    self.__stages.loader(clean_data, self.__destiny_conn.get_engine(),
+                                         destiny.get('bulk_load', False)).load()
+
+                    rejected = set()
+                    for measure in run_metrics.measures('load'):
+                        if measure.op is None and measure.rows:
+                            loaded[measure.table] = loaded.get(measure.table, 0) + measure.rows
+                        elif measure.op == 'delete':
+                            deleted += measure.rows or 0
+                        elif measure.op == 'reject' and measure.rows:
+                            rejected.add(measure.table)
+
+                    for name, (mark, seen) in marks.items():
+                        if changed[name]['destiny'] in rejected:
+                            if changed[name]['incremental'].get('keys'):
+                                Log.warning("Tabela %s com linhas rejeitadas; a marca d'água não avança "
+                                            "até que sejam corrigidas na origem.", name)
+                                continue
+                            Log.warning("Tabela %s com linhas rejeitadas; sem 'keys', a marca d'água avança "
+                                        "e elas só serão extraídas de novo se forem alteradas na origem.", name)
+                        watermarks.set(changed[name]['table'], mark, seen)
+
+            except (SystemExit, Exception) as error:
+                message = str(error) or str(error.__cause__ or "") or "verifique os registros anteriores"
+                Log.error(f"Falha no ciclo de sincronização {cycle}: {message}", trace=isinstance(error, Exception))
+                loaded, deleted = {}, 0
+                ReflectionCache.clear()
+
+            finally:
+                Metrics.finish_run()
+
+            if loaded or deleted:
+                report = run_metrics.save(self.__REPORTS_DIR)
+                Log.info("Ciclo %d: %d linhas gravadas e %d excluídas no destino. Relatório em %s",
+                         cycle, sum(loaded.values()), deleted, report)
+            else:
+                Log.info("Ciclo %d: nenhuma alteração sincronizada.", cycle)
+
+        return loaded
+
+    def __refresh_references(self, extractor: "Extractor", references: dict[str, dict],
+                             raw_data: dict[str, "DataFrame"], partial: list[str]) -> None:
+        """
+        Mantém completas, entre os ciclos, as tabelas usadas pela transformação `lookup`.
+
+        Uma tabela extraída por completo neste ciclo substitui a guardada se
+        os dados mudaram. Uma tabela ainda não guardada, ou extraída desde a
+        marca d'água com linhas novas, é extraída por completo. As demais,
+        inclusive as não sincronizadas (lidas uma vez por configuração),
+        mantêm os dados e o índice de busca do ciclo anterior.
+        """
+        stale = {}
+        for name, table in references.items():
+            if name in raw_data and name not in partial:
+                current = self.__references.get(name)
+                if current is None or not raw_data[name].equals(current):
+                    self.__references[name] = raw_data[name]
+                    self.__lookups.forget(name)
+
+            elif name not in self.__references or (name in raw_data and len(raw_data[name])):
+                stale[name] = table
+
+        if stale:
+            self.__references.update(extractor.extract(stale).raw_data)
+            for name in stale:
+                self.__lookups.forget(name)
+
+    def __warn_append_only(self, tables: dict[str, dict]) -> None:
+        """Avisa, uma vez por tabela, que as incrementais sem `keys` apenas acrescentam linhas."""
+        for name, table in tables.items():
+            if table.get('incremental') and not table['incremental'].get('keys') and name not in self.__append_only:
+                Log.warning(f"Tabela {name} com 'incremental' sem 'keys': as linhas alteradas na origem "
+                            "são acrescentadas ao destino, sem substituir a versão anterior.")
+                self.__append_only.add(name)
+
+    def __wait(self) -> None:
+        """Aguarda o próximo ciclo: o fim do intervalo, o gatilho ou o encerramento."""
+        deadline = monotonic() + self.__interval if self.__interval > 0 else None
+
+        while not self.__stop.is_set():
+            if self.__trigger and os.path.exists(self.__trigger):
+                try:
+                    os.remove(self.__trigger)
+                except OSError:
+                    pass
+                return
+
+            if deadline is not None:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    return
+                self.__stop.wait(min(remaining, 1.0))
+            else:
+                self.__stop.wait(1.0)
+
+
+if __name__ == "__main__":
+    run(SyncDaemon.run)
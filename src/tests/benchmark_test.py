@@ -0,0 +1,48 @@
+import os
+import numpy as np
+import pytest
+from src.benchmarks.data_generator import DataGenerator
+from src.benchmarks.run_benchmark import Benchmark
+
+
+def check_digits_ok(document, weights_first, weights_second):
+
+    digits = np.array([int(char) for char in document])
+    size = len(weights_first)
+    for weights, position in ((weights_first, size), (weights_second, size + 1)):
+        rest = (digits[:position] * weights).sum() % 11
+        if digits[position] != (0 if rest < 2 else 11 - rest):
+            return False
+    return True
+
+def test_generator_documents_are_valid():
+
+    generator = DataGenerator(seed=7)
+
+    for cpf in generator.cpf(50):
+        assert check_digits_ok(cpf, np.arange(10, 1, -1), np.arange(11, 1, -1))
+
+    for cnpj in generator.cnpj(50):
+        assert check_digits_ok(cnpj, np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]),
+                               np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+
+def test_generator_is_deterministic():
+
+    first = DataGenerator(seed=1).people(100)
+    second = DataGenerator(seed=1).people(100)
+
+    assert first.equals(second)
+    assert len(first) == 100
+
+def test_benchmark_runs_end_to_end(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(os, 'chdir', lambda path: pytest.fail("o benchmark não deve mudar o diretório corrente"))
+    report = Benchmark(rows=300).run()
+
+    assert report['rows'] == 300
+    assert report['stages']['extract']['rows'] == 300
+    assert report['stages']['transform']['rows'] == 300
+    assert report['stages']['load']['rows'] == 300
+    assert os.listdir(tmp_path) == []
+    assert any(item['op'] == 'format' for item in report['measures'])
@@ -0,0 +1,84 @@
+from datetime import date
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.stages.contracts.transform_contract import TransformContract
+from src.stages.load.bulk_session import BulkLoadSession
+from src.stages.load.load_data import Loader
+
+
+def create_destiny(path):
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes (codigo INTEGER PRIMARY KEY, nome TEXT, cpf TEXT)"))
+        connection.execute(text("CREATE INDEX ix_clientes_nome ON clientes (nome)"))
+        connection.execute(text("CREATE UNIQUE INDEX ux_clientes_cpf ON clientes (cpf)"))
+        connection.execute(text("CREATE TABLE auditoria (codigo INTEGER)"))
+        connection.execute(text(
+            "CREATE TRIGGER tr_clientes AFTER INSERT ON clientes "
+            "BEGIN INSERT INTO auditoria VALUES (NEW.codigo); END"
+        ))
+    return engine
+
+def schema_objects(engine):
+
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')"))
+        return sorted(row[0] for row in rows)
+
+def test_bulk_load_restores_objects(tmp_path):
+
+    engine = create_destiny(tmp_path / "destino.db")
+    before = schema_objects(engine)
+    df = pd.DataFrame({'codigo': [1, 2], 'nome': ['ANA', 'JOSE'], 'cpf': ['1', '2']})
+    contract = TransformContract(clean_data=[{'clientes': df}], transform_date=date.today())
+
+    Loader(contract, engine, bulk_load=True).load()
+
+    assert schema_objects(engine) == before
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM clientes")).scalar() == 2
+        assert connection.execute(text("SELECT COUNT(*) FROM auditoria")).scalar() == 0
+
+def test_bulk_session_disables_only_non_essential(tmp_path):
+
+    engine = create_destiny(tmp_path / "destino.db")
+
+    with BulkLoadSession(engine, 'clientes'):
+        assert schema_objects(engine) == ['ux_clientes_cpf']
+
+    assert schema_objects(engine) == ['ix_clientes_nome', 'tr_clientes', 'ux_clientes_cpf']
+
+def test_bulk_session_restores_on_failure(tmp_path):
+
+    engine = create_destiny(tmp_path / "destino.db")
+    before = schema_objects(engine)
+    df = pd.DataFrame({'codigo': [1, 1], 'nome': ['ANA', 'JOSE'], 'cpf': ['1', '2']})
+    contract = TransformContract(clean_data=[{'clientes': df}], transform_date=date.today())
+
+    with pytest.raises(SystemExit):
+        Loader(contract, engine, bulk_load=True).load()
+
+    assert schema_objects(engine) == before
+
+def test_failed_restore_keeps_the_original_error(tmp_path):
+
+    engine = create_destiny(tmp_path / "destino.db")
+
+    def occupy_index_name():
+        with engine.begin() as connection:
+            connection.execute(text("CREATE INDEX ix_clientes_nome ON auditoria (codigo)"))
+
+    with pytest.raises(ValueError, match='carga'):
+        with BulkLoadSession(engine, 'clientes'):
+            occupy_index_name()
+            raise ValueError('falha na carga')
+
+    assert schema_objects(engine) == ['ix_clientes_nome', 'tr_clientes', 'ux_clientes_cpf']
+
+    engine = create_destiny(tmp_path / "outro.db")
+
+    with pytest.raises(SystemExit):
+        with BulkLoadSession(engine, 'clientes'):
+            occupy_index_name()
@@ -0,0 +1,80 @@
+from datetime import date
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.stages.contracts.contract_store import ContractStore
+from src.stages.contracts.extract_contract import ExtractContract
+from src.stages.load.load_data import Loader
+from src.stages.transform.change_detector import ChangeDetector
+from src.stages.transform.transform_data import Transformer
+
+TABLES = {
+    'clientes': {
+        'table': 'CLIENTES', 'destiny': 'pessoas',
+        'fields': {'CODIGO': {'field_destiny': 'codigo'}, 'NOME': {'field_destiny': 'nome', 'transform': {'trim': True}}},
+        'remove': {},
+        'detect_changes': {'keys': ['codigo']},
+    }
+}
+
+
+def transform(rows, changes_dir):
+    raw = {'clientes': pd.DataFrame(rows, columns=['codigo', 'nome'])}
+    contract = ExtractContract(font=None, raw_data=raw, extraction_date=date.today())
+    return Transformer(contract, export=False, changes_dir=changes_dir).transform(TABLES)
+
+
+def destiny(engine):
+    with engine.connect() as connection:
+        return connection.execute(text('SELECT codigo, nome FROM pessoas ORDER BY codigo')).fetchall()
+
+
+def test_only_changes_are_loaded(tmp_path):
+    engine = create_engine('sqlite://')
+    changes_dir = str(tmp_path / 'changes')
+
+    first = transform([(1, 'Ana '), (2, 'Bia'), (3, 'Caio')], changes_dir)
+    assert first.changes[0].counts == {'inserted': 3, 'updated': 0, 'deleted': 0}
+    Loader(first, engine).load()
+
+    same = transform([(1, 'Ana'), (2, 'Bia'), (3, 'Caio')], changes_dir)
+    assert len(same.clean_data[0]['pessoas']) == 0
+    Loader(same, engine).load()
+    assert destiny(engine) == [(1, 'Ana'), (2, 'Bia'), (3, 'Caio')]
+
+    delta = transform([(1, 'Ana'), (2, 'Beatriz'), (4, 'Davi')], changes_dir)
+    assert delta.changes[0].counts == {'inserted': 1, 'updated': 1, 'deleted': 1}
+    assert delta.clean_data[0]['pessoas']['codigo'].tolist() == [2, 4]
+    Loader(delta, engine).load()
+    Loader(delta, engine).load()
+    assert destiny(engine) == [(1, 'Ana'), (2, 'Beatriz'), (4, 'Davi')]
+
+
+def test_index_not_saved_when_load_fails(tmp_path):
+    changes_dir = str(tmp_path / 'changes')
+    contract = transform([(1, 'Ana')], changes_dir)
+
+    with pytest.raises(SystemExit):
+        Loader(contract, create_engine(f"sqlite:///{tmp_path / 'inexistente' / 'x.db'}")).load()
+
+    assert transform([(1, 'Ana')], changes_dir).changes[0].counts['inserted'] == 1
+
+
+def test_repeated_keys_fail(tmp_path):
+    with pytest.raises(SystemExit):
+        transform([(1, 'Ana'), (1, 'Bia')], str(tmp_path / 'changes'))
+
+
+def test_delta_survives_contract_store(tmp_path):
+    engine = create_engine('sqlite://')
+    changes_dir = str(tmp_path / 'changes')
+    Loader(transform([(1, 'Ana'), (2, 'Bia')], changes_dir), engine).load()
+
+    store = ContractStore(str(tmp_path / 'contracts'))
+    store.save_transform(transform([(2, 'Bruna')], changes_dir), TABLES)
+    Loader(store.load_transform(TABLES), engine).load()
+
+    assert destiny(engine) == [(2, 'Bruna')]
+    assert ChangeDetector(changes_dir).detect('clientes', TABLES['clientes']['detect_changes'],
+                                              pd.DataFrame({'codigo': [2], 'nome': ['Bruna']}))[1].counts == \
+        {'inserted': 0, 'updated': 0, 'deleted': 0}
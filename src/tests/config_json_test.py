@@ -0,0 +1,105 @@
+import json
+import os
+import pytest
+from src.stages.table_checks import TableChecks
+from src.stages.transform.registry import TransformRegistry
+from src.utils.config_json import JsonConfig
+
+TABLES = {
+    'clientes': {
+        'table': 'clientes_origem',
+        'destiny': 'clientes_destino',
+        'fields': {
+            'nome': {'field_destiny': 'nome', 'transform': {'trim': True, 'format': 'CPF'}},
+        },
+        'remove': {},
+    }
+}
+
+
+def write(path, data):
+
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+def test_tables_are_cached_and_immutable(tmp_path, monkeypatch):
+
+    path = write(tmp_path / 'systems.json', TABLES)
+    monkeypatch.setattr(JsonConfig, '_JsonConfig__FILE_PATH_TABLES', path)
+
+    tables = JsonConfig.get_tables()
+
+    assert JsonConfig.get_tables() is tables
+    assert tables['clientes']['fields']['nome']['transform']['format'] == 'CPF'
+    with pytest.raises(TypeError):
+        tables['clientes']['destiny'] = 'outra'
+
+def test_tables_reloaded_when_file_changes(tmp_path, monkeypatch):
+
+    path = write(tmp_path / 'systems.json', TABLES)
+    monkeypatch.setattr(JsonConfig, '_JsonConfig__FILE_PATH_TABLES', path)
+    JsonConfig.get_tables()
+
+    changed = json.loads(json.dumps(TABLES))
+    changed['clientes']['destiny'] = 'clientes_novo'
+    write(tmp_path / 'systems.json', changed)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert JsonConfig.get_tables()['clientes']['destiny'] == 'clientes_novo'
+
+def test_all_errors_reported_at_once(tmp_path, monkeypatch, capsys):
+
+    tables = {
+        'clientes': {
+            'table': 'clientes_origem',
+            'fields': {
+                'nome': {'field_destiny': 'nome', 'transform': {'trimm': True, 'format': 'RG'}},
+                'apelido': {'field_destiny': 'nome'},
+            },
+            'dedup': {'keys': [], 'keep': 'middle'},
+        }
+    }
+    monkeypatch.setattr(JsonConfig, '_JsonConfig__FILE_PATH_TABLES', write(tmp_path / 'systems.json', tables))
+    monkeypatch.setattr(JsonConfig, '_JsonConfig__FILE_PATH_ORIGIN', write(tmp_path / 'origin.json', {'font': 'SQLServer'}))
+    monkeypatch.setattr(JsonConfig, '_JsonConfig__FILE_PATH_DESTINY', write(tmp_path / 'destiny.json',
+                                                                            {'font': 'SQLite', 'database': 'x.db'}))
+
+    with pytest.raises(SystemExit):
+        JsonConfig.validate(TransformRegistry.check, TableChecks.errors)
+
+    output = " ".join(capsys.readouterr().out.split())
+    assert "'destiny' ausente" in output
+    assert "'remove' ausente" in output
+    assert "'trimm' desconhecida" in output
+    assert "'format' deve ser" in output
+    assert "'nome' repetido" in output
+    assert "'dedup' deve informar a lista de colunas em 'keys'" in output
+    assert "'keep' deve ser 'first' ou 'last'" in output
+    assert "origin.json: 'host' ausente" in output
+    assert "destiny.json" not in output
+
+def test_tables_validated_once_per_load(tmp_path, monkeypatch):
+
+    path = write(tmp_path / 'systems.json', TABLES)
+    monkeypatch.setattr(JsonConfig, '_JsonConfig__FILE_PATH_TABLES', path)
+    monkeypatch.setattr(JsonConfig, '_JsonConfig__FILE_PATH_ORIGIN', write(tmp_path / 'origin.json',
+                                                                           {'font': 'SQLite', 'database': 'x.db'}))
+    monkeypatch.setattr(JsonConfig, '_JsonConfig__FILE_PATH_DESTINY', write(tmp_path / 'destiny.json',
+                                                                            {'font': 'SQLite', 'database': 'y.db'}))
+    calls = []
+
+    def blocks(name, config, tables):
+        calls.append(name)
+        return []
+
+    JsonConfig.validate(TransformRegistry.check, blocks)
+    JsonConfig.validate(TransformRegistry.check, blocks)
+    tables = JsonConfig.get_tables()
+    assert calls == ['clientes']
+    assert JsonConfig.get_tables() is tables
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    JsonConfig.validate(TransformRegistry.check, blocks)
+    assert calls == ['clientes', 'clientes']
@@ -0,0 +1,67 @@
+from datetime import date
+from decimal import Decimal
+import pytest
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from src.stages.contracts.contract_store import ContractStore
+from src.stages.contracts.extract_contract import ExtractContract
+from src.stages.contracts.transform_contract import TransformContract
+
+TABLES = {
+    'clientes': {'table': 'CLIENTES', 'destiny': 'pessoas'},
+    'produtos': {'table': 'PRODUTOS', 'destiny': 'itens'},
+}
+
+
+def frames():
+    return {
+        'clientes': DataFrame({'codigo': [1, 2, 3], 'nome': ['Ana', None, 'Caio']}),
+        'produtos': DataFrame({'codigo': [7, 8], 'preco': [Decimal('1.50'), Decimal('2.25')]}),
+    }
+
+
+def test_roundtrip_selected_tables(tmp_path):
+    store = ContractStore(str(tmp_path))
+    data = frames()
+    store.save_extract(ExtractContract('sqlite', data, date(2025, 1, 2)), TABLES)
+    store.save_transform(TransformContract([{'pessoas': data['clientes']}, {'itens': data['produtos']}],
+                                           date(2025, 1, 3)), TABLES)
+
+    selected = {'produtos': TABLES['produtos']}
+    raw = store.load_extract(selected)
+    assert raw.font == 'sqlite' and raw.extraction_date == date(2025, 1, 2)
+    assert list(raw.raw_data) == ['produtos']
+    assert_frame_equal(raw.raw_data['produtos'], data['produtos'])
+
+    clean = store.load_transform(TABLES)
+    assert clean.transform_date == date(2025, 1, 3)
+    assert_frame_equal(clean.clean_data[0]['pessoas'], data['clientes'])
+    assert_frame_equal(clean.clean_data[1]['itens'], data['produtos'])
+
+
+def test_transform_is_saved_by_destiny(tmp_path):
+    store = ContractStore(str(tmp_path))
+    data = frames()
+    store.save_transform(TransformContract([{'itens': data['produtos']}, {'pessoas': data['clientes']}],
+                                           date(2025, 1, 3)), TABLES)
+
+    clean = store.load_transform(TABLES)
+    assert_frame_equal(clean.clean_data[0]['pessoas'], data['clientes'])
+    assert_frame_equal(clean.clean_data[1]['itens'], data['produtos'])
+
+    with pytest.raises(SystemExit):
+        store.save_transform(TransformContract([{'pessoas': data['clientes']}], date(2025, 1, 3)), TABLES)
+
+
+def test_missing_or_stale_stage_fails(tmp_path):
+    store = ContractStore(str(tmp_path))
+    store.save_extract(ExtractContract('sqlite', frames(), date.today()), {'clientes': TABLES['clientes']})
+
+    with pytest.raises(SystemExit):
+        store.load_extract(TABLES)
+
+    with pytest.raises(SystemExit):
+        store.load_extract({'clientes': {'table': 'OUTRA', 'destiny': 'pessoas'}})
+
+    with pytest.raises(SystemExit):
+        store.load_transform({'clientes': TABLES['clientes']})
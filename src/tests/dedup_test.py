@@ -0,0 +1,66 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+from src.stages.contracts.extract_contract import ExtractContract
+from src.stages.transform.dedup import Deduplicator
+from src.stages.transform.transform_data import Transformer
+
+
+def customers():
+    return pd.DataFrame({
+        'nome': ['  José Araújo', 'JOSE ARAUJO ', 'Maria', None, None, 'maria'],
+        'cidade': ['Santos', 'Santos', 'Campinas', 'Santos', 'Santos', 'Campinas'],
+        'codigo': [1, 2, 3, 4, 5, 6],
+    })
+
+
+def test_keep_first_and_last_with_normalization():
+    config = {'keys': ['nome', 'cidade'], 'normalize': ['trim', 'clear', 'upper']}
+
+    first = Deduplicator(config).deduplicate(customers())
+    assert first['codigo'].tolist() == [1, 3, 4]
+
+    last = Deduplicator({**config, 'keep': 'last'}).deduplicate(customers())
+    assert last['codigo'].tolist() == [2, 5, 6]
+
+
+def test_without_normalization_matches_drop_duplicates():
+    df = customers()
+    result = Deduplicator({'keys': ['nome']}).deduplicate(df)
+    expected = df.drop_duplicates(subset=['nome']).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_chunked_fingerprints_are_identical():
+    df = pd.concat([customers()] * 50, ignore_index=True)
+    config = {'keys': ['nome', 'cidade'], 'normalize': ['trim']}
+
+    whole = Deduplicator(config, chunk_size=len(df)).fingerprints(df)
+    chunked = Deduplicator(config, chunk_size=7).fingerprints(df)
+    assert (whole == chunked).all()
+
+
+def test_hash_collisions_do_not_remove_distinct_rows(monkeypatch):
+    monkeypatch.setattr(Deduplicator, 'fingerprints', lambda self, df: np.zeros(len(df), dtype=np.uint64))
+    config = {'keys': ['nome', 'cidade'], 'normalize': ['trim', 'clear', 'upper']}
+
+    result = Deduplicator(config).deduplicate(customers())
+    assert result['codigo'].tolist() == [1, 3, 4]
+
+
+def test_transformer_applies_dedup_before_removing_columns():
+    config = {
+        'clientes': {
+            'table': 'CLIENTES', 'destiny': 'pessoas',
+            'fields': {'NOME': {'field_destiny': 'nome'}, 'CIDADE': {'field_destiny': 'cidade'},
+                       'CODIGO': {'field_destiny': 'codigo'}},
+            'remove': {'column_1': 'cidade'},
+            'dedup': {'keys': ['nome', 'cidade'], 'normalize': ['trim', 'clear', 'upper']},
+        }
+    }
+    contract = ExtractContract(font=None, raw_data={'clientes': customers()}, extraction_date=date.today())
+
+    result = Transformer(contract, export=False).transform(config).clean_data[0]['pessoas']
+
+    assert result.columns.tolist() == ['nome', 'codigo']
+    assert result['codigo'].tolist() == [1, 3, 4]
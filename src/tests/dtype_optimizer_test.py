@@ -0,0 +1,140 @@
+from datetime import date
+import numpy as np
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, text
+from src.stages.contracts.extract_contract import ExtractContract
+from src.stages.contracts.transform_contract import TransformContract
+from src.stages.extract.dtype_optimizer import DtypeOptimizer
+from src.stages.load.load_data import Loader
+from src.stages.transform.transform_data import Transformer
+
+SOURCE = Table(
+    'clientes', MetaData(),
+    Column('codigo', Integer), Column('grupo', Integer, nullable=True), Column('saldo', Float),
+    Column('taxa', Float), Column('uf', String(2)), Column('nome', String(60)),
+)
+
+
+def frame(rows=1000):
+    return DataFrame({
+        'codigo': np.arange(rows, dtype='int64'),
+        'grupo': [float(i % 7) if i % 5 else np.nan for i in range(rows)],
+        'saldo': [i * 0.5 for i in range(rows)],
+        'taxa': [0.1 * i for i in range(rows)],
+        'uf': [('SP', 'RJ', None)[i % 3] for i in range(rows)],
+        'nome': [f'cliente {i}' for i in range(rows)],
+    })
+
+
+def test_optimize_and_restore_roundtrip():
+    df = frame()
+    optimized = DtypeOptimizer().optimize(df, SOURCE, list(df.columns))
+
+    assert str(optimized['codigo'].dtype) == 'int16'
+    assert str(optimized['grupo'].dtype) == 'Int8'
+    assert str(optimized['saldo'].dtype) == 'float32'
+    assert str(optimized['taxa'].dtype) == 'float64'
+    assert str(optimized['uf'].dtype) == 'category'
+    assert str(optimized['nome'].dtype) == 'object'
+    assert optimized.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+
+    assert_frame_equal(DtypeOptimizer.restore(optimized), df)
+
+
+def test_candidates_skip_transformed_and_referenced_columns():
+    config = {
+        'fields': {
+            'CODIGO': {'field_destiny': 'codigo'},
+            'NOME': {'field_destiny': 'nome', 'transform': {'trim': True}},
+            'APELIDO': {'field_destiny': 'apelido', 'transform': {'copy': 'nome'}},
+            'CIDADE': {'field_destiny': 'cidade', 'transform': {'search': 'CITY'}},
+            'UF': {'field_destiny': 'UF'},
+            'ALTERADO': {'field_destiny': 'alterado'},
+        },
+        'incremental': {'column': 'ALTERADO'},
+    }
+
+    assert DtypeOptimizer.candidates(config) == ['codigo']
+
+
+def test_candidates_skip_columns_read_by_the_transformation():
+    tables = {
+        'grupos': {'fields': {'CODIGO': {'field_destiny': 'codigo'}, 'DESCRICAO': {'field_destiny': 'descricao'},
+                              'ATIVO': {'field_destiny': 'ativo'}}},
+        'produtos': {
+            'fields': {
+                'CODIGO': {'field_destiny': 'codigo'}, 'GRUPO': {'field_destiny': 'grupo_id'},
+                'PRECO': {'field_destiny': 'preco'}, 'QTD': {'field_destiny': 'qtd'}, 'CUSTO': {'field_destiny': 'custo'},
+                'NOME': {'field_destiny': 'nome'}, 'MARCA': {'field_destiny': 'marca'},
+                'TOTAL': {'field_destiny': 'total', 'transform': {'expr': 'round(custo * 2, 2)'}},
+                'CATEGORIA': {'field_destiny': 'categoria', 'transform': {
+                    'lookup': {'table': 'grupos', 'key': 'CODIGO', 'columns': {'DESCRICAO': 'grupo_nome'}}}},
+            },
+            'computed': {'valor': 'preco * qtd'},
+            'dedup': {'keys': ['nome']},
+            'detect_changes': {'keys': ['codigo']},
+            'remap': {'grupo_id': 'grupos'},
+        },
+    }
+
+    assert DtypeOptimizer.candidates(tables['produtos'], 'produtos', tables) == ['marca']
+    assert DtypeOptimizer.candidates(tables['grupos'], 'grupos', tables) == ['ativo']
+    assert DtypeOptimizer.candidates(tables['grupos']) == ['codigo', 'descricao', 'ativo']
+
+
+def test_transformation_of_optimized_data_is_unchanged(tmp_path):
+    rows = 600
+    tables = {
+        'grupos': {'table': 'GRUPOS', 'destiny': 'grupos', 'remove': {},
+                   'fields': {'CODIGO': {'field_destiny': 'codigo'}, 'DESCRICAO': {'field_destiny': 'descricao'}}},
+        'clientes': {
+            'table': 'CLIENTES', 'destiny': 'clientes', 'remove': {},
+            'fields': {
+                'CODIGO': {'field_destiny': 'codigo'}, 'SALDO': {'field_destiny': 'saldo'},
+                'UF': {'field_destiny': 'uf'}, 'NOME': {'field_destiny': 'nome'},
+                'GRUPO': {'field_destiny': 'grupo', 'transform': {
+                    'lookup': {'table': 'grupos', 'key': 'codigo', 'columns': {'descricao': 'grupo_nome'}}}},
+            },
+            'computed': {'dobro': 'saldo * 2'},
+            'dedup': {'keys': ['uf', 'grupo']},
+            'detect_changes': {'keys': ['uf', 'grupo']},
+        },
+    }
+    groups = DataFrame({'codigo': np.arange(7, dtype='int64'), 'descricao': [f'grupo {i % 2}' for i in range(7)]})
+    clients = frame(rows).assign(grupo=[i % 7 for i in range(rows)])
+    sources = {'grupos': Table('grupos', MetaData(), Column('codigo', Integer), Column('descricao', String(20))),
+               'clientes': SOURCE}
+
+    optimizer = DtypeOptimizer()
+    optimized = {name: optimizer.optimize(df, sources[name], DtypeOptimizer.candidates(tables[name], name, tables))
+                 for name, df in {'grupos': groups, 'clientes': clients}.items()}
+    assert str(optimized['clientes']['saldo'].dtype) == 'float64'
+    assert str(optimized['clientes']['codigo'].dtype) == 'int16'
+
+    results = []
+    for position, raw in enumerate(({'grupos': groups, 'clientes': clients}, optimized)):
+        transformer = Transformer(ExtractContract(None, raw, date.today()), export=False,
+                                  changes_dir=str(tmp_path / str(position)))
+        results.append(transformer.transform(tables).clean_data[1]['clientes'])
+
+    assert len(results[0]) == 21
+    assert_frame_equal(DtypeOptimizer.restore(results[1]), results[0])
+
+
+def test_loaded_rows_are_identical():
+    engine = create_engine('sqlite://')
+    df = frame(300)
+    optimized = DtypeOptimizer().optimize(df, SOURCE, list(df.columns))
+
+    contract = TransformContract([{'original': df}, {'otimizada': optimized}], date.today())
+    Loader(contract, engine).load()
+
+    with engine.connect() as connection:
+        original = connection.execute(text('SELECT * FROM original')).fetchall()
+        reduced = connection.execute(text('SELECT * FROM otimizada')).fetchall()
+        types = [connection.execute(text(f"SELECT sql FROM sqlite_master WHERE name = '{name}'")).scalar()
+                 for name in ('original', 'otimizada')]
+
+    assert original == reduced
+    assert types[0].replace('original', 'otimizada') == types[1]
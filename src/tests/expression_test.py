@@ -0,0 +1,86 @@
+from datetime import date
+from decimal import Decimal
+import pandas as pd
+import pytest
+from src.stages.contracts.extract_contract import ExtractContract
+from src.stages.table_checks import TableChecks
+from src.stages.transform.expression import Expression
+from src.stages.transform.registry import TransformRegistry
+from src.stages.transform.transform_data import Transformer
+from src.utils.config_json import JsonConfig, freeze
+
+
+def items():
+    return pd.DataFrame({
+        'preco': [Decimal('1.50'), Decimal('2'), None],
+        'quantidade': [2, 3, 4],
+        'endereco': [' Rua A ', 'Rua B', None],
+        'numero': [10.0, None, 3.0],
+        'celular': ['', '99999', None],
+        'telefone': ['1111', '2222', '3333'],
+    })
+
+
+def test_vectorized_expressions():
+    df = items()
+
+    assert Expression.compile('preco * quantidade').evaluate(df).iloc[:2].tolist() == [3.0, 6.0]
+    assert Expression.compile("trim(endereco) + ', ' + str(numero)").evaluate(df).tolist() == \
+        ['Rua A, 10', 'Rua B, ', ', 3']
+    assert Expression.compile("'S' if quantidade > 2 and not numero > 5 else 'N'").evaluate(df).tolist() == \
+        ['N', 'S', 'S']
+    assert Expression.compile('coalesce(celular, telefone)').evaluate(df).tolist() == ['1111', '99999', '3333']
+    assert Expression.compile('1 <= quantidade < 4').evaluate(df).tolist() == [True, True, False]
+
+
+def test_decimal_columns_keep_exact_arithmetic():
+    df = pd.DataFrame({'preco': [Decimal('0.10'), Decimal('-2.25'), None], 'taxa': [0.5, 1.0, 2.0]})
+
+    assert Expression.compile('preco * 3').evaluate(df).iloc[:2].tolist() == [Decimal('0.30'), Decimal('-6.75')]
+    assert Expression.compile('preco * 1.1 + preco').evaluate(df).iloc[:2].tolist() == [Decimal('0.210'), Decimal('-4.725')]
+    assert Expression.compile('round(abs(-preco), 1)').evaluate(df).iloc[:2].tolist() == [Decimal('0.1'), Decimal('2.2')]
+    assert Expression.compile('preco * 3 == 0.3').evaluate(df).tolist()[0]
+    assert pd.isna(Expression.compile('preco * 3').evaluate(df).iloc[2])
+    assert Expression.compile('preco * taxa').evaluate(df).iloc[:2].tolist() == [0.05, -2.25]
+
+
+def test_expressions_are_compiled_once_and_restricted():
+    assert Expression.compile('preco * 2') is Expression.compile('preco * 2')
+    assert Expression.compile('round(preco * quantidade, 2) + abs(numero)').columns == ('preco', 'quantidade', 'numero')
+
+    for text in ("__import__('os').system('ls')", 'preco.sum()', 'endereco[0]', 'lambda: 1', 'open(endereco)'):
+        assert Expression.check(text) is not None
+    assert Expression.check('preco * quantidade') is None
+
+    with pytest.raises(KeyError):
+        Expression.compile('inexistente + 1').evaluate(items())
+
+
+def test_expr_transform_in_pipeline():
+    tables = {
+        'itens': {
+            'table': 'ITENS', 'destiny': 'itens',
+            'fields': {
+                'PRECO': {'field_destiny': 'preco'},
+                'QUANTIDADE': {'field_destiny': 'quantidade'},
+                'NUMERO': {'field_destiny': 'numero', 'transform': {'expr': 'numero * 10'}},
+            },
+            'computed': {'total': 'preco * quantidade', 'dobro': 'total * 2'},
+            'remove': {},
+        },
+    }
+    assert JsonConfig.tables_errors(freeze(tables), TransformRegistry.check, TableChecks.errors) == []
+    assert JsonConfig.tables_errors(freeze({'itens': {**tables['itens'], 'fields': {
+        'PRECO': {'field_destiny': 'preco', 'transform': {'expr': 'preco.sum()'}}}}}),
+        TransformRegistry.check, TableChecks.errors)
+    assert len(JsonConfig.tables_errors(freeze({'itens': {**tables['itens'], 'computed': {
+        'preco': 'quantidade * 2', 'total': 'preco.sum()'}}}), TransformRegistry.check, TableChecks.errors)) == 2
+
+    raw = {'itens': items()}
+    result = Transformer(ExtractContract(None, raw, date.today()), export=False).transform(tables).clean_data
+    df = result[0]['itens']
+
+    assert list(df.columns) == ['preco', 'quantidade', 'numero', 'total', 'dobro']
+    assert df['total'].iloc[:2].tolist() == [3.0, 6.0]
+    assert df['dobro'].iloc[:2].tolist() == [6.0, 12.0]
+    assert df['numero'].iloc[[0, 2]].tolist() == [100, 30]
@@ -1,4 +1,5 @@
 import pandas as pd
+from src.stages.transform.column_transforms import ColumnTransforms
 from src.stages.transform.field_utils import FieldHandler
 
 
@@ -164,6 +165,46 @@ def test_format_cep():
 
     pd.testing.assert_frame_equal(result_df, expected_df)
 
+def test_date_inferred_format():
+
+    test_data = {
+        'nascimento': ['31/01/2024', '01/02/2024 10:30', '30/12/1899', '00/00/0000', None, '31/01/2024']
+    }
+    df = pd.DataFrame(test_data)
+    expected_data = {
+        'nascimento': pd.to_datetime(['2024-01-31', '2024-02-01 10:30', None, None, None, '2024-01-31'], format='ISO8601')
+    }
+    expected_df = pd.DataFrame(expected_data)
+
+    result_df = FieldHandler.date(df, 'nascimento', option_data=True)
+
+    pd.testing.assert_frame_equal(result_df, expected_df)
+
+def test_date_explicit_format_and_sentinels():
+
+    test_data = {
+        'data': [20240131, 19000101, 20240230]
+    }
+    df = pd.DataFrame(test_data)
+    expected_data = {
+        'data': pd.to_datetime(['2024-01-31', None, None])
+    }
+    expected_df = pd.DataFrame(expected_data)
+
+    result_df = FieldHandler.date(df, 'data', option_data={'format': '%Y%m%d', 'sentinels': ['1900-01-01']})
+
+    pd.testing.assert_frame_equal(result_df, expected_df)
+
+def test_date_formats_are_cached_per_table():
+
+    with ColumnTransforms.date_scope('pedidos'):
+        ColumnTransforms.date(pd.Series(['12/31/2024'], name='data'), True)
+
+    with ColumnTransforms.date_scope('clientes'):
+        result = ColumnTransforms.date(pd.Series(['01/02/2024', '25/12/2024'], name='data'), True)
+
+    assert result.tolist() == pd.to_datetime(['2024-02-01', '2024-12-25']).tolist()
+
 def test_split_ddd1():
 
     test_data = {
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.stages.transform.fixed_width import FixedWidth
+
+VALUES = pd.Series(['12345678901', '123.456.789-01', 'CPF 12345678901', '123456789012', '', 'None',
+                    '12345678901.0', '1234567890', '20240131', '2024-01-31', '2024/01.31', '2024-01-31 10:00:00',
+                    '01310100', '11999998888', '1133334444', '999998888', '33334444', '(11)33334444', 'ção12345'])
+
+FORMATS = [
+    (r'([0-9]{3})([0-9]{3})([0-9]{3})([0-9]{2})', r'\1.\2.\3-\4', ('99999999999',), '###.###.###-##'),
+    (r'([0-9]{2})([0-9]{3})([0-9]{3})([0-9]{4})([0-9]{2})', r'\1.\2.\3/\4-\5', ('99999999999999',),
+     '##.###.###/####-##'),
+    (r'([0-9]{4})[-./ ]?([0-9]{2})[-./ ]?([0-9]{2})', r'\1-\2-\3 00:00:00.000', ('99999999', '9999?99?99'),
+     '####-##-## 00:00:00.000'),
+    (r'([0-9]{5})([0-9]{3})', r'\1-\2', ('99999999',), '#####-###'),
+]
+
+
+@pytest.mark.parametrize('search, replace, patterns, layout', FORMATS)
+def test_format_matches_regex(search, replace, patterns, layout):
+    expected = VALUES.str.replace(search, replace, regex=True)
+
+    assert FixedWidth.format(VALUES, patterns, layout, search, replace).equals(expected)
+
+
+def test_split_matches_regex():
+    pattern = r'^(?P<DDD1>[0-9]{2})?(?P<Fone_Numero>[0-9]{8,9})'
+    expected = VALUES.str.extract(pattern)
+
+    ddd, number = FixedWidth.split_phone(VALUES, pattern)
+
+    assert ddd.equals(expected['DDD1'].rename(None))
+    assert number.equals(expected['Fone_Numero'].rename(None))
+
+
+def test_match_selects_exact_width_digits():
+    mask, digits = FixedWidth.match(np.array(['01310100', '0131010', '013101000', '0131-100'], dtype=object),
+                                    '99999999')
+
+    assert mask.tolist() == [True, False, False, False]
+    assert FixedWidth.assemble(digits, '#####-###').tolist() == ['01310-100']
+
+
+def test_dates_from_fixed_width_format():
+    values = np.array(['31/01/2024 10:30', '31/02/2024 10:30', '2024-01-31', '1/1/2024 10:30'], dtype=object)
+
+    mask, dates = FixedWidth.dates(values, '%d/%m/%Y %H:%M')
+
+    assert mask.tolist() == [True, True, False, False]
+    assert pd.isna(dates[1]) and dates[0] == np.datetime64('2024-01-31T10:30')
+    assert FixedWidth.dates(values, '%d/%b/%Y') is None
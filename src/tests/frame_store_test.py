@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from src.utils.frame_store import ColumnarFile, FrameStore, MemoryBudget
+
+
+def sample(rows=1000, offset=0):
+
+    return pd.DataFrame({
+        'codigo': np.arange(offset, offset + rows),
+        'preco': np.linspace(0, 1, rows),
+        'nome': [f'NOME {i}' for i in range(rows)],
+        'cadastro': pd.date_range('2024-01-01', periods=rows, freq='h'),
+        'estoque': pd.array([None if i % 3 == 0 else i for i in range(rows)], dtype='Int64'),
+    })
+
+def test_columnar_file_roundtrip(tmp_path):
+
+    df = sample().iloc[10:20]
+
+    ColumnarFile.write(df, str(tmp_path / 'tabela'))
+    result = ColumnarFile.read(str(tmp_path / 'tabela'))
+
+    pd.testing.assert_frame_equal(result, df)
+    assert not result['codigo'].values.flags.writeable
+
+def test_store_spills_least_recently_used(tmp_path):
+
+    size = int(sample().memory_usage(deep=True).sum())
+    budget = MemoryBudget(int(size * 2.5), str(tmp_path))
+    store = FrameStore(budget)
+
+    store['a'] = sample(offset=0)
+    store['b'] = sample(offset=1000)
+    store['a']
+    store['c'] = sample(offset=2000)
+
+    assert budget.used <= budget.limit
+    assert list(store) == ['a', 'b', 'c']
+    pd.testing.assert_frame_equal(store['b'], sample(offset=1000))
+    assert budget.used <= budget.limit
+    budget.close()
+
+def test_release_spills_first(tmp_path):
+
+    size = int(sample().memory_usage(deep=True).sum())
+    budget = MemoryBudget(int(size * 1.5), str(tmp_path))
+    raw = FrameStore(budget)
+    clean = FrameStore(budget)
+
+    raw['a'] = sample()
+    raw.release('a')
+    clean['x'] = sample(offset=5)
+
+    assert budget.used == int(clean['x'].memory_usage(deep=True).sum())
+    pd.testing.assert_frame_equal(raw['a'], sample())
+    budget.close()
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_SECONDS = 1.0
+
+SCRIPT = f"""
+import json, sys, time
+sys.path.insert(0, {SRC!r})
+start = time.perf_counter()
+import main_pipeline
+seconds = time.perf_counter() - start
+heavy = [name for name in ('pandas', 'numpy', 'sqlalchemy', 'fdb', 'pyodbc') if name in sys.modules]
+print(json.dumps({{'seconds': seconds, 'heavy': heavy}}))
+"""
+
+
+def test_entry_point_import_budget(tmp_path):
+
+    samples = []
+    for _ in range(3):
+        output = subprocess.run([sys.executable, "-c", SCRIPT], cwd=tmp_path, capture_output=True,
+                                text=True, check=True)
+        samples.append(json.loads(output.stdout))
+
+    assert samples[0]['heavy'] == []
+    assert min(sample['seconds'] for sample in samples) < BUDGET_SECONDS
+    assert not (tmp_path / 'app.log').exists()
+
+def test_help_does_not_load_stages(tmp_path):
+
+    output = subprocess.run([sys.executable, os.path.join(SRC, "main_pipeline.py"), "--help"], cwd=tmp_path,
+                            capture_output=True, text=True, check=True)
+
+    assert "--dry-run" in output.stdout
+    assert not (tmp_path / 'app.log').exists()
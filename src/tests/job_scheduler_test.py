@@ -0,0 +1,76 @@
+import json
+import pytest
+from sqlalchemy import create_engine, text
+from src.job_scheduler import JobScheduler
+
+SYSTEMS = {
+    'clientes': {
+        'table': 'clientes_origem',
+        'destiny': 'clientes_destino',
+        'fields': {
+            'codigo': {'field_destiny': 'codigo', 'transform': {}},
+            'nome': {'field_destiny': 'nome', 'transform': {'trim': True}},
+        },
+        'remove': {},
+    }
+}
+
+
+def create_origin(path, rows):
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_origem (codigo INTEGER, nome VARCHAR(50))"))
+        for number in range(rows):
+            connection.execute(text("INSERT INTO clientes_origem VALUES (:codigo, ' cliente ')"), {'codigo': number})
+
+def test_jobs_run_and_failures_are_isolated(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    create_origin(tmp_path / 'loja1.db', 3)
+    create_origin(tmp_path / 'loja2.db', 5)
+    destiny = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+    with destiny.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_destino (codigo INTEGER, nome VARCHAR(50))"))
+
+    (tmp_path / 'systems.json').write_text(json.dumps(SYSTEMS))
+    (tmp_path / 'jobs.json').write_text(json.dumps({
+        'max_workers': 2,
+        'max_per_host': 1,
+        'defaults': {'systems': 'systems.json', 'destiny': {'font': 'SQLite', 'database': str(tmp_path / 'destino.db')}},
+        'jobs': [
+            {'name': 'loja1', 'origin': {'font': 'SQLite', 'database': str(tmp_path / 'loja1.db')}},
+            {'name': 'loja2', 'origin': {'font': 'SQLite', 'database': str(tmp_path / 'loja2.db')}},
+            {'name': 'loja3', 'origin': {'font': 'SQLite', 'database': str(tmp_path / 'sem_pasta' / 'loja3.db')}},
+        ],
+    }))
+
+    results = JobScheduler(str(tmp_path / 'jobs.json')).execute()
+
+    assert [result.status for result in results] == ['ok', 'ok', 'erro']
+    assert [result.rows for result in results] == [3, 5, 0]
+    assert (tmp_path / 'exports' / 'loja1' / 'clientes.xlsx').exists()
+    with destiny.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM clientes_destino")).scalar() == 8
+
+    report = json.loads(open(JobScheduler.save(results), encoding='utf-8').read())
+    assert report['ok'] == 2
+    assert report['failed'] == 1
+
+def test_manifest_errors_reported_at_once(tmp_path, capsys):
+
+    (tmp_path / 'jobs.json').write_text(json.dumps({
+        'jobs': [
+            {'name': 'loja1', 'origin': 'nao_existe.json', 'destiny': {'font': 'Oracle'}},
+            {'name': 'loja1'},
+        ],
+    }))
+
+    with pytest.raises(SystemExit):
+        JobScheduler(str(tmp_path / 'jobs.json'))
+
+    output = " ".join(capsys.readouterr().out.split())
+    assert "'nao_existe.json' de 'origin' não encontrado" in output
+    assert "'systems' ausente" in output
+    assert "'font' deve ser" in output
+    assert "nome repetido" in output
@@ -0,0 +1,83 @@
+from datetime import date
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.stages.contracts.transform_contract import TransformContract
+from src.stages.load.key_mapper import KeyMapper
+from src.stages.load.load_data import Loader
+from src.stages.table_checks import TableChecks
+from src.utils.config_json import JsonConfig, freeze
+
+TABLES = {
+    'clientes': {
+        'table': 'CLIENTES', 'destiny': 'clientes', 'remove': {},
+        'fields': {'CODIGO': {'field_destiny': 'codigo', 'transform': {'rename': True}}},
+        'key_map': {'new': 'id'},
+    },
+    'pedidos': {
+        'table': 'PEDIDOS', 'destiny': 'pedidos', 'remove': {},
+        'fields': {'CLIENTE': {'field_destiny': 'cliente'}},
+        'remap': {'cliente': 'clientes'},
+    },
+}
+
+
+def create(engine, old_type='INTEGER'):
+    with engine.begin() as connection:
+        connection.execute(text(f'CREATE TABLE clientes (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                                f'Codigo_Old {old_type}, nome TEXT)'))
+        connection.execute(text('CREATE TABLE pedidos (id INTEGER PRIMARY KEY, cliente INTEGER)'))
+        connection.execute(text("INSERT INTO clientes (nome) VALUES ('existente')"))
+
+
+def contract(*tables):
+    return TransformContract(clean_data=list(tables), transform_date=date.today())
+
+
+def pedidos(engine):
+    with engine.connect() as connection:
+        return connection.execute(text('SELECT cliente FROM pedidos ORDER BY id')).fetchall()
+
+
+def test_children_use_identity_generated_for_parents(tmp_path):
+    engine = create_engine('sqlite://')
+    create(engine)
+    parents = {'clientes': pd.DataFrame({'Codigo_Old': [10, 20], 'nome': ['Ana', 'Bia']})}
+    children = {'pedidos': pd.DataFrame({'id': [1, 2, 3, 4], 'cliente': [20, 10, 99, None]})}
+
+    Loader(contract(parents, children), engine, key_mapper=KeyMapper(TABLES, str(tmp_path))).load()
+
+    assert pedidos(engine) == [(3,), (2,), (None,), (None,)]
+
+
+def test_persisted_map_is_reused_with_text_keys(tmp_path):
+    engine = create_engine('sqlite://')
+    create(engine, 'TEXT')
+    parents = {'clientes': pd.DataFrame({'Codigo_Old': ['10', '20'], 'nome': ['Ana', 'Bia']})}
+    Loader(contract(parents), engine, key_mapper=KeyMapper(TABLES, str(tmp_path))).load()
+
+    children = {'pedidos': pd.DataFrame({'id': [1, 2], 'cliente': [10.0, 20.0]})}
+    Loader(contract(children), engine, key_mapper=KeyMapper(TABLES, str(tmp_path))).load()
+
+    assert pedidos(engine) == [(2,), (3,)]
+
+
+def test_missing_map_fails(tmp_path):
+    engine = create_engine('sqlite://')
+    create(engine)
+    children = {'pedidos': pd.DataFrame({'id': [1], 'cliente': [10]})}
+
+    with pytest.raises(SystemExit):
+        Loader(contract(children), engine, key_mapper=KeyMapper(TABLES, str(tmp_path))).load()
+
+
+def test_config_errors():
+    assert JsonConfig.tables_errors(freeze(TABLES), blocks=TableChecks.errors) == []
+
+    tables = {'pedidos': TABLES['pedidos'], 'clientes': TABLES['clientes']}
+    assert JsonConfig.tables_errors(freeze(tables), blocks=TableChecks.errors) == [
+        "tabela 'pedidos': 'remap' da coluna 'cliente' usa a tabela 'clientes', que deve vir antes no systems.json"]
+
+    tables = {'clientes': {**TABLES['clientes'], 'key_map': {'old': 'Codigo_Old'}}, 'pedidos': TABLES['pedidos']}
+    errors = JsonConfig.tables_errors(freeze(tables), blocks=TableChecks.errors)
+    assert len(errors) == 1 and "'key_map' deve informar" in errors[0]
@@ -1,3 +1,5 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
 from utils.log import Log
 
 def test_log():
@@ -6,3 +8,50 @@ def test_log():
     Log.info('Teste de Info')
     Log.error('Teste de Erro', True)
     Log.critical('Teste Critico', True)
+
+def read_records(marker):
+
+    Log.flush()
+    with open('app.log', encoding='utf-8') as file:
+        return [json.loads(line) for line in file if marker in line]
+
+def test_log_structured_context():
+
+    with Log.context(stage='extract', table='clientes'):
+        with Log.context(chunk=3):
+            Log.info('Teste de contexto %s', 'log_test_ctx')
+        Log.warning('Teste sem bloco log_test_ctx')
+
+    records = read_records('log_test_ctx')
+
+    assert records[-2]['message'] == 'Teste de contexto log_test_ctx'
+    assert records[-2]['stage'] == 'extract'
+    assert records[-2]['chunk'] == 3
+    assert records[-2]['function'] == 'test_log_structured_context'
+    assert 'chunk' not in records[-1]
+    assert records[-1]['table'] == 'clientes'
+
+def test_error_formats_args_after_trace():
+
+    Log.error('Falha %s na tabela %s', False, 'log_test_args', 'clientes')
+    Log.critical('Falha critica %s', False, 'log_test_args')
+
+    records = read_records('log_test_args')
+
+    assert records[-2]['message'] == 'Falha log_test_args na tabela clientes'
+    assert records[-1]['message'] == 'Falha critica log_test_args'
+
+def test_log_from_threads():
+
+    def worker(number):
+        with Log.context(table=f'tabela_{number}'):
+            for _ in range(20):
+                Log.info('log_test_thread %s', number)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(worker, range(4)))
+
+    records = read_records('log_test_thread')
+
+    assert len(records) >= 80
+    assert all(record['table'] == f"tabela_{record['message'].split()[-1]}" for record in records)
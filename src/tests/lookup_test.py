@@ -0,0 +1,112 @@
+import json
+import os
+from datetime import date
+import pandas as pd
+from src.stages.contracts.extract_contract import ExtractContract
+from src.stages.table_checks import TableChecks
+from src.stages.transform import lookup
+from src.stages.transform.lookup import LookupIndex
+from src.stages.transform.transform_data import Transformer
+from src.utils.config_json import JsonConfig, freeze
+
+
+def groups():
+    return pd.DataFrame({'codigo': [10, 20, 20, 30], 'descricao': ['Bebidas', 'Limpeza', 'Outro', 'Frios']})
+
+
+def test_join_uses_first_key_and_nulls_for_missing():
+    lookups = LookupIndex({'grupos': groups()})
+    df = pd.DataFrame({'grupo': [20, 99, 10, None]})
+
+    result = lookups.join(df, 'grupo', {'table': 'grupos', 'key': 'CODIGO', 'columns': {'DESCRICAO': 'nome_grupo'}})
+
+    assert result['nome_grupo'].iloc[[0, 2]].tolist() == ['Limpeza', 'Bebidas']
+    assert result['nome_grupo'].isna().tolist() == [False, True, False, True]
+    assert len(result) == len(df)
+
+
+def test_file_sources(tmp_path, monkeypatch):
+    reads = []
+    monkeypatch.setattr(lookup, 'read_json', lambda *args, **kwargs: reads.append(args) or pd.read_json(*args, **kwargs))
+    json_path = tmp_path / 'ufs.json'
+    json_path.write_text(json.dumps([{'UF': 'SP', 'Regiao': 'Sudeste'}, {'UF': 'BA', 'Regiao': 'Nordeste'}]))
+    csv_path = tmp_path / 'ufs.csv'
+    csv_path.write_text('UF;Regiao\nSP;Sudeste\n'.replace(';', ','))
+
+    df = pd.DataFrame({'uf': ['BA', 'SP']})
+    lookups = LookupIndex({})
+
+    result = lookups.join(df, 'uf', {'file': str(json_path), 'key': 'UF', 'columns': ['Regiao']})
+    assert result['Regiao'].tolist() == ['Nordeste', 'Sudeste']
+    lookups.join(df, 'uf', {'file': str(json_path), 'key': 'UF', 'columns': ['Regiao']})
+    assert len(reads) == 1
+
+    json_path.write_text(json.dumps([{'UF': 'BA', 'Regiao': 'NE'}]))
+    stat = os.stat(json_path)
+    os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    result = lookups.join(df, 'uf', {'file': str(json_path), 'key': 'UF', 'columns': ['Regiao']})
+    assert result['Regiao'].fillna('').tolist() == ['NE', '']
+    assert len(reads) == 2
+
+    result = lookups.join(df, 'uf', {'file': str(csv_path), 'key': 'UF', 'columns': {'Regiao': 'regiao'}})
+    assert result['regiao'].isna().tolist() == [True, False]
+
+
+def test_index_is_built_once_and_shared_by_tables():
+    spec = {'table': 'grupos', 'key': 'codigo', 'columns': {'descricao': 'grupo_nome'}}
+    tables = {
+        'produtos': {
+            'table': 'PRODUTOS', 'destiny': 'itens',
+            'fields': {'CODIGO': {'field_destiny': 'codigo'},
+                       'GRUPO': {'field_destiny': 'grupo', 'transform': {'lookup': spec}}},
+            'remove': {},
+        },
+        'servicos': {
+            'table': 'SERVICOS', 'destiny': 'servicos',
+            'fields': {'GRUPO': {'field_destiny': 'grupo', 'transform': {'lookup': spec}}},
+            'remove': {},
+        },
+    }
+    raw = {
+        'produtos': pd.DataFrame({'codigo': [1, 2], 'grupo': [30, 10]}),
+        'servicos': pd.DataFrame({'grupo': [20]}),
+        'grupos': groups(),
+    }
+    assert JsonConfig.tables_errors(freeze({**tables, 'grupos': {
+        'table': 'GRUPOS', 'destiny': 'grupos', 'fields': {'CODIGO': {'field_destiny': 'codigo'}}, 'remove': {}}}),
+        blocks=TableChecks.errors) == []
+
+    transformer = Transformer(ExtractContract(None, raw, date.today()), export=False)
+    result = transformer.transform(tables).clean_data
+
+    assert result[0]['itens']['grupo_nome'].tolist() == ['Frios', 'Bebidas']
+    assert result[1]['servicos']['grupo_nome'].tolist() == ['Limpeza']
+    assert len(transformer._Transformer__lookups._LookupIndex__indexes) == 1
+
+
+def test_references_are_listed_and_shared_lookups_are_kept():
+    spec = {'table': 'grupos', 'key': 'codigo', 'columns': {'descricao': 'grupo_nome'}}
+    tables = {
+        'grupos': {'table': 'GRUPOS', 'destiny': 'grupos', 'fields': {'CODIGO': {'field_destiny': 'codigo'}},
+                   'remove': {}},
+        'produtos': {'table': 'PRODUTOS', 'destiny': 'itens', 'remove': {},
+                     'fields': {'GRUPO': {'field_destiny': 'grupo', 'transform': {'lookup': spec}}}},
+    }
+    assert list(LookupIndex.references(tables, ['produtos'])) == ['grupos']
+    assert LookupIndex.references(tables, ['grupos']) == {}
+
+    references = {'grupos': groups()}
+    lookups = LookupIndex(references)
+    raw = {'produtos': pd.DataFrame({'grupo': [30, 10]}), 'grupos': groups().iloc[3:]}
+    transformer = Transformer(ExtractContract(None, raw, date.today()), export=False, lookups=lookups)
+    result = transformer.transform({'produtos': tables['produtos']}).clean_data
+
+    assert result[0]['itens']['grupo_nome'].tolist() == ['Frios', 'Bebidas']
+    assert all(entry[2] is None for entry in lookups._LookupIndex__indexes.values())
+
+    references['grupos'] = pd.DataFrame({'codigo': [40, 10], 'descricao': ['Frios', 'Refrigerantes']})
+    lookups.forget('grupos')
+    transformer.reload(ExtractContract(None, {'produtos': pd.DataFrame({'grupo': [10]})}, date.today()))
+    result = transformer.transform({'produtos': tables['produtos']}).clean_data
+
+    assert result[0]['itens']['grupo_nome'].tolist() == ['Refrigerantes']
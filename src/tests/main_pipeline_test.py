@@ -1,6 +1,20 @@
+import pytest
 from src.main_pipeline import MainPipeline
 
 
 def test_pipeline():
 
     MainPipeline.run()
+
+def test_profile_is_written_when_the_run_fails(tmp_path, monkeypatch):
+
+    def fail(cls, *args):
+        raise SystemExit(1)
+
+    monkeypatch.setattr(MainPipeline, '_MainPipeline__execute', classmethod(fail))
+
+    with pytest.raises(SystemExit):
+        MainPipeline.run(profile=str(tmp_path / 'perfil'))
+
+    assert (tmp_path / 'perfil.prof').is_file()
+    assert (tmp_path / 'perfil.txt').is_file()
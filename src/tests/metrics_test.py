@@ -0,0 +1,65 @@
+import json
+import pandas as pd
+from src.utils.metrics import Metrics
+
+
+def test_measure_without_run_is_not_recorded():
+
+    with Metrics.measure('extract', table='clientes') as measure:
+        measure.frame(pd.DataFrame({'a': ['x', 'y']}))
+
+    assert Metrics.current() is None
+    assert measure.rows == 2
+    assert measure.bytes is None
+
+def test_run_report(tmp_path):
+
+    run = Metrics.start_run('teste')
+    df = pd.DataFrame({'nome': ['ANA', 'JOSE', 'MARIA']})
+
+    with Metrics.measure('extract', table='clientes') as measure:
+        measure.frame(df)
+
+    with Metrics.measure('transform', table='clientes', op='trim', column='nome') as measure:
+        measure.rows = len(df)
+
+    Metrics.finish_run()
+    path = run.save(str(tmp_path))
+
+    with open(path, encoding='utf-8') as file:
+        report = json.load(file)
+
+    assert report['stages']['extract']['rows'] == 3
+    assert report['stages']['extract']['bytes'] > 0
+    assert report['stages']['transform']['rows'] == 0
+    assert [item['op'] for item in report['measures']] == [None, 'trim']
+    assert Metrics.current() is None
+
+def test_peak_memory_is_measured_per_run():
+
+    previous = bytearray(256 * 1024 * 1024)
+    del previous
+
+    run = Metrics.start_run('pico')
+    with Metrics.measure('extract', table='clientes') as measure:
+        measure.frame(pd.DataFrame({'a': range(10)}))
+    Metrics.finish_run()
+
+    peak = run.report()['peak_memory']
+    assert peak is None or peak < 256 * 1024 * 1024
+    assert measure.memory_delta is None or 0 <= measure.memory_delta <= peak
+
+def test_memory_delta_is_measured_per_table():
+
+    run = Metrics.start_run('delta')
+    with Metrics.measure('transform', table='grande') as large:
+        data = bytearray(b'x') * (64 * 1024 * 1024)
+    del data
+    with Metrics.measure('transform', table='pequena') as small:
+        pd.DataFrame({'a': range(10)})
+    Metrics.finish_run()
+
+    if run.peak() is not None:
+        assert large.memory_delta >= 32 * 1024 * 1024
+        assert small.memory_delta < large.memory_delta
+        assert [item['memory_delta'] for item in run.report()['measures']] == [large.memory_delta, small.memory_delta]
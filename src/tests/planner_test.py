@@ -0,0 +1,83 @@
+import json
+from sqlalchemy import create_engine, text
+from src.stages.plan.planner import DryRunPlanner
+
+TABLES = {
+    'clientes': {
+        'table': 'clientes_origem',
+        'destiny': 'clientes_destino',
+        'fields': {
+            'codigo': {'field_destiny': 'codigo', 'transform': {}},
+            'nome': {'field_destiny': 'nome', 'transform': {'trim': True, 'upper': True}},
+        },
+        'remove': {},
+    }
+}
+
+
+def create_databases(tmp_path):
+
+    origin = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    destiny = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+
+    with origin.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_origem (codigo INTEGER, nome VARCHAR(50))"))
+        connection.execute(text("INSERT INTO clientes_origem VALUES (1, ' ana '), (2, 'jose'), (3, 'maria')"))
+
+    with destiny.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_destino (codigo INTEGER, nome VARCHAR(50))"))
+
+    return origin, destiny
+
+def test_plan_from_sample(tmp_path):
+
+    origin, destiny = create_databases(tmp_path)
+    planner = DryRunPlanner(origin, destiny, str(tmp_path / 'reports'))
+
+    plan = planner.plan(TABLES)
+    item = plan.tables[0]
+
+    assert plan.issues == []
+    assert item.rows == 3
+    assert item.bytes > 0
+    assert item.seconds['extract'] is not None
+    assert item.seconds['load'] is None
+    assert plan.seconds['load'] is None
+    assert item.basis == "amostra"
+
+    with destiny.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM clientes_destino")).scalar() == 0
+
+def test_plan_from_reports(tmp_path):
+
+    origin, destiny = create_databases(tmp_path)
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    measures = [
+        {'stage': 'extract', 'table': 'clientes', 'op': None, 'rows': 300, 'seconds': 1.0},
+        {'stage': 'transform', 'table': 'clientes', 'op': None, 'rows': 300, 'seconds': 2.0},
+        {'stage': 'load', 'table': 'clientes_destino', 'op': None, 'rows': 300, 'seconds': 3.0},
+    ]
+    (reports / 'run_20250101_000000_pipeline.json').write_text(json.dumps({'measures': measures}))
+
+    plan = DryRunPlanner(origin, destiny, str(reports)).plan(TABLES)
+
+    assert plan.tables[0].basis == "relatório"
+    assert round(plan.seconds['extract'], 6) == 0.01
+    assert round(plan.seconds['transform'], 6) == 0.02
+    assert round(plan.seconds['load'], 6) == 0.03
+
+def test_plan_reports_invalid_columns(tmp_path):
+
+    origin, destiny = create_databases(tmp_path)
+    planner = DryRunPlanner(origin, destiny, str(tmp_path / 'reports'))
+
+    tables = json.loads(json.dumps(TABLES))
+    tables['clientes']['fields']['cpf'] = {'field_destiny': 'cpf', 'transform': {}}
+    messages = [issue.message for issue in planner.plan(tables).issues if issue.level == 'erro']
+    assert any("'cpf' não existe na origem" in message for message in messages)
+
+    tables = json.loads(json.dumps(TABLES))
+    tables['clientes']['fields']['nome']['field_destiny'] = 'nome_completo'
+    messages = [issue.message for issue in planner.plan(tables).issues if issue.level == 'erro']
+    assert any("'nome_completo' não existe na tabela de destino" in message for message in messages)
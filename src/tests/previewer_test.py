@@ -0,0 +1,79 @@
+from rich.console import Console
+from sqlalchemy import create_engine, text
+from src.stages.plan.previewer import Previewer
+
+TABLES = {
+    'clientes': {
+        'table': 'clientes_origem',
+        'destiny': 'clientes_destino',
+        'fields': {
+            'codigo': {'field_destiny': 'codigo', 'transform': {}},
+            'nome': {'field_destiny': 'nome', 'transform': {'trim': True, 'upper': True}},
+            'grupo': {'field_destiny': 'grupo', 'transform': {
+                'lookup': {'table': 'grupos', 'key': 'codigo', 'columns': {'descricao': 'nome_grupo'}}}},
+        },
+        'remove': {},
+    },
+    'grupos': {
+        'table': 'grupos_origem',
+        'destiny': 'grupos_destino',
+        'fields': {'codigo': {'field_destiny': 'codigo'}, 'descricao': {'field_destiny': 'descricao'}},
+        'remove': {},
+    },
+}
+
+
+def create_origin(tmp_path, rows=1000):
+
+    origin = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    with origin.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_origem (codigo INTEGER PRIMARY KEY, nome VARCHAR(50), grupo INTEGER)"))
+        connection.execute(text("CREATE TABLE grupos_origem (codigo INTEGER PRIMARY KEY, descricao VARCHAR(50))"))
+        connection.execute(text("INSERT INTO clientes_origem VALUES (:codigo, :nome, :grupo)"),
+                           [{'codigo': i, 'nome': f' cliente {i} ', 'grupo': i % 50} for i in range(1, rows + 1)])
+        connection.execute(text("INSERT INTO grupos_origem VALUES (:codigo, :descricao)"),
+                           [{'codigo': i, 'descricao': f'grupo {i}'} for i in range(50)])
+    return origin
+
+
+def test_preview_first_rows_with_lookup(tmp_path):
+
+    previewer = Previewer(create_origin(tmp_path), rows=20)
+    preview = previewer.preview(TABLES)[0]
+
+    assert preview.error is None
+    assert preview.sample == 'first'
+    assert len(preview.before) == len(preview.after) == 20
+    assert preview.after['nome'].iloc[0] == 'CLIENTE 1'
+    assert preview.after['nome_grupo'].iloc[0] == 'grupo 1'
+
+    console = Console(record=True, width=200)
+    console.print(previewer.render(preview, TABLES['clientes']))
+    output = console.export_text()
+    assert "' cliente 1 ' → 'CLIENTE 1'" in output
+    assert 'nome_grupo (novo)' in output
+
+
+def test_key_ranges_spread_over_table_and_fallback(tmp_path):
+
+    origin = create_origin(tmp_path)
+    preview = Previewer(origin, rows=50, sample='keys').preview({'clientes': TABLES['clientes']})[0]
+
+    codes = preview.before['codigo']
+    assert preview.sample == 'keys'
+    assert len(codes) == 50 and codes.is_unique
+    assert codes.max() > 900
+
+    preview = Previewer(origin, rows=10, sample='native').preview({'clientes': TABLES['clientes']})[0]
+    assert preview.sample == 'keys'
+
+
+def test_preview_loads_into_scratch(tmp_path):
+
+    previewer = Previewer(create_origin(tmp_path), rows=5)
+    previews = previewer.preview(TABLES)
+    scratch = create_engine(f"sqlite:///{tmp_path / 'rascunho.db'}")
+
+    assert Previewer.load(previews, scratch) == 10
+    with scratch.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM clientes_destino")).scalar() == 5
@@ -0,0 +1,23 @@
+import os
+from src.utils.metrics import Metrics
+from src.utils.profiler import Profiler
+
+
+def test_profiler_writes_raw_and_summary(tmp_path):
+
+    run = Metrics.start_run('perfil')
+    with Profiler(str(tmp_path / 'execucao')) as profiler:
+        with Metrics.measure('transform', table='clientes', op='trim', column='nome'):
+            sum(range(10000))
+        with Metrics.measure('transform', table='clientes'):
+            pass
+    Metrics.finish_run()
+
+    raw_path, summary_path = profiler.write(run)
+
+    assert os.path.exists(raw_path)
+    with open(summary_path, encoding='utf-8') as file:
+        summary = file.read()
+    assert 'Tempo por operação' in summary
+    assert 'clientes / nome / trim' in summary
+    assert 'Funções mais custosas' in summary
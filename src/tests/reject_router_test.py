@@ -0,0 +1,112 @@
+import glob
+from datetime import date
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.stages.contracts.extract_contract import ExtractContract
+from src.stages.contracts.transform_contract import TransformContract
+from src.stages.load.load_data import Loader
+from src.stages.load.reject_router import RejectRouter
+from src.stages.table_checks import TableChecks
+from src.stages.transform.transform_data import Transformer
+from src.utils.config_json import JsonConfig, freeze
+
+
+def tables(**reject):
+    return {
+        'clientes': {
+            'table': 'CLIENTES', 'destiny': 'pessoas', 'remove': {},
+            'fields': {'CODIGO': {'field_destiny': 'codigo'}, 'NOME': {'field_destiny': 'nome'},
+                       'CPF': {'field_destiny': 'cpf', 'transform': {'format': 'CPF'}}},
+            'reject': reject,
+        }
+    }
+
+
+def create(engine):
+    with engine.begin() as connection:
+        connection.execute(text('CREATE TABLE pessoas (codigo INTEGER NOT NULL, nome VARCHAR(5), cpf VARCHAR(14))'))
+
+
+def rows(engine):
+    with engine.connect() as connection:
+        return connection.execute(text('SELECT codigo, nome, cpf FROM pessoas ORDER BY codigo')).fetchall()
+
+
+DATA = pd.DataFrame({
+    'codigo': ['1', None, 'abc', '4', '5', '6'],
+    'nome': ['Ana', 'Bia', 'Caio', 'Bartolomeu', 'Eva', 'Ivo'],
+    'cpf': ['529.982.247-25', None, None, None, '111.111.111-11', None],
+})
+
+
+def test_invalid_rows_are_rejected_and_the_rest_loaded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+    create(engine)
+    contract = TransformContract(clean_data=[{'pessoas': DATA.copy()}], transform_date=date.today())
+
+    Loader(contract, engine, rejects=RejectRouter(tables(max_ratio=0.9), str(tmp_path))).load()
+
+    assert rows(engine) == [(1, 'Ana', '529.982.247-25'), (6, 'Ivo', None)]
+    [path] = glob.glob(str(tmp_path / 'pessoas_*.csv'))
+    rejects = pd.read_csv(path, dtype=object)
+    assert rejects['reject_reason'].tolist() == ['null:codigo', 'cast:codigo', 'length:nome', 'document:cpf']
+
+
+def test_threshold_aborts_before_loading(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+    create(engine)
+    contract = TransformContract(clean_data=[{'pessoas': DATA.copy()}], transform_date=date.today())
+
+    with pytest.raises(SystemExit):
+        Loader(contract, engine, rejects=RejectRouter(tables(max_ratio=0.5), str(tmp_path))).load()
+
+    assert rows(engine) == []
+    assert glob.glob(str(tmp_path / 'pessoas_*.csv'))
+
+
+def test_rejected_rows_are_retried_by_change_detection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+    create(engine)
+    config = {'clientes': {**tables(max_ratio=1)['clientes'], 'detect_changes': {'keys': ['codigo']}}}
+    router = RejectRouter(config, str(tmp_path / 'rejects'))
+
+    def run(names):
+        raw = {'clientes': pd.DataFrame({'codigo': [1, 2], 'nome': names, 'cpf': ['52998224725', None]})}
+        contract = ExtractContract(font=None, raw_data=raw, extraction_date=date.today())
+        clean = Transformer(contract, export=False, changes_dir=str(tmp_path / 'changes')).transform(config)
+        Loader(clean, engine, rejects=router).load()
+
+    run(['Ana', 'Bartolomeu'])
+    assert rows(engine) == [(1, 'Ana', '529.982.247-25')]
+
+    run(['Ana', 'Bart'])
+    assert rows(engine) == [(1, 'Ana', '529.982.247-25'), (2, 'Bart', 'None')]
+
+
+def test_rejected_update_keeps_the_loaded_row(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+    create(engine)
+    config = {'clientes': {**tables(max_ratio=1)['clientes'], 'detect_changes': {'keys': ['codigo']}}}
+    router = RejectRouter(config, str(tmp_path / 'rejects'))
+
+    def run(names):
+        raw = {'clientes': pd.DataFrame({'codigo': [1, 2], 'nome': names, 'cpf': [None, None]})}
+        contract = ExtractContract(font=None, raw_data=raw, extraction_date=date.today())
+        clean = Transformer(contract, export=False, changes_dir=str(tmp_path / 'changes')).transform(config)
+        Loader(clean, engine, rejects=router).load()
+
+    run(['Ana', 'Bia'])
+    run(['Ana', 'Bartolomeu'])
+    assert [row[:2] for row in rows(engine)] == [(1, 'Ana'), (2, 'Bia')]
+
+    run(['Ana', 'Bea'])
+    assert [row[:2] for row in rows(engine)] == [(1, 'Ana'), (2, 'Bea')]
+
+
+def test_config_errors():
+    assert JsonConfig.tables_errors(freeze(tables(max_ratio=0.1, documents={'nome': 'CPF'})),
+                                    blocks=TableChecks.errors) == []
+
+    errors = JsonConfig.tables_errors(freeze(tables(max_ratio=2, documents={'nome': 'RG'})), blocks=TableChecks.errors)
+    assert len(errors) == 2
@@ -0,0 +1,40 @@
+import os
+from sqlalchemy import create_engine, text
+from src.stages.extract.row_counter import RowCounter
+from src.stages.extract.sql_extractor import Extractor
+
+
+def test_estimate_counts_and_uses_cache(tmp_path):
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes (codigo INTEGER)"))
+        connection.execute(text("INSERT INTO clientes VALUES (1), (2), (3)"))
+
+    counter = RowCounter(engine, str(tmp_path / 'cache' / 'row_counts.json'))
+    assert counter.estimate('clientes') == 3
+
+    counter.record('clientes', 10)
+    assert os.path.exists(tmp_path / 'cache' / 'row_counts.json')
+    assert RowCounter(engine, str(tmp_path / 'cache' / 'row_counts.json')).estimate('clientes') == 10
+
+def test_estimate_missing_table(tmp_path):
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    counter = RowCounter(engine, str(tmp_path / 'row_counts.json'))
+
+    assert counter.estimate('inexistente') is None
+
+def test_only_full_extractions_are_recorded(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    engine = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes (codigo INTEGER, alterado INTEGER)"))
+        connection.execute(text("INSERT INTO clientes VALUES (1, 10), (2, 20), (3, 30)"))
+
+    tables = {'clientes': {'table': 'clientes', 'incremental': {'column': 'alterado'}}}
+    Extractor('SQLite', engine).extract(tables)
+    Extractor('SQLite', engine).extract(tables, {'clientes': 30})
+
+    assert RowCounter(engine).estimate('clientes') == 3
@@ -0,0 +1,208 @@
+import json
+from sqlalchemy import create_engine, text
+from src import sync_daemon
+from src.sync_daemon import SyncDaemon
+
+SYSTEMS = {
+    'clientes': {
+        'table': 'clientes_origem',
+        'destiny': 'clientes_destino',
+        'incremental': {'column': 'alterado'},
+        'fields': {
+            'codigo': {'field_destiny': 'codigo', 'transform': {}},
+            'nome': {'field_destiny': 'nome', 'transform': {'trim': True}},
+        },
+        'remove': {},
+    }
+}
+
+
+def test_sync_loads_only_new_rows(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    origin = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    destiny = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+
+    with origin.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_origem (codigo INTEGER, nome VARCHAR(50), alterado INTEGER)"))
+        connection.execute(text("INSERT INTO clientes_origem VALUES (1, ' ana ', 10), (2, ' jose ', 20)"))
+    with destiny.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_destino (codigo INTEGER, nome VARCHAR(50))"))
+
+    files = {
+        '_JsonConfig__FILE_PATH_TABLES': ('systems.json', SYSTEMS),
+        '_JsonConfig__FILE_PATH_ORIGIN': ('origin.json', {'font': 'SQLite', 'database': str(tmp_path / 'origem.db')}),
+        '_JsonConfig__FILE_PATH_DESTINY': ('destiny.json', {'font': 'SQLite', 'database': str(tmp_path / 'destino.db')}),
+    }
+    for attribute, (name, data) in files.items():
+        (tmp_path / name).write_text(json.dumps(data))
+        monkeypatch.setattr(sync_daemon.JsonConfig, attribute, str(tmp_path / name))
+
+    daemon = SyncDaemon(interval=0, cycles=1)
+
+    assert daemon.sync_once(1) == {'clientes_destino': 2}
+    assert daemon.sync_once(2) == {}
+
+    with origin.begin() as connection:
+        connection.execute(text("INSERT INTO clientes_origem VALUES (3, ' maria ', 30)"))
+
+    assert daemon.sync_once(3) == {'clientes_destino': 1}
+
+    with destiny.connect() as connection:
+        rows = connection.execute(text("SELECT codigo, nome FROM clientes_destino ORDER BY codigo")).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 'ana'), (2, 'jose'), (3, 'maria')]
+    assert daemon.serve() == 1
+
+
+def test_sync_keeps_rows_loaded_at_the_same_mark(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    origin = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    destiny = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+
+    with origin.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_origem (codigo INTEGER, nome VARCHAR(50), alterado INTEGER)"))
+        connection.execute(text("INSERT INTO clientes_origem VALUES (1, ' ana ', 10), (2, ' jose ', 10)"))
+    with destiny.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_destino (codigo INTEGER, nome VARCHAR(50))"))
+
+    files = {
+        '_JsonConfig__FILE_PATH_TABLES': ('systems.json', SYSTEMS),
+        '_JsonConfig__FILE_PATH_ORIGIN': ('origin.json', {'font': 'SQLite', 'database': str(tmp_path / 'origem.db')}),
+        '_JsonConfig__FILE_PATH_DESTINY': ('destiny.json', {'font': 'SQLite', 'database': str(tmp_path / 'destino.db')}),
+    }
+    for attribute, (name, data) in files.items():
+        (tmp_path / name).write_text(json.dumps(data))
+        monkeypatch.setattr(sync_daemon.JsonConfig, attribute, str(tmp_path / name))
+
+    daemon = SyncDaemon(interval=0, cycles=1)
+    assert daemon.sync_once(1) == {'clientes_destino': 2}
+
+    with origin.begin() as connection:
+        connection.execute(text("INSERT INTO clientes_origem VALUES (3, ' maria ', 10)"))
+
+    assert daemon.sync_once(2) == {'clientes_destino': 1}
+    assert daemon.sync_once(3) == {}
+
+    with origin.begin() as connection:
+        connection.execute(text("INSERT INTO clientes_origem VALUES (4, ' bia ', 10)"))
+
+    assert daemon.sync_once(4) == {'clientes_destino': 1}
+    assert daemon.sync_once(5) == {}
+
+    with destiny.connect() as connection:
+        rows = connection.execute(text("SELECT codigo FROM clientes_destino ORDER BY codigo")).fetchall()
+    assert [row[0] for row in rows] == [1, 2, 3, 4]
+
+
+def test_sync_replaces_edited_rows_by_key(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    origin = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    destiny = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+
+    with origin.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_origem (codigo INTEGER, nome VARCHAR(50), alterado INTEGER)"))
+        connection.execute(text("INSERT INTO clientes_origem VALUES (1, ' ana ', 10), (2, ' jose ', 20)"))
+    with destiny.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_destino (codigo INTEGER, nome VARCHAR(50))"))
+
+    systems = {'clientes': {**SYSTEMS['clientes'], 'incremental': {'column': 'alterado', 'keys': ['codigo']}}}
+    files = {
+        '_JsonConfig__FILE_PATH_TABLES': ('systems.json', systems),
+        '_JsonConfig__FILE_PATH_ORIGIN': ('origin.json', {'font': 'SQLite', 'database': str(tmp_path / 'origem.db')}),
+        '_JsonConfig__FILE_PATH_DESTINY': ('destiny.json', {'font': 'SQLite', 'database': str(tmp_path / 'destino.db')}),
+    }
+    for attribute, (name, data) in files.items():
+        (tmp_path / name).write_text(json.dumps(data))
+        monkeypatch.setattr(sync_daemon.JsonConfig, attribute, str(tmp_path / name))
+
+    daemon = SyncDaemon(interval=0, cycles=1)
+    assert daemon.sync_once(1) == {'clientes_destino': 2}
+
+    with origin.begin() as connection:
+        connection.execute(text("UPDATE clientes_origem SET nome = ' ana maria ', alterado = 30 WHERE codigo = 1"))
+        connection.execute(text("INSERT INTO clientes_origem VALUES (3, ' maria ', 20)"))
+
+    assert daemon.sync_once(2) == {'clientes_destino': 2}
+    assert daemon.sync_once(3) == {}
+
+    with destiny.connect() as connection:
+        rows = connection.execute(text("SELECT codigo, nome FROM clientes_destino ORDER BY codigo")).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 'ana maria'), (2, 'jose'), (3, 'maria')]
+
+
+def test_sync_reads_lookup_references_in_full(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    origin = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    destiny = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+
+    with origin.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_origem (codigo INTEGER, nome VARCHAR(50), alterado INTEGER)"))
+        connection.execute(text("INSERT INTO clientes_origem VALUES (1, ' ana ', 10)"))
+        connection.execute(text("CREATE TABLE cidades_origem (id INTEGER, cidade VARCHAR(50))"))
+        connection.execute(text("INSERT INTO cidades_origem VALUES (1, 'Recife'), (2, 'Natal')"))
+    with destiny.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_destino (codigo INTEGER, nome VARCHAR(50), cidade VARCHAR(50))"))
+
+    lookup = {'table': 'cidades', 'key': 'id', 'columns': ['cidade']}
+    systems = {
+        'cidades': {'table': 'cidades_origem', 'destiny': 'cidades_destino', 'remove': {},
+                    'fields': {'id': {'field_destiny': 'id'}, 'cidade': {'field_destiny': 'cidade'}}},
+        'clientes': {**SYSTEMS['clientes'], 'fields': {
+            'codigo': {'field_destiny': 'codigo', 'transform': {'lookup': lookup}},
+            'nome': {'field_destiny': 'nome', 'transform': {'trim': True}},
+        }},
+    }
+    files = {
+        '_JsonConfig__FILE_PATH_TABLES': ('systems.json', systems),
+        '_JsonConfig__FILE_PATH_ORIGIN': ('origin.json', {'font': 'SQLite', 'database': str(tmp_path / 'origem.db')}),
+        '_JsonConfig__FILE_PATH_DESTINY': ('destiny.json', {'font': 'SQLite', 'database': str(tmp_path / 'destino.db')}),
+    }
+    for attribute, (name, data) in files.items():
+        (tmp_path / name).write_text(json.dumps(data))
+        monkeypatch.setattr(sync_daemon.JsonConfig, attribute, str(tmp_path / name))
+
+    daemon = SyncDaemon(interval=0, cycles=1)
+    assert daemon.sync_once(1) == {'clientes_destino': 1}
+
+    with origin.begin() as connection:
+        connection.execute(text("INSERT INTO clientes_origem VALUES (2, ' bia ', 20)"))
+
+    assert daemon.sync_once(2) == {'clientes_destino': 1}
+
+    with destiny.connect() as connection:
+        rows = connection.execute(text("SELECT codigo, nome, cidade FROM clientes_destino ORDER BY codigo")).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 'ana', 'Recife'), (2, 'bia', 'Natal')]
+
+
+def test_append_only_sync_with_rejects_does_not_reload_rows(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+    origin = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+    destiny = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+
+    with origin.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_origem (codigo INTEGER, nome VARCHAR(50), alterado INTEGER)"))
+        connection.execute(text("INSERT INTO clientes_origem VALUES (1, ' ana ', 10), (2, ' bartolomeu ', 20)"))
+    with destiny.begin() as connection:
+        connection.execute(text("CREATE TABLE clientes_destino (codigo INTEGER, nome VARCHAR(5))"))
+
+    systems = {'clientes': {**SYSTEMS['clientes'], 'reject': {'max_ratio': 1}}}
+    files = {
+        '_JsonConfig__FILE_PATH_TABLES': ('systems.json', systems),
+        '_JsonConfig__FILE_PATH_ORIGIN': ('origin.json', {'font': 'SQLite', 'database': str(tmp_path / 'origem.db')}),
+        '_JsonConfig__FILE_PATH_DESTINY': ('destiny.json', {'font': 'SQLite', 'database': str(tmp_path / 'destino.db')}),
+    }
+    for attribute, (name, data) in files.items():
+        (tmp_path / name).write_text(json.dumps(data))
+        monkeypatch.setattr(sync_daemon.JsonConfig, attribute, str(tmp_path / name))
+
+    daemon = SyncDaemon(interval=0, cycles=1)
+    assert daemon.sync_once(1) == {'clientes_destino': 1}
+    assert daemon.sync_once(2) == {}
+
+    with destiny.connect() as connection:
+        rows = connection.execute(text("SELECT codigo, nome FROM clientes_destino")).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 'ana')]
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+from src.stages.transform.column_transforms import ColumnTransforms
+from src.stages.transform.registry import TransformRegistry
+from src.utils.config_json import JsonConfig, freeze
+
+
+def test_builtins_are_registered_with_metadata():
+    assert {'trim', 'format', 'date', 'split', 'lookup'} <= set(TransformRegistry.names())
+
+    assert TransformRegistry.get('trim').per_value
+    assert TransformRegistry.get('split').frame
+    assert TransformRegistry.get('split').outputs('celular', 'DDD_Celular') == ('DDD_Celular', 'Numero_Celular')
+    assert TransformRegistry.check('format', 'RG') is not None
+    assert TransformRegistry.check('inexistente', True) == "desconhecida"
+
+
+def test_config_validation_uses_registry():
+    tables = freeze({'t': {'table': 'o', 'destiny': 'd', 'fields': {
+        'UF': {'field_destiny': 'uf', 'transform': {'format': 'RG', 'inexistente': True, 'trim': True}}}, 'remove': {}}})
+
+    errors = JsonConfig.tables_errors(tables, TransformRegistry.check)
+
+    assert len(errors) == 2
+    assert any("'format' deve ser" in error for error in errors)
+    assert any("'inexistente' desconhecida" in error for error in errors)
+    assert JsonConfig.tables_errors(tables) == []
+
+
+def test_plan_fuses_consecutive_column_transforms():
+    operations = [
+        ('nome', 'trim', True), ('nome', 'upper', True),
+        ('fone', 'split', 'DDD1'),
+        ('nome', 'lower', True), ('cidade', 'lower', True), ('cidade', 'clear', True),
+    ]
+
+    steps = TransformRegistry.plan(operations)
+
+    assert steps == [
+        ('nome', [('trim', True), ('upper', True)]),
+        ('fone', [('split', 'DDD1')]),
+        ('nome', [('lower', True)]),
+        ('cidade', [('lower', True), ('clear', True)]),
+    ]
+
+
+def test_fused_chain_matches_unfused_transforms():
+    values = ['  josé ', 'ANA', None, '  josé ', 'maria  ', 'ANA'] * 50
+    df = pd.DataFrame({'nome': values})
+
+    result = TransformRegistry.apply(df.copy(), 'nome', [('trim', True), ('clear', True), ('upper', True)])
+
+    expected = pd.Series(values, name='nome')
+    for function in (ColumnTransforms.trim, ColumnTransforms.clear, ColumnTransforms.upper):
+        expected = function(expected, True)
+    pd.testing.assert_series_equal(result['nome'], expected)
+
+
+def test_user_transform_and_central_errors():
+    @TransformRegistry.transform('sigla', per_value=True, check=lambda value: None if value > 0 else "deve ser positivo")
+    def sigla(series, value):
+        return series.str[:value].str.upper()
+
+    df = pd.DataFrame({'uf': ['sao paulo', 'bahia', 'sao paulo']})
+    result = TransformRegistry.apply(df, 'uf', [('sigla', 2)])
+    assert result['uf'].tolist() == ['SA', 'BA', 'SA']
+
+    assert TransformRegistry.check('sigla', -1) == "deve ser positivo"
+
+    with pytest.raises(SystemExit):
+        TransformRegistry.apply(pd.DataFrame({'uf': [1, 2]}), 'uf', [('sigla', 2)])
+
+
+def test_mixed_object_columns_are_not_grouped_by_value():
+    TransformRegistry.register('representa', lambda series, value: series.map(repr), per_value=True)
+    values = [1, 1.0, True, '1', None] * 10
+
+    result = TransformRegistry.apply(pd.DataFrame({'codigo': values}), 'codigo', [('representa', True)])
+
+    assert result['codigo'].iloc[:5].tolist() == ['1', '1.0', 'True', "'1'", 'None']
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from src.stages.load.type_mapping import DestinyTypeMap
+
+
+@pytest.fixture
+def engine(tmp_path):
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE produtos (codigo INTEGER, nome VARCHAR(40), preco FLOAT, cadastro DATETIME)"
+        ))
+    return engine
+
+def test_prepare_casts_to_destiny_types(engine):
+
+    df = pd.DataFrame({
+        'codigo': ['1', '2', 'None'],
+        'nome': ['ARROZ', 'FEIJAO', 'SAL'],
+        'preco': ['10.5', 'nan', '3'],
+        'cadastro': ['2024-01-01', '2024-02-01', 'NaT']
+    })
+
+    result, dtype = DestinyTypeMap(engine).prepare('produtos', df)
+
+    assert str(result['codigo'].dtype) == 'Int64'
+    assert result['codigo'].isna().tolist() == [False, False, True]
+    assert result['preco'].dtype == 'float64'
+    assert pd.api.types.is_datetime64_any_dtype(result['cadastro'])
+    assert set(dtype) == {'codigo', 'nome', 'preco', 'cadastro'}
+
+def test_prepare_reports_all_incompatible_columns(engine):
+
+    df = pd.DataFrame({'codigo': ['A1'], 'nome': ['ARROZ'], 'inexistente': [1]})
+
+    with pytest.raises(ValueError) as error:
+        DestinyTypeMap(engine).prepare('produtos', df)
+
+    assert 'codigo' in str(error.value)
+    assert 'inexistente' in str(error.value)
+
+def test_prepare_keeps_frame_for_missing_table(engine):
+
+    df = pd.DataFrame({'codigo': ['1']})
+
+    result, dtype = DestinyTypeMap(engine).prepare('nova_tabela', df)
+
+    assert result is df
+    assert dtype is None
@@ -14,11 +14,63 @@
 # com este programa. Se não, veja <https://www.gnu.org/licenses/>.
 
 import os
+from collections.abc import Hashable, Mapping
+from functools import partial
 from json import load
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Callable, TypedDict
 from rich import print
 from utils.log import Log
 
 
+class FieldConfig(TypedDict, total=False):
+    """Configuração de um campo de origem no `systems.json`."""
+    field_destiny: str
+    transform: Mapping[str, Any]
+
+
+class TableConfig(TypedDict, total=False):
+    """Configuração de uma tabela no `systems.json`."""
+    table: str
+    destiny: str
+    fields: Mapping[str, FieldConfig]
+    remove: Mapping[str, str]
+    incremental: Mapping[str, Any]
+    dedup: Mapping[str, Any]
+    detect_changes: Mapping[str, Any]
+    key_map: Mapping[str, str]
+    remap: Mapping[str, str]
+    reject: Mapping[str, Any]
+    computed: Mapping[str, str]
+
+
+class DatabaseConfig(TypedDict, total=False):
+    """Configuração de conexão dos arquivos `origin.json` e `destiny.json`."""
+    font: str
+    host: str
+    user: str
+    password: str
+    database: str
+    driver: str
+    bulk_load: bool
+
+
+def freeze(value: Any) -> Any:
+    """
+    Converte recursivamente dicionários e listas em estruturas imutáveis.
+
+    Dicionários viram `MappingProxyType` e listas viram tuplas, de modo que
+    a configuração compartilhada entre as etapas não possa ser alterada por
+    engano. A leitura continua igual à de dicionários e listas comuns.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
 class JsonConfig:
     """
     Fornece uma interface centralizada para ler arquivos de configuração JSON.
@@ -27,9 +79,16 @@ class JsonConfig:
     essenciais para a aplicação a partir de arquivos JSON localizados no
     mesmo diretório do código-fonte.
 
+    Cada arquivo é lido uma única vez e mantido em cache como uma estrutura
+    imutável (veja `freeze`). O cache é invalidado quando a data de
+    modificação do arquivo muda, para que processos de longa duração vejam
+    as alterações. As configurações de tabelas e de conexão são validadas
+    por completo ao serem carregadas, e todos os problemas são reportados
+    de uma só vez.
+
     Atenção: Todos os métodos nesta classe irão encerrar a aplicação
     (via `SystemExit`) se o arquivo de configuração correspondente não
-    puder ser encontrado ou lido.
+    puder ser encontrado, lido ou não passar na validação.
     """
 
     __PATH: str = os.path.dirname(os.path.abspath(__file__))
@@ -37,95 +96,353 @@ class JsonConfig:
     __FILE_PATH_ORIGIN: str = os.path.join(__PATH, "origin.json")
     __FILE_PATH_DESTINY: str = os.path.join(__PATH, "destiny.json")
     __FILE_PATH_CITYS: str = os.path.join(__PATH, "citys.json")
+    __FILE_PATH_TRANSFORMS: str = os.path.join(__PATH, "transforms.json")
+
+    __FONTS: dict[str, tuple[str, ...]] = {
+        'Firebird': ('host', 'user', 'password', 'database'),
+        'SQLServer': ('host', 'user', 'password', 'database', 'driver'),
+        'SQLite': ('database',),
+    }
+
+    __cache: dict[str, tuple[int, Any, set]] = {}
+    __lock: Lock = Lock()
 
     @classmethod
-    def get_tables(cls) -> dict[str: str]:
+    def get_tables(cls) -> Mapping[str, TableConfig]:
         """
         Carrega as configurações de mapeamento de tabelas do arquivo 'systems.json'.
 
         Returns:
-            (dict[str, str]): Um dicionário com os dados de configuração de tabelas.
+            (Mapping[str, TableConfig]): As configurações de tabelas, imutáveis.
 
         Raises:
-            SystemExit: Se o arquivo 'systems.json' não for encontrado ou
-                        estiver malformado.
+            SystemExit: Se o arquivo 'systems.json' não for encontrado,
+                        estiver malformado ou tiver erros de estrutura.
         """
-        try:
-            with open(cls.__FILE_PATH_TABLES, encoding="utf-8") as file:
-                data = load(file)
-
-        except Exception as error:
-            print("[bold red]Erro no arquivo de configuração, verifique o log.[/bold red]")
-            Log.warning("O arquivo systems.json não pôde ser encontrado ou aberto.")
-            raise SystemExit from error
-
-        return data
+        return cls.__get(cls.__FILE_PATH_TABLES, cls.tables_errors)
 
     @classmethod
-    def get_origin_db(cls) -> dict[str: str]:
+    def get_origin_db(cls) -> DatabaseConfig:
         """
         Carrega as configurações de conexão do banco de dados de origem.
 
         Returns:
-            (dict[str, str]): Um dicionário com os dados do arquivo 'origin.json'.
+            (DatabaseConfig): Os dados do arquivo 'origin.json', imutáveis.
 
         Raises:
-            SystemExit: Se o arquivo 'origin.json' não for encontrado ou
-                        estiver malformado.
+            SystemExit: Se o arquivo 'origin.json' não for encontrado,
+                        estiver malformado ou incompleto.
         """
-        try:
-            with open(cls.__FILE_PATH_ORIGIN, encoding="utf-8") as file:
-                data = load(file)
+        return cls.__get(cls.__FILE_PATH_ORIGIN, cls.database_errors)
 
-        except Exception as error:
-            print("[bold red]Erro no arquivo de configuração, verifique o log.[/bold red]")
-            Log.warning("O arquivo origin.json não pôde ser encontrado ou aberto.")
-            raise SystemExit from error
+    @classmethod
+    def get_destiny_db(cls) -> DatabaseConfig:
+        """
+        Carrega as configurações de conexão do banco de dados de destino.
 
-        return data
+        Returns:
+            (DatabaseConfig): Os dados do arquivo 'destiny.json', imutáveis.
+
+        Raises:
+            SystemExit: Se o arquivo 'destiny.json' não for encontrado,
+                        estiver malformado ou incompleto.
+        """
+        return cls.__get(cls.__FILE_PATH_DESTINY, cls.database_errors)
 
     @classmethod
-    def get_destiny_db(cls) -> dict[str: str]:
+    def get_citys(cls) -> tuple[Mapping[str, Any], ...]:
         """
-        Carrega as configurações de conexão do banco de dados de destino.
+        Carrega as configurações de mapeamento de cidades do arquivo 'citys.json'.
 
         Returns:
-            (dict[str, str]): Um dicionário com os dados do arquivo 'destiny.json'.
+            (tuple[Mapping[str, Any], ...]): As cidades do arquivo 'citys.json', imutáveis.
 
         Raises:
-            SystemExit: Se o arquivo 'destiny.json' não for encontrado ou
+            SystemExit: Se o arquivo 'citys.json' não for encontrado ou
                         estiver malformado.
         """
-        try:
-            with open(cls.__FILE_PATH_DESTINY, encoding="utf-8") as file:
-                data = load(file)
+        return cls.__get(cls.__FILE_PATH_CITYS, None)
 
-        except Exception as error:
-            print("[bold red]Erro no arquivo de configuração, verifique o log.[/bold red]")
-            Log.warning("O arquivo destiny.json não pôde ser encontrado ou aberto.")
-            raise SystemExit from error
+    @classmethod
+    def get_plugins(cls) -> tuple[str, ...]:
+        """
+        Carrega os módulos de transformações do usuário do arquivo opcional 'transforms.json'.
 
-        return data
+        O arquivo é uma lista de nomes de módulos importáveis ou de caminhos
+        de arquivos .py (relativos ao diretório de execução), que registram
+        suas transformações no `TransformRegistry`.
+
+        Returns:
+            tuple[str, ...]: Os módulos listados (vazio se o arquivo não existir).
+
+        Raises:
+            SystemExit: Se o arquivo estiver malformado.
+        """
+        if not os.path.exists(cls.__FILE_PATH_TRANSFORMS):
+            return ()
+        return cls.__get(cls.__FILE_PATH_TRANSFORMS, cls.plugins_errors)
 
     @classmethod
-    def get_citys(cls) -> dict[str: str]:
+    def read(cls, path: str, check: Callable[[Any], list[str]] | None = None) -> Any:
         """
-        Carrega as configurações de mapeamento de cidades do arquivo 'citys.json'.
+        Carrega um arquivo JSON qualquer com o mesmo cache e imutabilidade.
+
+        Usado para arquivos fora do diretório padrão, como o manifesto de
+        jobs e as configurações de cada job.
+
+        Args:
+            path (str): Caminho do arquivo.
+            check (Callable | None): Validação a aplicar, ex: `tables_errors`.
+
+        Raises:
+            SystemExit: Se o arquivo não puder ser lido ou não passar na validação.
+        """
+        return cls.__get(path, check)
+
+    @classmethod
+    def validate(cls, transforms: Callable[[str, Any], str | None] | None = None,
+                 blocks: Callable[[str, Mapping, Mapping], list[str]] | None = None) -> None:
+        """
+        Carrega e valida todos os arquivos de configuração antes da execução.
+
+        Os erros dos arquivos de tabelas, origem e destino são reunidos e
+        reportados juntos, em vez de interromper no primeiro arquivo inválido.
+        Um arquivo já validado só é conferido de novo se for modificado.
+
+        Args:
+            transforms (Callable | None): Confere cada transformação das tabelas
+                (veja `tables_errors`).
+            blocks (Callable | None): Confere os blocos opcionais de cada tabela
+                (veja `tables_errors`).
+
+        Raises:
+            SystemExit: Se algum arquivo não puder ser lido ou tiver erros.
+        """
+        errors = []
+        for path, check, keys in (
+            (cls.__FILE_PATH_TABLES, partial(cls.tables_errors, transforms=transforms, blocks=blocks),
+             ((cls.tables_errors, transforms, blocks), cls.tables_errors)),
+            (cls.__FILE_PATH_ORIGIN, cls.database_errors, (cls.database_errors,)),
+            (cls.__FILE_PATH_DESTINY, cls.database_errors, (cls.database_errors,)),
+        ):
+            try:
+                data = cls.__load(path)
+            except (OSError, ValueError) as error:
+                errors.append(f"{os.path.basename(path)}: não pôde ser aberto ({error})")
+                continue
+            errors.extend(f"{os.path.basename(path)}: {error}" for error in cls.__errors(path, data, check, *keys))
+
+        if errors:
+            cls.fail(errors)
+
+    @classmethod
+    def tables_errors(cls, tables: Any, transforms: Callable[[str, Any], str | None] | None = None,
+                      blocks: Callable[[str, Mapping, Mapping], list[str]] | None = None) -> list[str]:
+        """
+        Lista os problemas de estrutura da configuração de tabelas.
+
+        Confere a presença e o tipo de `table`, `destiny`, `fields` e `remove`,
+        o `field_destiny` de cada campo e os nomes de destino repetidos
+        (inclusive com as colunas de `computed`). Os blocos opcionais e as
+        transformações são conferidos pelas etapas que os usam, repassadas
+        aqui para que as configurações não dependam delas.
+
+        Args:
+            tables (Any): A configuração de tabelas já carregada.
+            transforms (Callable | None): Confere uma transformação pelo nome e
+                valor configurado, retornando o problema ou None (ex:
+                `TransformRegistry.check`). None não confere as transformações.
+            blocks (Callable | None): Lista os problemas dos blocos opcionais de
+                uma tabela, pelo nome, configuração e todas as tabelas (ex:
+                `TableChecks.errors`). None não confere os blocos.
+
+        Returns:
+            list[str]: Uma mensagem por problema encontrado (vazia se válida).
+        """
+        if not isinstance(tables, Mapping) or not tables:
+            return ["deve ser um objeto com ao menos uma tabela"]
+
+        errors = []
+        for name, config in tables.items():
+            if not isinstance(config, Mapping):
+                errors.append(f"tabela '{name}': deve ser um objeto")
+                continue
+
+            for key in ('table', 'destiny'):
+                if not isinstance(config.get(key), str) or not config.get(key):
+                    errors.append(f"tabela '{name}': '{key}' ausente ou vazio")
+
+            remove = config.get('remove')
+            if not isinstance(remove, Mapping):
+                errors.append(f"tabela '{name}': 'remove' ausente ou não é um objeto")
+            else:
+                errors.extend(f"tabela '{name}': 'remove.{key}' deve ser o nome de uma coluna"
+                              for key, column in remove.items() if not isinstance(column, str) or not column)
+
+            if blocks is not None:
+                errors.extend(f"tabela '{name}': {problem}" for problem in blocks(name, config, tables))
+
+            fields = config.get('fields')
+            if not isinstance(fields, Mapping) or not fields:
+                errors.append(f"tabela '{name}': 'fields' ausente ou vazio")
+                continue
+
+            computed = config.get('computed')
+            errors.extend(cls.__fields_errors(name, fields, computed if isinstance(computed, Mapping) else {},
+                                              transforms))
+
+        return errors
+
+    @staticmethod
+    def __fields_errors(name: str, fields: Mapping[str, Any], computed: Mapping[str, Any],
+                        transforms: Callable[[str, Any], str | None] | None) -> list[str]:
+        """Lista os problemas dos campos de uma tabela e das suas transformações."""
+        errors = []
+        destinies = set()
+        for field, info in fields.items():
+            prefix = f"tabela '{name}', campo '{field}'"
+            if not isinstance(info, Mapping):
+                errors.append(f"{prefix}: deve ser um objeto")
+                continue
+
+            destiny = info.get('field_destiny')
+            if not isinstance(destiny, str) or not destiny:
+                errors.append(f"{prefix}: 'field_destiny' ausente ou vazio")
+            elif destiny in destinies or destiny in computed:
+                errors.append(f"{prefix}: 'field_destiny' '{destiny}' repetido")
+            else:
+                destinies.add(destiny)
+
+            transform = info.get('transform', {})
+            if not isinstance(transform, Mapping):
+                errors.append(f"{prefix}: 'transform' deve ser um objeto")
+            elif transforms is not None:
+                errors.extend(f"{prefix}: transformação '{option}' {problem}"
+                              for option, value in transform.items() if (problem := transforms(option, value)))
+
+        return errors
+
+    @staticmethod
+    def columns(value: Any) -> bool:
+        """Indica se o valor é uma lista não vazia de nomes de colunas (ex: `keys` dos blocos das tabelas)."""
+        return isinstance(value, tuple) and bool(value) and all(isinstance(item, str) and item for item in value)
+
+    @classmethod
+    def database_errors(cls, info: Any) -> list[str]:
+        """
+        Lista os problemas de uma configuração de conexão.
+
+        Args:
+            info (Any): A configuração de conexão já carregada.
 
         Returns:
-            (dict[str, str]): Um dicionário com os dados do arquivo 'citys.json'.
+            list[str]: Uma mensagem por problema encontrado (vazia se válida).
+        """
+        if not isinstance(info, Mapping):
+            return ["deve ser um objeto"]
+
+        font = info.get('font')
+        if font not in cls.__FONTS:
+            return [f"'font' deve ser um de {', '.join(cls.__FONTS)}"]
+
+        errors = [f"'{key}' ausente para a base {font}" for key in cls.__FONTS[font] if key not in info]
+        if not isinstance(info.get('bulk_load', False), bool):
+            errors.append("'bulk_load' deve ser true ou false")
+
+        return errors
+
+    @classmethod
+    def plugins_errors(cls, modules: Any) -> list[str]:
+        """
+        Lista os problemas do arquivo de módulos de transformações.
+
+        Args:
+            modules (Any): A lista de módulos já carregada.
+
+        Returns:
+            list[str]: Uma mensagem por problema encontrado (vazia se válida).
+        """
+        if not isinstance(modules, tuple):
+            return ["deve ser uma lista de módulos ou arquivos .py"]
+        return [f"módulo {position}: deve ser um nome de módulo ou caminho de arquivo .py"
+                for position, module in enumerate(modules, start=1) if not isinstance(module, str) or not module]
+
+    @classmethod
+    def __get(cls, path: str, check: Callable[[Any], list[str]] | None) -> Any:
+        """
+        Retorna o conteúdo em cache do arquivo, validando-o uma vez a cada carga.
 
         Raises:
-            SystemExit: Se o arquivo 'citys.json' não for encontrado ou
-                        estiver malformado.
+            SystemExit: Se o arquivo não puder ser lido ou não for válido.
         """
         try:
-            with open(cls.__FILE_PATH_CITYS, encoding="utf-8") as file:
-                data = load(file)
+            data = cls.__load(path)
 
         except Exception as error:
             print("[bold red]Erro no arquivo de configuração, verifique o log.[/bold red]")
-            Log.warning("O arquivo citys.json não pôde ser encontrado ou aberto.")
+            Log.warning(f"O arquivo {os.path.basename(path)} não pôde ser encontrado ou aberto.")
             raise SystemExit from error
 
+        if check is not None:
+            errors = cls.__errors(path, data, check, check)
+            if errors:
+                cls.fail([f"{os.path.basename(path)}: {error}" for error in errors])
+
         return data
+
+    @classmethod
+    def __errors(cls, path: str, data: Any, check: Callable[[Any], list[str]], *keys: Hashable) -> list[str]:
+        """
+        Confere os dados carregados do arquivo, a menos que já tenham passado na mesma verificação.
+
+        O resultado fica junto dos dados no cache e vale até o arquivo mudar.
+        A primeira chave identifica a verificação (a função e o que foi
+        repassado a ela); as demais, as verificações contidas nela, que também
+        ficam dispensadas se ela passar (ex: a estrutura das tabelas).
+        """
+        with cls.__lock:
+            cached = cls.__cache.get(path)
+            if cached is not None and cached[1] is data and keys[0] in cached[2]:
+                return []
+
+        errors = check(data)
+        if not errors:
+            with cls.__lock:
+                cached = cls.__cache.get(path)
+                if cached is not None and cached[1] is data:
+                    cached[2].update(keys)
+
+        return errors
+
+    @classmethod
+    def __load(cls, path: str) -> Any:
+        """Lê e congela o arquivo, ou reaproveita o cache se ele não mudou."""
+        mtime = os.stat(path).st_mtime_ns
+
+        with cls.__lock:
+            cached = cls.__cache.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+        with open(path, encoding="utf-8") as file:
+            data = freeze(load(file))
+
+        with cls.__lock:
+            cls.__cache[path] = (mtime, data, set())
+
+        return data
+
+    @classmethod
+    def fail(cls, errors: list[str]) -> None:
+        """
+        Reporta todos os erros de configuração e encerra a aplicação.
+
+        Raises:
+            SystemExit: Sempre, com código 1.
+        """
+        print("[bold red]Erros nos arquivos de configuração:[/bold red]")
+        for error in errors:
+            print(f"[red]  - {error}[/red]")
+            Log.error(f"Configuração inválida: {error}")
+
+        raise SystemExit(1)
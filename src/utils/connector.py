@@ -13,16 +13,31 @@
 # Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
 # com este programa. Se não, veja <https://www.gnu.org/licenses/>.
 
+from threading import Lock
+from typing import TYPE_CHECKING
 from rich import print
-from sqlalchemy import create_engine, Engine
 from utils.log import Log
 
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+
 
 class SQLConnector():
-    """Gerencia a criação e o armazenamento de um engine de conexão do SQLAlchemy."""
+    """
+    Gerencia a criação e o armazenamento de um engine de conexão do SQLAlchemy.
+
+    O SQLAlchemy só é importado ao criar a conexão, e o dialeto e o driver
+    (fdb, pyodbc...) carregados são apenas os da `font` configurada.
+
+    Os engines são compartilhados no processo: conectores com a mesma string
+    de conexão reutilizam o mesmo engine e, com ele, o mesmo pool de conexões.
+    """
+
+    __engines: dict[str, "Engine"] = {}
+    __lock: Lock = Lock()
 
     def __init__(self) -> None:
-        self.__engine: Engine = None
+        self.__engine: "Engine" = None
 
     def db_connection(self, info: dict[str, str]) -> None:
         """
@@ -30,7 +45,8 @@ class SQLConnector():
 
         Este método tenta criar um engine do SQLAlchemy e, em seguida, realiza
         uma tentativa de conexão para validar a string e as credenciais.
-        Se a conexão for bem-sucedida, o engine é armazenado internamente.
+        Se a conexão for bem-sucedida, o engine é armazenado internamente e
+        reaproveitado pelas próximas conexões com a mesma string.
 
         Args:
             info (dict[str, str]): Um dicionário contendo as credenciais e o tipo ('font')
@@ -41,18 +57,28 @@ class SQLConnector():
                         qualquer motivo.
         """
         try:
+            from sqlalchemy import create_engine
+
             engine_name = self.__get_engine_name(info)
-            engine = create_engine(engine_name)
-            connection = engine.connect()
-            connection.close()
+            with self.__lock:
+                engine = self.__engines.get(engine_name)
+
+            if engine is None:
+                engine = create_engine(engine_name)
+                connection = engine.connect()
+                connection.close()
+
+                with self.__lock:
+                    engine = self.__engines.setdefault(engine_name, engine)
+
             self.__set_engine(engine)
 
         except Exception as error:
             print("[bold red]Erro ao conectar no banco de dados, verifique o log.[/bold red]")
-            Log.error(f"Erro ao conectar no banco de dados: {error}", False)
+            Log.error(f"Erro ao conectar no banco de dados: {error}")
             raise SystemExit from error
 
-    def __set_engine(self, engine: Engine) -> None:
+    def __set_engine(self, engine: "Engine") -> None:
         """
         Define o engine do SQLAlchemy para a instância do conector.
 
@@ -61,7 +87,7 @@ class SQLConnector():
         """
         self.__engine = engine
 
-    def get_engine(self) -> Engine:
+    def get_engine(self) -> "Engine":
         """
         Recupera o engine do SQLAlchemy armazenado.
 
@@ -83,8 +109,8 @@ class SQLConnector():
             str: A string de conexão formatada para o SQLAlchemy.
 
         Raises:
-            SystemExit: Se o tipo de banco de dados ('font') não for 'Firebird'
-                        ou 'SQLServer', pois não é suportado.
+            SystemExit: Se o tipo de banco de dados ('font') não for 'Firebird',
+                        'SQLServer' ou 'SQLite', pois não é suportado.
         """
         if info['font'] == 'Firebird':
             return f"firebird+fdb://{info['user']}:{info['password']}@{info['host']}/{info['database']}"
@@ -92,6 +118,9 @@ class SQLConnector():
         elif info['font'] == 'SQLServer':
             return f"mssql+pyodbc://{info['user']}:{info['password']}@{info['host']}/{info['database']}?{info['driver']}"
 
+        elif info['font'] == 'SQLite':
+            return f"sqlite:///{info['database']}"
+
         else:
             print("[bold red]Base informada é invalida ou ainda não foi implementada.[/bold red]")
             Log.warning("A base de dados informada é invalida ou ainda não foi implementada.")
@@ -0,0 +1,278 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+import shutil
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from json import dump, load
+from tempfile import mkdtemp
+from threading import RLock
+from typing import Iterator
+import numpy as np
+from pandas import DataFrame, RangeIndex, read_pickle
+from utils.log import Log
+
+
+class ColumnarFile:
+    """
+    Grava e lê um DataFrame como um diretório com um arquivo por coluna.
+
+    Colunas com dtype nativo do NumPy (números, booleanos e datas) são
+    gravadas em `.npy` e lidas com memory-map, sem copiar os dados para a
+    memória. As demais (texto, categorias e tipos anuláveis do pandas) são
+    gravadas com pickle. Um `meta.json` guarda a ordem e o tipo das colunas.
+    """
+
+    @staticmethod
+    def write(df: DataFrame, directory: str) -> None:
+        """
+        Grava o DataFrame no diretório informado.
+
+        Args:
+            df (DataFrame): DataFrame a ser gravado.
+            directory (str): Diretório de destino, criado se não existir.
+        """
+        os.makedirs(directory, exist_ok=True)
+        columns = []
+
+        for position, name in enumerate(df.columns):
+            series = df.iloc[:, position]
+            native = isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM'
+            file_name = f"{position}.npy" if native else f"{position}.pkl"
+
+            if native:
+                np.save(os.path.join(directory, file_name), series.to_numpy(), allow_pickle=False)
+            else:
+                series.to_pickle(os.path.join(directory, file_name))
+
+            columns.append({'name': name, 'file': file_name, 'native': native})
+
+        index = df.index
+        range_index = isinstance(index, RangeIndex) and index.start == 0 and index.step == 1
+        if not range_index:
+            index.to_series().to_pickle(os.path.join(directory, "index.pkl"))
+
+        with open(os.path.join(directory, "meta.json"), 'w', encoding='utf-8') as file:
+            dump({'columns': columns, 'rows': len(df), 'range_index': range_index}, file, default=str)
+
+    @staticmethod
+    def read(directory: str, mmap: bool = True) -> DataFrame:
+        """
+        Lê um DataFrame gravado por `write`.
+
+        Args:
+            directory (str): Diretório gravado por `write`.
+            mmap (bool): Se True, as colunas nativas são mapeadas em memória
+                         em vez de lidas por completo. O padrão é True.
+
+        Returns:
+            DataFrame: O DataFrame reconstruído.
+        """
+        with open(os.path.join(directory, "meta.json"), encoding='utf-8') as file:
+            meta = load(file)
+
+        data = {}
+        for column in meta['columns']:
+            path = os.path.join(directory, column['file'])
+            if column['native']:
+                data[column['name']] = np.load(path, mmap_mode='r' if mmap else None).view(np.ndarray)
+            else:
+                data[column['name']] = read_pickle(path).reset_index(drop=True)
+
+        df = DataFrame(data, copy=False)
+        if not meta['range_index']:
+            df.index = read_pickle(os.path.join(directory, "index.pkl")).index
+
+        return df
+
+
+class MemoryBudget:
+    """
+    Controla a memória ocupada pelos DataFrames mantidos pelo pipeline.
+
+    As tabelas guardadas em `FrameStore` ligados ao mesmo orçamento são
+    contabilizadas por `memory_usage(deep=True)`. Quando o total ultrapassa
+    o limite, as tabelas usadas há mais tempo (ou liberadas com `release`)
+    são gravadas em disco e removidas da memória, até que o total volte a
+    caber no orçamento.
+
+    Args:
+            limit (int): Limite de memória, em bytes.
+            spill_dir (str | None): Diretório base dos arquivos temporários. O
+                                    padrão (None) usa o diretório temporário
+                                    do sistema.
+    """
+
+    def __init__(self, limit: int, spill_dir: str | None = None) -> None:
+        self.limit = limit
+        self.__spill_dir = spill_dir
+        self.__directory: str | None = None
+        self.__entries: OrderedDict[tuple[int, str], tuple["FrameStore", int]] = OrderedDict()
+        self.__lock = RLock()
+        self.__sequence = 0
+
+    @property
+    def used(self) -> int:
+        """Total de bytes das tabelas atualmente em memória."""
+        with self.__lock:
+            return sum(size for _, size in self.__entries.values())
+
+    def path(self) -> str:
+        """Cria (uma única vez) e retorna um diretório novo para uma tabela despejada."""
+        with self.__lock:
+            if self.__directory is None:
+                if self.__spill_dir:
+                    os.makedirs(self.__spill_dir, exist_ok=True)
+                self.__directory = mkdtemp(prefix="etl_spill_", dir=self.__spill_dir)
+            self.__sequence += 1
+            return os.path.join(self.__directory, str(self.__sequence))
+
+    def register(self, store: "FrameStore", key: str, size: int) -> None:
+        """Contabiliza uma tabela em memória como a mais recentemente usada."""
+        with self.__lock:
+            self.__entries[(id(store), key)] = (store, size)
+            self.__entries.move_to_end((id(store), key))
+            self.__enforce(keep=(id(store), key))
+
+    def touch(self, store: "FrameStore", key: str) -> None:
+        """Marca uma tabela como a mais recentemente usada."""
+        with self.__lock:
+            if (id(store), key) in self.__entries:
+                self.__entries.move_to_end((id(store), key))
+
+    def release(self, store: "FrameStore", key: str) -> None:
+        """Marca uma tabela como a primeira candidata a ser despejada."""
+        with self.__lock:
+            if (id(store), key) in self.__entries:
+                self.__entries.move_to_end((id(store), key), last=False)
+                self.__enforce()
+
+    def forget(self, store: "FrameStore", key: str) -> None:
+        """Deixa de contabilizar uma tabela (removida ou despejada)."""
+        with self.__lock:
+            self.__entries.pop((id(store), key), None)
+
+    def close(self) -> None:
+        """Remove os arquivos temporários de todas as tabelas despejadas."""
+        with self.__lock:
+            if self.__directory is not None:
+                shutil.rmtree(self.__directory, ignore_errors=True)
+                self.__directory = None
+
+    def __enforce(self, keep: tuple[int, str] | None = None) -> None:
+        """Despeja as tabelas menos usadas até o total caber no limite."""
+        for entry in list(self.__entries):
+            if self.used <= self.limit:
+                break
+            if entry == keep:
+                continue
+
+            store, _ = self.__entries[entry]
+            store.spill(entry[1])
+
+
+class FrameStore(MutableMapping):
+    """
+    Dicionário de DataFrames que respeita um orçamento de memória.
+
+    Pode substituir o dicionário `raw_data` do `ExtractContract` e os itens
+    de `clean_data` do `TransformContract`: quem o usa continua acessando as
+    tabelas pela chave, e as tabelas despejadas em disco são recarregadas
+    (com memory-map quando possível) de forma transparente no acesso.
+
+    Args:
+            budget (MemoryBudget): Orçamento de memória compartilhado.
+    """
+
+    def __init__(self, budget: MemoryBudget) -> None:
+        self.__budget = budget
+        self.__lock = RLock()
+        self.__frames: dict[str, DataFrame] = {}
+        self.__spilled: dict[str, str] = {}
+        self.__order: list[str] = []
+
+    def __setitem__(self, key: str, df: DataFrame) -> None:
+        with self.__lock:
+            if key in self:
+                del self[key]
+            self.__frames[key] = df
+            self.__order.append(key)
+        self.__budget.register(self, key, int(df.memory_usage(deep=True).sum()))
+
+    def __getitem__(self, key: str) -> DataFrame:
+        with self.__lock:
+            df = self.__frames.get(key)
+            if df is None:
+                if key not in self.__spilled:
+                    raise KeyError(key)
+
+                df = ColumnarFile.read(self.__spilled[key])
+                self.__frames[key] = df
+                loaded = True
+            else:
+                loaded = False
+
+        if loaded:
+            self.__budget.register(self, key, int(df.memory_usage(deep=True).sum()))
+        else:
+            self.__budget.touch(self, key)
+        return df
+
+    def __delitem__(self, key: str) -> None:
+        with self.__lock:
+            if key not in self:
+                raise KeyError(key)
+            self.__frames.pop(key, None)
+            path = self.__spilled.pop(key, None)
+            self.__order.remove(key)
+        self.__budget.forget(self, key)
+        if path:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__frames or key in self.__spilled
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.__order))
+
+    def __len__(self) -> int:
+        return len(self.__order)
+
+    def release(self, key: str) -> None:
+        """Indica que a tabela não será usada tão cedo, priorizando seu despejo."""
+        self.__budget.release(self, key)
+
+    def spill(self, key: str) -> None:
+        """
+        Grava a tabela em disco e a remove da memória.
+
+        A tabela é sempre regravada, pois pode ter sido alterada depois de
+        recarregada; o arquivo anterior, se houver, é removido.
+        """
+        with self.__lock:
+            df = self.__frames.pop(key, None)
+            if df is None:
+                return
+
+            previous = self.__spilled.get(key)
+            path = self.__budget.path()
+            ColumnarFile.write(df, path)
+            self.__spilled[key] = path
+
+        self.__budget.forget(self, key)
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+        Log.info("Tabela %s gravada em disco (%s) para respeitar o orçamento de memória.", key, path)
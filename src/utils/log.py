@@ -13,8 +13,57 @@
 # Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
 # com este programa. Se não, veja <https://www.gnu.org/licenses/>.
 
+import atexit
 import logging
-import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from json import dumps
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from threading import Lock
+from typing import Iterator
+
+
+class JsonLineFormatter(logging.Formatter):
+    """
+    Formata cada registro de log como uma linha JSON.
+
+    Além da data, nível e mensagem, a linha inclui a origem da chamada
+    (módulo, função e linha), a thread e o contexto do pipeline (etapa,
+    tabela, bloco...) vigente no momento da chamada. O traceback, quando
+    solicitado, é incluído no campo `exception`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+            'thread': record.threadName,
+        }
+        data.update(getattr(record, 'context', {}))
+
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+
+        return dumps(data, ensure_ascii=False, default=str)
+
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    Envia o registro para a fila sem formatá-lo.
+
+    O `QueueHandler` padrão formata a mensagem na thread que chamou o log;
+    aqui a formatação (inclusive dos argumentos da mensagem e do traceback)
+    fica a cargo da thread de escrita.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 class Log:
@@ -26,54 +75,82 @@ class Log:
     níveis de severidade (INFO, WARNING, ERROR, CRITICAL).
 
     Características principais:
-    - Logs de erro e críticos incluem automaticamente informações de contexto
-      (módulo, função e linha) de onde foram chamados.
-    - Um separador é adicionado após cada mensagem para facilitar a leitura do arquivo.
-    - A configuração do logger (nível, formatadores, handler) é feita
-      internamente, abstraindo a complexidade do usuário final.
+    - Cada mensagem é gravada como uma linha JSON, com módulo, função e linha
+      de onde o log foi chamado e o contexto do pipeline definido em `context`.
+    - As chamadas apenas enfileiram o registro; a formatação e a escrita no
+      arquivo são feitas por uma thread de fundo, de modo que o log é barato
+      e seguro para ser chamado por várias threads ao mesmo tempo.
+    - A mensagem aceita argumentos no estilo `%`, formatados somente na escrita.
+    - O arquivo e a thread de escrita só são criados no primeiro registro, de
+      modo que importar o módulo não tem custo nem efeitos colaterais.
     """
 
-    __logger: str = logging.getLogger(__name__)
+    __logger: logging.Logger = logging.getLogger(__name__)
     __logger.setLevel("INFO")
 
-    __separator: str = logging.Formatter("%(message)s", style="%")
+    __context: ContextVar[dict] = ContextVar('log_context', default={})
 
-    __simple_formatter: str = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(message)s",
-        style="%",
-        datefmt="%d-%m-%Y %H:%M"
-    )
+    __queue: SimpleQueue = SimpleQueue()
+    __logger.addHandler(_LazyQueueHandler(__queue))
 
-    __file_handler: str = logging.FileHandler("app.log", mode="a")
-    __logger.addHandler(__file_handler)
+    __listener: QueueListener | None = None
+    __lock: Lock = Lock()
 
     @classmethod
-    def __custom_formatter(cls, mod: str, func: str, line: str) -> str:
+    @contextmanager
+    def context(cls, **fields) -> Iterator[None]:
         """
-        Cria um formatador de log detalhado para mensagens de erro e críticas.
+        Define campos de contexto incluídos em todos os logs do bloco.
 
-        Args:
-            mod (str): O nome do módulo onde o log foi originado.
-            func (str): O nome da função onde o log foi originado.
-            line (str): O número da linha onde o log foi originado.
+        Os campos são acumulados com os do contexto externo e valem apenas
+        para a thread (ou tarefa) corrente.
 
-        Returns:
-            logging.Formatter: Um objeto formatador com informações de contexto.
+        Exemplo:
+            with Log.context(stage='extract', table='clientes'):
+                Log.info('Extraindo')
+
+        Args:
+            **fields: Campos de contexto, ex: stage, table, chunk.
         """
-        return logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(message)s\n"
-            f"Module: {mod}\nFunction: {func}\nLine: {line}",
-            datefmt="%d-%m-%Y %H:%M"
-        )
+        token = cls.__context.set({**cls.__context.get(), **fields})
+        try:
+            yield
+        finally:
+            cls.__context.reset(token)
 
     @classmethod
-    def __print_separator(cls) -> None:
-        """Adiciona uma linha separadora ao arquivo de log para melhor legibilidade."""
-        cls.__file_handler.setFormatter(cls.__separator)
-        cls.__logger.info("================")
+    def flush(cls) -> None:
+        """Aguarda a escrita de todos os registros pendentes na fila."""
+        with cls.__lock:
+            if cls.__listener is not None:
+                cls.__listener.stop()
+                cls.__listener.start()
+
+    @classmethod
+    def __start(cls) -> None:
+        """Abre o arquivo 'app.log' e inicia a thread de escrita, uma única vez."""
+        with cls.__lock:
+            if cls.__listener is None:
+                file_handler = logging.FileHandler("app.log", mode="a", encoding="utf-8")
+                file_handler.setFormatter(JsonLineFormatter())
+
+                cls.__listener = QueueListener(cls.__queue, file_handler)
+                cls.__listener.start()
+                atexit.register(cls.__listener.stop)
 
     @classmethod
-    def info(cls, message: str) -> None:
+    def __log(cls, level: int, message: str, args: tuple, trace: bool) -> None:
+        """Enfileira o registro com o contexto corrente e a origem da chamada."""
+        if cls.__logger.isEnabledFor(level):
+            if cls.__listener is None:
+                cls.__start()
+            cls.__logger.log(
+                level, message, *args,
+                exc_info=trace, stacklevel=3, extra={'context': cls.__context.get()}
+            )
+
+    @classmethod
+    def info(cls, message: str, *args) -> None:
         """
         Registra uma mensagem com o nível INFO.
 
@@ -81,13 +158,12 @@ class Log:
 
         Args:
             message (str): A mensagem a ser registrada.
+            *args: Argumentos da mensagem no estilo `%`.
         """
-        cls.__file_handler.setFormatter(cls.__simple_formatter)
-        cls.__logger.info(message)
-        cls.__print_separator()
+        cls.__log(logging.INFO, message, args, False)
 
     @classmethod
-    def warning(cls, message: str) -> None:
+    def warning(cls, message: str, *args) -> None:
         """
         Registra uma mensagem com o nível WARNING.
 
@@ -96,56 +172,38 @@ class Log:
 
         Args:
             message (str): A mensagem de aviso a ser registrada.
+            *args: Argumentos da mensagem no estilo `%`.
         """
-        cls.__file_handler.setFormatter(cls.__simple_formatter)
-        cls.__logger.warning(message)
-        cls.__print_separator()
+        cls.__log(logging.WARNING, message, args, False)
 
     @classmethod
-    def error(cls, message: str, trace: bool = False) -> None:
+    def error(cls, message: str, trace: bool = False, *args) -> None:
         """
         Registra uma mensagem com o nível ERROR.
 
         Indica um problema sério que impediu a execução de uma operação específica,
-        mas não necessariamente da aplicação inteira. Inclui automaticamente o
-        contexto da chamada (módulo, função, linha).
+        mas não necessariamente da aplicação inteira.
 
         Args:
             message (str): A mensagem de erro a ser registrada.
             trace (bool): Se True, inclui o traceback completo da exceção no log.
                           Útil para depuração detalhada. O padrão é False.
+            *args: Argumentos da mensagem no estilo `%`, após `trace`.
         """
-        caller_frame = inspect.currentframe().f_back
-        module_name = inspect.getmodule(caller_frame).__name__
-        func_name = caller_frame.f_code.co_name
-        line_no = caller_frame.f_lineno
-
-        custom_formatter = cls.__custom_formatter(module_name, func_name, line_no)
-
-        cls.__file_handler.setFormatter(custom_formatter)
-        cls.__logger.error(message, exc_info=trace)
-        cls.__print_separator()
+        cls.__log(logging.ERROR, message, args, trace)
 
     @classmethod
-    def critical(cls, message: str, trace: bool = False) -> None:
+    def critical(cls, message: str, trace: bool = False, *args) -> None:
         """
         Registra uma mensagem com o nível CRITICAL.
 
         Indica um erro gravíssimo que provavelmente levará ao encerramento da
-        aplicação. Inclui automaticamente o contexto da chamada.
+        aplicação.
 
         Args:
             message (str): A mensagem crítica a ser registrada.
             trace (bool): Se True, inclui o traceback completo da exceção no log.
                           O padrão é False.
+            *args: Argumentos da mensagem no estilo `%`, após `trace`.
         """
-        caller_frame = inspect.currentframe().f_back
-        module_name = inspect.getmodule(caller_frame).__name__
-        func_name = caller_frame.f_code.co_name
-        line_no = caller_frame.f_lineno
-
-        custom_formatter = cls.__custom_formatter(module_name, func_name, line_no)
-
-        cls.__file_handler.setFormatter(custom_formatter)
-        cls.__logger.critical(message, exc_info=trace)
-        cls.__print_separator()
+        cls.__log(logging.CRITICAL, message, args, trace)
@@ -0,0 +1,338 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import os
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from json import dump
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Iterator
+
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    class _Counters(ctypes.Structure):
+        """`PROCESS_MEMORY_COUNTERS` da API do Windows, preenchida por `GetProcessMemoryInfo`."""
+
+        _fields_ = [
+            ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+
+def current_memory() -> int | None:
+    """
+    Retorna a memória residente atual do processo, em bytes.
+
+    Usa `/proc/self/statm` no Linux e `GetProcessMemoryInfo` no Windows.
+    Retorna None se a informação não estiver disponível na plataforma.
+    """
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm', encoding='ascii') as file:
+                return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+        if sys.platform == 'win32':
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(_Counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+            return counters.WorkingSetSize
+
+    except Exception:
+        return None
+
+    return None
+
+
+class Measure:
+    """
+    Registro de uma medição de etapa do pipeline.
+
+    Os campos `rows` e `bytes` são preenchidos por quem mede, dentro do
+    bloco `with`; o tempo e, nas medições de tabela, o quanto a memória
+    residente subiu acima da do início do bloco (`memory_delta`) são
+    preenchidos ao sair dele.
+    """
+
+    __slots__ = ('stage', 'table', 'op', 'column', 'rows', 'bytes', 'seconds', 'memory_delta', 'active')
+
+    def __init__(self, stage: str, table: str | None, op: str | None, column: str | None) -> None:
+        self.active = False
+        self.stage = stage
+        self.table = table
+        self.op = op
+        self.column = column
+        self.rows: int | None = None
+        self.bytes: int | None = None
+        self.seconds: float = 0.0
+        self.memory_delta: int | None = None
+
+    def frame(self, df) -> None:
+        """
+        Registra a quantidade de linhas e o tamanho em memória de um DataFrame.
+
+        O tamanho (`memory_usage(deep=True)`) só é calculado quando há uma
+        execução sendo medida, pois percorre todos os valores de texto.
+        """
+        self.rows = len(df)
+        if self.active:
+            self.bytes = int(df.memory_usage(deep=True).sum())
+
+    def as_dict(self) -> dict:
+        """Converte a medição em um dicionário serializável em JSON."""
+        return {
+            'stage': self.stage,
+            'table': self.table,
+            'op': self.op,
+            'column': self.column,
+            'seconds': round(self.seconds, 6),
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'rows_per_second': round(self.rows / self.seconds, 2) if self.rows and self.seconds else None,
+            'memory_delta': self.memory_delta,
+        }
+
+
+class RunMetrics:
+    """
+    Agrega as medições de uma execução do pipeline.
+
+    É segura para uso concorrente: as medições podem ser registradas por
+    várias threads ao mesmo tempo.
+
+    O pico de memória é o da execução, e não o de toda a vida do processo:
+    enquanto ela dura, uma thread de fundo lê a memória residente atual a
+    cada `__INTERVAL` segundos e guarda o maior valor, tanto da execução
+    quanto de cada medição de tabela em andamento (ver `track`). Picos mais
+    curtos que o intervalo podem não ser percebidos.
+
+    Args:
+            name (str): Nome da execução, usado no relatório.
+    """
+
+    __INTERVAL: float = 0.05
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started_at = datetime.now()
+        self.seconds: float = 0.0
+        self.__start = perf_counter()
+        self.__lock = Lock()
+        self.__measures: list[Measure] = []
+        self.__tracked: dict[Measure, list[int]] = {}
+        self.__peak = current_memory()
+        self.__finished = Event()
+
+        if self.__peak is not None:
+            Thread(target=self.__watch, name=f'metrics-{name}', daemon=True).start()
+
+    def add(self, measure: Measure) -> None:
+        """Adiciona uma medição concluída à execução."""
+        with self.__lock:
+            self.__measures.append(measure)
+
+    def finish(self) -> None:
+        """Registra o tempo total e o pico de memória da execução e encerra a leitura da memória."""
+        self.seconds = perf_counter() - self.__start
+        self.__sample()
+        self.__finished.set()
+
+    def peak(self) -> int | None:
+        """
+        Retorna o pico de memória residente da execução, em bytes.
+
+        Depois de `finish`, retorna o valor registrado ao encerrá-la.
+        Retorna None se a memória não puder ser lida na plataforma.
+        """
+        if not self.__finished.is_set():
+            self.__sample()
+        return self.__peak
+
+    def track(self, measure: Measure) -> None:
+        """Passa a acompanhar o pico de memória durante a medição, a partir da memória atual."""
+        memory = current_memory()
+        if memory is not None:
+            with self.__lock:
+                self.__tracked[measure] = [memory, memory]
+
+    def untrack(self, measure: Measure) -> int | None:
+        """
+        Encerra o acompanhamento da medição.
+
+        Returns:
+            int | None: O quanto a memória residente subiu, no pico, acima da
+                do início da medição (None se não foi acompanhada).
+        """
+        self.__sample()
+        with self.__lock:
+            tracked = self.__tracked.pop(measure, None)
+        return None if tracked is None else tracked[1] - tracked[0]
+
+    def __watch(self) -> None:
+        """Lê a memória periodicamente até o fim da execução."""
+        while not self.__finished.wait(self.__INTERVAL):
+            self.__sample()
+
+    def __sample(self) -> None:
+        """Lê a memória atual e atualiza o pico da execução e das medições acompanhadas."""
+        memory = current_memory()
+        if memory is None:
+            return
+
+        with self.__lock:
+            if self.__peak is not None and not self.__finished.is_set():
+                self.__peak = max(self.__peak, memory)
+            for tracked in self.__tracked.values():
+                tracked[1] = max(tracked[1], memory)
+
+    def measures(self, stage: str | None = None) -> list[Measure]:
+        """Retorna as medições registradas, opcionalmente filtradas por etapa."""
+        with self.__lock:
+            return [item for item in self.__measures if stage is None or item.stage == stage]
+
+    def totals(self, stage: str) -> dict:
+        """
+        Soma as medições de nível de tabela (sem operação) de uma etapa.
+
+        Returns:
+            dict: Tempo, linhas, bytes e linhas por segundo da etapa.
+        """
+        items = [item for item in self.measures(stage) if item.op is None]
+        seconds = sum(item.seconds for item in items)
+        rows = sum(item.rows or 0 for item in items)
+        return {
+            'seconds': round(seconds, 6),
+            'rows': rows,
+            'bytes': sum(item.bytes or 0 for item in items),
+            'rows_per_second': round(rows / seconds, 2) if rows and seconds else None,
+        }
+
+    def report(self) -> dict:
+        """Monta o relatório da execução em um dicionário serializável em JSON."""
+        stages = []
+        for item in self.measures():
+            if item.stage not in stages:
+                stages.append(item.stage)
+
+        return {
+            'name': self.name,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'seconds': round(self.seconds, 6),
+            'peak_memory': self.peak(),
+            'stages': {stage: self.totals(stage) for stage in stages},
+            'measures': [item.as_dict() for item in self.measures()],
+        }
+
+    def save(self, directory: str) -> str:
+        """
+        Grava o relatório da execução em um arquivo JSON.
+
+        Args:
+            directory (str): Diretório onde o relatório será criado.
+
+        Returns:
+            str: O caminho do arquivo gravado.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"run_{self.started_at:%Y%m%d_%H%M%S}_{self.name}.json")
+
+        with open(path, 'w', encoding='utf-8') as file:
+            dump(self.report(), file, ensure_ascii=False, indent=2)
+
+        return path
+
+
+class Metrics:
+    """
+    Fornece uma interface centralizada para instrumentar as etapas do pipeline.
+
+    A execução corrente é guardada em uma variável de contexto, de modo que
+    execuções simultâneas em threads diferentes não se misturam. Quando não
+    há execução iniciada, `measure` não registra nada e tem custo desprezível.
+    """
+
+    __current: ContextVar[RunMetrics | None] = ContextVar('metrics_run', default=None)
+
+    @classmethod
+    def start_run(cls, name: str = 'pipeline') -> RunMetrics:
+        """
+        Inicia uma nova execução e a torna a execução corrente do contexto.
+
+        Uma execução anterior do mesmo contexto que não tenha sido encerrada
+        é encerrada antes.
+        """
+        cls.finish_run()
+
+        run = RunMetrics(name)
+        cls.__current.set(run)
+        return run
+
+    @classmethod
+    def current(cls) -> RunMetrics | None:
+        """Retorna a execução corrente do contexto, se houver."""
+        return cls.__current.get()
+
+    @classmethod
+    def finish_run(cls) -> RunMetrics | None:
+        """Encerra a execução corrente e a retorna."""
+        run = cls.__current.get()
+        if run is not None:
+            run.finish()
+            cls.__current.set(None)
+        return run
+
+    @classmethod
+    @contextmanager
+    def measure(cls, stage: str, table: str | None = None,
+                op: str | None = None, column: str | None = None) -> Iterator[Measure]:
+        """
+        Mede o tempo de um bloco de código e o registra na execução corrente.
+
+        Args:
+            stage (str): Etapa do pipeline ('extract', 'transform', 'load').
+            table (str | None): Tabela processada no bloco.
+            op (str | None): Operação de transformação aplicada, se houver.
+            column (str | None): Coluna transformada, se houver.
+
+        Yields:
+            Measure: O registro da medição, para que o chamador informe
+                     `rows` e `bytes` processados.
+        """
+        measure = Measure(stage, table, op, column)
+        run = cls.__current.get()
+        if run is None:
+            yield measure
+            return
+
+        measure.active = True
+        if op is None:
+            run.track(measure)
+        start = perf_counter()
+        try:
+            yield measure
+        finally:
+            measure.seconds = perf_counter() - start
+            if op is None:
+                measure.memory_delta = run.untrack(measure)
+            run.add(measure)
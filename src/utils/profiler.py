@@ -0,0 +1,107 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+import io
+import os
+import pstats
+from cProfile import Profile
+from utils.metrics import RunMetrics
+
+
+class Profiler:
+    """
+    Captura o perfil de CPU de uma execução do pipeline.
+
+    Usado como gerenciador de contexto em volta da execução. Ao final,
+    `write` grava o perfil bruto (`<nome>.prof`, legível por `pstats` ou
+    `snakeviz`) e um resumo (`<nome>.txt`) com o tempo agregado por etapa,
+    por tabela e por operação de transformação (a partir das métricas da
+    execução) seguido das funções mais custosas do perfil.
+
+    Args:
+            output (str): Caminho base dos arquivos gerados, sem extensão.
+            limit (int): Quantidade de funções listadas no resumo. O padrão é 30.
+    """
+
+    def __init__(self, output: str, limit: int = 30) -> None:
+        self.__output = os.path.splitext(output)[0]
+        self.__limit = limit
+        self.__profile = Profile()
+
+    def __enter__(self) -> "Profiler":
+        self.__profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.__profile.disable()
+
+    def write(self, run_metrics: RunMetrics | None) -> tuple[str, str]:
+        """
+        Grava o perfil bruto e o resumo dos pontos quentes.
+
+        Args:
+            run_metrics (RunMetrics | None): Métricas da execução perfilada,
+                                             usadas para agregar o tempo por
+                                             etapa, tabela e operação.
+
+        Returns:
+            tuple[str, str]: Os caminhos do perfil bruto e do resumo.
+        """
+        directory = os.path.dirname(self.__output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        raw_path = f"{self.__output}.prof"
+        summary_path = f"{self.__output}.txt"
+        self.__profile.dump_stats(raw_path)
+
+        with open(summary_path, 'w', encoding='utf-8') as file:
+            file.write(self.summary(run_metrics))
+
+        return raw_path, summary_path
+
+    def summary(self, run_metrics: RunMetrics | None) -> str:
+        """Monta o texto do resumo dos pontos quentes da execução."""
+        lines = []
+
+        if run_metrics is not None:
+            measures = run_metrics.measures()
+            groups = (
+                ("Tempo por etapa", lambda item: item.op is None, lambda item: item.stage),
+                ("Tempo por tabela", lambda item: item.op is None, lambda item: f"{item.stage} / {item.table}"),
+                ("Tempo por operação", lambda item: item.op is not None, lambda item: item.op),
+                ("Tempo por operação e coluna", lambda item: item.op is not None,
+                 lambda item: f"{item.table} / {item.column} / {item.op}"),
+            )
+
+            for title, selected, key in groups:
+                totals: dict[str, float] = {}
+                for item in measures:
+                    if selected(item):
+                        totals[key(item)] = totals.get(key(item), 0.0) + item.seconds
+
+                lines.append(title)
+                for name, seconds in sorted(totals.items(), key=lambda pair: pair[1], reverse=True):
+                    lines.append(f"  {seconds:10.3f}s  {name}")
+                lines.append("")
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self.__profile, stream=stream)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.__limit)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.__limit)
+
+        lines.append("Funções mais custosas")
+        lines.append(stream.getvalue())
+        return "\n".join(lines)
@@ -0,0 +1,114 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from threading import Lock
+from rich.progress import (BarColumn, Progress, ProgressColumn, SpinnerColumn, Task, TaskID, TextColumn,
+                           TimeRemainingColumn)
+from rich.text import Text
+
+
+class ProgressReporter:
+    """
+    Recebe o avanço, em linhas, de cada tabela em cada etapa do pipeline.
+
+    Esta implementação não faz nada e é a usada pelas etapas quando nenhum
+    acompanhamento é informado. `RichProgressReporter` exibe o avanço no
+    terminal.
+    """
+
+    def start(self, stage: str, table: str, total: int | None) -> None:
+        """Indica o início de uma tabela em uma etapa, com o total estimado de linhas."""
+
+    def advance(self, stage: str, table: str, rows: int) -> None:
+        """Soma linhas processadas a uma tabela em uma etapa."""
+
+    def finish(self, stage: str, table: str) -> None:
+        """Indica o fim de uma tabela em uma etapa."""
+
+
+class RowCountColumn(ProgressColumn):
+    """Exibe as linhas processadas e o total das tarefas de tabela."""
+
+    def render(self, task: Task) -> Text:
+        if not task.fields.get('rows'):
+            return Text("")
+        total = f"{task.total:,.0f}" if task.total is not None else "?"
+        return Text(f"{task.completed:,.0f}/{total}", style="progress.download")
+
+
+class RowSpeedColumn(ProgressColumn):
+    """Exibe a velocidade das tarefas de tabela em linhas por segundo."""
+
+    def render(self, task: Task) -> Text:
+        if not task.fields.get('rows'):
+            return Text("")
+        if not task.speed:
+            return Text("- linhas/s", style="progress.data.speed")
+        return Text(f"{task.speed:,.0f} linhas/s", style="progress.data.speed")
+
+
+class RichProgressReporter(ProgressReporter):
+    """
+    Exibe uma barra de progresso por tabela e etapa em um `Progress` do Rich.
+
+    As barras são criadas sob demanda em `start`. Quando o total informado é
+    uma estimativa e a tabela termina com outra quantidade de linhas, o total
+    é ajustado em `finish` para que a barra feche em 100%.
+
+    Args:
+            progress (Progress): Instância do Rich onde as barras são exibidas.
+            prefix (str): Texto exibido antes da descrição das barras, ex: o nome
+                          do job quando vários compartilham o mesmo `Progress`.
+    """
+
+    __LABELS = {'extract': "Extraindo", 'transform': "Transformando", 'load': "Carregando"}
+
+    def __init__(self, progress: Progress, prefix: str = "") -> None:
+        self.__progress = progress
+        self.__prefix = f"{prefix} · " if prefix else ""
+        self.__tasks: dict[tuple[str, str], TaskID] = {}
+        self.__lock = Lock()
+
+    def start(self, stage: str, table: str, total: int | None) -> None:
+        with self.__lock:
+            description = f"{self.__prefix}{self.__LABELS.get(stage, stage)} {table}"
+            task = self.__tasks.get((stage, table))
+            if task is None:
+                self.__tasks[(stage, table)] = self.__progress.add_task(description, total=total, rows=True)
+            else:
+                self.__progress.reset(task, total=total, description=description)
+
+    def advance(self, stage: str, table: str, rows: int) -> None:
+        task = self.__tasks.get((stage, table))
+        if task is not None:
+            self.__progress.advance(task, rows)
+
+    def finish(self, stage: str, table: str) -> None:
+        task = self.__tasks.get((stage, table))
+        if task is not None:
+            completed = next(item.completed for item in self.__progress.tasks if item.id == task)
+            self.__progress.update(task, total=completed, completed=completed)
+
+    @staticmethod
+    def columns() -> tuple[ProgressColumn, ...]:
+        """Retorna as colunas do `Progress` usado pelo pipeline."""
+        return (
+            SpinnerColumn(spinner_name='boxBounce2'),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            RowCountColumn(),
+            RowSpeedColumn(),
+            TimeRemainingColumn(),
+        )
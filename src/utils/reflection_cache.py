@@ -0,0 +1,87 @@
+# Pipeline ETL - Sistema de Extract, Transform, Load
+# Copyright (C) 2025 Victor Henrique Gonçalves dos Santos
+#
+# Este programa é um software livre; você pode redistribuí-lo e/ou
+# modificá-lo sob os termos da Licença Pública Geral GNU como
+# publicada pela Free Software Foundation; na versão 3 da Licença.
+#
+# Este programa é distribuído na esperança de que seja útil,
+# mas SEM NENHUMA GARANTIA; sem mesmo a garantia implícita de
+# COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM DETERMINADO FIM. Consulte a
+# Licença Pública Geral GNU para mais detalhes.
+#
+# Você deve ter recebido uma cópia da Licença Pública Geral GNU junto
+# com este programa. Se não, veja <https://www.gnu.org/licenses/>.
+
+from threading import Lock
+from sqlalchemy import Engine, MetaData, Table, inspect
+from sqlalchemy.exc import NoSuchTableError
+
+
+class ReflectionCache:
+    """
+    Guarda a reflexão das tabelas dos bancos, compartilhada no processo.
+
+    Cada tabela é refletida uma única vez por banco (identificado pela URL
+    do engine), mesmo quando várias execuções ou threads usam o mesmo banco,
+    como o destino comum de várias migrações. Tabelas inexistentes não são
+    guardadas, pois podem ser criadas pela própria carga.
+    """
+
+    __lock: Lock = Lock()
+    __metadata: dict[str, MetaData] = {}
+    __locks: dict[str, Lock] = {}
+    __columns: dict[tuple[str, str], list[dict]] = {}
+
+    @classmethod
+    def table(cls, engine: Engine, name: str) -> Table:
+        """
+        Retorna a tabela refletida, refletindo-a apenas no primeiro acesso.
+
+        Raises:
+            NoSuchTableError: Se a tabela não existir no banco.
+        """
+        key = cls.__key(engine)
+        with cls.__lock:
+            metadata = cls.__metadata.setdefault(key, MetaData())
+            lock = cls.__locks.setdefault(key, Lock())
+
+        with lock:
+            return Table(name, metadata, autoload_with=engine)
+
+    @classmethod
+    def columns(cls, engine: Engine, name: str) -> list[dict] | None:
+        """
+        Retorna as colunas da tabela (como `Inspector.get_columns`).
+
+        Returns:
+            (list[dict] | None): As colunas, ou None se a tabela não existir.
+        """
+        key = (cls.__key(engine), name)
+        with cls.__lock:
+            columns = cls.__columns.get(key)
+
+        if columns is None:
+            try:
+                columns = inspect(engine).get_columns(name)
+
+            except NoSuchTableError:
+                return None
+
+            with cls.__lock:
+                cls.__columns[key] = columns
+
+        return columns
+
+    @classmethod
+    def clear(cls) -> None:
+        """Descarta todas as reflexões, ex: após uma alteração de esquema."""
+        with cls.__lock:
+            cls.__metadata.clear()
+            cls.__locks.clear()
+            cls.__columns.clear()
+
+    @staticmethod
+    def __key(engine: Engine) -> str:
+        """Identifica o banco pela URL completa do engine."""
+        return engine.url.render_as_string(hide_password=False)